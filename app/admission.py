@@ -0,0 +1,263 @@
+"""
+Admission control for SNMP requests.
+
+Every datagram the agent accepts costs responder time on the event loop, so
+one misbehaving manager can starve every other manager and the REST API.
+``AdmissionController`` decides, before a PDU is processed, whether to
+serve it:
+
+- a token bucket per source address and one per community;
+- a cap on PDUs in flight (admitted but not yet answered);
+- a cap on var-binds per request (GETBULK max-repetitions is lowered to
+  fit it, on the fast path and pysnmp's stock responder alike);
+- a state-writer backlog above which SETs are refused.
+
+Refused requests are dropped without a response, as an overloaded agent
+would, and counted by reason. The limits come from the ``admission``
+section of ``agent_config.yaml``; every limit is optional::
+
+    admission:
+      source_rate: 200        # requests/s per source address
+      source_burst: 400
+      community_rate: 1000    # requests/s per community
+      community_burst: 2000
+      max_in_flight: 256
+      max_varbinds: 1024
+      max_queue_depth: 5000   # pending state-writer commands
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable, Mapping, Optional
+
+from pysnmp.proto import rfc3411
+from pysnmp.proto.api import v2c
+
+logger = logging.getLogger(__name__)
+
+# Idle source buckets are forgotten once this many sources are tracked
+_MAX_TRACKED_SOURCES = 4096
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, at most ``burst`` banked."""
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.stamp = now
+
+    def take(self, now: float) -> bool:
+        """Spend one token if one is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+    def full(self, now: float) -> bool:
+        return self.tokens + (now - self.stamp) * self.rate >= self.burst
+
+
+class AdmissionController:
+    """Per-source and per-community admission decisions for incoming PDUs."""
+
+    LIMITS = (
+        "source_rate",
+        "source_burst",
+        "community_rate",
+        "community_burst",
+        "max_in_flight",
+        "max_varbinds",
+        "max_queue_depth",
+    )
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, Any]] = None,
+        queue_depth: Optional[Callable[[], int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limits: dict[str, Optional[float]] = {}
+        for key in self.LIMITS:
+            value = (limits or {}).get(key)
+            self.limits[key] = float(value) if value is not None else None
+        for kind in ("source", "community"):
+            # A rate without a burst allows one second's worth of requests
+            if self.limits[f"{kind}_rate"] and not self.limits[f"{kind}_burst"]:
+                self.limits[f"{kind}_burst"] = self.limits[f"{kind}_rate"]
+        self.queue_depth = queue_depth
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._source_buckets: dict[Hashable, TokenBucket] = {}
+        self._community_buckets: dict[Hashable, TokenBucket] = {}
+        self._in_flight: set[Any] = set()
+        self._admitted = 0
+        self._dropped: dict[str, int] = {}
+        self._dropped_by_source: dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return any(value is not None for value in self.limits.values())
+
+    @property
+    def max_varbinds(self) -> Optional[int]:
+        value = self.limits["max_varbinds"]
+        return int(value) if value is not None else None
+
+    def admit(
+        self,
+        request_id: Any,
+        source: Optional[str],
+        community: Optional[str],
+        var_binds: int = 0,
+        write: bool = False,
+    ) -> Optional[str]:
+        """Admit a request (tracked until ``release``) or return why it was dropped."""
+        with self._lock:
+            reason = self._check(source, community, var_binds, write)
+            if reason is None:
+                self._admitted += 1
+                self._in_flight.add(request_id)
+                return None
+            self._dropped[reason] = self._dropped.get(reason, 0) + 1
+            key = source or "unknown"
+            if key not in self._dropped_by_source and len(self._dropped_by_source) >= _MAX_TRACKED_SOURCES:
+                # Spoofed sources must not grow the table without bound
+                key = "other"
+            self._dropped_by_source[key] = self._dropped_by_source.get(key, 0) + 1
+        logger.debug("Dropped request from %s (%s): %s", source, community, reason)
+        return reason
+
+    def release(self, request_id: Any) -> None:
+        """Forget an admitted request once its response has been sent (idempotent)."""
+        with self._lock:
+            self._in_flight.discard(request_id)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Limits and counters, for the REST API."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "limits": dict(self.limits),
+                "in_flight": len(self._in_flight),
+                "admitted": self._admitted,
+                "dropped": dict(self._dropped),
+                "dropped_by_source": dict(self._dropped_by_source),
+            }
+
+    def _check(
+        self, source: Optional[str], community: Optional[str], var_binds: int, write: bool
+    ) -> Optional[str]:
+        limits = self.limits
+        if limits["max_in_flight"] is not None and len(self._in_flight) >= limits["max_in_flight"]:
+            return "in_flight"
+        if limits["max_varbinds"] is not None and var_binds > limits["max_varbinds"]:
+            return "varbinds"
+        if write and limits["max_queue_depth"] is not None and self.queue_depth is not None:
+            if self.queue_depth() > limits["max_queue_depth"]:
+                return "queue_depth"
+        now = self._clock()
+        if limits["source_rate"] and not self._take(self._source_buckets, source, "source", now):
+            return "source_rate"
+        if limits["community_rate"] and not self._take(
+            self._community_buckets, community, "community", now
+        ):
+            return "community_rate"
+        return None
+
+    def _take(self, buckets: dict[Hashable, TokenBucket], key: Any, kind: str, now: float) -> bool:
+        bucket = buckets.get(key)
+        if bucket is None:
+            if len(buckets) >= _MAX_TRACKED_SOURCES:
+                for idle in [k for k, b in buckets.items() if b.full(now)]:
+                    del buckets[idle]
+            bucket = TokenBucket(
+                float(self.limits[f"{kind}_rate"] or 0.0),
+                float(self.limits[f"{kind}_burst"] or 0.0),
+                now,
+            )
+            buckets[key] = bucket
+        return bucket.take(now)
+
+
+def _cap_repetitions(PDU: Any, max_varbinds: int) -> None:
+    """Lower a GETBULK's max-repetitions so its response stays within ``max_varbinds``."""
+    var_binds = len(v2c.apiBulkPDU.get_varbinds(PDU))
+    non_repeaters = min(max(int(v2c.apiBulkPDU.get_non_repeaters(PDU)), 0), var_binds)
+    repeaters = var_binds - non_repeaters
+    if not repeaters:
+        return
+    cap = max(max_varbinds - non_repeaters, 0) // repeaters
+    if int(v2c.apiBulkPDU.get_max_repetitions(PDU)) > cap:
+        v2c.apiBulkPDU.set_max_repetitions(PDU, cap)
+
+
+class AdmissionMixin:
+    """Runs each incoming PDU past an ``AdmissionController`` before processing it."""
+
+    admission: Optional[AdmissionController] = None
+    # securityName -> community string, for per-community limits
+    communities: Mapping[str, str] = {}
+
+    def process_pdu(
+        self,
+        snmpEngine: Any,
+        messageProcessingModel: Any,
+        securityModel: Any,
+        securityName: Any,
+        securityLevel: Any,
+        contextEngineId: Any,
+        contextName: Any,
+        pduVersion: Any,
+        PDU: Any,
+        maxSizeResponseScopedPDU: Any,
+        stateReference: Any,
+    ) -> None:
+        admission = self.admission
+        if admission is not None:
+            try:
+                _, address = snmpEngine.message_dispatcher.get_transport_info(stateReference)
+                source: Optional[str] = str(address[0])
+            except Exception:
+                source = None
+            security_name = str(securityName)
+            reason = admission.admit(
+                stateReference,
+                source,
+                self.communities.get(security_name, security_name),
+                len(v2c.apiPDU.get_varbinds(PDU)),
+                PDU.tagSet in rfc3411.WRITE_CLASS_PDUS,
+            )
+            if reason is not None:
+                return
+            max_varbinds = admission.max_varbinds
+            if max_varbinds is not None and PDU.tagSet == v2c.GetBulkRequestPDU.tagSet:
+                _cap_repetitions(PDU, max_varbinds)
+        try:
+            super().process_pdu(  # type: ignore[misc]
+                snmpEngine,
+                messageProcessingModel,
+                securityModel,
+                securityName,
+                securityLevel,
+                contextEngineId,
+                contextName,
+                pduVersion,
+                PDU,
+                maxSizeResponseScopedPDU,
+                stateReference,
+            )
+        except Exception:
+            self.release_state_information(stateReference)
+            raise
+
+    def release_state_information(self, stateReference: Any) -> None:
+        if self.admission is not None:
+            self.admission.release(stateReference)
+        super().release_state_information(stateReference)  # type: ignore[misc]
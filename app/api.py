@@ -1,12 +1,19 @@
 from fastapi import FastAPI, HTTPException
 from app.app_logger import AppLogger
 from pydantic import BaseModel
-from typing import Optional, Any, Literal
+from typing import Optional, Any, Literal, cast
 from pathlib import Path
 import json
+import logging
+import time
 
+from app.deleted_instances import index_sort_key
+from app.index_codec import faux_index_str, faux_index_values
+from app.oid_search import get_search_index
 from app.oid_utils import oid_str_to_tuple, oid_tuple_to_str
+from app.table_graph import TableNode
 from app.trap_receiver import TrapReceiver
+from app.type_plan import TypePlanError
 from app.value_links import get_link_manager, ValueLinkEndpoint
 
 # Reference to the SNMPAgent instance will be set by main app
@@ -18,6 +25,9 @@ trap_receiver: Optional[TrapReceiver] = None
 logger = AppLogger.get(__name__)
 app = FastAPI()
 
+# Index-value keys accepted for tables without index columns, besides __index__
+_LEGACY_INDEX_KEYS = ("index", "instance")
+
 
 class SysDescrUpdate(BaseModel):
     value: str
@@ -211,46 +221,52 @@ def create_or_update_link(request: LinkRequest) -> dict[str, Any]:
     if link_id in existing and existing[link_id].get("source") != "state":
         raise HTTPException(status_code=400, detail="Cannot overwrite schema link")
 
-    # Replace existing state link if needed
-    link_manager.remove_link(link_id, source="state")
-
-    link_manager.add_link(
-        link_id,
-        endpoints=[ValueLinkEndpoint(e.table_oid, e.column) for e in request.endpoints],
-        scope=request.scope,
-        match=request.match,
-        source="state",
-        description=request.description,
-        create_missing=request.create_missing,
-    )
+    agent = snmp_agent
 
-    # Source-over-dest sync on creation: use first endpoint as source
-    if request.scope == "per-instance" and request.match == "shared-index":
-        source_ep = request.endpoints[0]
-        source_table = source_ep.table_oid
-        source_col = source_ep.column
-        if source_table:
-            source_instances = snmp_agent.table_instances.get(source_table, {})
-            for instance_str, payload in source_instances.items():
-                value = payload.get("column_values", {}).get(source_col)
-                if value is None:
-                    continue
-                for target_ep in request.endpoints[1:]:
-                    target_table = target_ep.table_oid
-                    target_col = target_ep.column
-                    if not target_table:
-                        continue
-                    if target_table not in snmp_agent.table_instances:
-                        continue
-                    if instance_str not in snmp_agent.table_instances[target_table]:
-                        continue
-                    snmp_agent._update_table_cell_values(
-                        target_table,
-                        instance_str,
-                        {target_col: value},
-                    )
+    def _apply_link() -> None:
+        # Replace existing state link if needed
+        link_manager.remove_link(link_id, source="state")
 
-    snmp_agent._save_mib_state()
+        link_manager.add_link(
+            link_id,
+            endpoints=[ValueLinkEndpoint(e.table_oid, e.column) for e in request.endpoints],
+            scope=request.scope,
+            match=request.match,
+            source="state",
+            description=request.description,
+            create_missing=request.create_missing,
+        )
+
+        # Source-over-dest sync on creation: use first endpoint as source
+        if request.scope == "per-instance" and request.match == "shared-index":
+            source_ep = request.endpoints[0]
+            source_table = source_ep.table_oid
+            source_col = source_ep.column
+            if source_table:
+                source_instances = dict(agent.table_instances.get(source_table, {}))
+                for instance_str, payload in source_instances.items():
+                    value = payload.get("column_values", {}).get(source_col)
+                    if value is None:
+                        continue
+                    for target_ep in request.endpoints[1:]:
+                        target_table = target_ep.table_oid
+                        target_col = target_ep.column
+                        if not target_table:
+                            continue
+                        if target_table not in agent.table_instances:
+                            continue
+                        if instance_str not in agent.table_instances[target_table]:
+                            continue
+                        agent._update_table_cell_values(
+                            target_table,
+                            instance_str,
+                            {target_col: value},
+                        )
+
+        agent._request_state_save()
+
+    # Links feed table writes, so apply them on the state writer thread
+    agent.run_state_command(_apply_link)
 
     return {"status": "ok", "id": link_id}
 
@@ -268,10 +284,17 @@ def delete_link(link_id: str) -> dict[str, Any]:
     if existing[link_id].get("source") != "state":
         raise HTTPException(status_code=400, detail="Cannot delete schema link")
 
-    if not link_manager.remove_link(link_id, source="state"):
+    agent = snmp_agent
+
+    def _remove_link() -> bool:
+        removed = link_manager.remove_link(link_id, source="state")
+        if removed:
+            agent._request_state_save()
+        return removed
+
+    if not agent.run_state_command(_remove_link):
         raise HTTPException(status_code=404, detail="Link not found")
 
-    snmp_agent._save_mib_state()
     return {"status": "deleted", "id": link_id}
 
 
@@ -296,6 +319,73 @@ def check_ready() -> dict[str, Any]:
     return {"ready": True, "oid_count": oid_count}
 
 
+@app.get("/admission")
+def get_admission() -> dict[str, Any]:
+    """Request admission limits and drop counters of the SNMP agent."""
+    if snmp_agent is None:
+        raise HTTPException(status_code=503, detail="SNMP agent not initialized")
+    snapshot: dict[str, Any] = snmp_agent.admission.snapshot()
+    return snapshot
+
+
+@app.get("/fault-injection")
+def get_fault_injection() -> dict[str, Any]:
+    """Latency/drop injection profiles of the SNMP agent and their counters."""
+    if snmp_agent is None:
+        raise HTTPException(status_code=503, detail="SNMP agent not initialized")
+    injector = snmp_agent.fault_injector
+    if injector is None:
+        return {"profiles": [], "stats": {}}
+    snapshot: dict[str, Any] = injector.snapshot()
+    return snapshot
+
+
+CAPTURE_DIR = Path("data") / "captures"
+
+
+class CaptureRequest(BaseModel):
+    """Name of the capture file under data/captures (default: <timestamp>.snmpcap)."""
+    name: Optional[str] = None
+
+
+@app.get("/capture")
+def get_capture() -> dict[str, Any]:
+    """Status of the SNMP traffic capture."""
+    if snmp_agent is None:
+        raise HTTPException(status_code=503, detail="SNMP agent not initialized")
+    status: dict[str, Any] = snmp_agent.traffic_capture.status()
+    return status
+
+
+@app.post("/capture/start")
+def start_capture(request: Optional[CaptureRequest] = None) -> dict[str, Any]:
+    """Start recording received requests and sent responses to a capture file."""
+    if snmp_agent is None:
+        raise HTTPException(status_code=503, detail="SNMP agent not initialized")
+    name = request.name if request is not None and request.name else None
+    if name is None:
+        name = f"{time.strftime('%Y%m%d_%H%M%S')}.snmpcap"
+    elif "/" in name or "\\" in name or ".." in name:
+        raise HTTPException(status_code=400, detail="Capture name must be a file name, not a path")
+    path = str(CAPTURE_DIR / name)
+    try:
+        snmp_agent.traffic_capture.start(path)
+    except OSError as e:
+        raise HTTPException(status_code=400, detail=f"Cannot write capture file: {e}")
+    status: dict[str, Any] = snmp_agent.traffic_capture.status()
+    return status
+
+
+@app.post("/capture/stop")
+def stop_capture() -> dict[str, Any]:
+    """Stop the traffic capture in progress."""
+    if snmp_agent is None:
+        raise HTTPException(status_code=503, detail="SNMP agent not initialized")
+    status = snmp_agent.traffic_capture.status()
+    snmp_agent.traffic_capture.stop()
+    return {**status, "active": False}
+
+
 @app.get("/mibs")
 def list_mibs() -> dict[str, Any]:
     """List all MIBs implemented by the agent."""
@@ -473,6 +563,76 @@ def get_oid_metadata() -> dict[str, Any]:
     return {"count": len(metadata_map), "metadata": metadata_map}
 
 
+@app.get("/search")
+def search_oids(q: str, mode: str = "auto", limit: int = 50, mib: Optional[str] = None) -> dict[str, Any]:
+    """Search object names, OIDs, descriptions and enum labels across the loaded schemas.
+
+    Results are ranked; ``mode`` is one of auto, prefix, substring or fuzzy.
+    The index is kept in memory and re-indexes only schemas that changed.
+    """
+    index = get_search_index()
+    index.refresh_from_dir("agent-model")
+    try:
+        hits = index.search(q, mode=mode, limit=limit, mib=mib)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "query": q,
+        "mode": mode,
+        "count": len(hits),
+        "results": [hit.to_dict() for hit in hits],
+    }
+
+
+def _make_jsonable(v: Any) -> Any:
+    """JSON-friendly form of a value; pysnmp syntax objects become strings."""
+    if v is None:
+        return None
+    if isinstance(v, (str, int, float, bool)):
+        return v
+    if isinstance(v, (list, tuple)):
+        return [_make_jsonable(x) for x in v]
+    try:
+        return str(v)
+    except Exception:
+        return repr(v)
+
+
+def _virtual_index_columns(instances: list[str]) -> dict[str, dict[str, Any]]:
+    """``__index__``/``__index_N__`` columns for a table without index columns.
+
+    One column per part of the longest instance string, so multi-part
+    instances stay editable.
+    """
+    max_parts = max((len(str(inst).split(".")) for inst in instances), default=1)
+    columns: dict[str, dict[str, Any]] = {}
+    for i in range(1, max_parts + 1):
+        col_name = "__index__" if i == 1 else f"__index_{i}__"
+        columns[col_name] = {
+            "oid": [],  # Virtual column has no real OID
+            "type": "Integer32",
+            "access": "read-write",  # Allow editing
+            "is_index": True,
+            "default": "1" if i == 1 else "",
+            "enums": None
+        }
+    return columns
+
+
+def _enum_label(value: Any, enums: Any) -> Optional[str]:
+    """Name of an enumerated integer value, if ``enums`` defines it."""
+    if not isinstance(enums, dict) or value is None:
+        return None
+    try:
+        int_value = int(str(value))
+    except (TypeError, ValueError):
+        return None
+    for enum_name, enum_value in enums.items():
+        if enum_value == int_value:
+            return str(enum_name)
+    return None
+
+
 @app.get("/table-schema")
 def get_table_schema(oid: str) -> dict[str, Any]:
     """Get schema information for a table OID."""
@@ -614,38 +774,23 @@ def get_table_schema(oid: str) -> dict[str, Any]:
 
     # Add dynamically-created instances from the persisted state file
     oid_str = ".".join(str(x) for x in parts)
-    if snmp_agent and oid_str in snmp_agent.table_instances:
-        for instance_key in snmp_agent.table_instances[oid_str].keys():
+    state = snmp_agent.state_snapshot() if snmp_agent else None
+    if state is not None and oid_str in state.table_instances:
+        for instance_key in state.table_instances[oid_str].keys():
             if instance_key not in instances:
                 instances.append(instance_key)
     
     # Remove deleted instances
-    if snmp_agent:
-        instances = [inst for inst in instances if f"{oid_str}.{inst}" not in snmp_agent.deleted_instances]
+    if state is not None:
+        deleted = state.deleted_instances.get(oid_str, frozenset())
+        if deleted:
+            instances = [inst for inst in instances if inst not in deleted]
     
     # For no-index tables, add virtual __index__ columns to support multi-part indexes
     if not index_columns:
-        # Analyze instances to determine how many __index__ parts we need
-        max_parts = 1
-        for inst in instances:
-            parts_count = len(str(inst).split("."))
-            max_parts = max(max_parts, parts_count)
-        
-        # Add virtual __index__ columns
-        virtual_index_cols = []
-        for i in range(1, max_parts + 1):
-            col_name = "__index__" if i == 1 else f"__index_{i}__"
-            virtual_index_cols.append(col_name)
-            columns[col_name] = {
-                "oid": [],  # Virtual column has no real OID
-                "type": "Integer32",
-                "access": "read-write",  # Allow editing
-                "is_index": True,
-                "default": "1" if i == 1 else "",
-                "enums": None
-            }
-        
-        index_columns = virtual_index_cols
+        virtual_index_cols = _virtual_index_columns(instances)
+        columns.update(virtual_index_cols)
+        index_columns = list(virtual_index_cols)
 
     return {
         "name": table_name,
@@ -661,6 +806,151 @@ def get_table_schema(oid: str) -> dict[str, Any]:
     }
 
 
+@app.get("/table-rows")
+def get_table_rows(
+    oid: str, offset: int = 0, limit: int = 200, instance: Optional[str] = None
+) -> dict[str, Any]:
+    """Get one page of a table's rows, fully materialised from in-memory data.
+
+    Rows are the schema rows plus dynamically added ones, minus deleted ones,
+    in numeric instance order. Each row carries its decoded index values,
+    every column's current value and the enum labels of those values, so a
+    client needs no per-cell ``/value`` requests. ``limit <= 0`` returns all
+    rows from ``offset``; when ``instance`` is listed, the page holding it is
+    returned instead.
+    """
+    if snmp_agent is None:
+        raise HTTPException(status_code=500, detail="SNMP agent not initialized")
+
+    try:
+        table_oid = oid_tuple_to_str(oid_str_to_tuple(oid))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid OID format")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must not be negative")
+
+    node = snmp_agent.table_graph.tables.get(table_oid)
+    if node is None:
+        raise HTTPException(status_code=404, detail="Table not found")
+
+    schema = snmp_agent.mib_jsons.get(node.mib, {})
+    objects = schema.get("objects", schema) if isinstance(schema, dict) else {}
+    entry_info = objects.get(node.entry_name) if node.entry_name else None
+    foreign_keys = entry_info.get("foreign_keys", []) if isinstance(entry_info, dict) else []
+    index_columns = list(node.indexes)
+
+    columns: dict[str, dict[str, Any]] = {}
+    for col_name in node.columns:
+        obj_data = objects.get(col_name, {})
+        columns[col_name] = {
+            "oid": list(obj_data.get("oid", [])),
+            "type": obj_data.get("type", ""),
+            "access": obj_data.get("access", ""),
+            "is_index": col_name in index_columns,
+            "is_foreign_key": col_name in foreign_keys,
+            "default": obj_data.get("initial", ""),
+            "enums": obj_data.get("enums"),
+        }
+
+    # Schema rows keyed by instance string, encoded as the registrar does
+    codec = snmp_agent.index_codec(table_oid) if index_columns else None
+    schema_rows: dict[str, dict[str, Any]] = {}
+    for row_idx, row in enumerate(node.rows):
+        if not isinstance(row, dict):
+            continue
+        if codec is not None and codec.columns:
+            try:
+                inst = codec.to_instance_str(row, codec.schema_row_defaults(row_idx))
+            except ValueError:
+                continue  # not registered either
+        else:
+            inst = "1"
+        schema_rows.setdefault(inst, row)
+
+    state = snmp_agent.state_snapshot()
+    dynamic = state.table_instances.get(table_oid, {})
+    deleted = state.deleted_instances.get(table_oid, frozenset())
+    instances = sorted(
+        (inst for inst in schema_rows.keys() | dynamic.keys() if inst not in deleted),
+        key=index_sort_key,
+    )
+
+    total = len(instances)
+    if instance is not None and limit > 0:
+        try:
+            offset = (instances.index(instance) // limit) * limit
+        except ValueError:
+            pass
+    page = instances[offset:] if limit <= 0 else instances[offset:offset + limit]
+
+    if not index_columns:
+        virtual_index_cols = _virtual_index_columns(instances)
+        columns.update(virtual_index_cols)
+        index_columns = list(virtual_index_cols)
+
+    registrar = getattr(snmp_agent, "mib_registrar", None)
+    rows: list[dict[str, Any]] = []
+    for inst in page:
+        schema_row = schema_rows.get(inst)
+        row_values: dict[str, Any] = {}
+        live: dict[str, Any] = {}
+        if schema_row is not None:
+            nested = schema_row.get("values")
+            row_values = nested if isinstance(nested, dict) else schema_row
+            if registrar is not None and codec is not None:
+                live = registrar.row_values(table_oid, inst)
+
+        if codec is None or not codec.columns:
+            index_values: dict[str, Any] = faux_index_values(inst)
+        elif schema_row is not None and codec.covers(schema_row):
+            index_values = {idx: schema_row[idx] for idx in codec.columns}
+        else:
+            try:
+                index_values = codec.from_instance_str(inst)
+            except ValueError:
+                index_values = faux_index_values(inst)
+
+        dynamic_values = dynamic.get(inst, {}).get("column_values", {})
+        values: dict[str, Any] = {}
+        labels: dict[str, str] = {}
+        for col_name in node.columns:
+            # Same precedence as GET /value: live MIB cell, dynamic row, schema row
+            if col_name in index_values:
+                value = index_values[col_name]
+            elif col_name in live:
+                value = live[col_name]
+            elif col_name in dynamic_values:
+                value = dynamic_values[col_name]
+            else:
+                value = row_values.get(col_name)
+            value = _make_jsonable(value)
+            values[col_name] = value
+            label = _enum_label(value, columns[col_name]["enums"])
+            if label is not None:
+                labels[col_name] = label
+
+        rows.append({
+            "instance": inst,
+            "index": {name: _make_jsonable(val) for name, val in index_values.items()},
+            "values": values,
+            "labels": labels,
+        })
+
+    return {
+        "oid": table_oid,
+        "name": node.table_name,
+        "mib": node.mib,
+        "entry_name": node.entry_name or None,
+        "index_columns": index_columns,
+        "foreign_keys": foreign_keys,
+        "columns": columns,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "rows": rows,
+    }
+
+
 @app.get("/value")
 def get_oid_value(oid: str) -> dict[str, Any]:
     """Get the value for a specific OID string (dot separated)."""
@@ -689,19 +979,6 @@ def get_oid_value(oid: str) -> dict[str, Any]:
         raise HTTPException(status_code=500, detail="Internal server error")
 
     # Ensure returned value is JSON-serializable; fall back to string representation
-    def _make_jsonable(v: Any) -> Any:
-        # Primitive JSON-friendly types
-        if v is None:
-            return None
-        if isinstance(v, (str, int, float, bool)):
-            return v
-        if isinstance(v, (list, tuple)):
-            return [ _make_jsonable(x) for x in v ]
-        try:
-            return str(v)
-        except Exception:
-            return repr(v)
-
     serializable = _make_jsonable(value)
     logger.info(f"Fetched value for OID {parts}: {serializable}")
     return {"oid": parts, "value": serializable}
@@ -780,8 +1057,9 @@ def _try_get_table_cell_value(oid: str, parts: tuple[int, ...]) -> Any | None:
         return None
     
     # Now check table_instances for this specific table
-    if table_oid_str in snmp_agent.table_instances:
-        instances = snmp_agent.table_instances[table_oid_str]
+    state = snmp_agent.state_snapshot()
+    if table_oid_str in state.table_instances:
+        instances = state.table_instances[table_oid_str]
         if instance_str in instances:
             column_values = instances[instance_str].get("column_values", {})
             if column_name in column_values:
@@ -862,19 +1140,6 @@ def get_all_values() -> dict[str, Any]:
     if snmp_agent is None:
         raise HTTPException(status_code=500, detail="SNMP agent not initialized")
 
-    # Helper to make values JSON-serializable
-    def _make_jsonable(v: Any) -> Any:
-        if v is None:
-            return None
-        if isinstance(v, (str, int, float, bool)):
-            return v
-        if isinstance(v, (list, tuple)):
-            return [_make_jsonable(x) for x in v]
-        try:
-            return str(v)
-        except Exception:
-            return repr(v)
-
     # Get all registered OIDs
     all_oids = snmp_agent.get_all_oids()
     values = {}
@@ -913,6 +1178,9 @@ def set_oid_value(update: OIDValueUpdate) -> dict[str, Any]:
         snmp_agent.set_scalar_value(parts, update.value)
         logger.info(f"Set value for OID {parts} to: {update.value}")
         return {"status": "ok", "oid": parts, "new_value": update.value}
+    except TypePlanError as e:
+        logger.warning(f"Rejected value for OID {parts}: {e}")
+        raise HTTPException(status_code=400, detail={"error": e.status, "message": str(e)})
     except ValueError as e:
         # Expected: scalar not found or not writable for this OID
         logger.warning(f"Cannot set scalar OID: {parts} - {e}")
@@ -923,195 +1191,77 @@ def set_oid_value(update: OIDValueUpdate) -> dict[str, Any]:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+def _bulk_instance_str(row: dict[str, Any], node: TableNode) -> str:
+    """Instance string of a schema row, with IpAddress indexes expanded to four arcs."""
+    parts: list[str] = []
+    for idx_col, idx_type in zip(node.indexes, node.index_types):
+        if idx_col in row:
+            val = row[idx_col]
+            if idx_type == "IpAddress" and isinstance(val, str):
+                parts.extend(val.split("."))
+            else:
+                parts.append(str(val))
+    return ".".join(parts)
+
+
 @app.get("/tree/bulk")
 def get_tree_bulk_data() -> dict[str, Any]:
     """Get complete tree data including all table instances for efficient GUI loading."""
     if snmp_agent is None:
         raise HTTPException(status_code=500, detail="SNMP agent not initialized")
 
-    from app.cli_load_model import load_all_schemas
-    import os
-
-    schema_dir = "agent-model"
-    if not os.path.exists(schema_dir):
-        return {"tables": {}}
-
-    schemas = load_all_schemas(schema_dir)
-
-    # Get all table instances with their full data
+    # Tables, entries and index_from links come from the agent's relationship graph
+    graph = snmp_agent.table_graph
+    state = snmp_agent.state_snapshot()
     tables_data: dict[str, Any] = {}
-    
-    # Build a map of parent column sources for tables with index_from
-    # This helps identify which table rows to use for instances
-    index_source_map: dict[str, dict[str, Any]] = {}  # table_oid -> {source_mib, source_column}
-    
-    # First pass: identify tables and their index sources
-    for mib_name, schema in schemas.items():
-        if "objects" in schema:
-            objects = schema["objects"]
-        else:
-            objects = schema
 
-        for obj_name, obj_data in objects.items():
-            if isinstance(obj_data, dict) and obj_data.get("type") == "MibTableRow":
-                # Check if this entry has index_from
-                index_from = obj_data.get("index_from", [])
-                if index_from and isinstance(index_from, list) and len(index_from) > 0:
-                    # Store the source info for this table row
-                    table_oid_parts = obj_data.get("oid", [])
-                    # Table OID is entry OID minus the .1
-                    if table_oid_parts and len(table_oid_parts) > 0 and table_oid_parts[-1] == 1:
-                        table_oid = ".".join(str(x) for x in table_oid_parts[:-1])
-                        index_source_map[table_oid] = index_from[0]  # Store first index source
-    
-    # Second pass: process all tables
-    for mib_name, schema in schemas.items():
-        if "objects" in schema:
-            objects = schema["objects"]
-        else:
-            objects = schema
+    for table_oid, node in graph.tables.items():
+        instances: list[str] = []
+        # Tables whose deleted rows must not be listed (own, plus the index source)
+        deleted_from = [table_oid]
+        try:
+            if node.index_source is not None:
+                # This table's instances come from its parent table's rows only
+                source = graph.index_source(table_oid)
+                if source is not None:
+                    deleted_from.append(source.table_oid)
+                    for row in source.rows:
+                        if isinstance(row, dict):
+                            inst = _bulk_instance_str(row, source)
+                            if inst:
+                                instances.append(inst)
+            else:
+                for row in node.rows:
+                    if isinstance(row, dict):
+                        inst = _bulk_instance_str(row, node)
+                        if inst:
+                            instances.append(inst)
+
+            # Dynamic instances, except for augmented tables (they follow the parent table)
+            if not node.has_index_from and table_oid in state.table_instances:
+                seen = set(instances)
+                for inst_key in state.table_instances[table_oid].keys():
+                    if inst_key not in seen:
+                        seen.add(inst_key)
+                        instances.append(inst_key)
+
+            for deleted_table in deleted_from:
+                deleted = state.deleted_instances.get(deleted_table)
+                if deleted:
+                    instances = [inst for inst in instances if inst not in deleted]
+        except Exception as e:
+            logger.warning(f"Error getting instances for table {node.table_name}: {e}")
+
+        if instances:
+            tables_data[table_oid] = {
+                "table_name": node.table_name,
+                "entry_name": node.entry_name or None,
+                "index_columns": list(node.indexes),
+                "instances": instances,
+            }
 
-        for obj_name, obj_data in objects.items():
-            if isinstance(obj_data, dict) and obj_data.get("type") == "MibTable":
-                table_oid = ".".join(str(x) for x in obj_data["oid"])
-                
-                # Find the entry object
-                entry_name = None
-                entry_obj = {}
-                table_oid_parts = obj_data["oid"]
-                expected_entry_oid = list(table_oid_parts) + [1]
-                
-                for other_name, other_data in objects.items():
-                    if isinstance(other_data, dict) and other_data.get("type") == "MibTableRow":
-                        if list(other_data.get("oid", [])) == expected_entry_oid:
-                            entry_name = other_name
-                            entry_obj = other_data
-                            break
-                
-                index_columns = entry_obj.get("indexes", [])
-                
-                # Get instances for this table
-                instances: list[str] = []
-                try:
-                    # Check if this table has entries that reference another table for indexes
-                    if table_oid in index_source_map:
-                        # This table's instances come from a parent table
-                        source_info = index_source_map[table_oid]
-                        source_mib = source_info.get("mib", "")
-                        source_column = source_info.get("column", "")
-                        
-                        # Debug log for augmented tables
-                        if table_oid.endswith(".31.1.1"):
-                            logger.debug(f"Fetching parent instances for {obj_name} ({table_oid}) from {source_mib}.{source_column}")
-                        if source_mib in schemas:
-                            source_schema = schemas[source_mib]
-                            if "objects" in source_schema:
-                                source_objects = source_schema["objects"]
-                            else:
-                                source_objects = source_schema
-                            
-                            # First find which table contains the source column
-                            # The source_column is a column object, so we find its parent entry's parent table
-                            parent_table_obj = None
-                            if source_column in source_objects:
-                                col_data = source_objects[source_column]
-                                if isinstance(col_data, dict):
-                                    col_oid = tuple(col_data.get("oid", []))
-                                    # The parent entry OID is all but the last segment
-                                    if len(col_oid) > 1:
-                                        entry_oid = col_oid[:-1]
-                                        # Find the table OID (all but the last entry "1")
-                                        if len(entry_oid) > 0 and entry_oid[-1] == 1:
-                                            table_oid_parts = entry_oid[:-1]
-                                            # Now find the table with this OID
-                                            for tbl_name, tbl_data in source_objects.items():
-                                                if (isinstance(tbl_data, dict) and 
-                                                    tbl_data.get("type") == "MibTable" and
-                                                    list(tbl_data.get("oid", [])) == list(table_oid_parts)):
-                                                    parent_table_obj = tbl_data
-                                                    break
-                            
-                            # Extract instances from the parent table only
-                            if parent_table_obj:
-                                source_rows = parent_table_obj.get("rows", [])
-                                source_entry_obj = {}
-                                
-                                # Find the entry for the parent table
-                                source_entry_oid = list(parent_table_obj.get("oid", [])) + [1]
-                                for source_entry_name, source_entry_data in source_objects.items():
-                                    if (isinstance(source_entry_data, dict) and 
-                                        source_entry_data.get("type") == "MibTableRow" and
-                                        list(source_entry_data.get("oid", [])) == source_entry_oid):
-                                        source_entry_obj = source_entry_data
-                                        break
-                                
-                                source_indexes = source_entry_obj.get("indexes", [])
-                                
-                                # Extract instances from source table's rows
-                                if isinstance(source_rows, list):
-                                    for row in source_rows:
-                                        if isinstance(row, dict):
-                                            # Build instance string from source table's indexes
-                                            parts = []
-                                            for idx_col in source_indexes:
-                                                if idx_col in row:
-                                                    val = row[idx_col]
-                                                    col_meta = source_objects.get(idx_col, {})
-                                                    if col_meta.get("type") == "IpAddress" and isinstance(val, str):
-                                                        parts.extend(val.split("."))
-                                                    else:
-                                                        parts.append(str(val))
-                                            if parts:
-                                                instances.append(".".join(parts))
-                        
-                        # Debug log after fetching parent instances
-                        if table_oid.endswith(".31.1.1"):
-                            logger.debug(f"After fetching parent instances for {obj_name}: {instances}")
-                    else:
-                        # Get instances from actual rows in this table
-                        rows = obj_data.get("rows", [])
-                        if isinstance(rows, list):
-                            for row in rows:
-                                if isinstance(row, dict):
-                                    # Build instance string from index columns
-                                    parts = []
-                                    for idx_col in index_columns:
-                                        if idx_col in row:
-                                            val = row[idx_col]
-                                            # Handle IpAddress expansion
-                                            col_meta = objects.get(idx_col, {})
-                                            if col_meta.get("type") == "IpAddress" and isinstance(val, str):
-                                                parts.extend(val.split("."))
-                                            else:
-                                                parts.append(str(val))
-                                    if parts:
-                                        instances.append(".".join(parts))
-                    
-                    # Also add any dynamic instances from snmp_agent.table_instances
-                    # BUT: Skip this for augmented tables (those with index_from) - they should only use parent table instances
-                    # Check both entry_obj and index_source_map to detect augmented tables
-                    has_index_from = isinstance(entry_obj, dict) and bool(entry_obj.get("index_from"))
-                    is_in_index_source = table_oid in index_source_map
-                    is_augmented = has_index_from or is_in_index_source
-                    
-                    if not is_augmented and table_oid in snmp_agent.table_instances:
-                        for inst_key in snmp_agent.table_instances[table_oid].keys():
-                            if inst_key not in instances:
-                                instances.append(inst_key)
-                except Exception as e:
-                    logger.warning(f"Error getting instances for table {obj_name}: {e}")
-                
-                if instances:
-                    tables_data[table_oid] = {
-                        "table_name": obj_name,
-                        "entry_name": entry_name,
-                        "index_columns": index_columns,
-                        "instances": instances
-                    }
-    
     logger.info(f"Bulk tree data: {len(tables_data)} tables with instances")
 
-
     return {
         "tables": tables_data
     }
@@ -1641,17 +1791,13 @@ def create_table_row(request: CreateTableRowRequest) -> dict[str, Any]:
         schemas = load_all_schemas(schema_dir)
         
         logger.info(f"Creating table instance for {request.table_oid}")
-        logger.info(f"  index_values: {request.index_values} (type: {type(request.index_values)})")
-        logger.info(f"  column_values: {request.column_values}")
+        logger.debug(f"  index_values: {request.index_values} (type: {type(request.index_values)})")
+        logger.debug(f"  column_values: {request.column_values}")
         
         # Log each column value's type
-        if request.column_values:
+        if request.column_values and logger.isEnabledFor(logging.DEBUG):
             for col_name, col_val in request.column_values.items():
-                logger.info(f"    {col_name}: {col_val} (type: {type(col_val).__name__})")
-        
-        # Parse table OID
-        table_parts = tuple(int(x) for x in request.table_oid.split(".")) if request.table_oid else ()
-        entry_oid = table_parts + (1,)
+                logger.debug(f"    {col_name}: {col_val} (type: {type(col_val).__name__})")
         
         # Fetch table schema to get index column types
         try:
@@ -1692,40 +1838,11 @@ def create_table_row(request: CreateTableRowRequest) -> dict[str, Any]:
                 return True
             return False
         
-        def _extract_index_str(values: dict[str, Any]) -> str:
-            """Extract instance string from index values, supporting multi-part __index__."""
-            # Handle multi-part __index__ (__index__, __index_2__, __index_3__, etc.)
-            index_parts = []
-            i = 1
-            while True:
-                key = "__index__" if i == 1 else f"__index_{i}__"
-                if key in values:
-                    index_parts.append(str(values[key]))
-                    i += 1
-                else:
-                    break
-            
-            if index_parts:
-                return ".".join(index_parts)
-            
-            # Legacy fallbacks
-            if "index" in values:
-                return str(values["index"])
-            if "instance" in values:
-                return str(values["instance"])
-            if not values:
-                return "1"
-            return ".".join(str(v) for v in values.values())
-
         if not index_columns:
-            index_str = _extract_index_str(request.index_values)
+            index_str = faux_index_str(request.index_values, legacy_keys=_LEGACY_INDEX_KEYS)
             # Parse multi-part index string into separate __index__ values
             # E.g., "1.2.3" → {"__index__": "1", "__index_2__": "2", "__index_3__": "3"}
-            index_parts = index_str.split(".")
-            parsed_index_values = {}
-            for i, part in enumerate(index_parts, 1):
-                key = "__index__" if i == 1 else f"__index_{i}__"
-                parsed_index_values[key] = part
+            parsed_index_values = faux_index_values(index_str)
 
             # Merge defaults for missing or "unset" columns
             default_row = _get_default_row(request.table_oid)
@@ -1758,73 +1875,18 @@ def create_table_row(request: CreateTableRowRequest) -> dict[str, Any]:
                 "columns_created": [str(col) for col in merged_values.keys()] if merged_values else []
             }
 
-        # Helper function to convert index value based on column type
-        def convert_index_value(col_name: str, value: str | int) -> int | tuple[int, ...] | str:
-            """Convert index value to appropriate format based on column type."""
-            if col_name not in columns:
-                # Try to parse as int, otherwise keep as string
-                if isinstance(value, int):
-                    return value
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return str(value)
-            
-            col_info = columns[col_name]
-            col_type = col_info.get("type", "")
-            
-            # Convert based on type
-            if col_type == "IpAddress" or "IpAddress" in col_type:
-                # Convert "192.168.1.1" to (192, 168, 1, 1)
-                if isinstance(value, str):
-                    try:
-                        parts = tuple(int(p) for p in value.split("."))
-                        return parts
-                    except (ValueError, AttributeError):
-                        return str(value)
-                return value
-            elif "Integer" in col_type or col_type in ("Integer32", "Integer64", "Unsigned32", "Gauge32", "Counter32", "Counter64"):
-                # Integer types
-                if isinstance(value, int):
-                    return value
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return str(value)
-            else:
-                # String or unknown types - keep as-is
-                return str(value) if not isinstance(value, str) else value
-        
-        # Convert all index values
-        converted_indices = {}
-        for col_name in index_columns:
-            if col_name in request.index_values:
-                converted_indices[col_name] = convert_index_value(col_name, request.index_values[col_name])
-        
-        # Build the instance OID from ALL converted index values (not just the first)
-        # OID format: entry_oid + (1,) + <first_index_components> + <second_index_components> + ...
-        index_oid = entry_oid + (1,)  # Start with column index 1
-        instance_index_str = ""
-        
-        # Append each index value to the OID in order
         for idx_col_name in index_columns:
             if idx_col_name not in request.index_values:
                 raise HTTPException(status_code=400, detail=f"Missing required index column: {idx_col_name}")
-            
-            converted_val = converted_indices.get(idx_col_name)
-            if converted_val is None:
-                converted_val = convert_index_value(idx_col_name, request.index_values[idx_col_name])
-            
-            if isinstance(converted_val, tuple):
-                # For IpAddress and similar tuple types, expand the tuple into the OID
-                index_oid = index_oid + converted_val
-                instance_index_str += "." + ".".join(str(x) for x in converted_val)
-            else:
-                # For single values
-                int_val = int(converted_val) if isinstance(converted_val, (int, float)) else int(str(converted_val))
-                index_oid = index_oid + (int_val,)
-                instance_index_str += f".{int_val}"
-        
+
+        # Encode the index with the table's compiled codec (IpAddress and
+        # string indexes expand to several sub-identifiers)
+        codec = snmp_agent.index_codec(request.table_oid)
+        if codec is not None and codec.covers(request.index_values):
+            instance_index_str = codec.to_instance_str(request.index_values)
+        else:
+            instance_index_str = ".".join(str(request.index_values[col]) for col in index_columns)
+
         # Merge defaults for missing or "unset" columns
         default_row = _get_default_row(request.table_oid)
         merged_values: dict[str, Any] = {}
@@ -1854,12 +1916,14 @@ def create_table_row(request: CreateTableRowRequest) -> dict[str, Any]:
         return {
             "status": "ok",
             "table_oid": request.table_oid,
-            "instance_index": instance_index_str.lstrip("."),
+            "instance_index": instance_index_str,
             "instance_oid": instance_oid,
             "columns_created": [str(col) for col in merged_values.keys()] if merged_values else []
         }
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid index value: {e}")
     except Exception as e:
         logger.error(f"Failed to create table instance: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create instance: {str(e)}")
@@ -1872,41 +1936,12 @@ def delete_table_row(request: CreateTableRowRequest) -> dict[str, Any]:
         raise HTTPException(status_code=500, detail="SNMP agent not initialized")
     
     try:
-        def _extract_index_str(values: dict[str, Any]) -> str:
-            """Extract instance string from index values, supporting multi-part __index__."""
-            # Handle multi-part __index__ (__index__, __index_2__, __index_3__, etc.)
-            index_parts = []
-            i = 1
-            while True:
-                key = "__index__" if i == 1 else f"__index_{i}__"
-                if key in values:
-                    index_parts.append(str(values[key]))
-                    i += 1
-                else:
-                    break
-            
-            if index_parts:
-                return ".".join(index_parts)
-            
-            # Legacy fallbacks
-            if "index" in values:
-                return str(values["index"])
-            if "instance" in values:
-                return str(values["instance"])
-            if not values:
-                return "1"
-            return ".".join(str(v) for v in values.values())
-
         index_values = request.index_values or {}
-        index_str = _extract_index_str(index_values)
+        index_str = faux_index_str(index_values, legacy_keys=_LEGACY_INDEX_KEYS)
         
         # Parse multi-part index string into separate __index__ values
         # E.g., "1.2.3" → {"__index__": "1", "__index_2__": "2", "__index_3__": "3"}
-        index_parts = index_str.split(".")
-        parsed_index_values = {}
-        for i, part in enumerate(index_parts, 1):
-            key = "__index__" if i == 1 else f"__index_{i}__"
-            parsed_index_values[key] = part
+        parsed_index_values = faux_index_values(index_str)
 
         # Delete the instance
         success = snmp_agent.delete_table_instance(
@@ -2201,7 +2236,7 @@ async def send_test_trap(request: TestTrapRequest) -> dict[str, Any]:
 
 def _write_empty_state(state_file: Path) -> None:
     state_file.parent.mkdir(parents=True, exist_ok=True)
-    state: dict[str, Any] = {"deleted_instances": [], "scalars": {}, "tables": {}}
+    state: dict[str, Any] = {"deleted_instances": {}, "scalars": {}, "tables": {}}
     with state_file.open("w", encoding="utf-8") as f:
         json.dump(state, f, indent=2, sort_keys=True)
 
@@ -2216,7 +2251,7 @@ def bake_state() -> dict[str, Any]:
     2. Reads current state from data/mib_state.json
     3. Merges state values into schema files as initial_value
     """
-    from app.cli_bake_state import backup_schemas, load_mib_state, bake_state_into_schemas
+    from app.cli_bake_state import backup_schemas, load_mib_state, load_type_registry, bake_state_into_schemas
     from pathlib import Path
 
     schema_dir = Path("agent-model")
@@ -2231,18 +2266,17 @@ def bake_state() -> dict[str, Any]:
         state = load_mib_state(state_file)
 
         # Bake state into schemas
-        baked_count = bake_state_into_schemas(schema_dir, state)
+        baked_count = bake_state_into_schemas(
+            schema_dir, state, type_registry=load_type_registry(Path("data/types.json"))
+        )
 
         # Clear the state file now that values have been baked into schemas
         _write_empty_state(state_file)
 
         # Clear the agent's in-memory state as well
         if snmp_agent is not None:
-            snmp_agent.overrides = {}
-            snmp_agent.table_instances = {}
-            snmp_agent.deleted_instances = []
             try:
-                snmp_agent._save_mib_state()
+                snmp_agent.reset_state()
             except Exception:
                 pass
 
@@ -2256,6 +2290,31 @@ def bake_state() -> dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Failed to bake state: {e}")
 
 
+def _hot_reload_agent(
+    schema_dir: Path, state_file: Path = Path("data/mib_state.json")
+) -> Optional[dict[str, Any]]:
+    """Clear state and hot-swap the agent onto the schemas now in ``schema_dir``.
+
+    Returns the reload summary, or None if there is no running agent or the
+    reload failed (state is still cleared; a restart picks up the schemas).
+    """
+    try:
+        _write_empty_state(state_file)
+    except Exception:
+        pass
+    if snmp_agent is None:
+        return None
+    try:
+        return cast(Optional[dict[str, Any]], snmp_agent.reload_schemas(str(schema_dir), reset_state=True))
+    except Exception as e:
+        logger.error(f"Hot reload failed, restart required: {e}", exc_info=True)
+        try:
+            snmp_agent.reset_state()
+        except Exception:
+            pass
+        return None
+
+
 @app.post("/state/reset")
 def reset_state() -> dict[str, Any]:
     """Clear mib_state.json (scalars, tables, deletions)."""
@@ -2267,11 +2326,8 @@ def reset_state() -> dict[str, Any]:
         _write_empty_state(state_file)
 
         if snmp_agent is not None:
-            snmp_agent.overrides = {}
-            snmp_agent.table_instances = {}
-            snmp_agent.deleted_instances = []
             try:
-                snmp_agent._save_mib_state()
+                snmp_agent.reset_state()
             except Exception:
                 pass
 
@@ -2306,21 +2362,13 @@ def fresh_state() -> dict[str, Any]:
             generator.generate(str(compiled_path), mib_name=mib, force_regenerate=True)
             regenerated += 1
 
-        _write_empty_state(state_file)
-
-        if snmp_agent is not None:
-            snmp_agent.overrides = {}
-            snmp_agent.table_instances = {}
-            snmp_agent.deleted_instances = []
-            try:
-                snmp_agent._save_mib_state()
-            except Exception:
-                pass
+        reload_summary = _hot_reload_agent(schema_dir, state_file)
 
         return {
             "status": "ok",
             "backup_dir": str(backup_dir),
             "regenerated": regenerated,
+            "applied": reload_summary is not None,
             "message": "Fresh state complete",
         }
     except Exception as e:
@@ -2405,24 +2453,25 @@ def load_preset(request: PresetRequest) -> dict[str, Any]:
         if result != 0:
             raise HTTPException(status_code=400, detail=f"Failed to load preset: {output}")
 
-        # Clear state after loading preset
-        try:
-            _write_empty_state(Path("data/mib_state.json"))
-            if snmp_agent is not None:
-                snmp_agent.overrides = {}
-                snmp_agent.table_instances = {}
-                snmp_agent.deleted_instances = []
-                try:
-                    snmp_agent._save_mib_state()
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        # Clear state after loading preset and switch the running agent over
+        reload_summary = _hot_reload_agent(schema_dir)
 
+        if reload_summary is not None and reload_summary.get("skipped_mibs"):
+            skipped = ", ".join(reload_summary["skipped_mibs"])
+            message = (
+                f"Preset '{request.preset_name}' loaded and applied to the running agent. "
+                f"Restart agent to serve {skipped}."
+            )
+        elif reload_summary is not None:
+            message = f"Preset '{request.preset_name}' loaded and applied to the running agent."
+        else:
+            message = f"Preset '{request.preset_name}' loaded successfully. Restart agent to apply changes."
         return {
             "status": "ok",
             "preset_name": request.preset_name,
-            "message": f"Preset '{request.preset_name}' loaded successfully. Restart agent to apply changes.",
+            "applied": reload_summary is not None,
+            "reload": reload_summary,
+            "message": message,
         }
     except HTTPException:
         raise
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import re
 import shutil
 import sys
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -20,6 +23,8 @@ class LoggingConfig:
     max_bytes: int = 10 * 1024 * 1024
     backup_count: int = 5
     rotate_on_startup: bool = True
+    queued: bool = False
+    queue_size: int = 10000
 
 
 if TYPE_CHECKING:
@@ -59,7 +64,9 @@ class ColoredFormatter(logging.Formatter):
 
 
 class FlushingStreamHandler(logging.StreamHandler):  # type: ignore[type-arg]
-    """Stream handler that flushes after every emit."""
+    """Stream handler that flushes after every emit (unless flushing is deferred)."""
+
+    defer_flush: bool = False
 
     def emit(self, record: logging.LogRecord) -> None:
         try:
@@ -68,9 +75,15 @@ class FlushingStreamHandler(logging.StreamHandler):  # type: ignore[type-arg]
         except Exception:
             self.handleError(record)
 
+    def flush(self) -> None:
+        if not self.defer_flush:
+            super().flush()
+
 
 class FlushingRotatingFileHandler(logging.handlers.RotatingFileHandler):
-    """Rotating file handler that flushes after every emit."""
+    """Rotating file handler that flushes after every emit (unless flushing is deferred)."""
+
+    defer_flush: bool = False
 
     def emit(self, record: logging.LogRecord) -> None:
         try:
@@ -79,6 +92,137 @@ class FlushingRotatingFileHandler(logging.handlers.RotatingFileHandler):
         except Exception:
             self.handleError(record)
 
+    def flush(self) -> None:
+        if not self.defer_flush:
+            super().flush()
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks: records are dropped when the queue is full."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.records: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        super().__init__(self.records)
+        self.enqueued = 0
+        self.dropped = 0
+        self.overflows = 0
+        self._overflowing = False
+        self._lock_counters = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.records.put_nowait(record)
+        except queue.Full:
+            with self._lock_counters:
+                self.dropped += 1
+                if not self._overflowing:
+                    # Count each run of drops once
+                    self._overflowing = True
+                    self.overflows += 1
+            return
+        with self._lock_counters:
+            self.enqueued += 1
+            self._overflowing = False
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "overflows": self.overflows,
+            "pending": self.records.qsize(),
+            "capacity": self.records.maxsize,
+        }
+
+
+class BatchingQueueListener:
+    """Writes queued records in batches on its own thread, flushing once per batch.
+
+    Runs the (flushing) file and console handlers with per-record flushing
+    deferred, respecting each handler's level, and reports records dropped
+    by the ``BoundedQueueHandler`` as a warning in the log itself.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        queue_handler: BoundedQueueHandler,
+        *handlers: logging.Handler,
+        max_batch: int = 512,
+    ) -> None:
+        self.queue_handler = queue_handler
+        self.handlers = handlers
+        self.max_batch = max_batch
+        self.batches = 0
+        self._reported_drops = 0
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write out everything already queued, then stop the thread."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        # Blocks while the queue is full: stopping must still get through
+        self.queue_handler.records.put(self._STOP)
+        thread.join()
+
+    def handle(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _run(self) -> None:
+        records = self.queue_handler.records
+        for handler in self.handlers:
+            setattr(handler, "defer_flush", True)
+        try:
+            stopping = False
+            while not stopping:
+                batch = [records.get()]
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(records.get_nowait())
+                    except queue.Empty:
+                        break
+                for record in batch:
+                    if record is self._STOP:
+                        stopping = True
+                    else:
+                        self.handle(record)
+                self._report_drops()
+                self._flush_handlers()
+                self.batches += 1
+        finally:
+            for handler in self.handlers:
+                setattr(handler, "defer_flush", False)
+
+    def _report_drops(self) -> None:
+        dropped = self.queue_handler.dropped
+        if dropped > self._reported_drops:
+            record = logging.LogRecord(
+                __name__,
+                logging.WARNING,
+                __file__,
+                0,
+                "Logging queue full: dropped %d record(s)",
+                (dropped - self._reported_drops,),
+                None,
+            )
+            self._reported_drops = dropped
+            self.handle(record)
+
+    def _flush_handlers(self) -> None:
+        for handler in self.handlers:
+            setattr(handler, "defer_flush", False)
+            try:
+                handler.flush()
+            finally:
+                setattr(handler, "defer_flush", True)
+
 
 def _archive_log_file(log_path: Path) -> None:
     """
@@ -144,6 +288,7 @@ def _archive_log_file(log_path: Path) -> None:
 
 class AppLogger:
     _configured: bool = False
+    _listener: BatchingQueueListener | None = None
 
     @staticmethod
     def configure(app_config: "AppConfig") -> None:
@@ -162,6 +307,8 @@ class AppLogger:
         max_bytes = logger_cfg.get("max_bytes", 10 * 1024 * 1024)
         backup_count = logger_cfg.get("backup_count", 5)
         rotate_on_startup = logger_cfg.get("rotate_on_startup", True)
+        queued = logger_cfg.get("queued", False)
+        queue_size = logger_cfg.get("queue_size", 10000)
         config = LoggingConfig(
             level=level,
             log_dir=Path(os.path.abspath(log_dir)),
@@ -170,6 +317,8 @@ class AppLogger:
             max_bytes=max_bytes,
             backup_count=backup_count,
             rotate_on_startup=rotate_on_startup,
+            queued=queued,
+            queue_size=queue_size,
         )
         AppLogger(config)
 
@@ -195,6 +344,27 @@ class AppLogger:
     def info(msg: str, *args: Any, **kwargs: Any) -> None:
         logging.getLogger().info(msg, *args, **kwargs)
 
+    @staticmethod
+    def queue_stats() -> dict[str, int] | None:
+        """Counters for queued logging, or None when logging is synchronous."""
+        listener = AppLogger._listener
+        if listener is None:
+            return None
+        stats = listener.queue_handler.stats()
+        stats["batches"] = listener.batches
+        return stats
+
+    @staticmethod
+    def shutdown() -> None:
+        """Stop the queue listener (if any), writing out everything still queued."""
+        listener = AppLogger._listener
+        if listener is None:
+            return
+        AppLogger._listener = None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
     @staticmethod
     def _configure(config: LoggingConfig) -> None:
         level_name = config.level.upper()
@@ -210,6 +380,7 @@ class AppLogger:
         root = logging.getLogger()
         root.setLevel(level)
 
+        AppLogger.shutdown()
         for handler in list(root.handlers):
             root.removeHandler(handler)
 
@@ -230,7 +401,7 @@ class AppLogger:
         )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        root.addHandler(file_handler)
+        handlers: list[logging.Handler] = [file_handler]
 
         if config.console:
             console_handler = FlushingStreamHandler(sys.stdout)
@@ -238,7 +409,19 @@ class AppLogger:
             # Use colored formatter for console output
             colored_formatter = ColoredFormatter(fmt=fmt, datefmt="%Y-%m-%d %H:%M:%S")
             console_handler.setFormatter(colored_formatter)
-            root.addHandler(console_handler)
+            handlers.append(console_handler)
+
+        if config.queued:
+            # Logging threads only enqueue; file/console I/O happens on the listener
+            queue_handler = BoundedQueueHandler(config.queue_size)
+            queue_handler.setLevel(level)
+            root.addHandler(queue_handler)
+            listener = BatchingQueueListener(queue_handler, *handlers)
+            listener.start()
+            AppLogger._listener = listener
+        else:
+            for handler in handlers:
+                root.addHandler(handler)
 
         AppLogger._suppress_third_party_loggers(level)
 
@@ -254,3 +437,6 @@ class AppLogger:
         else:
             # Enable pysnmp logging at DEBUG level
             logging.getLogger("pysnmp").setLevel(logging.DEBUG)
+
+
+atexit.register(AppLogger.shutdown)
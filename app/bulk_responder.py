@@ -0,0 +1,359 @@
+"""
+GET / GETNEXT / GETBULK fast path over a sorted index of the served instances.
+
+pysnmp's stock responders resolve every var-bind of every repetition by
+walking the MIB tree from the root. ``InstanceIndex`` keeps the served
+``MibScalarInstance`` objects in one OID-sorted array, so the successors of
+an OID are a bisect plus a slice. Besides the exported instances it holds
+the rows pysnmp creates under ``MibTableColumn`` objects at run time (the
+VACM, community and USM tables ``pysnmp.entity.config`` writes, rows created
+by SET). The index is rebuilt when the MibBuilder's exported symbols change,
+or when a column in the range being answered has gained or lost rows. ``FastNextCommandResponder`` and
+``FastBulkCommandResponder`` answer from that index: a GETBULK repetition
+column is one contiguous run, cut short by max-repetitions or by the
+response size limit.
+
+Instances the registrar flags ``immutable`` (read-only objects other than
+sysUpTime) are read once: the index keeps their var-bind and its BER
+encoding, and serves them until the instance's ``syntax`` object is
+replaced. SNMP SETs, REST writes and state restores all assign a new
+syntax object, and preset or schema reloads re-export the instances, so
+nothing has to invalidate the cache explicitly.
+
+Anything the index cannot answer the way pysnmp would - SNMPv1 requests,
+an unexpected error, non-repeaters that do not fit in the response - is
+handed to the stock responder. The agent grants every community the full
+read view, so view-based access control is not consulted on this path.
+"""
+
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional, Sequence
+
+from pyasn1.codec.ber import encoder
+from pysnmp.entity.rfc3413 import cmdrsp
+from pysnmp.proto.api import v2c
+from pysnmp.smi import error as smi_error
+from pysnmp.smi import exval
+
+from app.type_plan import ACCESS_MAP
+
+logger = logging.getLogger(__name__)
+
+_READABLE_ACCESS = ("read-only", "read-write", "read-create")
+# The registrar sets MAX-ACCESS in pysnmp's short spelling; compiled MIBs use the SMI one
+_READABLE = frozenset(_READABLE_ACCESS) | {ACCESS_MAP[access] for access in _READABLE_ACCESS}
+
+# Response PDU bytes not taken by var-binds (message header, PDU fields)
+_RESPONSE_OVERHEAD = 128
+
+
+class _Encoded(NamedTuple):
+    syntax: Any
+    var_bind: tuple[Any, Any]
+    encoded: bytes
+
+
+class InstanceIndex:
+    """Readable instances of a MibBuilder, sorted by OID."""
+
+    def __init__(self, mib_builder: Any, mib_instrum: Optional[Any] = None) -> None:
+        self.mib_builder = mib_builder
+        # Tells rows pysnmp created apart from exported instances it attached
+        self.mib_instrum = mib_instrum
+        self._build_id: Optional[int] = None
+        self._oids: list[tuple[int, ...]] = []
+        self._instances: list[Any] = []
+        # Pre-encoded var-binds of immutable instances, by id() of the instance
+        self._encoded: dict[int, _Encoded] = {}
+        # Readable table columns and how many children each had when indexed
+        self._column_oids: list[tuple[int, ...]] = []
+        self._columns: list[tuple[Any, int]] = []
+        self.stats = {"hits": 0, "misses": 0}
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._oids)
+
+    def refresh(self, force: bool = False) -> None:
+        """Rebuild the index if symbols were exported or unexported since the last build."""
+        build_id = getattr(self.mib_builder, "lastBuildId", None)
+        if not force and build_id is not None and build_id == self._build_id:
+            return
+        mib_scalar_instance, mib_scalar, mib_table_column = self.mib_builder.import_symbols(
+            "SNMPv2-SMI", "MibScalarInstance", "MibScalar", "MibTableColumn"
+        )
+        # Same precedence as pysnmp's MIB instrumentation for duplicate OIDs
+        parents: dict[tuple[int, ...], Any] = {}
+        instances: dict[tuple[int, ...], Any] = {}
+        for _, symbols in sorted(self.mib_builder.mibSymbols.items(), key=lambda x: x[0], reverse=True):
+            for obj in symbols.values():
+                if isinstance(obj, mib_scalar_instance):
+                    instances[tuple(obj.name)] = obj
+                elif isinstance(obj, mib_scalar):
+                    parents[tuple(obj.name)] = obj
+
+        columns = sorted(
+            (oid, obj)
+            for oid, obj in parents.items()
+            if isinstance(obj, mib_table_column) and obj.maxAccess in _READABLE
+        )
+        # Instances the instrumentation attached from an earlier export; once
+        # unexported they linger under their column until it rebuilds its tree
+        attached = {tuple(name) for name in getattr(self.mib_instrum, "lastBuildSyms", {})}
+        for _, column in columns:
+            # Rows pysnmp created at run time are only reachable through the column
+            for child in list(column._vars.values()):
+                oid = tuple(child.name)
+                if isinstance(child, mib_scalar_instance) and oid not in attached:
+                    instances.setdefault(oid, child)
+
+        readable = sorted(
+            (oid, inst)
+            for oid, inst in instances.items()
+            if getattr(parents.get(tuple(inst.typeName)), "maxAccess", None) in _READABLE
+        )
+        self._oids = [oid for oid, _ in readable]
+        self._instances = [inst for _, inst in readable]
+        self._column_oids = [oid for oid, _ in columns]
+        self._columns = [(column, len(column._vars)) for _, column in columns]
+        self._encoded = {}
+        self._build_id = build_id
+        logger.debug("Indexed %d readable instances (build %s)", len(self._oids), build_id)
+
+    def _rows_changed(self, after: tuple[int, ...], upto: Optional[tuple[int, ...]]) -> bool:
+        """Whether a column that can hold OIDs in (``after``, ``upto``] gained or lost rows.
+
+        ``upto`` None means up to the end of the MIB.
+        """
+        # The column enclosing ``after`` (columns never nest), then every column up to ``upto``
+        start = max(bisect_right(self._column_oids, after) - 1, 0)
+        end = len(self._column_oids) if upto is None else bisect_right(self._column_oids, upto)
+        return any(len(column._vars) != count for column, count in self._columns[start:end])
+
+    def successors(self, oid: Sequence[int], count: int) -> list[Any]:
+        """Up to ``count`` instances that follow ``oid``, in OID order."""
+        self.refresh()
+        key = tuple(oid)
+        for _ in range(2):
+            start = bisect_right(self._oids, key)
+            found = self._instances[start : start + count]
+            upto = self._oids[start + count - 1] if len(found) == count and found else None
+            if not self._rows_changed(key, upto):
+                break
+            self.refresh(force=True)
+        return found
+
+    def instance(self, oid: Sequence[int]) -> Optional[Any]:
+        """The instance at exactly ``oid``, or None."""
+        self.refresh()
+        key = tuple(oid)
+        if self._rows_changed(key, key):
+            self.refresh(force=True)
+        pos = bisect_left(self._oids, key)
+        if pos < len(self._oids) and self._oids[pos] == key:
+            return self._instances[pos]
+        return None
+
+    def read(self, instance: Any) -> tuple[tuple[Any, Any], int]:
+        """An instance's var-bind and its encoded size, from the cache when it is immutable."""
+        if not getattr(instance, "immutable", False):
+            var_bind = _read(instance)
+            return var_bind, _varbind_size(*var_bind)
+        entry = self._encoded.get(id(instance))
+        if entry is None or entry.syntax is not instance.syntax:
+            syntax = instance.syntax
+            var_bind = _read(instance)
+            entry = _Encoded(syntax, var_bind, _encode(*var_bind))
+            self._encoded[id(instance)] = entry
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        return entry.var_bind, len(entry.encoded)
+
+
+def _read(instance: Any) -> tuple[Any, Any]:
+    name, value = instance.readGet((instance.name, None))
+    return name, value
+
+
+def _encode(name: Sequence[int], value: Any) -> bytes:
+    var_bind = v2c.VarBind()
+    v2c.apiVarBind.set_oid_value(var_bind, (name, value))
+    return bytes(encoder.encode(var_bind))
+
+
+def _oid_size(oid: Sequence[int]) -> int:
+    size = 2
+    for arc in oid:
+        size += 1 if arc < 0x80 else (int(arc).bit_length() + 6) // 7
+    return size
+
+
+def _varbind_size(name: Sequence[int], value: Any) -> int:
+    """Upper bound of a var-bind's BER size, without encoding it."""
+    try:
+        payload = len(value.asOctets()) if hasattr(value, "asOctets") else 9
+    except Exception:
+        payload = 9
+    if hasattr(value, "asTuple"):
+        payload = _oid_size(value.asTuple())
+    return _oid_size(name) + payload + 8
+
+
+class FastPathMixin:
+    """Serves read-next operations from an ``InstanceIndex`` when one is attached."""
+
+    instance_index: Optional[InstanceIndex] = None
+    # Hard cap on var-binds per response, whatever max-repetitions asks for
+    max_varbinds = 2048
+
+    _message_model: Optional[int] = None
+    _max_response_size = 65507
+
+    def process_pdu(
+        self,
+        snmpEngine: Any,
+        messageProcessingModel: Any,
+        securityModel: Any,
+        securityName: Any,
+        securityLevel: Any,
+        contextEngineId: Any,
+        contextName: Any,
+        pduVersion: Any,
+        PDU: Any,
+        maxSizeResponseScopedPDU: Any,
+        stateReference: Any,
+    ) -> None:
+        self._message_model = messageProcessingModel
+        self._max_response_size = int(maxSizeResponseScopedPDU or 65507)
+        super().process_pdu(  # type: ignore[misc]
+            snmpEngine,
+            messageProcessingModel,
+            securityModel,
+            securityName,
+            securityLevel,
+            contextEngineId,
+            contextName,
+            pduVersion,
+            PDU,
+            maxSizeResponseScopedPDU,
+            stateReference,
+        )
+
+    def handle_management_operation(
+        self, snmpEngine: Any, stateReference: Any, contextName: Any, PDU: Any
+    ) -> None:
+        rsp_var_binds = None
+        if self.instance_index is not None and self._message_model != 0:
+            try:
+                rsp_var_binds = self._fast_var_binds(PDU)
+            except smi_error.SmiError:
+                rsp_var_binds = None
+            except Exception:
+                logger.exception("Fast path failed; falling back to pysnmp")
+                rsp_var_binds = None
+        if rsp_var_binds is None:
+            super().handle_management_operation(  # type: ignore[misc]
+                snmpEngine, stateReference, contextName, PDU
+            )
+            return
+        self.send_varbinds(snmpEngine, stateReference, 0, 0, rsp_var_binds)  # type: ignore[attr-defined]
+        self.release_state_information(stateReference)  # type: ignore[attr-defined]
+
+    def _fast_var_binds(self, PDU: Any) -> Optional[list[tuple[Any, Any]]]:
+        """Response var-binds for ``PDU``, or None to let pysnmp answer it."""
+        return None
+
+    def _budget(self) -> int:
+        return max(self._max_response_size - _RESPONSE_OVERHEAD, 0)
+
+    def _next_var_bind(self, name: Sequence[int]) -> tuple[tuple[Any, Any], int]:
+        assert self.instance_index is not None
+        found = self.instance_index.successors(name, 1)
+        if not found:
+            return (name, exval.endOfMibView), _varbind_size(name, exval.endOfMibView)
+        return self.instance_index.read(found[0])
+
+
+class FastGetMixin(FastPathMixin):
+    """GET answered from the agent's instance index when every OID is a served instance."""
+
+    def _fast_var_binds(self, PDU: Any) -> Optional[list[tuple[Any, Any]]]:
+        assert self.instance_index is not None
+        rsp_var_binds = []
+        for name, _ in v2c.apiPDU.get_varbinds(PDU):
+            instance = self.instance_index.instance(name)
+            if instance is None:
+                return None  # noSuchObject/noSuchInstance come from pysnmp
+            rsp_var_binds.append(self.instance_index.read(instance)[0])
+        return rsp_var_binds
+
+
+class FastNextMixin(FastPathMixin):
+    """GETNEXT answered from the agent's instance index."""
+
+    def _fast_var_binds(self, PDU: Any) -> Optional[list[tuple[Any, Any]]]:
+        return [self._next_var_bind(name)[0] for name, _ in v2c.apiPDU.get_varbinds(PDU)]
+
+
+class FastBulkMixin(FastPathMixin):
+    """GETBULK answered from the agent's instance index."""
+
+    def _fast_var_binds(self, PDU: Any) -> Optional[list[tuple[Any, Any]]]:
+        assert self.instance_index is not None
+        req_var_binds = v2c.apiPDU.get_varbinds(PDU)
+        non_repeaters = max(int(v2c.apiBulkPDU.get_non_repeaters(PDU)), 0)
+        max_repetitions = max(int(v2c.apiBulkPDU.get_max_repetitions(PDU)), 0)
+
+        n = min(non_repeaters, len(req_var_binds))
+        r = max(len(req_var_binds) - n, 0)
+        m = max_repetitions
+        if r:
+            m = min(m, max(self.max_varbinds - n, 0) // r)
+
+        budget = self._budget()
+        rsp_var_binds: list[tuple[Any, Any]] = []
+        for name, _ in req_var_binds[:n]:
+            var_bind, size = self._next_var_bind(name)
+            budget -= size
+            rsp_var_binds.append(var_bind)
+        if budget < 0:
+            # Non-repeaters must all fit; let pysnmp produce tooBig
+            return None
+
+        # One contiguous run of successors per repeater
+        runs = [
+            self.instance_index.successors(name, m) for name, _ in req_var_binds[n:]
+        ] if m else []
+        for repetition in range(m):
+            if all(repetition > len(run) for run in runs):
+                break  # every repeater already answered endOfMibView
+            for column, run in enumerate(runs):
+                if repetition < len(run):
+                    var_bind, size = self.instance_index.read(run[repetition])
+                else:
+                    last = run[-1].name if run else req_var_binds[n + column][0]
+                    var_bind = (last, exval.endOfMibView)
+                    size = _varbind_size(*var_bind)
+                budget -= size
+                if budget < 0:
+                    return rsp_var_binds if rsp_var_binds else None
+                rsp_var_binds.append(var_bind)
+        return rsp_var_binds if rsp_var_binds or not req_var_binds else None
+
+
+@lru_cache(maxsize=None)
+def compose_responder(base: type, *mixins: type) -> type:
+    """``base`` with ``mixins`` layered over it, outermost first (``base`` itself if none)."""
+    if not mixins:
+        return base
+    return type(f"Fast{base.__name__}", (*mixins, base), {})
+
+
+FastGetCommandResponder = compose_responder(cmdrsp.GetCommandResponder, FastGetMixin)
+FastNextCommandResponder = compose_responder(cmdrsp.NextCommandResponder, FastNextMixin)
+FastBulkCommandResponder = compose_responder(cmdrsp.BulkCommandResponder, FastBulkMixin)
@@ -6,18 +6,22 @@ This tool:
 1. Backs up existing agent-model directory to agent-model-backups/{timestamp}/
 2. Reads current state from data/mib_state.json
 3. Merges state values into schema files as initial values
-4. Updates schema files in-place
+4. Rewrites the schema files that changed
 """
 
 import argparse
 import json
+import os
 import shutil
 import sys
+import tempfile
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping, Optional
 
+from app.index_codec import IndexCodec
 
 def backup_schemas(schema_dir: Path, backup_base: Path) -> Path:
     """Backup existing schema directory with timestamp."""
@@ -38,159 +42,207 @@ def load_mib_state(state_file: Path) -> dict[str, Any]:
     """Load current MIB state from mib_state.json."""
     if not state_file.exists():
         print(f"Warning: State file {state_file} does not exist")
-        return {"scalars": {}, "tables": {}, "deleted_instances": []}
+        return {"scalars": {}, "tables": {}, "deleted_instances": {}}
     
     with open(state_file, "r", encoding="utf-8") as f:
         state: dict[str, Any] = json.load(f)
         return state
 
 
-def bake_state_into_schemas(schema_dir: Path, state: dict[str, Any]) -> int:
+def _objects_of(schema: dict[str, Any]) -> dict[str, Any]:
+    # Handle both old flat structure and new {"objects": ..., "traps": ...} structure
+    objects = schema["objects"] if "objects" in schema else schema
+    return objects if isinstance(objects, dict) else {}
+
+
+def _oid_str(obj_data: dict[str, Any]) -> str:
+    return ".".join(str(x) for x in obj_data["oid"])
+
+
+def load_type_registry(types_file: Path) -> dict[str, Any]:
+    """Load the type registry (data/types.json) used to encode table indexes."""
+    if not types_file.exists():
+        return {}
+    try:
+        with open(types_file, "r", encoding="utf-8") as f:
+            registry = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not load type registry {types_file}: {e}", file=sys.stderr)
+        return {}
+    return registry if isinstance(registry, dict) else {}
+
+
+def _rows_from_instances(instances_dict: dict[str, Any], codec: IndexCodec) -> list[dict[str, Any]]:
+    """Convert a table's state instances into schema rows.
+
+    Instance keys are decoded with the table's index codec, so IpAddress and
+    string indexes (several sub-identifiers each) come back as one value.
+    """
+    rows: list[dict[str, Any]] = []
+    for instance_str, instance_data in instances_dict.items():
+        row: dict[str, Any] = {}
+
+        if codec.columns == ("__index__",):
+            row["__index__"] = instance_str
+        elif codec.columns:
+            try:
+                row.update(codec.from_instance_str(codec.from_legacy_instance_str(instance_str)))
+            except ValueError as e:
+                print(f"Warning: Skipping instance {instance_str}: {e}", file=sys.stderr)
+                continue
+
+        # Add column values
+        if isinstance(instance_data, dict):
+            if "column_values" in instance_data:
+                if isinstance(instance_data["column_values"], dict):
+                    row.update(instance_data["column_values"])
+            elif "index_values" in instance_data:
+                # Legacy format with explicit index_values
+                row.update(instance_data["index_values"])
+
+        if row:
+            rows.append(row)
+    return rows
+
+
+class _SchemaIndex:
+    """OID -> (schema file, object name) lookups across all schema files."""
+
+    def __init__(self, schemas: dict[Path, dict[str, Any]]) -> None:
+        self.objects: dict[str, list[tuple[Path, str]]] = {}
+        self.tables: dict[str, list[tuple[Path, str]]] = {}
+        self.entries: dict[tuple[Path, str], str] = {}
+        for schema_file, schema in schemas.items():
+            seen_tables: set[str] = set()
+            for obj_name, obj_data in _objects_of(schema).items():
+                if not isinstance(obj_data, dict) or "oid" not in obj_data:
+                    continue
+                oid_str = _oid_str(obj_data)
+                self.objects.setdefault(oid_str, []).append((schema_file, obj_name))
+                obj_type = obj_data.get("type")
+                # Only the first matching table per file is baked
+                if obj_type == "MibTable" and oid_str not in seen_tables:
+                    seen_tables.add(oid_str)
+                    self.tables.setdefault(oid_str, []).append((schema_file, obj_name))
+                elif obj_type == "MibTableRow":
+                    self.entries.setdefault((schema_file, oid_str), obj_name)
+
+
+def _load_schema_file(schema_file: Path) -> tuple[str, dict[str, Any]]:
+    raw = schema_file.read_text(encoding="utf-8")
+    schema = json.loads(raw)
+    if not isinstance(schema, dict):
+        raise ValueError("schema is not a JSON object")
+    return raw, schema
+
+
+def _write_if_changed(schema_file: Path, original: str, schema: dict[str, Any]) -> bool:
+    """Atomically replace ``schema_file`` if its serialised content changed."""
+    content = json.dumps(schema, indent=2)
+    if content == original:
+        return False
+    fd, tmp_name = tempfile.mkstemp(dir=schema_file.parent, prefix=".schema-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_name, schema_file)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return True
+
+
+def bake_state_into_schemas(
+    schema_dir: Path,
+    state: dict[str, Any],
+    max_workers: int | None = None,
+    type_registry: Optional[Mapping[str, Any]] = None,
+) -> int:
     """
     Bake state values into schema files as initial values.
-    
+
+    All schema files are indexed by OID once, state is grouped by the file it
+    lands in, and only files that receive values are rewritten (atomically,
+    and only if their content actually changes). Files are read and written
+    on a thread pool. ``type_registry`` resolves textual-convention index
+    types, as the agent does when it encodes instance keys.
+
     Returns the number of values baked.
     """
-    baked_count = 0
     scalars = state.get("scalars", {})
     tables = state.get("tables", {})
-    
-    # Process all schema files
-    for schema_file in schema_dir.rglob("schema.json"):
-        try:
-            with open(schema_file, "r", encoding="utf-8") as f:
-                schema = json.load(f)
-            
-            modified = False
-            
-            # Handle both old flat structure and new {"objects": ..., "traps": ...} structure
-            if "objects" in schema:
-                objects = schema["objects"]
-            else:
-                objects = schema
-            
-            # Bake scalar values
-            for oid, value in scalars.items():
-                # Find object by OID string
-                for obj_name, obj_data in objects.items():
-                    if isinstance(obj_data, dict) and "oid" in obj_data:
-                        obj_oid_str = ".".join(str(x) for x in obj_data["oid"])
-                        if obj_oid_str == oid or oid.endswith(f".{obj_oid_str}.0"):
-                            # Strip instance suffix (.0) if present
-                            if oid.endswith(".0"):
-                                obj_oid_base = oid[:-2]
-                            else:
-                                obj_oid_base = oid
-                            
-                            if obj_oid_str == obj_oid_base:
-                                obj_data["initial"] = value
-                                modified = True
-                                baked_count += 1
-                                print(f"  Baked scalar {obj_name} ({oid}) = {value}")
-            
-            # Bake table instances
-            # table_instances format: {table_oid: {instance_str: {column_values: {...}}}}
-            for table_oid, instances_dict in tables.items():
-                if not isinstance(instances_dict, dict):
-                    continue
-                # Find the table object and entry by OID
-                for obj_name, obj_data in objects.items():
-                    if isinstance(obj_data, dict) and obj_data.get("type") == "MibTable":
-                        obj_oid_str = ".".join(str(x) for x in obj_data["oid"])
-                        if obj_oid_str == table_oid:
-                            # Find the entry object by OID structure (table_oid + [1])
-                            entry_obj = {}
-                            expected_entry_oid = list(obj_data["oid"]) + [1]
-                            for other_name, other_data in objects.items():
-                                if isinstance(other_data, dict) and other_data.get("type") == "MibTableRow":
-                                    if list(other_data.get("oid", [])) == expected_entry_oid:
-                                        entry_obj = other_data
-                                        break
-                            index_columns = entry_obj.get("indexes", [])
-                            if not isinstance(index_columns, list):
-                                index_columns = []
-                            
-                            # Build columns metadata for type info (needed for IpAddress parsing)
-                            columns_meta: dict[str, Any] = {}
-                            for col_name in index_columns:
-                                if col_name in objects:
-                                    columns_meta[col_name] = objects[col_name]
-                            
-                            # Convert instance dict to list of row dicts
-                            rows: list[dict[str, Any]] = []
-                            for instance_str, instance_data in instances_dict.items():
-                                # Reconstruct index values from instance_str and index_columns metadata
-                                row: dict[str, Any] = {}
-
-                                if index_columns == ["__index__"]:
-                                    row["__index__"] = instance_str
-                                    # Apply column values if present
-                                    column_values = instance_data.get("column_values", {}) if isinstance(instance_data, dict) else {}
-                                    if isinstance(column_values, dict):
-                                        row.update(column_values)
-                                    rows.append(row)
-                                    continue
-                                
-                                # Parse instance_str to extract index values
-                                parts = instance_str.split(".")
-                                pos = 0
-                                for col_name in index_columns:
-                                    col_meta = columns_meta.get(col_name, {})
-                                    col_type = col_meta.get("type", "")
-                                    
-                                    if col_type == "IpAddress":
-                                        # IpAddress uses 4 octets
-                                        if pos + 4 <= len(parts):
-                                            row[col_name] = ".".join(parts[pos:pos + 4])
-                                            pos += 4
-                                        else:
-                                            # Fallback: use remaining parts
-                                            row[col_name] = ".".join(parts[pos:])
-                                            pos = len(parts)
-                                    else:
-                                        # Single value
-                                        if pos < len(parts):
-                                            # Try to convert to int if it looks like a number
-                                            try:
-                                                row[col_name] = int(parts[pos])
-                                            except (ValueError, IndexError):
-                                                row[col_name] = parts[pos] if pos < len(parts) else ""
-                                            pos += 1
-                                
-                                # Add column values
-                                if isinstance(instance_data, dict):
-                                    if "column_values" in instance_data:
-                                        row.update(instance_data["column_values"])
-                                    elif "index_values" in instance_data:
-                                        # Legacy format with explicit index_values
-                                        row.update(instance_data["index_values"])
-                                        if "column_values" in instance_data:
-                                            row.update(instance_data["column_values"])
-                                else:
-                                    # Old format: instance_data is the row dict directly
-                                    if isinstance(instance_data, dict):
-                                        row.update(instance_data)
-                                
-                                if row:
-                                    rows.append(row)
-                            
-                            if rows:
-                                obj_data["rows"] = rows
-                                modified = True
-                                baked_count += len(rows)
-                                print(f"  Baked {len(rows)} row(s) for table {obj_name} ({table_oid})")
-                            break
-            
-            # Write back if modified
-            if modified:
-                with open(schema_file, "w", encoding="utf-8") as f:
-                    json.dump(schema, f, indent=2)
+    schema_files = sorted(schema_dir.rglob("schema.json"))
+
+    sources: dict[Path, str] = {}
+    schemas: dict[Path, dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        loads = {schema_file: pool.submit(_load_schema_file, schema_file) for schema_file in schema_files}
+        for schema_file, load in loads.items():
+            try:
+                sources[schema_file], schemas[schema_file] = load.result()
+            except Exception as e:
+                print(f"Error processing {schema_file}: {e}", file=sys.stderr)
+                traceback.print_exc()
+
+    index = _SchemaIndex(schemas)
+
+    # Group scalar overrides by target file
+    scalar_updates: dict[Path, list[tuple[str, Any]]] = {}
+    for oid, value in scalars.items():
+        # Strip instance suffix (.0) if present
+        obj_oid_base = oid[:-2] if oid.endswith(".0") else oid
+        for schema_file, obj_name in index.objects.get(obj_oid_base, ()):
+            scalar_updates.setdefault(schema_file, []).append((obj_name, value))
+
+    # Group table instances by target file
+    # table_instances format: {table_oid: {instance_str: {column_values: {...}}}}
+    table_updates: dict[Path, list[tuple[str, str, dict[str, Any]]]] = {}
+    for table_oid, instances_dict in tables.items():
+        if not isinstance(instances_dict, dict):
+            continue
+        for schema_file, obj_name in index.tables.get(table_oid, ()):
+            table_updates.setdefault(schema_file, []).append((obj_name, table_oid, instances_dict))
+
+    def _bake_file(schema_file: Path) -> tuple[int, bool]:
+        objects = _objects_of(schemas[schema_file])
+        baked = 0
+
+        for obj_name, value in scalar_updates.get(schema_file, ()):
+            objects[obj_name]["initial"] = value
+            baked += 1
+        if schema_file in scalar_updates:
+            print(f"  Baked {len(scalar_updates[schema_file])} scalar(s) into {schema_file.parent.name}")
+
+        for obj_name, table_oid, instances_dict in table_updates.get(schema_file, ()):
+            # Find the entry object by OID structure (table_oid + [1])
+            entry_name = index.entries.get((schema_file, f"{table_oid}.1"))
+            entry_obj = objects.get(entry_name, {}) if entry_name else {}
+            codec = IndexCodec.for_entry(entry_obj, objects, type_registry)
+            rows = _rows_from_instances(instances_dict, codec)
+            if rows:
+                objects[obj_name]["rows"] = rows
+                baked += len(rows)
+                print(f"  Baked {len(rows)} row(s) for table {obj_name} ({table_oid})")
+
+        written = _write_if_changed(schema_file, sources[schema_file], schemas[schema_file]) if baked else False
+        return baked, written
+
+    baked_count = 0
+    targets = [f for f in schemas if f in scalar_updates or f in table_updates]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        bakes = {schema_file: pool.submit(_bake_file, schema_file) for schema_file in targets}
+        for schema_file, bake in bakes.items():
+            try:
+                baked, written = bake.result()
+            except Exception as e:
+                print(f"Error processing {schema_file}: {e}", file=sys.stderr)
+                traceback.print_exc()
+                continue
+            baked_count += baked
+            if written:
                 print(f"✓ Updated {schema_file.relative_to(schema_dir.parent)}")
-        
-        except Exception as e:
-            print(f"Error processing {schema_file}: {e}", file=sys.stderr)
-            traceback.print_exc()
-    
+
     return baked_count
 
 
@@ -209,6 +261,11 @@ def main(argv: list[str] | None = None) -> int:
         default="data/mib_state.json",
         help="MIB state file to bake from (default: data/mib_state.json)",
     )
+    parser.add_argument(
+        "--types-file",
+        default="data/types.json",
+        help="Type registry used to decode table indexes (default: data/types.json)",
+    )
     parser.add_argument(
         "--backup-dir",
         default="agent-model-backups",
@@ -245,12 +302,14 @@ def main(argv: list[str] | None = None) -> int:
     
     # Bake state into schemas
     print(f"\nBaking state into schemas in {schema_dir}...")
-    baked_count = bake_state_into_schemas(schema_dir, state)
+    baked_count = bake_state_into_schemas(
+        schema_dir, state, type_registry=load_type_registry(Path(args.types_file))
+    )
     
     # Clear the state file now that values have been baked
     print(f"\nClearing state file {state_file}...")
     with open(state_file, "w", encoding="utf-8") as f:
-        json.dump({"scalars": {}, "tables": {}, "deleted_instances": []}, f, indent=2, sort_keys=True)
+        json.dump({"scalars": {}, "tables": {}, "deleted_instances": {}}, f, indent=2, sort_keys=True)
     print("✓ State file cleared")
     
     print("\n" + "=" * 60)
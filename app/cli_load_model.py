@@ -7,6 +7,7 @@ import json
 import os
 import sys
 from typing import Any, Dict
+from app.model_cache import load_json
 from app.types import TypeRegistry
 
 def load_all_schemas(schema_dir: str) -> TypeRegistry:
@@ -23,8 +24,7 @@ def load_all_schemas(schema_dir: str) -> TypeRegistry:
             schema_path = mib_dir / "schema.json"
             if schema_path.exists():
                 try:
-                    with open(schema_path, "r", encoding="utf-8") as f:
-                        schema = json.load(f)
+                    schema = load_json(schema_path)
                     if schema:  # Only include non-empty schemas
                         model[item] = schema
                 except json.JSONDecodeError as e:
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Iterable
 
 from app.generator import BehaviourGenerator
+from app.mib_build_context import MibBuildContext
 from app.app_config import AppConfig
 
 
@@ -82,6 +83,10 @@ def main(argv: Iterable[str] | None = None) -> int:
     generator = BehaviourGenerator(
         output_dir=args.output_dir,
         load_default_plugins=not args.no_plugins,
+        # All configured MIBs share one builder, so common imports load once
+        build_context=(
+            MibBuildContext(Path("compiled-mibs")) if args.compiled_mib_py is None else None
+        ),
     )
 
     if args.compiled_mib_py is None:
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+CLI tool to replay a traffic capture against a running agent.
+
+Requests from a capture file (see app.traffic_capture) are sent to the
+target agent with the original inter-arrival times divided by --speed, or
+as fast as the agent answers with --speed max (at most --window requests
+outstanding). Each request gets a fresh request-id so replies can be
+matched even when the capture mixes several managers.
+
+The report gives throughput, the latency distribution, lost requests and,
+when the capture also recorded the agent's responses, every response whose
+error-status or var-binds differ from the recorded one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.proto import api
+
+from app.traffic_capture import REQUEST, RESPONSE, CaptureRecord, decode_message, read_capture
+
+
+@dataclass
+class _Request:
+    index: int
+    timestamp: float
+    payload: bytes
+    expected: Optional[dict[str, Any]]
+
+
+@dataclass
+class ReplayResult:
+    sent: int = 0
+    received: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    diffs: list[dict[str, Any]] = field(default_factory=list)
+    compared: int = 0
+    skipped: int = 0
+
+    @property
+    def lost(self) -> int:
+        return self.sent - self.received
+
+    @property
+    def throughput(self) -> float:
+        return self.received / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "received": self.received,
+            "lost": self.lost,
+            "skipped": self.skipped,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": round(self.throughput, 1),
+            "latency_ms": latency_summary(self.latencies),
+            "compared": self.compared,
+            "diffs": len(self.diffs),
+        }
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float]:
+    """min/p50/p90/p99/max of latencies (seconds), in milliseconds."""
+    if not latencies:
+        return {}
+    ordered = sorted(latencies)
+
+    def _pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))] * 1000.0
+
+    return {
+        "min": round(ordered[0] * 1000.0, 3),
+        "p50": round(_pct(50), 3),
+        "p90": round(_pct(90), 3),
+        "p99": round(_pct(99), 3),
+        "max": round(ordered[-1] * 1000.0, 3),
+    }
+
+
+def _with_request_id(message: bytes, request_id: int) -> Optional[bytes]:
+    try:
+        p_mod = api.PROTOCOL_MODULES[int(api.decodeMessageVersion(message))]
+        msg, _ = decoder.decode(message, asn1Spec=p_mod.Message())
+        p_mod.apiPDU.set_request_id(p_mod.apiMessage.get_pdu(msg), request_id)
+        return bytes(encoder.encode(msg))
+    except Exception:
+        return None
+
+
+def load_requests(records: Iterable[CaptureRecord]) -> tuple[list[_Request], int]:
+    """Replayable requests, paired with the recorded responses; also the number skipped."""
+    requests: list[_Request] = []
+    pending: dict[tuple[str, int, int], _Request] = {}
+    skipped = 0
+    for record in records:
+        decoded = decode_message(record.message)
+        if decoded is None:
+            skipped += 1
+            continue
+        key = (record.host, record.port, decoded["request_id"])
+        if record.kind == RESPONSE:
+            request = pending.pop(key, None)
+            if request is not None:
+                request.expected = decoded
+            continue
+        if record.kind != REQUEST:
+            continue
+        payload = _with_request_id(record.message, len(requests) + 1)
+        if payload is None:
+            skipped += 1
+            continue
+        request = _Request(len(requests) + 1, record.timestamp, payload, None)
+        requests.append(request)
+        pending[key] = request
+    return requests, skipped
+
+
+def _differences(expected: dict[str, Any], actual: dict[str, Any]) -> Optional[dict[str, Any]]:
+    keys = ("error_status", "var_binds")
+    if all(expected.get(k) == actual.get(k) for k in keys):
+        return None
+    return {k: {"expected": expected.get(k), "actual": actual.get(k)} for k in keys if expected.get(k) != actual.get(k)}
+
+
+class _ReplayProtocol(asyncio.DatagramProtocol):
+    def __init__(self, result: ReplayResult, requests: dict[int, _Request]) -> None:
+        self.result = result
+        self.requests = requests
+        self.sent_at: dict[int, float] = {}
+        self.outstanding: Optional[asyncio.Semaphore] = None
+        self.done = asyncio.Event()
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        decoded = decode_message(data)
+        if decoded is None:
+            return
+        request_id = decoded["request_id"]
+        sent_at = self.sent_at.pop(request_id, None)
+        if sent_at is None:
+            return  # duplicate, or answered after its timeout
+        self.result.received += 1
+        self.result.latencies.append(time.perf_counter() - sent_at)
+        if self.outstanding is not None:
+            self.outstanding.release()
+        expected = self.requests[request_id].expected
+        if expected is not None:
+            self.result.compared += 1
+            diff = _differences(expected, decoded)
+            if diff is not None:
+                self.result.diffs.append({"request": request_id, **diff})
+        if not self.sent_at and self.result.sent == len(self.requests):
+            self.done.set()
+
+    def expire(self, request_id: int) -> None:
+        if self.sent_at.pop(request_id, None) is not None and self.outstanding is not None:
+            self.outstanding.release()
+        if not self.sent_at and self.result.sent == len(self.requests):
+            self.done.set()
+
+
+async def replay(
+    requests: list[_Request],
+    host: str,
+    port: int,
+    speed: Optional[float] = 1.0,
+    timeout: float = 2.0,
+    window: int = 64,
+) -> ReplayResult:
+    """Send ``requests`` to ``host:port``; ``speed`` None means as fast as possible."""
+    loop = asyncio.get_running_loop()
+    result = ReplayResult()
+    by_id = {request.index: request for request in requests}
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: _ReplayProtocol(result, by_id), remote_addr=(host, port)
+    )
+    if speed is None:
+        protocol.outstanding = asyncio.Semaphore(max(window, 1))
+    start = time.perf_counter()
+    first = requests[0].timestamp if requests else 0.0
+    try:
+        for request in requests:
+            if protocol.outstanding is not None:
+                await protocol.outstanding.acquire()
+            elif speed:
+                delay = (request.timestamp - first) / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            protocol.sent_at[request.index] = time.perf_counter()
+            result.sent += 1
+            transport.sendto(request.payload)
+            loop.call_later(timeout, protocol.expire, request.index)
+        if protocol.sent_at:
+            await asyncio.wait_for(protocol.done.wait(), timeout + 1.0)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        result.elapsed = time.perf_counter() - start
+        transport.close()
+    return result
+
+
+def _speed(value: str) -> Optional[float]:
+    if value.lower() == "max":
+        return None
+    speed = float(value.rstrip("xX"))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point for replaying a capture."""
+    parser = argparse.ArgumentParser(description="Replay a captured SNMP request log against an agent")
+    parser.add_argument("capture", help="Capture file written by the agent (capture_file / POST /capture/start)")
+    parser.add_argument("--host", default="127.0.0.1", help="Target agent host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=11161, help="Target agent port (default: 11161)")
+    parser.add_argument(
+        "--speed", type=_speed, default=1.0,
+        help="Replay speed: 1, 10 (10x), ... or 'max' (default: 1)",
+    )
+    parser.add_argument("--timeout", type=float, default=2.0, help="Seconds to wait for each reply (default: 2)")
+    parser.add_argument(
+        "--window", type=int, default=64,
+        help="Requests outstanding at once with --speed max (default: 64)",
+    )
+    parser.add_argument("--max-diffs", type=int, default=20, help="Response diffs to print (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    args = parser.parse_args(argv)
+
+    try:
+        requests, skipped = load_requests(read_capture(args.capture))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not requests:
+        print("Error: no replayable SNMPv1/v2c requests in the capture", file=sys.stderr)
+        return 1
+
+    result = asyncio.run(replay(requests, args.host, args.port, args.speed, args.timeout, args.window))
+    result.skipped = skipped
+    report = result.report()
+
+    if args.json:
+        print(json.dumps({**report, "diff_details": result.diffs[: args.max_diffs]}, indent=2))
+    else:
+        latency = report["latency_ms"]
+        print(f"Sent {report['sent']} request(s), {report['received']} answered, {report['lost']} lost")
+        print(f"Throughput: {report['throughput_rps']} responses/s over {report['elapsed_s']} s")
+        if latency:
+            print(
+                "Latency (ms): "
+                + ", ".join(f"{name} {value}" for name, value in latency.items())
+            )
+        print(f"Responses compared: {report['compared']}, differing: {report['diffs']}")
+        for diff in result.diffs[: args.max_diffs]:
+            print(f"  request {diff['request']}: " + json.dumps({k: v for k, v in diff.items() if k != "request"}))
+
+    return 0 if report["lost"] == 0 and not result.diffs else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
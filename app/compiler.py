@@ -9,6 +9,7 @@ from pysmi.parser.smi import parserFactory
 from pysmi.codegen.pysnmp import PySnmpCodeGen
 from pysmi.compiler import MibCompiler as PysmiMibCompiler
 from app.app_config import AppConfig
+from app.mib_catalogue import MibCatalogue
 
 logger = AppLogger.get(__name__)
 
@@ -59,13 +60,11 @@ class MibCompiler:
         compiler.addSources(FileReader(mib_dir))
         compiler.addSources(FileReader("."))
 
-        # Add data/mibs and all its subdirectories recursively
+        # Add data/mibs and all its subdirectories (from the shared catalogue scan)
         mib_data_dir = "data/mibs"
         if os.path.exists(mib_data_dir):
-            compiler.addSources(FileReader(mib_data_dir))
-            for root, dirs, files in os.walk(mib_data_dir):
-                if root != mib_data_dir:  # Don't add the root twice
-                    compiler.addSources(FileReader(root))
+            for source_dir in MibCatalogue.shared().directories(under=mib_data_dir):
+                compiler.addSources(FileReader(source_dir))
 
         # Add system MIB directory (Net-SNMP default location on Windows)
         # AppConfig should be passed in by the caller for config access
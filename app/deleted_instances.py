@@ -0,0 +1,184 @@
+"""
+Per-table record of deleted table rows.
+
+Deleted schema rows are kept as ``table OID -> set of instance strings`` so
+that marking, restoring and looking up a row is O(1), and whole-table
+consumers (the table responder, ``/tree/bulk``, MIB registration) fetch the
+set for one table instead of scanning every deletion. The persisted form is
+the same mapping with sorted lists; the legacy flat list of full instance
+OIDs is still accepted when loading.
+"""
+
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import AbstractSet, Any, Iterable, Iterator, Mapping, Optional
+
+
+def index_sort_key(index_str: str) -> tuple[tuple[int, object], ...]:
+    """Order instance strings numerically arc by arc (non-numeric arcs last)."""
+    return tuple((0, int(p)) if p.isdigit() else (1, p) for p in index_str.split("."))
+
+
+class DeletedInstances:
+    """Deleted table rows grouped by table OID."""
+
+    def __init__(self) -> None:
+        self._tables: dict[str, set[str]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __contains__(self, instance_oid: object) -> bool:
+        """Membership by full instance OID, e.g. ``"1.3.6.1.2.1.2.2.3"``."""
+        if not isinstance(instance_oid, str):
+            return False
+        return any(
+            self.contains(table_oid, index_str)
+            for table_oid, index_str in self._splits(instance_oid)
+        )
+
+    def add(self, table_oid: str, index_str: str) -> bool:
+        """Mark a row deleted; returns False if it already was."""
+        rows = self._tables.setdefault(table_oid, set())
+        if index_str in rows:
+            return False
+        rows.add(index_str)
+        self._count += 1
+        return True
+
+    def discard(self, table_oid: str, index_str: str) -> bool:
+        """Un-mark a row; returns False if it was not deleted."""
+        rows = self._tables.get(table_oid)
+        if rows is None or index_str not in rows:
+            return False
+        rows.remove(index_str)
+        self._count -= 1
+        if not rows:
+            del self._tables[table_oid]
+        return True
+
+    def contains(self, table_oid: str, index_str: str) -> bool:
+        rows = self._tables.get(table_oid)
+        return rows is not None and index_str in rows
+
+    def for_table(self, table_oid: str) -> AbstractSet[str]:
+        """Deleted instance strings of one table (empty if none); do not mutate."""
+        return self._tables.get(table_oid, frozenset())
+
+    def tables(self) -> list[str]:
+        """Table OIDs that have at least one deleted row."""
+        return list(self._tables)
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        """Iterate ``(table_oid, index_str)`` pairs."""
+        for table_oid, rows in self._tables.items():
+            for index_str in rows:
+                yield table_oid, index_str
+
+    def instance_oids(self) -> Iterator[str]:
+        """Iterate full instance OIDs (``<table_oid>.<index>``)."""
+        for table_oid, index_str in self.items():
+            yield f"{table_oid}.{index_str}"
+
+    def clear(self) -> None:
+        self._tables.clear()
+        self._count = 0
+
+    def retain(self, table_oid: str, keep: AbstractSet[str]) -> int:
+        """Drop the table's deletions not in ``keep``; returns how many were dropped."""
+        rows = self._tables.get(table_oid)
+        if not rows:
+            return 0
+        stale = rows - keep
+        if not stale:
+            return 0
+        rows -= stale
+        self._count -= len(stale)
+        if not rows:
+            del self._tables[table_oid]
+        return len(stale)
+
+    def drop_table(self, table_oid: str) -> int:
+        """Forget every deletion of a table; returns how many were dropped."""
+        rows = self._tables.pop(table_oid, None)
+        if not rows:
+            return 0
+        self._count -= len(rows)
+        return len(rows)
+
+    def frozen(
+        self,
+        previous: Optional[Mapping[str, frozenset[str]]] = None,
+        dirty: Optional[AbstractSet[str]] = None,
+    ) -> Mapping[str, frozenset[str]]:
+        """Read-only copy for state snapshots.
+
+        With ``previous`` and ``dirty``, per-table sets of tables not listed
+        in ``dirty`` are shared with the previous copy instead of re-frozen.
+        """
+        frozen: dict[str, frozenset[str]] = {}
+        for table_oid, rows in self._tables.items():
+            if (
+                previous is not None
+                and dirty is not None
+                and table_oid not in dirty
+                and table_oid in previous
+            ):
+                frozen[table_oid] = previous[table_oid]
+            else:
+                frozen[table_oid] = frozenset(rows)
+        return MappingProxyType(frozen)
+
+    def to_state(self) -> dict[str, list[str]]:
+        """Compact JSON form: ``{table_oid: [index, ...]}`` with sorted indexes."""
+        return {
+            table_oid: sorted(rows, key=index_sort_key)
+            for table_oid, rows in sorted(self._tables.items())
+        }
+
+    @classmethod
+    def from_state(cls, value: Any, table_oids: Iterable[str] = ()) -> "DeletedInstances":
+        """Load the persisted form.
+
+        Accepts the per-table mapping written by :meth:`to_state` and the
+        legacy list of full instance OIDs. Legacy OIDs are split at the
+        longest prefix found in ``table_oids``, or before the last arc when
+        none matches.
+        """
+        deleted = cls()
+        if isinstance(value, dict):
+            for table_oid, rows in value.items():
+                if not isinstance(table_oid, str) or not isinstance(rows, list):
+                    continue
+                for index_str in rows:
+                    deleted.add(table_oid, str(index_str))
+        elif isinstance(value, list):
+            known = set(table_oids)
+            for instance_oid in value:
+                if not isinstance(instance_oid, str):
+                    continue
+                split = cls._split_legacy(instance_oid, known)
+                if split is not None:
+                    deleted.add(*split)
+        return deleted
+
+    @staticmethod
+    def _split_legacy(instance_oid: str, table_oids: AbstractSet[str]) -> Optional[tuple[str, str]]:
+        parts = instance_oid.strip(".").split(".")
+        if len(parts) < 2:
+            return None
+        for end in range(len(parts) - 1, 0, -1):
+            prefix = ".".join(parts[:end])
+            if prefix in table_oids:
+                return prefix, ".".join(parts[end:])
+        return ".".join(parts[:-1]), parts[-1]
+
+    def _splits(self, instance_oid: str) -> Iterator[tuple[str, str]]:
+        parts = instance_oid.split(".")
+        for end in range(len(parts) - 1, 0, -1):
+            yield ".".join(parts[:end]), ".".join(parts[end:])
@@ -0,0 +1,231 @@
+"""
+Latency, timeout and packet-loss injection for SNMP requests.
+
+Profiles from the ``fault_injection`` list in ``agent_config.yaml`` make
+the agent answer slowly, or not at all, for chosen subtrees and managers::
+
+    fault_injection:
+      - name: slow-hrSWRun
+        oid: 1.3.6.1.2.1.25.4.2      # subtree ...
+        delay_ms: 800
+        jitter_ms: 100
+      - mib: IF-MIB                 # ... or every object of a served MIB
+        sources: [10.0.0.5]         # only for these managers (default: all)
+        drop_percent: 20
+      - oid: 1.3.6.1.2.1.4
+        timeout: true               # never answered
+
+A request matches a profile when one of its OIDs - or, for GETNEXT and
+GETBULK, the instance that follows it - lies in the profile's subtree.
+Matching profiles combine: the longest delay wins and any drop drops the
+request. Delayed requests are processed later with ``loop.call_later`` on
+the agent's event loop, so a slow subtree never holds up other requests
+and any number of deferred replies can be pending.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
+
+from pysnmp.proto import rfc1905
+from pysnmp.proto.api import v2c
+
+logger = logging.getLogger(__name__)
+
+OID = tuple[int, ...]
+
+_READ_NEXT_PDUS = (rfc1905.GetNextRequestPDU.tagSet, rfc1905.GetBulkRequestPDU.tagSet)
+# Observer execution point pysnmp's access control reads while a request is processed
+_REQUEST_EXECPOINT = "rfc3412.receiveMessage:request"
+
+
+def _parse_oid(value: Any) -> OID:
+    if isinstance(value, str):
+        return tuple(int(arc) for arc in value.strip(".").split(".") if arc)
+    return tuple(int(arc) for arc in value)
+
+
+@dataclass(frozen=True)
+class InjectionProfile:
+    """Delay/drop behaviour for requests touching some subtrees."""
+
+    name: str
+    prefixes: tuple[OID, ...]
+    sources: Optional[frozenset[str]] = None
+    delay_ms: float = 0.0
+    jitter_ms: float = 0.0
+    drop_percent: float = 0.0
+    timeout: bool = False
+
+    @classmethod
+    def from_config(
+        cls, entry: Mapping[str, Any], mib_oids: Callable[[str], Iterable[OID]]
+    ) -> "InjectionProfile":
+        prefixes: list[OID] = []
+        if entry.get("oid") is not None:
+            prefixes.append(_parse_oid(entry["oid"]))
+        if entry.get("mib"):
+            prefixes.extend(mib_oids(str(entry["mib"])))
+        sources = entry.get("sources")
+        return cls(
+            name=str(entry.get("name") or entry.get("oid") or entry.get("mib") or "profile"),
+            prefixes=tuple(prefixes),
+            sources=frozenset(str(s) for s in sources) if sources else None,
+            delay_ms=float(entry.get("delay_ms", 0) or 0),
+            jitter_ms=float(entry.get("jitter_ms", 0) or 0),
+            drop_percent=float(entry.get("drop_percent", 0) or 0),
+            timeout=bool(entry.get("timeout", False)),
+        )
+
+    def matches(self, source: Optional[str], oids: Iterable[Sequence[int]]) -> bool:
+        if self.sources is not None and source not in self.sources:
+            return False
+        for oid in oids:
+            for prefix in self.prefixes:
+                if tuple(oid[: len(prefix)]) == prefix:
+                    return True
+        return False
+
+
+class FaultInjector:
+    """Decides, per request, whether to drop it and how long to hold it."""
+
+    def __init__(
+        self, profiles: Sequence[InjectionProfile], rng: Optional[random.Random] = None
+    ) -> None:
+        self.profiles = list(profiles)
+        self._rng = rng or random.Random()
+        self.stats = {"matched": 0, "delayed": 0, "dropped": 0, "pending": 0, "max_pending": 0}
+
+    @classmethod
+    def from_config(
+        cls,
+        entries: Iterable[Mapping[str, Any]],
+        mib_oids: Callable[[str], Iterable[OID]] = lambda _mib: (),
+    ) -> "FaultInjector":
+        profiles = []
+        for entry in entries or []:
+            profile = InjectionProfile.from_config(entry, mib_oids)
+            if not profile.prefixes:
+                logger.warning("Ignoring fault injection profile %s: no OID or known MIB", profile.name)
+                continue
+            profiles.append(profile)
+        return cls(profiles)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.profiles)
+
+    def decide(self, source: Optional[str], oids: Sequence[Sequence[int]]) -> tuple[bool, float]:
+        """``(drop, delay_seconds)`` for a request from ``source`` for ``oids``."""
+        drop = False
+        delay_ms = 0.0
+        matched = False
+        for profile in self.profiles:
+            if not profile.matches(source, oids):
+                continue
+            matched = True
+            if profile.timeout or (
+                profile.drop_percent and self._rng.random() * 100.0 < profile.drop_percent
+            ):
+                drop = True
+            jitter = self._rng.uniform(-profile.jitter_ms, profile.jitter_ms) if profile.jitter_ms else 0.0
+            delay_ms = max(delay_ms, profile.delay_ms + jitter)
+        if matched:
+            self.stats["matched"] += 1
+        if drop:
+            self.stats["dropped"] += 1
+        return drop, max(delay_ms, 0.0) / 1000.0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Profiles and counters, for the REST API."""
+        return {
+            "profiles": [
+                {
+                    "name": p.name,
+                    "prefixes": [".".join(map(str, prefix)) for prefix in p.prefixes],
+                    "sources": sorted(p.sources) if p.sources is not None else None,
+                    "delay_ms": p.delay_ms,
+                    "jitter_ms": p.jitter_ms,
+                    "drop_percent": p.drop_percent,
+                    "timeout": p.timeout,
+                }
+                for p in self.profiles
+            ],
+            "stats": dict(self.stats),
+        }
+
+
+class FaultInjectionMixin:
+    """Drops or defers incoming PDUs according to a ``FaultInjector``."""
+
+    fault_injector: Optional[FaultInjector] = None
+
+    def process_pdu(self, snmpEngine: Any, *args: Any) -> None:
+        injector = self.fault_injector
+        if injector is None:
+            super().process_pdu(snmpEngine, *args)  # type: ignore[misc]
+            return
+        PDU, stateReference = args[7], args[9]
+        try:
+            _, address = snmpEngine.message_dispatcher.get_transport_info(stateReference)
+            source: Optional[str] = str(address[0])
+        except Exception:
+            source = None
+
+        drop, delay = injector.decide(source, self._affected_oids(PDU))
+        if drop:
+            self.release_state_information(stateReference)  # type: ignore[attr-defined]
+            return
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if delay <= 0 or loop is None:
+            super().process_pdu(snmpEngine, *args)  # type: ignore[misc]
+            return
+
+        try:
+            exec_context = snmpEngine.observer.get_execution_context(_REQUEST_EXECPOINT)
+        except Exception:
+            exec_context = None
+        stats = injector.stats
+        stats["delayed"] += 1
+        stats["pending"] += 1
+        stats["max_pending"] = max(stats["max_pending"], stats["pending"])
+        loop.call_later(delay, self._process_deferred, snmpEngine, args, exec_context)
+
+    def _process_deferred(
+        self, snmpEngine: Any, args: tuple[Any, ...], exec_context: Optional[dict[str, Any]]
+    ) -> None:
+        assert self.fault_injector is not None
+        self.fault_injector.stats["pending"] -= 1
+        # The dispatcher cleared the request's context when the datagram was
+        # handled; restore it so access control sees the original request.
+        # Observers see it again too, marked as deferred.
+        if exec_context is not None:
+            snmpEngine.observer.store_execution_context(
+                snmpEngine, _REQUEST_EXECPOINT, dict(exec_context, deferred=True)
+            )
+        try:
+            super().process_pdu(snmpEngine, *args)  # type: ignore[misc]
+        except Exception:
+            logger.exception("Deferred request failed")
+        finally:
+            if exec_context is not None:
+                snmpEngine.observer.clear_execution_context(snmpEngine, _REQUEST_EXECPOINT)
+
+    def _affected_oids(self, PDU: Any) -> list[Sequence[int]]:
+        oids: list[Sequence[int]] = [tuple(name) for name, _ in v2c.apiPDU.get_varbinds(PDU)]
+        index = getattr(self, "instance_index", None)
+        if index is not None and PDU.tagSet in _READ_NEXT_PDUS:
+            # A walk from above a subtree lands in it on its first step
+            for name in list(oids):
+                found = index.successors(name, 1)
+                if found:
+                    oids.append(tuple(found[0].name))
+        return oids
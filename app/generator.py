@@ -7,6 +7,8 @@ from pysnmp.smi import builder
 from app.app_logger import AppLogger
 from app.plugin_loader import load_plugins
 from app.default_value_plugins import get_default_value
+from app.mib_build_context import MibBuildContext
+from app.model_cache import load_json
 
 logger = AppLogger.get(__name__)
 
@@ -25,10 +27,15 @@ class BehaviourGenerator:
     """
 
     def __init__(
-        self, output_dir: str = "agent-model", load_default_plugins: bool = True
+        self,
+        output_dir: str = "agent-model",
+        load_default_plugins: bool = True,
+        build_context: Optional[MibBuildContext] = None,
     ) -> None:
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
+        # Shared builder the compiled modules are loaded into; None builds one per MIB
+        self.build_context = build_context
 
         # Load plugins on initialization
         if load_default_plugins:
@@ -114,26 +121,7 @@ class BehaviourGenerator:
                             # This is a best-effort: look for setIndexNames in the compiled MIB
                             # (We assume the symbol_name is the same as entry_name)
                             try:
-                                mibBuilder = builder.MibBuilder()
-                                # Some tests / mocks replace `builder` with a minimal object
-                                # that only exposes `MibBuilder`. Protect against missing
-                                # `DirMibSource` by trying the usual call and falling back.
-                                try:
-                                    mibBuilder.add_mib_sources(
-                                        builder.DirMibSource(
-                                            os.path.dirname(compiled_py_path)
-                                        )
-                                    )
-                                except Exception:
-                                    # either DirMibSource is missing (AttributeError) or
-                                    # the add call failed; call without args (mocks accept it)
-                                    try:
-                                        mibBuilder.add_mib_sources()
-                                    except Exception:
-                                        # best-effort: move on if even that fails
-                                        pass
-                                mibBuilder.load_modules(mib_name)
-                                mib_symbols = mibBuilder.mibSymbols[mib_name]
+                                mib_symbols = self._load_mib_symbols(compiled_py_path, mib_name)
                                 entry_obj = mib_symbols.get(entry_name)
                                 if entry_obj and hasattr(entry_obj, "getIndexNames"):
                                     index_names = [
@@ -232,6 +220,25 @@ class BehaviourGenerator:
         # Fallback: use filename without extension
         return os.path.splitext(os.path.basename(compiled_py_path))[0]
 
+    def _load_mib_symbols(self, mib_py_path: str, mib_name: str) -> Any:
+        """Symbols of a compiled MIB, from the shared build context when there is one."""
+        if self.build_context is not None:
+            self.build_context.add_source(os.path.dirname(mib_py_path))
+            return self.build_context.symbols(mib_name)
+
+        mibBuilder = builder.MibBuilder()
+        # Some tests / mocks replace `builder` with a minimal object that only
+        # exposes `MibBuilder`; protect against a missing DirMibSource
+        try:
+            mibBuilder.add_mib_sources(builder.DirMibSource(os.path.dirname(mib_py_path)))
+        except Exception:
+            try:
+                mibBuilder.add_mib_sources()
+            except Exception:
+                pass
+        mibBuilder.load_modules(mib_name)
+        return mibBuilder.mibSymbols[mib_name]
+
     def _extract_mib_info(self, mib_py_path: str, mib_name: str) -> Dict[str, Any]:
         """Extract MIB symbol information from a compiled MIB Python file.
 
@@ -243,17 +250,7 @@ class BehaviourGenerator:
             Dictionary mapping symbol names to their metadata
         """
 
-        mibBuilder = builder.MibBuilder()
-        # Protect against minimal / mocked `builder` objects that lack DirMibSource
-        try:
-            mibBuilder.add_mib_sources(builder.DirMibSource(os.path.dirname(mib_py_path)))
-        except Exception:
-            try:
-                mibBuilder.add_mib_sources()
-            except Exception:
-                pass
-        mibBuilder.load_modules(mib_name)
-        mib_symbols = mibBuilder.mibSymbols[mib_name]
+        mib_symbols = self._load_mib_symbols(mib_py_path, mib_name)
 
         if not isinstance(mib_symbols, dict):
             mib_type = type(mib_symbols)
@@ -446,8 +443,7 @@ class BehaviourGenerator:
             raise FileNotFoundError(
                 f"Type registry JSON not found at {registry_path}. Run the type recorder/export step first."
             )
-        with registry_path.open("r", encoding="utf-8") as f:
-            return cast(Dict[str, Any], json.load(f))
+        return cast(Dict[str, Any], load_json(registry_path))
 
     def _detect_inherited_indexes(
         self, result: Dict[str, Any], table_entries: Dict[str, Any], _mib_name: str
@@ -0,0 +1,368 @@
+"""
+Compiled table index codecs.
+
+A table's INDEX clause fixes how row values map to the OID suffix that
+identifies a row instance. ``IndexCodec`` resolves the index column types
+once per table and then converts row values <-> OID suffix tuples <->
+canonical dotted instance strings, memoising recently used keys.
+``IndexCodecCache`` holds one codec per table OID for a set of schemas.
+
+Encoding follows what the registrar has always registered: integers are one
+sub-identifier, IpAddress is four, and strings / OIDs are IMPLIED (no
+length prefix). Values that cannot be encoded for their column type raise
+``ValueError``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Mapping, Optional
+
+# Index kinds
+INT = "int"
+IPADDRESS = "ipaddress"
+OCTETS = "octets"
+OID = "oid"
+AUTO = "auto"
+
+_INT_TYPES = {
+    "Integer32",
+    "Integer",
+    "INTEGER",
+    "Unsigned32",
+    "Gauge32",
+    "Counter32",
+    "Counter64",
+    "TimeTicks",
+}
+_OCTET_TYPES = {"OctetString", "OCTET STRING", "DisplayString", "PhysAddress", "Opaque"}
+_OID_TYPES = {"ObjectIdentifier", "OBJECT IDENTIFIER"}
+
+_DOTTED_NUMERIC = re.compile(r"^\d+(\.\d+)*$")
+
+_MAX_CACHED_KEYS = 4096
+
+
+def index_kind(type_name: Optional[str], type_registry: Optional[Mapping[str, Any]] = None) -> str:
+    """Classify an index column type, consulting the type registry for TCs."""
+    if not type_name:
+        return AUTO
+    candidates = [type_name]
+    if type_registry:
+        entry = type_registry.get(type_name)
+        if isinstance(entry, dict) and entry.get("base_type"):
+            candidates.append(str(entry["base_type"]))
+    for name in candidates:
+        if name == "IpAddress":
+            return IPADDRESS
+        if name in _INT_TYPES:
+            return INT
+        if name in _OCTET_TYPES:
+            return OCTETS
+        if name in _OID_TYPES:
+            return OID
+    return AUTO
+
+
+def _int_components(values: Iterable[Any], what: Any) -> tuple[int, ...]:
+    try:
+        return tuple(int(x) for x in values)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid index value {what!r}") from None
+
+
+def encode_index_value(value: Any, kind: str) -> tuple[int, ...]:
+    """Expand one index value into OID sub-identifiers for the given kind.
+
+    Raises:
+        ValueError: If the value cannot be encoded as that kind
+    """
+    if kind == IPADDRESS:
+        if isinstance(value, (bytes, bytearray)):
+            parts = tuple(value)
+        elif isinstance(value, str):
+            parts = _int_components(value.split("."), value)
+        elif isinstance(value, (list, tuple)):
+            parts = _int_components(value, value)
+        else:
+            parts = ()
+        if len(parts) != 4 or not all(0 <= x <= 255 for x in parts):
+            raise ValueError(f"Invalid IpAddress index value {value!r}")
+        return parts
+
+    if kind == OCTETS:
+        if isinstance(value, str):
+            return tuple(ord(c) for c in value)
+        if isinstance(value, (bytes, bytearray)):
+            return tuple(value)
+        if isinstance(value, int):
+            return (value,)
+        if isinstance(value, (list, tuple)):
+            return _int_components(value, value)
+        return ()
+
+    if kind == OID:
+        if isinstance(value, (list, tuple)):
+            return _int_components(value, value)
+        text = str(value).strip(".") if value is not None else ""
+        if text and not _DOTTED_NUMERIC.match(text):
+            raise ValueError(f"Invalid OBJECT IDENTIFIER index value {value!r}")
+        return tuple(int(x) for x in text.split(".")) if text else ()
+
+    if kind == INT:
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ValueError(f"Invalid integer index value {value!r}")
+        return _int_components((value,), value)
+
+    # AUTO: integers, dotted numbers and lists pass through; other text as IMPLIED octets
+    if isinstance(value, bool):
+        return (int(value),)
+    if isinstance(value, int):
+        return (value,)
+    if isinstance(value, (list, tuple)):
+        return _int_components(value, value)
+    if isinstance(value, str):
+        if _DOTTED_NUMERIC.match(value):
+            return tuple(int(x) for x in value.split("."))
+        return tuple(ord(c) for c in value)
+    return _int_components((value,), value)
+
+
+def faux_index_str(
+    values: Mapping[str, Any], legacy_keys: Iterable[str] = ("__instance__",)
+) -> str:
+    """Instance string for tables without index columns (``__index__``, ``__index_N__``).
+
+    Falls back to the first present ``legacy_keys`` entry, then to joining
+    all values in order; an empty mapping is instance "1".
+    """
+    if not values:
+        return "1"
+
+    index_parts: list[str] = []
+    i = 1
+    while True:
+        key = "__index__" if i == 1 else f"__index_{i}__"
+        if key not in values:
+            break
+        index_parts.append(str(values[key]))
+        i += 1
+    if index_parts:
+        return ".".join(index_parts)
+
+    for key in legacy_keys:
+        if key in values:
+            return str(values[key])
+
+    return ".".join(str(v) for v in values.values())
+
+
+def faux_index_values(index_str: str) -> dict[str, str]:
+    """Split "1.2.3" into ``{"__index__": "1", "__index_2__": "2", "__index_3__": "3"}``."""
+    return {
+        ("__index__" if i == 1 else f"__index_{i}__"): part
+        for i, part in enumerate(index_str.split("."), 1)
+    }
+
+
+class IndexCodec:
+    """Row values <-> OID suffix <-> instance string for one table's INDEX."""
+
+    def __init__(self, columns: Iterable[str], kinds: Iterable[str]) -> None:
+        self.columns = tuple(columns)
+        self.kinds = tuple(kinds)
+        if len(self.columns) != len(self.kinds):
+            raise ValueError("columns and kinds must have the same length")
+        self._suffix_cache: dict[tuple[Any, ...], tuple[int, ...]] = {}
+        self._decode_cache: dict[tuple[int, ...], dict[str, Any]] = {}
+
+    @classmethod
+    def for_entry(
+        cls,
+        entry: Mapping[str, Any],
+        objects: Mapping[str, Any],
+        type_registry: Optional[Mapping[str, Any]] = None,
+    ) -> "IndexCodec":
+        """Compile a codec from a schema entry (MibTableRow) and its MIB's objects."""
+        columns = entry.get("indexes") or ([entry["index"]] if entry.get("index") else [])
+        kinds = []
+        for col in columns:
+            col_info = objects.get(col)
+            type_name = col_info.get("type") if isinstance(col_info, dict) else None
+            kinds.append(index_kind(type_name, type_registry))
+        return cls(columns, kinds)
+
+    def covers(self, values: Mapping[str, Any]) -> bool:
+        """True if ``values`` names every index column."""
+        return bool(self.columns) and all(col in values for col in self.columns)
+
+    def schema_row_defaults(self, row_position: int) -> dict[str, int]:
+        """Index values the registrar assumes for a schema row that omits them.
+
+        The first index column defaults to the row's 1-based position, the
+        rest to 0.
+        """
+        return {col: (row_position + 1 if i == 0 else 0) for i, col in enumerate(self.columns)}
+
+    def encode_column(self, position: int, value: Any) -> tuple[int, ...]:
+        return encode_index_value(value, self.kinds[position])
+
+    def to_oid_suffix(
+        self, values: Mapping[str, Any], defaults: Optional[Mapping[str, Any]] = None
+    ) -> tuple[int, ...]:
+        """Encode the index columns of ``values`` (missing ones from ``defaults``)."""
+        raw = tuple(
+            values[col] if col in values else (defaults or {}).get(col)
+            for col in self.columns
+        )
+        try:
+            cached = self._suffix_cache.get(raw)
+        except TypeError:
+            # Unhashable value (e.g. a list-valued IpAddress); encode without caching
+            return self._encode(raw)
+        if cached is None:
+            cached = self._encode(raw)
+            if len(self._suffix_cache) >= _MAX_CACHED_KEYS:
+                self._suffix_cache.clear()
+            self._suffix_cache[raw] = cached
+        return cached
+
+    def to_instance_str(
+        self, values: Mapping[str, Any], defaults: Optional[Mapping[str, Any]] = None
+    ) -> str:
+        return ".".join(str(x) for x in self.to_oid_suffix(values, defaults))
+
+    def from_oid_suffix(self, suffix: Iterable[int]) -> dict[str, Any]:
+        """Decode an OID suffix back into index column values.
+
+        Raises:
+            ValueError: If the suffix does not match the index layout
+        """
+        key = tuple(int(x) for x in suffix)
+        cached = self._decode_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        values: dict[str, Any] = {}
+        pos = 0
+        last = len(self.columns) - 1
+        for i, (col, kind) in enumerate(zip(self.columns, self.kinds)):
+            if kind == IPADDRESS:
+                part = key[pos:pos + 4]
+                if len(part) != 4:
+                    raise ValueError(f"Truncated IpAddress index for {col}")
+                values[col] = ".".join(str(x) for x in part)
+                pos += 4
+            elif kind in (OCTETS, OID):
+                if i != last:
+                    raise ValueError(f"Cannot decode IMPLIED index {col} before other index columns")
+                rest = key[pos:]
+                values[col] = (
+                    "".join(chr(x) for x in rest) if kind == OCTETS else ".".join(str(x) for x in rest)
+                )
+                pos = len(key)
+            elif kind == AUTO and i == last and len(key) - pos != 1:
+                # Unknown type encoded as dotted numbers or IMPLIED text
+                values[col] = ".".join(str(x) for x in key[pos:])
+                pos = len(key)
+            else:
+                if pos >= len(key):
+                    raise ValueError(f"Missing index component for {col}")
+                values[col] = key[pos]
+                pos += 1
+        if pos != len(key):
+            raise ValueError(f"Index suffix {key} is longer than the index columns")
+
+        if len(self._decode_cache) >= _MAX_CACHED_KEYS:
+            self._decode_cache.clear()
+        self._decode_cache[key] = values
+        return dict(values)
+
+    def from_instance_str(self, instance_str: str) -> dict[str, Any]:
+        return self.from_oid_suffix(int(x) for x in instance_str.split(".") if x)
+
+    def from_legacy_instance_str(self, instance_str: str) -> str:
+        """Canonical instance string for a key saved before string indexes were encoded.
+
+        Older state joined the raw index values with dots (``"5.eth0"``);
+        keys that are already dotted numbers are returned unchanged.
+
+        Raises:
+            ValueError: If the key does not fit the index layout
+        """
+        if not self.columns or _DOTTED_NUMERIC.match(instance_str):
+            return instance_str
+        parts = instance_str.split(".")
+        values: dict[str, Any] = {}
+        pos = 0
+        last = len(self.columns) - 1
+        for i, (col, kind) in enumerate(zip(self.columns, self.kinds)):
+            if kind == IPADDRESS:
+                values[col] = ".".join(parts[pos:pos + 4])
+                pos += 4
+            elif i == last and kind in (OCTETS, OID, AUTO):
+                # IMPLIED text may itself contain dots
+                values[col] = ".".join(parts[pos:])
+                pos = len(parts)
+            else:
+                values[col] = parts[pos] if pos < len(parts) else None
+                pos += 1
+        if pos != len(parts):
+            raise ValueError(f"Instance key {instance_str!r} does not match the index columns")
+        return self.to_instance_str(values)
+
+    def _encode(self, raw: tuple[Any, ...]) -> tuple[int, ...]:
+        components: list[int] = []
+        for value, kind in zip(raw, self.kinds):
+            components.extend(encode_index_value(value, kind))
+        return tuple(components)
+
+
+class IndexCodecCache:
+    """One compiled ``IndexCodec`` per table OID for a set of MIB schemas."""
+
+    def __init__(self, type_registry: Optional[Mapping[str, Any]] = None) -> None:
+        self.type_registry = type_registry or {}
+        self._codecs: dict[str, Optional[IndexCodec]] = {}
+        self._entries: Optional[dict[str, tuple[Mapping[str, Any], Mapping[str, Any]]]] = None
+
+    def clear(self) -> None:
+        """Forget compiled codecs (call when the schemas change)."""
+        self._codecs.clear()
+        self._entries = None
+
+    def get(self, table_oid: str, schemas: Mapping[str, Any]) -> Optional[IndexCodec]:
+        """Return the codec for ``table_oid``, or None if the table has no entry."""
+        if table_oid in self._codecs:
+            return self._codecs[table_oid]
+        if self._entries is None or table_oid not in self._entries:
+            self._entries = self._index_entries(schemas)
+        found = self._entries.get(table_oid)
+        codec = IndexCodec.for_entry(found[0], found[1], self.type_registry) if found else None
+        self._codecs[table_oid] = codec
+        return codec
+
+    @staticmethod
+    def _index_entries(
+        schemas: Mapping[str, Any],
+    ) -> dict[str, tuple[Mapping[str, Any], Mapping[str, Any]]]:
+        entries: dict[str, tuple[Mapping[str, Any], Mapping[str, Any]]] = {}
+        for schema in schemas.values():
+            objects = schema.get("objects", schema) if isinstance(schema, dict) else {}
+            if not isinstance(objects, dict):
+                continue
+            rows_by_oid = {
+                tuple(obj["oid"]): obj
+                for obj in objects.values()
+                if isinstance(obj, dict) and obj.get("type") == "MibTableRow" and isinstance(obj.get("oid"), list)
+            }
+            for obj in objects.values():
+                if not isinstance(obj, dict) or obj.get("type") != "MibTable":
+                    continue
+                oid = obj.get("oid")
+                if not isinstance(oid, list) or not oid:
+                    continue
+                entry = rows_by_oid.get(tuple(oid) + (1,))
+                if entry is not None:
+                    entries[".".join(str(x) for x in oid)] = (entry, objects)
+        return entries
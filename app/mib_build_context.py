@@ -0,0 +1,103 @@
+"""
+Shared pysnmp MIB loading for the model build pipeline.
+
+Executing a compiled MIB module is the expensive part of recording types,
+generating schemas and setting up the agent's MIB tree. A
+``MibBuildContext`` owns one SNMP engine's MibBuilder and loads each
+compiled module into it at most once, so the type recorder, the schema
+generator and the agent take their modules from the same builder instead
+of each building and filling their own.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional, cast
+
+from app.app_logger import AppLogger
+
+logger = AppLogger.get(__name__)
+
+
+class MibBuildContext:
+    """One MibBuilder, with compiled MIB modules loaded incrementally."""
+
+    def __init__(
+        self,
+        compiled_dir: str | Path,
+        snmp_engine: Optional[Any] = None,
+        mib_builder: Optional[Any] = None,
+    ) -> None:
+        if snmp_engine is None:
+            from pysnmp.entity import engine
+
+            snmp_engine = engine.SnmpEngine()
+        self.snmp_engine = snmp_engine
+        self.mib_builder = mib_builder if mib_builder is not None else snmp_engine.get_mib_builder()
+        self.compiled_dir = Path(compiled_dir)
+        # Module name -> number of times this context executed it (at most 1)
+        self.load_counts: dict[str, int] = {}
+        self._sources: set[str] = set()
+        self.add_source(self.compiled_dir)
+
+    def add_source(self, directory: str | Path) -> None:
+        """Make a directory of compiled modules searchable (once per directory)."""
+        key = str(Path(directory).resolve())
+        if key in self._sources:
+            return
+        from pysnmp.smi import builder
+
+        self.mib_builder.add_mib_sources(builder.DirMibSource(str(directory)))
+        self._sources.add(key)
+
+    def available_modules(self) -> list[str]:
+        """Names of the compiled modules in ``compiled_dir``."""
+        return sorted(
+            path.stem for path in self.compiled_dir.glob("*.py") if path.stem != "__init__"
+        )
+
+    def is_loaded(self, module: str) -> bool:
+        return module in self._loaded()
+
+    def load(self, *modules: str) -> list[str]:
+        """Load the given modules (and their imports) unless already loaded.
+
+        Returns the modules this call executed, imports included.
+
+        Raises:
+            Whatever ``MibBuilder.load_modules`` raises for a module that
+            cannot be found or executed.
+        """
+        before = set(self._loaded())
+        pending = [name for name in dict.fromkeys(modules) if name not in before]
+        if not pending:
+            return []
+        self.mib_builder.load_modules(*pending)
+        loaded = set(self._loaded())
+        # Builders that do not expose mibSymbols are trusted to have loaded pending
+        executed = sorted(loaded - before) if loaded else sorted(pending)
+        for name in executed:
+            self.load_counts[name] = self.load_counts.get(name, 0) + 1
+        if executed:
+            logger.debug(f"Loaded {len(executed)} MIB module(s): {', '.join(executed)}")
+        return executed
+
+    def load_each(self, modules: Iterable[str]) -> list[str]:
+        """Load modules one at a time, skipping those that fail; returns the failures."""
+        failed: list[str] = []
+        for name in modules:
+            try:
+                self.load(name)
+            except Exception as e:
+                logger.debug(f"Could not load MIB module {name}: {e}")
+                failed.append(name)
+        return failed
+
+    def symbols(self, module: str) -> Mapping[str, Any]:
+        """Symbols exported by a module, loading it first if needed."""
+        self.load(module)
+        return cast(Mapping[str, Any], self._loaded()[module])
+
+    def _loaded(self) -> Mapping[str, Any]:
+        symbols = getattr(self.mib_builder, "mibSymbols", None)
+        return symbols if isinstance(symbols, Mapping) else {}
@@ -0,0 +1,280 @@
+"""
+Persistent catalogue of MIB source files.
+
+Maps MIB module name -> source path, mtime, size, content digest and parsed
+IMPORTS for every MIB file under a set of search directories. The catalogue
+is saved to disk and refreshed incrementally: only files whose mtime or size
+changed are re-read and re-parsed, so resolving dependencies across
+thousands of vendor MIBs becomes a dictionary lookup.
+
+``MibCatalogue.shared()`` hands out one catalogue per set of directories so
+the dependency resolver, the compiler and the REST API share the same scan.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+DEFAULT_SOURCE_DIRS: Tuple[str, ...] = (
+    "data/mibs_reference",
+    "data/mibs",
+    "compiled-mibs",  # Fallback to compiled MIBs if source not found
+)
+DEFAULT_EXTENSIONS: Tuple[str, ...] = (".txt", ".mib", ".my", ".py")
+DEFAULT_CACHE_FILE = Path("data") / "mib_catalogue.json"
+
+_CATALOGUE_VERSION = 1
+_IMPORTS_RE = re.compile(r"IMPORTS\s+(.*?);\s*(?=\w+|$)", re.DOTALL)
+_FROM_RE = re.compile(r"FROM\s+(\S+)")
+# Compiled pysnmp modules import via mibBuilder.import_symbols("MIB-NAME", ...)
+_PY_IMPORT_RE = re.compile(r"import_symbols\(\s*[\"']([^\"']+)[\"']")
+
+
+def parse_mib_imports(content: str, compiled: bool = False) -> Set[str]:
+    """MIB names imported by a MIB source (or compiled pysnmp module)."""
+    if compiled:
+        return set(_PY_IMPORT_RE.findall(content))
+
+    imports_match = _IMPORTS_RE.search(content)
+    if not imports_match:
+        return set()
+
+    imported_mibs: Set[str] = set()
+    for mib_name in _FROM_RE.findall(imports_match.group(1)):
+        # Clean up - remove trailing punctuation
+        mib_name = mib_name.rstrip(";,")
+        if mib_name:
+            imported_mibs.add(mib_name)
+    return imported_mibs
+
+
+@dataclass
+class CatalogueEntry:
+    name: str
+    path: str
+    mtime: float
+    size: int
+    digest: str
+    imports: List[str] = field(default_factory=list)
+
+
+class MibCatalogue:
+    """Name -> source index over MIB search directories, refreshed by mtime."""
+
+    _shared: Dict[Tuple[Tuple[str, ...], Tuple[str, ...], int, Optional[str]], "MibCatalogue"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        source_dirs: Optional[Sequence[str]] = None,
+        cache_file: Optional[Path] = None,
+        extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+        max_depth: int = 5,
+        refresh_interval: float = 5.0,
+    ) -> None:
+        self.source_dirs = list(source_dirs) if source_dirs else list(DEFAULT_SOURCE_DIRS)
+        self.cache_file = cache_file
+        self.extensions = tuple(extensions)
+        self.max_depth = max_depth
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._entries: Dict[str, CatalogueEntry] = {}
+        self._by_name: Dict[str, CatalogueEntry] = {}
+        self._directories: List[str] = []
+        self._refreshed_at: Optional[float] = None
+        self._load_cache()
+
+    @classmethod
+    def shared(
+        cls,
+        source_dirs: Optional[Sequence[str]] = None,
+        cache_file: Optional[Path] = DEFAULT_CACHE_FILE,
+        extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+        max_depth: int = 5,
+    ) -> "MibCatalogue":
+        """Process-wide catalogue for these directories (created on first use)."""
+        dirs = tuple(source_dirs) if source_dirs else DEFAULT_SOURCE_DIRS
+        key = (dirs, tuple(extensions), max_depth, str(cache_file) if cache_file else None)
+        with cls._shared_lock:
+            catalogue = cls._shared.get(key)
+            if catalogue is None:
+                catalogue = cls(dirs, cache_file=cache_file, extensions=extensions, max_depth=max_depth)
+                cls._shared[key] = catalogue
+            return catalogue
+
+    def ensure_fresh(self) -> None:
+        """Refresh if never scanned or the last scan is older than ``refresh_interval``."""
+        refreshed_at = self._refreshed_at
+        if refreshed_at is None or time.monotonic() - refreshed_at > self.refresh_interval:
+            self.refresh()
+
+    def refresh(self) -> int:
+        """Rescan the directories, re-parsing only new or modified files.
+
+        Returns the number of files that were (re)parsed.
+        """
+        with self._lock:
+            found: Dict[str, Tuple[os.stat_result, int, int, int]] = {}
+            directories: List[str] = []
+            for dir_rank, search_dir in enumerate(self.source_dirs):
+                if not os.path.isdir(search_dir):
+                    continue
+                self._scan_dir(search_dir, dir_rank, found, directories)
+
+            parsed = 0
+            entries: Dict[str, CatalogueEntry] = {}
+            for path, (st, *_rank) in found.items():
+                entry = self._entries.get(path)
+                if entry is None or entry.mtime != st.st_mtime or entry.size != st.st_size:
+                    entry = self._parse_file(path, st)
+                    if entry is None:
+                        continue
+                    parsed += 1
+                entries[path] = entry
+
+            # Earlier directories, shallower files and preferred extensions win
+            by_name: Dict[str, CatalogueEntry] = {}
+            for path in sorted(found, key=lambda p: (found[p][1:], p)):
+                entry = entries.get(path)
+                if entry is not None and entry.name not in by_name:
+                    by_name[entry.name] = entry
+
+            changed = parsed > 0 or set(entries) != set(self._entries)
+            self._entries = entries
+            self._by_name = by_name
+            self._directories = directories
+            self._refreshed_at = time.monotonic()
+            if changed:
+                self._save_cache()
+            return parsed
+
+    def find(self, mib_name: str) -> Optional[str]:
+        """Path of the source for ``mib_name``, or None if not catalogued."""
+        self.ensure_fresh()
+        entry = self._by_name.get(mib_name)
+        return entry.path if entry else None
+
+    def imports(self, mib_name: str) -> Set[str]:
+        """MIBs directly imported by ``mib_name`` (empty if unknown)."""
+        self.ensure_fresh()
+        entry = self._by_name.get(mib_name)
+        return set(entry.imports) if entry else set()
+
+    def entry(self, mib_name: str) -> Optional[CatalogueEntry]:
+        self.ensure_fresh()
+        return self._by_name.get(mib_name)
+
+    def names(self) -> List[str]:
+        self.ensure_fresh()
+        return sorted(self._by_name)
+
+    def directories(self, under: Optional[str] = None) -> List[str]:
+        """Scanned directories, optionally only ``under`` and its subdirectories."""
+        self.ensure_fresh()
+        if under is None:
+            return list(self._directories)
+        root = os.path.normpath(under)
+        return [
+            d for d in self._directories
+            if os.path.normpath(d) == root or os.path.normpath(d).startswith(root + os.sep)
+        ]
+
+    def _scan_dir(
+        self,
+        search_dir: str,
+        dir_rank: int,
+        found: Dict[str, Tuple[os.stat_result, int, int, int]],
+        directories: List[str],
+    ) -> None:
+        ext_rank = {ext: i for i, ext in enumerate(self.extensions)}
+        for root, dirs, files in os.walk(search_dir):
+            # Limit recursion to avoid runaway traversal
+            depth = root[len(search_dir):].count(os.sep)
+            if depth >= self.max_depth:
+                dirs[:] = []
+            dirs.sort()
+            directories.append(root)
+            for filename in files:
+                ext = os.path.splitext(filename)[1]
+                if ext not in ext_rank or filename == "__init__.py":
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found[path] = (st, dir_rank, depth, ext_rank[ext])
+
+    @staticmethod
+    def _parse_file(path: str, st: os.stat_result) -> Optional[CatalogueEntry]:
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        content = raw.decode("utf-8", errors="ignore")
+        name, ext = os.path.splitext(os.path.basename(path))
+        return CatalogueEntry(
+            name=name,
+            path=path,
+            mtime=st.st_mtime,
+            size=st.st_size,
+            digest=hashlib.blake2b(raw, digest_size=16).hexdigest(),
+            imports=sorted(parse_mib_imports(content, compiled=ext == ".py")),
+        )
+
+    def _load_cache(self) -> None:
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            with self.cache_file.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != _CATALOGUE_VERSION:
+                return
+            self._entries = {
+                path: CatalogueEntry(**entry) for path, entry in data.get("entries", {}).items()
+            }
+        except Exception:
+            # A broken catalogue is just rebuilt on the next refresh
+            self._entries = {}
+
+    def _save_cache(self) -> None:
+        if self.cache_file is None:
+            return
+        # Keep entries for directories scanned by other catalogues sharing the file
+        merged: Dict[str, Dict[str, object]] = {}
+        if self.cache_file.exists():
+            try:
+                with self.cache_file.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == _CATALOGUE_VERSION:
+                    merged = {
+                        path: entry for path, entry in data.get("entries", {}).items()
+                        if not self._owns(path)
+                    }
+            except Exception:
+                merged = {}
+        merged.update({path: asdict(entry) for path, entry in self._entries.items()})
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_file.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": _CATALOGUE_VERSION, "entries": merged}, f)
+            os.replace(tmp_name, self.cache_file)
+        except OSError:
+            pass
+
+    def _owns(self, path: str) -> bool:
+        return any(
+            path == d or path.startswith(d.rstrip(os.sep) + os.sep) for d in self.source_dirs
+        )
+
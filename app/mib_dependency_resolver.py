@@ -2,29 +2,45 @@
 
 from __future__ import annotations
 
-import os
-import re
+from pathlib import Path
 from typing import Dict, Set, List, Optional, Any, cast
 
+from app.mib_catalogue import DEFAULT_CACHE_FILE, DEFAULT_SOURCE_DIRS, MibCatalogue
+
 
 class MibDependencyResolver:
     """Resolves MIB dependencies by parsing IMPORTS sections."""
 
-    def __init__(self, mib_source_dirs: Optional[List[str]] = None):
+    def __init__(
+        self,
+        mib_source_dirs: Optional[List[str]] = None,
+        catalogue_file: Optional[Path] = DEFAULT_CACHE_FILE,
+    ):
         """Initialize the resolver with optional custom MIB directories.
         
         Args:
             mib_source_dirs: List of directories to search for MIB source files.
                             Defaults to common locations.
+            catalogue_file: Where the shared source catalogue is persisted
+                            (None keeps it in memory only).
         """
-        self.mib_source_dirs = mib_source_dirs or [
-            "data/mibs_reference",
-            "data/mibs",
-            "compiled-mibs",  # Fallback to compiled MIBs if source not found
-        ]
+        self.mib_source_dirs = mib_source_dirs or list(DEFAULT_SOURCE_DIRS)
+        self.catalogue_file = catalogue_file
+        self._catalogue: Optional[MibCatalogue] = None
         self._dependency_cache: Dict[str, Set[str]] = {}
         self._mib_file_cache: Dict[str, Optional[str]] = {}
 
+    @property
+    def catalogue(self) -> MibCatalogue:
+        """Process-wide source catalogue for these directories.
+
+        Lookups rescan it at most once per ``refresh_interval``, however many
+        resolvers are created.
+        """
+        if self._catalogue is None:
+            self._catalogue = MibCatalogue.shared(self.mib_source_dirs, cache_file=self.catalogue_file)
+        return self._catalogue
+
     def _find_mib_source(self, mib_name: str) -> Optional[str]:
         """Find a MIB source file by name.
         
@@ -34,74 +50,9 @@ class MibDependencyResolver:
         Returns:
             Path to the MIB source file, or None if not found.
         """
-        if mib_name in self._mib_file_cache:
-            return self._mib_file_cache[mib_name]
-
-        # Try to find source file with common extensions
-        for search_dir in self.mib_source_dirs:
-            if not os.path.exists(search_dir):
-                continue
-            
-            # Try direct match first
-            for ext in [".txt", ".mib", ".my"]:
-                mib_path = os.path.join(search_dir, f"{mib_name}{ext}")
-                if os.path.exists(mib_path):
-                    self._mib_file_cache[mib_name] = mib_path
-                    return mib_path
-            
-            # Search subdirectories recursively with depth limit
-            for root, dirs, files in os.walk(search_dir):
-                # Calculate depth and limit recursion to avoid infinite traversal
-                depth = root[len(search_dir):].count(os.sep)
-                if depth > 5:  # Limit depth to 5 levels
-                    dirs[:] = []  # Don't descend further
-                    continue
-                
-                for ext in [".txt", ".mib", ".my"]:
-                    mib_filename = f"{mib_name}{ext}"
-                    if mib_filename in files:
-                        mib_path = os.path.join(root, mib_filename)
-                        self._mib_file_cache[mib_name] = mib_path
-                        return mib_path
-
-        self._mib_file_cache[mib_name] = None
-        return None
-
-    def _parse_imports(self, mib_path: str) -> Set[str]:
-        """Parse the IMPORTS section of a MIB file.
-        
-        Args:
-            mib_path: Path to the MIB source file.
-            
-        Returns:
-            Set of MIB names imported by this MIB.
-        """
-        if not os.path.exists(mib_path):
-            return set()
-
-        try:
-            with open(mib_path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except (IOError, UnicodeDecodeError):
-            return set()
-
-        # Extract IMPORTS section using regex
-        imports_match = re.search(r"IMPORTS\s+(.*?);\s*(?=\w+|$)", content, re.DOTALL)
-        if not imports_match:
-            return set()
-
-        imports_text = imports_match.group(1)
-        imported_mibs: Set[str] = set()
-
-        # Parse "FROM MIB_NAME" patterns
-        from_matches = re.findall(r"FROM\s+(\S+)", imports_text)
-        for mib_name in from_matches:
-            # Clean up - remove trailing punctuation
-            mib_name = mib_name.rstrip(";,")
-            if mib_name and mib_name not in ("", " "):
-                imported_mibs.add(mib_name)
-
-        return imported_mibs
+        if mib_name not in self._mib_file_cache:
+            self._mib_file_cache[mib_name] = self.catalogue.find(mib_name)
+        return self._mib_file_cache[mib_name]
 
     def get_direct_dependencies(self, mib_name: str) -> Set[str]:
         """Get the direct dependencies of a MIB.
@@ -115,11 +66,8 @@ class MibDependencyResolver:
         if mib_name in self._dependency_cache:
             return self._dependency_cache[mib_name].copy()
 
-        mib_path = self._find_mib_source(mib_name)
-        if mib_path:
-            dependencies = self._parse_imports(mib_path)
-        else:
-            dependencies = set()
+        # Imports come pre-parsed from the catalogue
+        dependencies = self.catalogue.imports(mib_name)
 
         self._dependency_cache[mib_name] = dependencies
         return dependencies.copy()
@@ -151,6 +99,21 @@ class MibDependencyResolver:
 
         return all_deps
 
+    def get_load_closure(self, mib_names: List[str]) -> List[str]:
+        """Return the given MIBs plus all of their transitive imports.
+
+        Args:
+            mib_names: MIBs that are actually served.
+
+        Returns:
+            Sorted list of MIB names that must be loadable to serve them.
+        """
+        closure: Set[str] = set()
+        for mib_name in mib_names:
+            closure.add(mib_name)
+            closure.update(self.get_all_dependencies(mib_name))
+        return sorted(closure)
+
     def build_dependency_tree(self, mib_names: List[str]) -> Dict[str, Dict[str, Any]]:
         """Build a hierarchical dependency tree for a list of MIBs.
         
@@ -9,12 +9,32 @@ from __future__ import annotations
 import json
 import logging
 import time
-from typing import Any, Dict, Optional, Set
-
-from plugins.type_encoders import encode_value
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Set
+
+from app.deleted_instances import DeletedInstances
+from app.index_codec import IndexCodec
+from app.model_cache import load_json
+from app.table_graph import TableGraph
+from app.type_plan import TypePlan, compile_type_plan
+from plugins.type_encoders import encode_value, get_type_encoder
 import types
 
 
+@dataclass
+class MibReloadPlan:
+    """Symbol changes needed to move one MIB from its current schema to a new one."""
+
+    mib: str
+    changed_objects: list[str] = field(default_factory=list)
+    remove_symbols: list[str] = field(default_factory=list)
+    add_symbols: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.remove_symbols and not self.add_symbols
+
+
 class MibRegistrar:
     """Manages the registration of MIB objects (scalars and tables) from MIB JSON data."""
 
@@ -47,6 +67,30 @@ class MibRegistrar:
         self.MibTableColumn = mib_table_column
         self.logger = logger
         self.start_time = start_time
+        # Symbols this registrar exported per MIB (compiled-module symbols are never touched)
+        self._exported_symbols: Dict[str, Set[str]] = {}
+        # Deleted table rows; their cell instances are built but not exported
+        self.deleted_instances: Optional[DeletedInstances] = None
+        # Table relationship graph of the agent's schemas (entries and columns per table)
+        self.table_graph: Optional[TableGraph] = None
+        # Cell instances per table row: table OID -> (mib, {index: {symbol: instance}})
+        self._table_rows: Dict[str, tuple[str, Dict[str, Dict[str, Any]]]] = {}
+        # Compiled type plans for the type registry they were compiled from
+        self._type_plans: Dict[tuple[Any, ...], TypePlan] = {}
+        self._type_plan_registry: Optional[Dict[str, Any]] = None
+
+    def load_type_registry(self, type_registry_path: Optional[str] = None) -> Dict[str, Any]:
+        """Load the exported type registry (defaults to data/types.json)."""
+        from pathlib import Path
+        if type_registry_path is None:
+            type_registry_path = str(Path(__file__).resolve().parent.parent / "data" / "types.json")
+
+        try:
+            registry: Dict[str, Any] = load_json(type_registry_path)
+            return registry
+        except Exception as e:
+            self.logger.error(f"Failed to load type registry: {e}", exc_info=True)
+            return {}
 
     def register_all_mibs(
         self, mib_jsons: Dict[str, Dict[str, Any]], type_registry_path: Optional[str] = None
@@ -63,16 +107,7 @@ class MibRegistrar:
             return
 
         # Load the type registry from the exported JSON file
-        from pathlib import Path
-        if type_registry_path is None:
-            type_registry_path = str(Path(__file__).resolve().parent.parent / "data" / "types.json")
-
-        try:
-            with open(type_registry_path, "r") as f:
-                type_registry = json.load(f)
-        except Exception as e:
-            self.logger.error(f"Failed to load type registry: {e}", exc_info=True)
-            type_registry = {}
+        type_registry = self.load_type_registry(type_registry_path)
 
         # Register each MIB with all its objects (scalars and tables) at once
         for mib, mib_json in mib_jsons.items():
@@ -220,6 +255,7 @@ class MibRegistrar:
 
                 if filtered_symbols:
                     self.mib_builder.export_symbols(mib, **filtered_symbols)
+                    self._exported_symbols.setdefault(mib, set()).update(filtered_symbols)
                     self.logger.info(
                         f"Registered {len(filtered_symbols)} objects for {mib}"
                     )
@@ -232,6 +268,176 @@ class MibRegistrar:
         except Exception as e:
             self.logger.error(f"Error registering MIB {mib}: {e}", exc_info=True)
 
+    def plan_mib_reload(
+        self,
+        mib: str,
+        old_json: Dict[str, Any],
+        new_json: Dict[str, Any],
+        type_registry: Dict[str, Any],
+        force_oids: Iterable[str] = (),
+    ) -> MibReloadPlan:
+        """Work out which symbols must be replaced to serve ``new_json`` instead of ``old_json``.
+
+        Objects are compared per unit: each scalar on its own, and each table
+        together with its entry, columns and rows. Only units that differ (or
+        whose OID covers one of ``force_oids``) are rebuilt. Nothing is
+        exported here, so the plan can be prepared off the SNMP event loop.
+        """
+        old_units = self._group_object_units(self._schema_objects(old_json))
+        new_units = self._group_object_units(self._schema_objects(new_json))
+        forced = tuple(force_oids)
+
+        plan = MibReloadPlan(mib=mib)
+        for unit in sorted(old_units.keys() | new_units.keys()):
+            old_unit = old_units.get(unit)
+            new_unit = new_units.get(unit)
+            if old_unit == new_unit and not (
+                new_unit is not None and self._unit_covers_oids(unit, new_unit, forced)
+            ):
+                continue
+            plan.changed_objects.append(unit)
+
+        if not plan.changed_objects:
+            return plan
+
+        exported = self._exported_symbols.get(mib, set())
+        remove: Set[str] = set()
+        add: Dict[str, Any] = {}
+        for unit in plan.changed_objects:
+            if unit in old_units:
+                remove.update(self._unit_symbol_names(old_units[unit], exported))
+            if unit in new_units:
+                add.update(self._build_mib_symbols(mib, new_units[unit], type_registry))
+
+        existing = set(self.mib_builder.mibSymbols.get(mib, {}).keys()) - remove
+        plan.remove_symbols = sorted(remove)
+        plan.add_symbols = {k: v for k, v in add.items() if k not in existing}
+        return plan
+
+    def apply_mib_reload(self, plan: MibReloadPlan) -> None:
+        """Swap the symbols described by ``plan`` into the live MIB builder."""
+        if plan.is_empty:
+            return
+        exported = self._exported_symbols.setdefault(plan.mib, set())
+        if plan.remove_symbols:
+            self.mib_builder.unexport_symbols(plan.mib, *plan.remove_symbols)
+            exported.difference_update(plan.remove_symbols)
+        if plan.add_symbols:
+            self.mib_builder.export_symbols(plan.mib, **plan.add_symbols)
+            exported.update(plan.add_symbols)
+        self.logger.info(
+            f"Reloaded {len(plan.changed_objects)} object(s) for {plan.mib}: "
+            f"-{len(plan.remove_symbols)} +{len(plan.add_symbols)} symbols"
+        )
+
+    def set_table_row_served(self, table_oid: str, index_str: str, served: bool) -> bool:
+        """Export (``served``) or unexport the cell instances of one schema row.
+
+        Used when a row is deleted or restored at runtime. Returns False if
+        the row was never built from the schema.
+        """
+        table = self._table_rows.get(table_oid)
+        cells = table[1].get(index_str) if table is not None else None
+        if table is None or not cells:
+            return False
+        mib = table[0]
+        exported = self._exported_symbols.setdefault(mib, set())
+        if served:
+            missing = {name: inst for name, inst in cells.items() if name not in exported}
+            if missing:
+                self.mib_builder.export_symbols(mib, **missing)
+                exported.update(missing)
+        else:
+            present = [name for name in cells if name in exported]
+            if present:
+                self.mib_builder.unexport_symbols(mib, *present)
+                exported.difference_update(present)
+        return True
+
+    def cell_instance(self, table_oid: str, index_str: str, column: str) -> Optional[Any]:
+        """Cell instance of a schema row, or None if the row was never built."""
+        table = self._table_rows.get(table_oid)
+        cells = table[1].get(index_str) if table is not None else None
+        if not cells:
+            return None
+        return cells.get(f"{column}Inst_{index_str.replace('.', '_')}")
+
+    def row_values(self, table_oid: str, index_str: str) -> Dict[str, Any]:
+        """Current syntax of each cell of one schema row, keyed by column name.
+
+        Empty if the row was never built from the schema.
+        """
+        table = self._table_rows.get(table_oid)
+        cells = table[1].get(index_str) if table is not None else None
+        if not cells:
+            return {}
+        # Instance symbols are named "<column>Inst_<index arcs>"
+        return {name.rpartition("Inst_")[0]: inst.syntax for name, inst in cells.items()}
+
+    @staticmethod
+    def _schema_objects(mib_json: Dict[str, Any]) -> Dict[str, Any]:
+        if "objects" in mib_json and isinstance(mib_json["objects"], dict):
+            objects: Dict[str, Any] = mib_json["objects"]
+            return objects
+        return mib_json
+
+    def _group_object_units(self, mib_json: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Group schema objects into reload units keyed by scalar or table name."""
+        table_related = self._find_table_related_objects(mib_json)
+        units: Dict[str, Dict[str, Any]] = {}
+
+        for name, info in mib_json.items():
+            if not isinstance(info, dict):
+                continue
+            if name not in table_related:
+                units[name] = {name: info}
+                continue
+            if not name.endswith("Table"):
+                continue
+
+            unit = {name: info}
+            entry_name = name[:-5] + "Entry"
+            entry_info = mib_json.get(entry_name)
+            if isinstance(entry_info, dict):
+                unit[entry_name] = entry_info
+                entry_oid = tuple(entry_info.get("oid", []))
+                for col_name, col_info in mib_json.items():
+                    if not isinstance(col_info, dict):
+                        continue
+                    col_oid = tuple(col_info.get("oid", []))
+                    if entry_oid and len(col_oid) > len(entry_oid) and col_oid[: len(entry_oid)] == entry_oid:
+                        unit[col_name] = col_info
+            units[name] = unit
+
+        return units
+
+    @staticmethod
+    def _unit_covers_oids(unit: str, objects: Dict[str, Any], oids: tuple[str, ...]) -> bool:
+        if not oids:
+            return False
+        info = objects.get(unit, {})
+        oid = info.get("oid") if isinstance(info, dict) else None
+        if not isinstance(oid, list) or not oid:
+            return False
+        dotted = ".".join(str(x) for x in oid)
+        prefix = dotted + "."
+        return any(o == dotted or o.startswith(prefix) for o in oids)
+
+    @staticmethod
+    def _unit_symbol_names(objects: Dict[str, Any], exported: Set[str]) -> Set[str]:
+        """Return exported symbols built from ``objects`` (``x``, ``xInst``, ``xInst_<index>``)."""
+        names: Set[str] = set()
+        for sym in exported:
+            if "Inst_" in sym:
+                base = sym.split("Inst_", 1)[0]
+            elif sym.endswith("Inst"):
+                base = sym[:-4]
+            else:
+                base = sym
+            if base in objects:
+                names.add(sym)
+        return names
+
     def _build_mib_symbols(
         self, mib: str, mib_json: Dict[str, Any], type_registry: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -267,60 +473,29 @@ class MibRegistrar:
                 self.logger.warning(f"Skipping {name}: invalid type '{type_name}'")
                 continue
 
-            # Prefer the explicit type name when it maps to a concrete SNMP type (e.g., Counter32)
-            # Include TEXTUAL-CONVENTIONs that have type encoders registered
-            preferred_snmp_types = {
-                "Counter32",
-                "Counter64",
-                "Gauge32",
-                "Unsigned32",
-                "Integer32",
-                "TimeTicks",
-                "DisplayString",
-                "OctetString",
-                "DateAndTime",  # TEXTUAL-CONVENTION with type encoder
-            }
-            snmp_type_name = (
-                type_name if type_name in preferred_snmp_types else base_type_raw
-            )
-            base_type = snmp_type_name
+            plan = self.type_plan(str(type_name), access, type_registry, info.get("enums"))
+            snmp_type_name = plan.snmp_type
 
             # Special handling for sysUpTime
             if name == "sysUpTime":
                 uptime_seconds = time.time() - self.start_time
                 value = int(uptime_seconds * 100)
 
-            # Decode value if it's in encoded format
-            value = self._decode_value(value)
-
-            # Apply type converter if one is registered (plugin system)
-            value = encode_value(value, base_type)
+            # Decode the stored value and apply the type's encoder (plugin system)
+            value = plan.convert(value)
 
             # Handle None values with defaults
             if value is None:
-                if base_type in [
-                    "Integer32",
-                    "Integer",
-                    "Gauge32",
-                    "Counter32",
-                    "Counter64",
-                    "TimeTicks",
-                    "Unsigned32",
-                ]:
-                    value = 0
-                elif base_type in ["OctetString", "DisplayString"]:
-                    value = ""
-                elif base_type == "ObjectIdentifier":
-                    value = "0.0"
-                else:
+                value = plan.default_value
+                if value is None:
                     self.logger.warning(
-                        f"Skipping {name}: no value and no default for type '{base_type}'"
+                        f"Skipping {name}: no value and no default for type '{snmp_type_name}'"
                     )
                     continue
 
             # Get SNMP type class
             try:
-                pysnmp_type = self._get_pysnmp_type(snmp_type_name)
+                pysnmp_type = plan.pysnmp_type
                 if pysnmp_type is None:
                     raise ImportError(f"Could not resolve type '{snmp_type_name}'")
 
@@ -330,16 +505,12 @@ class MibRegistrar:
                 )
 
                 # Set max access based on schema access field
-                access_map = {
-                    "read-only": "readonly",
-                    "read-write": "readwrite",
-                    "read-create": "readcreate",
-                    "not-accessible": "noaccess",
-                    "accessible-for-notify": "notify",
-                }
-                max_access = access_map.get(access or "read-only", "readonly")
+                max_access = plan.max_access
                 scalar_inst.setMaxAccess(max_access)
-                is_writable = max_access in ("readwrite", "readcreate")
+                is_writable = plan.is_writable
+                scalar_inst.type_plan = plan
+                # Served from the pre-encoded var-bind cache (sysUpTime is computed per read)
+                scalar_inst.immutable = not is_writable and name != "sysUpTime"
 
                 # Special handling for sysUpTime: make it dynamic
                 if name == "sysUpTime":
@@ -480,21 +651,21 @@ class MibRegistrar:
                                 _format_value(getattr(inst, "syntax", None)),
                             )
 
-                            # Note: Persistence is handled by the agent's set_scalar_value() method
-                            # which saves to mib_state.json. Direct SNMP SET operations via
-                            # pysnmp's writeCommit are not automatically persisted.
+                            # The agent persists the whole SET PDU once it has been
+                            # committed (SNMPAgent._capture_network_sets).
                         except Exception:
                             pass
 
                     # Bind wrapper as method on the instance
                     scalar_inst.writeCommit = types.MethodType(_write_commit_wrapper, scalar_inst)
-                    # Also override writeTest to accept any value
+                    # Also override writeTest to validate against the type plan
                     def _write_test_wrapper(
                         self: Any,
                         varBind: Any,
                         _dotted: str = dotted,
                         _friendly: str = friendly,
                         _is_writable: bool = is_writable,
+                        _plan: TypePlan = plan,
                         _logger: logging.Logger = registrar_logger,
                         **_context: Any,
                     ) -> None:
@@ -506,6 +677,7 @@ class MibRegistrar:
                             )
                             raise ValueError("notWritable")
                         _logger.debug(f"writeTest called for {varBind}")
+                        MibRegistrar._check_write(_plan, varBind, _friendly, _logger, _context)
                         return None
                     scalar_inst.writeTest = types.MethodType(_write_test_wrapper, scalar_inst)
                 except Exception:
@@ -540,58 +712,6 @@ class MibRegistrar:
 
         return export_symbols
 
-    def _expand_index_value_to_oid_components(self, value: Any, index_type: str) -> tuple[int, ...]:
-        """Expand an index value into OID components based on its type.
-        
-        For complex types like IpAddress, this expands them into multiple integers.
-        For simple integer types, returns a single-element tuple.
-        
-        Args:
-            value: The index value (could be int, string, etc.)
-            index_type: The SNMP type of the index (e.g., "IpAddress", "Integer32")
-            
-        Returns:
-            Tuple of integers representing the OID components
-        """
-        # Handle IpAddress type - convert "a.b.c.d" to (a, b, c, d)
-        if index_type == "IpAddress":
-            if isinstance(value, str):
-                try:
-                    parts = [int(x) for x in value.split(".")]
-                    if len(parts) == 4:
-                        return tuple(parts)
-                except (ValueError, AttributeError):
-                    pass
-            # Fallback: treat as 0.0.0.0
-            return (0, 0, 0, 0)
-        
-        # Handle OctetString and DisplayString - convert to length-prefixed or just octets
-        # For now, we'll use IMPLIED encoding (no length prefix) for string indexes
-        elif index_type in ("OctetString", "DisplayString", "PhysAddress"):
-            if isinstance(value, str):
-                return tuple(ord(c) for c in value)
-            elif isinstance(value, bytes):
-                return tuple(value)
-            elif isinstance(value, int):
-                return (value,)
-            return ()
-        
-        # Handle integer types - simple single value
-        elif index_type in ("Integer32", "Unsigned32", "Integer", "Gauge32", "Counter32", "TimeTicks"):
-            try:
-                return (int(value),)
-            except (ValueError, TypeError):
-                return (0,)
-        
-        # Default: try to convert to int
-        try:
-            return (int(value),)
-        except (ValueError, TypeError):
-            # Last resort: if it's a string, use ASCII values
-            if isinstance(value, str):
-                return tuple(ord(c) for c in value)
-            return (0,)
-
     def _build_table_symbols(
         self,
         mib: str,
@@ -608,19 +728,29 @@ class MibRegistrar:
         if not table_oid:
             raise ValueError(f"Table {table_name} has no OID")
 
-        # Find entry object (ends with "Entry")
+        # Find entry object (ends with "Entry"), from the table graph when it knows the table
         entry_name = None
         entry_info = None
         entry_oid = None
-
-        for obj_name, obj_info in mib_json.items():
-            if isinstance(obj_info, dict) and obj_name.endswith("Entry"):
-                obj_table_name = obj_name[:-5]  # Remove "Entry" suffix
-                if obj_table_name + "Table" == table_name:
-                    entry_name = obj_name
-                    entry_info = obj_info
-                    entry_oid = tuple(obj_info.get("oid", []))
-                    break
+        node = (
+            self.table_graph.tables.get(".".join(str(x) for x in table_oid))
+            if self.table_graph is not None
+            else None
+        )
+        if node is not None and isinstance(mib_json.get(node.entry_name), dict):
+            entry_name = node.entry_name
+            entry_info = mib_json[entry_name]
+            entry_oid = tuple(entry_info.get("oid", []))
+        else:
+            node = None
+            for obj_name, obj_info in mib_json.items():
+                if isinstance(obj_info, dict) and obj_name.endswith("Entry"):
+                    obj_table_name = obj_name[:-5]  # Remove "Entry" suffix
+                    if obj_table_name + "Table" == table_name:
+                        entry_name = obj_name
+                        entry_info = obj_info
+                        entry_oid = tuple(obj_info.get("oid", []))
+                        break
 
         if not entry_name or not entry_oid:
             raise ValueError(f"No entry found for table {table_name}")
@@ -637,6 +767,9 @@ class MibRegistrar:
         if not index_names:
             index_names = [entry_info.get("index")] if entry_info.get("index") else []
 
+        # Compile the index layout once for all rows of this table
+        index_codec = IndexCodec.for_entry(entry_info, mib_json, type_registry)
+
         # Create entry with index specs
         index_specs = tuple((0, mib, idx_name) for idx_name in index_names)
         entry_obj = self.MibTableRow(entry_oid).setIndexNames(*index_specs)
@@ -644,7 +777,11 @@ class MibRegistrar:
 
         # Find and create column objects
         columns_by_name = {}
-        for col_name, col_info in mib_json.items():
+        if node is not None and node.entry_oid == entry_oid:
+            candidate_columns = [(name, mib_json.get(name)) for name in node.columns]
+        else:
+            candidate_columns = list(mib_json.items())
+        for col_name, col_info in candidate_columns:
             if not isinstance(col_info, dict):
                 continue
 
@@ -660,58 +797,37 @@ class MibRegistrar:
             if not col_type_name:
                 continue
 
-            type_info = type_registry.get(col_type_name, {})
-            base_type_raw = type_info.get("base_type") or col_type_name
-
-            # Prefer explicit SNMP type names for table columns (same as scalars)
-            # Include TEXTUAL-CONVENTIONs that have type encoders registered
-            preferred_snmp_types = {
-                "Counter32",
-                "Counter64",
-                "Gauge32",
-                "Unsigned32",
-                "Integer32",
-                "TimeTicks",
-                "DisplayString",
-                "OctetString",
-                "DateAndTime",  # TEXTUAL-CONVENTION with type encoder
-            }
-            base_type = (
-                col_type_name
-                if col_type_name in preferred_snmp_types
-                else base_type_raw
+            # One plan per column: every cell of the column is built and validated from it
+            plan = self.type_plan(
+                col_type_name, col_info.get("access", "read-only"), type_registry, col_info.get("enums")
             )
 
             try:
-                pysnmp_type = self._get_pysnmp_type(base_type)
+                pysnmp_type = plan.pysnmp_type
                 if pysnmp_type is None:
                     continue
 
-                col_access_raw = col_info.get("access", "read-only")
-                access_map = {
-                    "read-only": "readonly",
-                    "read-write": "readwrite",
-                    "read-create": "readcreate",
-                    "not-accessible": "noaccess",
-                    "accessible-for-notify": "notify",
-                }
-                col_access = access_map.get(col_access_raw, col_access_raw)
                 col_obj = self.MibTableColumn(col_oid, pysnmp_type()).setMaxAccess(
-                    col_access
+                    plan.max_access
                 )
-                col_is_writable = col_access in ("readwrite", "readcreate")
                 symbols[col_name] = col_obj
-                # Store writable flag alongside oid and *declared* type so it's available when creating instances
-                # Use the declared column type name (col_type_name) for index handling (e.g., IpAddress)
-                columns_by_name[col_name] = (col_oid, col_type_name, col_is_writable)
+                columns_by_name[col_name] = (col_oid, plan)
             except Exception as e:
                 self.logger.warning(f"Error creating column {col_name}: {e}")
                 continue
 
-        # Create row instances
+        # Create row instances (deleted rows are kept aside, not exported)
         rows_data = table_info.get("rows", [])
         if not isinstance(rows_data, list):
             rows_data = []
+        table_oid_str = ".".join(str(x) for x in table_oid)
+        deleted_rows = (
+            self.deleted_instances.for_table(table_oid_str)
+            if self.deleted_instances is not None
+            else frozenset()
+        )
+        row_cells: Dict[str, Dict[str, Any]] = {}
+        self._table_rows[table_oid_str] = (mib, row_cells)
 
         if table_name == "sysORTable":
             self.logger.info(
@@ -726,24 +842,15 @@ class MibRegistrar:
                 continue
 
             # Build index tuple from the index column values in row_data
-            # For multi-field indexes or complex types like IpAddress, expand properly
-            index_components: list[int] = []
-            for i, idx_name in enumerate(index_names):
-                idx_value = row_data.get(idx_name, row_idx + 1 if i == 0 else 0)
-                
-                # Get the type of this index column
-                idx_type = "Integer32"  # default
-                if idx_name in columns_by_name:
-                    _, idx_type, _ = columns_by_name[idx_name]
-
-                # Log what we're expanding for diagnostics
-                self.logger.info(f"Expanding index: {idx_name} value={idx_value} type={idx_type}")
-                # Expand the value into OID components
-                components = self._expand_index_value_to_oid_components(idx_value, idx_type)
-                self.logger.info(f"Expanded components for {idx_name}: {components}")
-                index_components.extend(components)
-            
-            index_tuple = tuple(index_components)
+            # (IpAddress and string indexes expand to several sub-identifiers)
+            try:
+                index_tuple = index_codec.to_oid_suffix(row_data, index_codec.schema_row_defaults(row_idx))
+            except ValueError as e:
+                self.logger.warning("Skipping row %d of %s: %s", row_idx, table_name, e)
+                continue
+            index_str = ".".join(str(x) for x in index_tuple)
+            cells = row_cells.setdefault(index_str, {})
+            row_deleted = index_str in deleted_rows
 
             if table_name == "sysORTable":
                 self.logger.info(
@@ -759,7 +866,8 @@ class MibRegistrar:
             else:
                 row_values = row_data
 
-            for col_name, (col_oid, base_type, col_is_writable) in columns_by_name.items():
+            for col_name, (col_oid, plan) in columns_by_name.items():
+                col_is_writable = plan.is_writable
                 # Get value for this cell
                 if col_name in row_values:
                     value = row_values[col_name]
@@ -770,23 +878,18 @@ class MibRegistrar:
                 else:
                     continue
 
-                # Decode value if it's in encoded format
-                value = self._decode_value(value)
-
-                # Apply type converter if one is registered (plugin system)
-                value = encode_value(value, base_type)
-
                 try:
-                    pysnmp_type = self._get_pysnmp_type(base_type)
-                    if pysnmp_type is None:
-                        continue
-
+                    pysnmp_type = plan.pysnmp_type
                     inst = self.MibScalarInstance(
-                        col_oid, index_tuple, pysnmp_type(value)
+                        col_oid, index_tuple, pysnmp_type(plan.convert(value))
                     )
+                    inst.type_plan = plan
+                    inst.immutable = not col_is_writable
 
                     inst_name = f"{col_name}Inst_{'_'.join(map(str, index_tuple))}"
-                    symbols[inst_name] = inst
+                    cells[inst_name] = inst
+                    if not row_deleted:
+                        symbols[inst_name] = inst
 
                     try:
                         # Log instance OID for diagnostics
@@ -907,9 +1010,8 @@ class MibRegistrar:
                                     _format_value(getattr(inst_ref, "syntax", None)),
                                 )
 
-                                # Note: Persistence is handled by the agent's set_scalar_value() method
-                                # which saves to mib_state.json. Direct SNMP SET operations via
-                                # pysnmp's writeCommit are not automatically persisted.
+                                # The agent persists the whole SET PDU once it has been
+                                # committed (SNMPAgent._capture_network_sets).
                             except Exception:
                                 pass
 
@@ -921,6 +1023,7 @@ class MibRegistrar:
                             _dotted: str = dotted,
                             _friendly: str = friendly,
                             _col_is_writable: bool = col_is_writable,
+                            _plan: TypePlan = plan,
                             _logger: logging.Logger = registrar_logger,
                             **context: Any,
                         ) -> None:
@@ -932,6 +1035,7 @@ class MibRegistrar:
                                 )
                                 raise ValueError("notWritable")
                             _logger.debug(f"writeTest called for {varBind}")
+                            MibRegistrar._check_write(_plan, varBind, _friendly, _logger, context)
                             return None
 
                         inst.writeTest = types.MethodType(_write_test_wrapper, inst)
@@ -954,6 +1058,60 @@ class MibRegistrar:
 
         return symbols
 
+    def type_plan(
+        self,
+        type_name: str,
+        access: Optional[str],
+        type_registry: Dict[str, Any],
+        enums: Optional[Dict[str, int]] = None,
+    ) -> TypePlan:
+        """Compiled plan for a declared type, shared by every object using it."""
+        if type_registry is not self._type_plan_registry:
+            self._type_plans.clear()
+            self._type_plan_registry = type_registry
+        if not isinstance(enums, dict):
+            enums = None
+        key = (type_name, access, tuple(sorted(enums.items())) if enums else None)
+        plan = self._type_plans.get(key)
+        if plan is None:
+            plan = compile_type_plan(
+                type_name,
+                access,
+                type_registry,
+                self._get_pysnmp_type,
+                encode_value,
+                self._decode_value,
+                enums,
+                has_encoder=lambda name: get_type_encoder(name) is not None,
+            )
+            self._type_plans[key] = plan
+        return plan
+
+    @staticmethod
+    def _check_write(
+        plan: TypePlan,
+        var_bind: Any,
+        friendly: str,
+        logger: logging.Logger,
+        context: Dict[str, Any],
+    ) -> None:
+        """Raise the pysnmp error for a SET value the plan rejects."""
+        if not (isinstance(var_bind, tuple) and len(var_bind) == 2):
+            return
+        name, value = var_bind
+        status = plan.check(value)
+        if status is None:
+            return
+        from pysnmp.smi import error as smi_error
+
+        errors = {
+            "wrongType": smi_error.WrongTypeError,
+            "wrongLength": smi_error.WrongLengthError,
+            "wrongValue": smi_error.WrongValueError,
+        }
+        logger.info("Rejecting SET on %s: %s for %s", friendly, status, plan.type_name)
+        raise errors[status](name=name, idx=context.get("idx"))
+
     def _find_table_related_objects(self, mib_json: Dict[str, Any]) -> Set[str]:
         """Find all table-related object names."""
         table_related = set()
@@ -0,0 +1,158 @@
+"""
+Binary cache for parsed model JSON (schema.json, types.json).
+
+Schemas and the type registry are written as pretty-printed JSON, which is
+slow to parse once there are many MIBs. ``load_json`` keeps a pickled copy of
+each parsed file under ``data/model-cache``. Each entry starts with a small
+header - the source path, its (mtime_ns, size) and a digest of its bytes -
+followed by the payload. While the source's stat matches, the payload is
+loaded without even reading the source; if only the stat changed, the digest
+decides. A changed (or regenerated) source file simply misses and the entry
+is rewritten. The first time a process writes to a cache directory, entries
+whose source file no longer exists are evicted and the cache is capped at
+``MAX_ENTRIES``.
+
+The cache only ever holds what ``json.load`` produced from our own files, and
+is local to the working tree, so unpickling it is no more trusted than the
+JSON itself.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "model-cache"
+
+# Entries kept after eviction (least recently written are dropped first)
+MAX_ENTRIES = 512
+
+# Bump when the cached payload layout changes
+_FORMAT_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+_pruned_dirs: set[Path] = set()
+
+
+def content_digest(data: bytes) -> str:
+    """Digest identifying a source file's contents."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def cache_path_for(source: Union[str, Path], cache_dir: Optional[Path] = None) -> Path:
+    """Cache file used for ``source`` (one entry per source path)."""
+    resolved = Path(source).resolve()
+    path_key = hashlib.blake2b(str(resolved).encode("utf-8"), digest_size=8).hexdigest()
+    name = f"{resolved.parent.name}-{resolved.stem}-{path_key}.pickle"
+    return (cache_dir or DEFAULT_CACHE_DIR) / name
+
+
+def load_json(path: Union[str, Path], cache_dir: Optional[Path] = None) -> Any:
+    """``json.load`` for model files, served from the binary cache when fresh.
+
+    Raises the same errors as reading and parsing the file directly
+    (``OSError``, ``json.JSONDecodeError``); cache problems are never fatal.
+    """
+    source = Path(path)
+    st = source.stat()
+    stat_key = (st.st_mtime_ns, st.st_size)
+    cache_file = cache_path_for(source, cache_dir)
+
+    header, payload = _read_entry(cache_file, lambda h: h.stat_key == stat_key)
+    if payload is not None:
+        return payload
+
+    raw = source.read_bytes()
+    digest = content_digest(raw)
+    if header is not None and header.digest == digest:
+        # Touched but unchanged: keep the payload, refresh the stat key
+        _, payload = _read_entry(cache_file, lambda h: h.digest == digest)
+        if payload is not None:
+            _write_cache(cache_file, source, stat_key, digest, payload)
+            return payload
+
+    data = json.loads(raw)
+    _write_cache(cache_file, source, stat_key, digest, data)
+    return data
+
+
+def prune_cache(cache_dir: Optional[Path] = None, max_entries: int = MAX_ENTRIES) -> int:
+    """Evict entries whose source file is gone, then the oldest beyond ``max_entries``.
+
+    Returns the number of entries removed.
+    """
+    directory = cache_dir or DEFAULT_CACHE_DIR
+    try:
+        entries = sorted(directory.glob("*.pickle"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    except OSError:
+        return 0
+    removed = 0
+    kept = 0
+    for entry in entries:
+        header, _ = _read_entry(entry, lambda _h: False)
+        if header is None or not Path(header.source).exists() or kept >= max_entries:
+            try:
+                entry.unlink()
+                removed += 1
+            except OSError:
+                pass
+            continue
+        kept += 1
+    return removed
+
+
+class _Header(NamedTuple):
+    source: str
+    stat_key: tuple[int, int]
+    digest: str
+
+
+def _read_entry(
+    cache_file: Path, want_payload: Callable[[_Header], bool]
+) -> tuple[Optional[_Header], Any]:
+    """An entry's header, and its payload if ``want_payload(header)``."""
+    try:
+        with cache_file.open("rb") as f:
+            version, source, stat_key, digest = pickle.load(f)
+            if version != _FORMAT_VERSION:
+                return None, None
+            header = _Header(str(source), (int(stat_key[0]), int(stat_key[1])), str(digest))
+            if not want_payload(header):
+                return header, None
+            return header, pickle.load(f)
+    except FileNotFoundError:
+        return None, None
+    except Exception as e:
+        logger.debug("Ignoring unreadable model cache %s: %s", cache_file, e)
+        return None, None
+
+
+def _write_cache(
+    cache_file: Path, source: Path, stat_key: tuple[int, int], digest: str, data: Any
+) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                header = (_FORMAT_VERSION, str(source.resolve()), stat_key, digest)
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, cache_file)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except Exception as e:
+        logger.debug("Could not write model cache %s: %s", cache_file, e)
+        return
+    # Evict once per process and cache directory, on the first write
+    if cache_file.parent not in _pruned_dirs:
+        _pruned_dirs.add(cache_file.parent)
+        prune_cache(cache_file.parent)
@@ -0,0 +1,406 @@
+"""
+In-memory search index over the loaded MIB schemas.
+
+Indexes object and notification names, OIDs, descriptions and enum labels
+from every ``<schema_dir>/<MIB>/schema.json``. Words are kept in an
+inverted index (token -> documents) with a sorted vocabulary for prefix
+lookups and a trigram map for fuzzy matching, so a search touches the
+vocabulary rather than every object. The index is refreshed per MIB: only
+schemas whose file changed are re-indexed.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+from app.model_cache import load_json
+
+SEARCH_MODES = ("auto", "prefix", "substring", "fuzzy")
+
+# Weight of a token by the field it came from
+_NAME, _ENUM, _DESCRIPTION = 3.0, 2.0, 1.0
+_FIELD_NAMES = {_NAME: "name", _ENUM: "enum", _DESCRIPTION: "description"}
+# Multiplier by how the query term matched the token
+_EXACT, _PREFIX, _SUBSTRING = 1.0, 0.8, 0.6
+FUZZY_CUTOFF = 0.75
+
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_OID_QUERY_RE = re.compile(r"^\.?\d+(\.\d+)*\.?$")
+_MIN_DESCRIPTION_WORD = 3
+
+
+@lru_cache(maxsize=65536)
+def name_tokens(name: str) -> FrozenSet[str]:
+    """Lower-cased tokens for an identifier: the whole name plus its camelCase parts."""
+    tokens = {name.lower()}
+    for word in _WORD_RE.findall(name):
+        tokens.add(word.lower())
+        tokens.update(part.lower() for part in _CAMEL_RE.findall(word))
+    return frozenset(t for t in tokens if t)
+
+
+@lru_cache(maxsize=4096)
+def _description_tokens(description: str) -> FrozenSet[str]:
+    return frozenset(w.lower() for w in _WORD_RE.findall(description) if len(w) >= _MIN_DESCRIPTION_WORD)
+
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    oid: Tuple[int, ...]
+    oid_str: str
+    name: str
+    mib: str
+    kind: str  # "object" or "notification"
+    type: str
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    entry: SearchEntry
+    score: float
+    matched: str  # "name", "oid", "enum" or "description"
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry = self.entry
+        return {
+            "oid": entry.oid_str,
+            "path": list(entry.oid),
+            "name": entry.name,
+            "mib": entry.mib,
+            "kind": entry.kind,
+            "type": entry.type,
+            "matched": self.matched,
+            "score": round(self.score, 3),
+        }
+
+
+class OidSearchIndex:
+    """Inverted index over schema names, OIDs, descriptions and enum labels."""
+
+    def __init__(self, refresh_interval: float = 2.0) -> None:
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._entries: Dict[int, SearchEntry] = {}
+        self._doc_tokens: Dict[int, Dict[str, float]] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._by_mib: Dict[str, List[int]] = {}
+        self._fingerprints: Dict[str, Tuple[int, int]] = {}
+        self._next_id = 0
+        # Derived lookup structures, rebuilt lazily after an update
+        self._vocab: List[str] = []
+        self._trigram_map: Optional[Dict[str, Set[str]]] = None
+        self._oid_keys: List[str] = []
+        self._oid_docs: Dict[str, List[int]] = {}
+        self._dirty = False
+        self._schema_dir: Optional[str] = None
+        self._refreshed_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def mibs(self) -> List[str]:
+        return sorted(self._by_mib)
+
+    # Building
+
+    def update_mib(self, mib: str, schema: Mapping[str, Any]) -> int:
+        """(Re)index one MIB's schema. Returns the number of entries indexed."""
+        with self._lock:
+            self._drop_mib(mib)
+            doc_ids: List[int] = []
+            objects = schema.get("objects", schema) if isinstance(schema, Mapping) else {}
+            traps = schema.get("traps", {}) if isinstance(schema, Mapping) else {}
+            for kind, section in (("object", objects), ("notification", traps)):
+                if not isinstance(section, Mapping):
+                    continue
+                for name, data in section.items():
+                    doc_id = self._add(mib, kind, str(name), data)
+                    if doc_id is not None:
+                        doc_ids.append(doc_id)
+            self._by_mib[mib] = doc_ids
+            self._dirty = True
+            return len(doc_ids)
+
+    def remove_mib(self, mib: str) -> None:
+        with self._lock:
+            self._drop_mib(mib)
+            self._fingerprints.pop(mib, None)
+            self._dirty = True
+
+    def update_all(self, schemas: Mapping[str, Mapping[str, Any]]) -> None:
+        """Index exactly ``schemas``, dropping MIBs that are no longer present."""
+        with self._lock:
+            for mib in set(self._by_mib) - set(schemas):
+                self.remove_mib(mib)
+            for mib, schema in schemas.items():
+                self.update_mib(mib, schema)
+
+    def refresh_from_dir(self, schema_dir: str, force: bool = False) -> int:
+        """Re-index MIBs whose ``schema.json`` under ``schema_dir`` changed.
+
+        Checks file mtimes at most every ``refresh_interval`` seconds unless
+        ``force``; switching to another directory re-indexes from scratch.
+        Returns the number of MIBs (re)indexed.
+        """
+        schema_dir = os.path.abspath(schema_dir)
+        with self._lock:
+            now = time.monotonic()
+            if schema_dir != self._schema_dir:
+                for mib in list(self._by_mib):
+                    self.remove_mib(mib)
+                self._schema_dir = schema_dir
+            elif not force and self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+                return 0
+            self._refreshed_at = now
+
+            seen: Set[str] = set()
+            reindexed = 0
+            if os.path.isdir(schema_dir):
+                for mib in os.listdir(schema_dir):
+                    schema_path = Path(schema_dir) / mib / "schema.json"
+                    try:
+                        st = schema_path.stat()
+                    except OSError:
+                        continue
+                    seen.add(mib)
+                    fingerprint = (st.st_mtime_ns, st.st_size)
+                    if self._fingerprints.get(mib) == fingerprint and mib in self._by_mib:
+                        continue
+                    try:
+                        schema = load_json(schema_path)
+                    except Exception:
+                        continue
+                    if not isinstance(schema, Mapping) or not schema:
+                        continue
+                    self.update_mib(mib, schema)
+                    self._fingerprints[mib] = fingerprint
+                    reindexed += 1
+            for mib in set(self._fingerprints) - seen:
+                self.remove_mib(mib)
+            return reindexed
+
+    def _add(self, mib: str, kind: str, name: str, data: Any) -> Optional[int]:
+        if not isinstance(data, dict):
+            return None
+        oid_value = data.get("oid")
+        try:
+            oid = tuple(int(x) for x in oid_value) if oid_value else ()
+        except (TypeError, ValueError):
+            return None
+        if not oid:
+            return None
+
+        doc_id = self._next_id
+        self._next_id += 1
+        self._entries[doc_id] = SearchEntry(
+            oid=oid,
+            oid_str=".".join(str(x) for x in oid),
+            name=name,
+            mib=mib,
+            kind=kind,
+            type=str(data.get("type", "") or ""),
+        )
+
+        # Lower-weight fields first so each word keeps its strongest field
+        tokens: Dict[str, float] = {}
+        description = data.get("description")
+        if isinstance(description, str) and description:
+            tokens.update(dict.fromkeys(_description_tokens(description), _DESCRIPTION))
+        enums = data.get("enums")
+        if isinstance(enums, dict):
+            for label in enums:
+                tokens.update(dict.fromkeys(name_tokens(str(label)), _ENUM))
+        tokens.update(dict.fromkeys(name_tokens(name), _NAME))
+
+        self._doc_tokens[doc_id] = tokens
+        for token, weight in tokens.items():
+            self._postings.setdefault(token, {})[doc_id] = weight
+        return doc_id
+
+    def _drop_mib(self, mib: str) -> None:
+        for doc_id in self._by_mib.pop(mib, []):
+            self._entries.pop(doc_id, None)
+            for token in self._doc_tokens.pop(doc_id, {}):
+                docs = self._postings.get(token)
+                if docs is not None:
+                    docs.pop(doc_id, None)
+                    if not docs:
+                        del self._postings[token]
+
+    def _ensure_lookups(self) -> None:
+        if not self._dirty:
+            return
+        self._vocab = sorted(self._postings)
+        # Only needed for fuzzy queries; built on first use
+        self._trigram_map = None
+        oid_docs: Dict[str, List[int]] = {}
+        for doc_id, entry in self._entries.items():
+            oid_docs.setdefault(entry.oid_str, []).append(doc_id)
+        self._oid_docs = oid_docs
+        self._oid_keys = sorted(oid_docs)
+        self._dirty = False
+
+    # Querying
+
+    def search(
+        self,
+        query: str,
+        mode: str = "auto",
+        limit: int = 50,
+        mib: Optional[str] = None,
+    ) -> List[SearchHit]:
+        """Ranked hits for ``query``.
+
+        A dotted-decimal query matches OIDs (the OID and its subtree for
+        ``prefix``/``auto``, any OID containing it for ``substring``). Other
+        queries are split into words that must all match a token by
+        ``prefix``, ``substring`` or ``fuzzy`` comparison; ``auto`` tries
+        them in that order until something matches.
+
+        Raises:
+            ValueError: If ``mode`` is not one of ``SEARCH_MODES``
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}', expected one of {', '.join(SEARCH_MODES)}")
+        query = query.strip()
+        if not query:
+            return []
+
+        with self._lock:
+            self._ensure_lookups()
+            if _OID_QUERY_RE.match(query):
+                scores, matched = self._search_oid(query.strip("."), mode)
+            else:
+                modes = ("prefix", "substring", "fuzzy") if mode == "auto" else (mode,)
+                scores, matched = {}, {}
+                for term_mode in modes:
+                    scores, matched = self._search_terms(query, term_mode)
+                    if scores:
+                        break
+            entries = self._entries
+            ranked = [
+                (-score, len(entries[doc_id].oid), entries[doc_id].oid, entries[doc_id].mib, doc_id)
+                for doc_id, score in scores.items()
+                if mib is None or entries[doc_id].mib == mib
+            ]
+            # Only the top ``limit`` need ordering
+            top = heapq.nsmallest(limit, ranked) if 0 < limit < len(ranked) else sorted(ranked)
+            return [SearchHit(entries[key[-1]], -key[0], matched[key[-1]]) for key in top]
+
+    def _search_oid(self, oid_query: str, mode: str) -> Tuple[Dict[int, float], Dict[int, str]]:
+        scores: Dict[int, float] = {}
+        if mode == "substring":
+            keys = [k for k in self._oid_keys if oid_query in k]
+        else:
+            # Keys sharing a string prefix are contiguous in sorted order
+            start = bisect.bisect_left(self._oid_keys, oid_query)
+            keys = []
+            for key in self._oid_keys[start:]:
+                if not key.startswith(oid_query):
+                    break
+                if key == oid_query or key[len(oid_query)] == ".":
+                    keys.append(key)
+        depth = oid_query.count(".") + 1
+        for key in keys:
+            for doc_id in self._oid_docs[key]:
+                # The OID itself first, then its subtree from the top down
+                scores[doc_id] = 10.0 if key == oid_query else 5.0 / (1 + key.count(".") + 1 - depth)
+        return scores, {doc_id: "oid" for doc_id in scores}
+
+    def _search_terms(self, query: str, mode: str) -> Tuple[Dict[int, float], Dict[int, str]]:
+        terms = [t.lower() for t in _WORD_RE.findall(query)]
+        if not terms:
+            return {}, {}
+        whole = query.lower()
+
+        total: Optional[Dict[int, float]] = None
+        best_field: Dict[int, float] = {}
+        for term in terms:
+            term_scores: Dict[int, float] = {}
+            for token, factor in self._matching_tokens(term, mode):
+                for doc_id, weight in self._postings.get(token, {}).items():
+                    score = weight * factor
+                    if score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = score
+                    if weight > best_field.get(doc_id, 0.0):
+                        best_field[doc_id] = weight
+            if total is None:
+                total = term_scores
+            else:
+                # Every word has to match
+                total = {d: s + term_scores[d] for d, s in total.items() if d in term_scores}
+            if not total:
+                return {}, {}
+
+        assert total is not None
+        for doc_id in total:
+            name = self._entries[doc_id].name.lower()
+            if name == whole:
+                total[doc_id] += 10.0
+            elif name.startswith(whole):
+                total[doc_id] += 5.0
+        return total, {doc_id: _FIELD_NAMES[best_field[doc_id]] for doc_id in total}
+
+    def _matching_tokens(self, term: str, mode: str) -> List[Tuple[str, float]]:
+        vocab = self._vocab
+        if mode == "prefix":
+            start = bisect.bisect_left(vocab, term)
+            matches = []
+            for token in vocab[start:]:
+                if not token.startswith(term):
+                    break
+                matches.append((token, _EXACT if token == term else _PREFIX))
+            return matches
+        if mode == "substring":
+            return [
+                (token, _EXACT if token == term else _PREFIX if token.startswith(term) else _SUBSTRING)
+                for token in vocab
+                if term in token
+            ]
+
+        # Fuzzy: candidates share at least a third of the term's trigrams
+        trigram_map = self._trigram_map
+        if trigram_map is None:
+            trigram_map = {}
+            for token in vocab:
+                for gram in _trigrams(token):
+                    trigram_map.setdefault(gram, set()).add(token)
+            self._trigram_map = trigram_map
+        grams = _trigrams(term)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for token in trigram_map.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        needed = max(1, len(grams) // 3)
+        matches = []
+        for token, count in shared.items():
+            if count < needed:
+                continue
+            ratio = SequenceMatcher(None, term, token).ratio()
+            if ratio >= FUZZY_CUTOFF:
+                matches.append((token, _SUBSTRING * ratio))
+        return matches
+
+
+_search_index = OidSearchIndex()
+
+
+def get_search_index() -> OidSearchIndex:
+    """Get the global OidSearchIndex instance."""
+    return _search_index
@@ -2,36 +2,51 @@
 SNMPAgent: Main orchestrator for the SNMP agent (initial workflow).
 """
 
-from dataclasses import dataclass
 from typing import cast
 from app.app_logger import AppLogger
 from app.app_config import AppConfig
+from app.admission import AdmissionController, AdmissionMixin
+from app.bulk_responder import (
+    FastBulkMixin,
+    FastGetMixin,
+    FastNextMixin,
+    InstanceIndex,
+    compose_responder,
+)
 from app.compiler import MibCompiler
+from app.deleted_instances import DeletedInstances
+from app.fault_injection import FaultInjectionMixin, FaultInjector
+from app.index_codec import IndexCodec, IndexCodecCache, faux_index_str
+from app.mib_build_context import MibBuildContext
+from app.mib_dependency_resolver import MibDependencyResolver
 from app.mib_registrar import MibRegistrar
+from app.model_cache import load_json
+from app.state_queue import StateCommandQueue, StateSnapshot
+from app.table_graph import AugmentedTableChild, TableGraph
+from app.traffic_capture import TrafficCapture
+import copy
 import os
 import signal
 import sys
 from pathlib import Path
 import json
 import time
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
 from pysnmp import debug as pysnmp_debug
 from app.value_links import get_link_manager
 
 # Load type converter plugins
 import plugins.date_and_time  # noqa: F401 - registers the converter
 
-
-@dataclass
-class AugmentedTableChild:
-    table_oid: str
-    entry_name: str
-    indexes: tuple[str, ...]
-    inherited_columns: tuple[str, ...]
-    default_columns: dict[str, Any]
+# Per-module type records reused across startups (app_config "type_shard_dir")
+DEFAULT_TYPE_SHARD_DIR = Path("data") / "type-shards"
 
 
 class SNMPAgent:
+    # SNMPv1/v2c security name -> community string
+    COMMUNITIES = {"public-area": "public", "private-area": "private"}
+
     def __init__(
         self,
         host: str = "0.0.0.0",
@@ -64,16 +79,46 @@ class SNMPAgent:
         self.overrides: dict[str, object] = {}
         # Table instances: table_oid -> {index_str -> {column_values}}
         self.table_instances: dict[str, dict[str, Any]] = {}
-        # Deleted instances: list of instance OIDs marked for deletion
-        self.deleted_instances: list[str] = []
+        # Deleted schema rows: table_oid -> {index_str}
+        self.deleted_instances = DeletedInstances()
         # Map of initial values captured after registration: dotted OID -> JSON-serializable value
         self._initial_values: dict[str, object] = {}
         # Set of dotted OIDs that are writable (read-write)
         self._writable_oids: set[str] = set()
+        # One MibBuilder shared by type recording, schema generation and serving
+        self.build_context: Optional[MibBuildContext] = None
+        # Sorted instance index behind the GETNEXT/GETBULK fast path (if enabled)
+        self.instance_index: Optional[InstanceIndex] = None
+        # Latency/drop profiles (agent_config.yaml "fault_injection"), built with the responders
+        self.fault_injector: Optional[FaultInjector] = None
+        # Binary log of received requests and sent responses (see app.traffic_capture)
+        self.traffic_capture = TrafficCapture()
+        # Table relationships (entries, indexes, index_from links) for mib_jsons
+        self.table_graph = TableGraph()
         # Augmented table metadata (parent table oid -> child table metadata)
         self._augmented_parents: dict[str, list[AugmentedTableChild]] = {}
         # Default column values for tables (used when auto-creating augmented rows)
         self._table_defaults: dict[str, dict[str, Any]] = {}
+        # Single writer for state mutations; started once the agent is serving
+        self._state_queue = StateCommandQueue(
+            on_batch_applied=self._flush_state_batch,
+            logger=self.logger,
+        )
+        self._state_save_pending = False
+        # Per-source/per-community request limits (agent_config.yaml "admission")
+        self.admission = AdmissionController(
+            self.app_config.get("admission", {}) or {},
+            queue_depth=lambda: self._state_queue.stats["pending"],
+        )
+        # Schema rows to hide from / re-expose to SNMP at the end of the batch
+        self._pending_row_visibility: dict[tuple[str, str], bool] = {}
+        # Last published read-only view of the state, plus what changed since
+        self._state_snapshot: Optional[StateSnapshot] = None
+        self._state_changed = False
+        self._dirty_tables: set[str] = set()
+        self._dirty_rows: dict[str, set[str]] = {}
+        self._dirty_overrides: set[str] = set()
+        self._all_tables_dirty = False
 
         # Set up signal handlers for graceful shutdown
         self._setup_signal_handlers()
@@ -87,6 +132,12 @@ class SNMPAgent:
             self.logger.info(
                 f"Received signal {sig_name} ({signum}), terminating immediately..."
             )
+            # Apply queued state mutations and write out queued log records:
+            # os._exit skips the atexit hooks that would otherwise do it
+            state_queue = getattr(self, "_state_queue", None)
+            if state_queue is not None:
+                state_queue.stop()
+            AppLogger.shutdown()
             # Force immediate exit - don't wait for event loop
             os._exit(0)
 
@@ -104,6 +155,14 @@ class SNMPAgent:
         self.logger.info("Starting graceful shutdown...")
 
         try:
+            # Apply any queued state mutations before the process exits
+            state_queue = getattr(self, "_state_queue", None)
+            if state_queue is not None:
+                state_queue.stop()
+            capture = getattr(self, "traffic_capture", None)
+            if capture is not None:
+                capture.stop()
+
             if self.snmpEngine is not None:
                 self.logger.info("Closing SNMP transport dispatcher...")
                 # Close the dispatcher to stop accepting new requests
@@ -123,6 +182,9 @@ class SNMPAgent:
         except Exception as e:
             self.logger.error(f"Error during shutdown: {e}", exc_info=True)
         finally:
+            # A queue handler's flush() does not drain the listener, and
+            # os._exit skips the atexit hook that would stop it
+            AppLogger.shutdown()
             # Exit cleanly - use os._exit to ensure termination
             os._exit(0)
 
@@ -232,12 +294,17 @@ class SNMPAgent:
                 "Using preloaded model and existing types.json, skipping full MIB compilation"
             )
             # Load existing type registry
-            with types_json_path.open("r", encoding="utf-8") as f:
-                type_registry_data = json.load(f)
+            type_registry_data = load_json(types_json_path)
             type_registry = TypeRegistry(Path(""))  # dummy
             type_registry._registry = type_registry_data
         else:
-            type_registry = TypeRegistry(compiled_dir)
+            type_registry = TypeRegistry(
+                compiled_dir, modules=self._served_mib_modules(compiled_dir)
+            )
+            # Loads the served modules into the builder the engine will use
+            type_registry.build_context = self._mib_build_context(compiled_dir)
+            # Only modules whose compiled file changed are re-recorded
+            type_registry.shard_dir = Path(self.app_config.get("type_shard_dir") or DEFAULT_TYPE_SHARD_DIR)
             type_registry.build()
             type_registry.export_to_json(str(types_json_path))
             self.logger.info(
@@ -264,6 +331,7 @@ class SNMPAgent:
             from app.generator import BehaviourGenerator
 
             generator = BehaviourGenerator(str(json_dir))
+            generator.build_context = self._mib_build_context(compiled_dir)
             # Build a map of MIB name -> compiled Python path
             mib_to_py_path: dict[str, str] = {}
             for mib in mibs:
@@ -312,8 +380,7 @@ class SNMPAgent:
                 schema_path = mib_dir / "schema.json"
 
                 if schema_path.exists():
-                    with schema_path.open("r", encoding="utf-8") as jf:
-                        self.mib_jsons[mib] = json.load(jf)
+                    self.mib_jsons[mib] = load_json(schema_path)
                     self.logger.info(f"Loaded schema for {mib} from {schema_path}")
                 else:
                     self.logger.warning(f"Schema not found for {mib} at {schema_path}")
@@ -337,16 +404,25 @@ class SNMPAgent:
             self._setup_transport()
             self._setup_community()
             self._setup_responders()
+            self._setup_capture()
+            # Load unified state (scalars, tables, deletions) first so rows
+            # deleted earlier are never registered
+            try:
+                self._load_mib_state()
+            except Exception as e:
+                self.logger.error(f"Error loading MIB state: {e}", exc_info=True)
             self._register_mib_objects()
             # Capture initial scalar values (for comparison) and apply overrides
             try:
                 self._capture_initial_values()
-                self._load_mib_state()  # Load unified state (scalars, tables, deletions)
                 self._apply_overrides()
                 self._apply_table_instances()  # Apply loaded table instance values to MIB cells
             except Exception as e:
                 self.logger.error(f"Error applying overrides: {e}", exc_info=True)
             self._populate_sysor_table()  # Populate sysORTable with actual MIBs
+            # From here on REST handlers run concurrently: mutate via the writer thread
+            self._publish_state_snapshot()
+            self._state_queue.start()
             self.logger.info("SNMP Agent is now listening for SNMP requests.")
             # Block and serve SNMP requests using asyncio dispatcher
             try:
@@ -368,10 +444,11 @@ class SNMPAgent:
         from pysnmp.entity import engine
         from pysnmp.carrier.asyncio.dispatch import AsyncioDispatcher
         from pysnmp.entity.rfc3413 import context
-        from pysnmp.smi import builder as snmp_builder
 
         self.logger.info("Setting up SNMP engine...")
-        self.snmpEngine = engine.SnmpEngine()
+        # Reuse the engine whose builder the type registry and schemas were built from
+        build_context = self.build_context
+        self.snmpEngine = build_context.snmp_engine if build_context is not None else engine.SnmpEngine()
 
         # Register asyncio dispatcher
         dispatcher = AsyncioDispatcher()
@@ -381,15 +458,27 @@ class SNMPAgent:
         self.snmpContext = context.SnmpContext(self.snmpEngine)
         mib_instrum = self.snmpContext.get_mib_instrum()
         self.mib_builder = mib_instrum.get_mib_builder()
+        self._capture_network_sets(mib_instrum)
 
-        # Ensure compiled MIBs are discoverable and loaded into the builder
+        # Make compiled MIBs discoverable, but only load the served ones and their
+        # imports; anything else (e.g. a trap's MIB) is loaded on demand
         compiled_path = Path(compiled_dir)
-        self.mib_builder.add_mib_sources(snmp_builder.DirMibSource(str(compiled_path)))
-        compiled_modules = [p.stem for p in compiled_path.glob("*.py")]
+        if build_context is None or build_context.mib_builder is not self.mib_builder:
+            build_context = MibBuildContext(compiled_path, self.snmpEngine, self.mib_builder)
+            self.build_context = build_context
+        else:
+            build_context.add_source(compiled_path)
+        compiled_modules = self._served_mib_modules(compiled_path)
+        if compiled_modules is None:
+            compiled_modules = sorted(
+                p.stem for p in compiled_path.glob("*.py") if p.stem != "__init__"
+            )
         if compiled_modules:
-            self.mib_builder.load_modules(*compiled_modules)
+            executed = build_context.load(*compiled_modules)
             self.logger.info(
-                "Loaded compiled MIB modules: %s", ", ".join(sorted(compiled_modules))
+                "Loaded compiled MIB modules: %s (%d executed now, the rest already loaded)",
+                ", ".join(sorted(compiled_modules)),
+                len(executed),
             )
         else:
             self.logger.warning(
@@ -425,6 +514,25 @@ class SNMPAgent:
 
         self.logger.info("SNMP engine and MIB classes initialized")
 
+    def _mib_build_context(self, compiled_dir: Path) -> MibBuildContext:
+        """The shared MIB build context, created on first use."""
+        if self.build_context is None:
+            self.build_context = MibBuildContext(compiled_dir)
+        return self.build_context
+
+    def _served_mib_modules(self, compiled_dir: Path) -> Optional[list[str]]:
+        """Configured MIBs plus their transitive imports that exist as compiled modules.
+
+        Returns None (every compiled module) when no MIBs are configured.
+        """
+        configured = cast(list[str], self.app_config.get("mibs", []) or [])
+        served = list(dict.fromkeys([*configured, *getattr(self, "mib_jsons", {})]))
+        available = {p.stem for p in compiled_dir.glob("*.py") if p.stem != "__init__"}
+        if not served or not available:
+            return None
+        resolver = MibDependencyResolver(["data/mibs_reference", "data/mibs", str(compiled_dir)])
+        return [mib for mib in resolver.get_load_closure(served) if mib in available]
+
     def _setup_transport(self) -> None:
         try:
             from pysnmp.carrier.asyncio.dgram import udp
@@ -448,11 +556,9 @@ class SNMPAgent:
         if self.snmpEngine is None:
             raise RuntimeError("snmpEngine is not initialized.")
 
-        # Add read-only community "public"
-        config.add_v1_system(self.snmpEngine, "public-area", "public")
-
-        # Add read-write community "private"
-        config.add_v1_system(self.snmpEngine, "private-area", "private")
+        # Add read-only community "public" and read-write community "private"
+        for security_name, community in self.COMMUNITIES.items():
+            config.add_v1_system(self.snmpEngine, security_name, community)
 
         # Add context
         config.add_context(self.snmpEngine, "")
@@ -501,11 +607,68 @@ class SNMPAgent:
         if not hasattr(self, "snmpContext") or self.snmpContext is None:
             raise RuntimeError("snmpContext is not initialized.")
 
+        bases = {
+            "get": cmdrsp.GetCommandResponder,
+            "next": cmdrsp.NextCommandResponder,
+            "bulk": cmdrsp.BulkCommandResponder,
+            "set": cmdrsp.SetCommandResponder,
+        }
+        mixins: dict[str, list[type]] = {kind: [] for kind in bases}
+        admission = getattr(self, "admission", None)
+        if admission is not None and not admission.enabled:
+            admission = None
+        if admission is not None:
+            for kind in mixins:
+                mixins[kind].append(AdmissionMixin)
+        self.fault_injector = FaultInjector.from_config(
+            self.app_config.get("fault_injection", []) or [], self._mib_subtrees
+        )
+        injector = self.fault_injector if self.fault_injector.enabled else None
+        if injector is not None:
+            for kind in mixins:
+                mixins[kind].append(FaultInjectionMixin)
+        mib_builder = getattr(self, "mib_builder", None)
+        if self.app_config.get("bulk_fast_path", True) and mib_builder is not None:
+            # Reads served from a sorted instance index, falling back to pysnmp
+            self.instance_index = InstanceIndex(mib_builder, self.snmpContext.get_mib_instrum())
+            mixins["get"].append(FastGetMixin)
+            mixins["next"].append(FastNextMixin)
+            mixins["bulk"].append(FastBulkMixin)
+
         # Use the context created in _setup_snmpEngine
-        cmdrsp.GetCommandResponder(self.snmpEngine, self.snmpContext)
-        cmdrsp.NextCommandResponder(self.snmpEngine, self.snmpContext)
-        cmdrsp.BulkCommandResponder(self.snmpEngine, self.snmpContext)
-        cmdrsp.SetCommandResponder(self.snmpEngine, self.snmpContext)
+        for kind, base in bases.items():
+            responder = compose_responder(base, *mixins[kind])(self.snmpEngine, self.snmpContext)
+            if self.instance_index is not None:
+                responder.instance_index = self.instance_index
+            if injector is not None:
+                responder.fault_injector = injector
+            if admission is not None:
+                responder.admission = admission
+                responder.communities = self.COMMUNITIES
+                if kind == "bulk" and admission.max_varbinds is not None:
+                    responder.max_varbinds = admission.max_varbinds
+
+    def _setup_capture(self) -> None:
+        """Observe the engine for traffic capture; start one if ``capture_file`` is configured."""
+        if getattr(self.snmpEngine, "observer", None) is None:
+            return
+        self.traffic_capture.attach(self.snmpEngine)
+        capture_file = self.app_config.get("capture_file")
+        if capture_file:
+            self.traffic_capture.start(str(capture_file))
+
+    def _mib_subtrees(self, mib: str) -> list[tuple[int, ...]]:
+        """Smallest set of OID prefixes covering every object of a served MIB."""
+        oids = sorted(
+            tuple(info["oid"])
+            for info in self.mib_jsons.get(mib, {}).values()
+            if isinstance(info, dict) and isinstance(info.get("oid"), list) and info["oid"]
+        )
+        subtrees: list[tuple[int, ...]] = []
+        for oid in oids:
+            if not subtrees or oid[: len(subtrees[-1])] != subtrees[-1]:
+                subtrees.append(oid)
+        return subtrees
 
     def _register_mib_objects(self) -> None:
         """Register all MIB objects using the MibRegistrar."""
@@ -533,6 +696,8 @@ class SNMPAgent:
                 self.logger.error("Failed to create MibRegistrar", exc_info=True)
                 return
 
+        registrar.deleted_instances = self.deleted_instances
+        registrar.table_graph = self.table_graph
         registrar.register_all_mibs(self.mib_jsons)
 
     def _populate_sysor_table(self) -> None:
@@ -544,6 +709,146 @@ class SNMPAgent:
         # Use the MibRegistrar to populate sysORTable
         self.mib_registrar.populate_sysor_table(self.mib_jsons)
 
+    def reload_schemas(self, schema_dir: str = "agent-model", reset_state: bool = True) -> dict[str, Any]:
+        """Re-read the served MIBs' schema.json files and hot-swap them into the agent.
+
+        MIBs without a schema file in ``schema_dir`` keep their current model.
+        Configured MIBs that are not loaded yet are read too, so the summary
+        can report them as needing a restart. See ``reload_model`` for what
+        is swapped and the meaning of ``reset_state``.
+        """
+        configured = cast(list[str], self.app_config.get("mibs", []) or [])
+        new_jsons: Dict[str, Dict[str, Any]] = {}
+        for mib in dict.fromkeys([*self.mib_jsons, *configured]):
+            schema_path = Path(schema_dir) / mib / "schema.json"
+            if schema_path.exists():
+                new_jsons[mib] = load_json(schema_path)
+        return self.reload_model(new_jsons, reset_state=reset_state)
+
+    def reload_model(self, new_jsons: Dict[str, Dict[str, Any]], reset_state: bool = True) -> dict[str, Any]:
+        """Switch the running agent to new MIB schemas without restarting.
+
+        Only scalars and tables whose schema changed are unregistered and
+        rebuilt; the symbol swap and the ``mib_jsons`` replacement happen in a
+        single callback on the SNMP event loop, so no request sees a half
+        loaded model. With ``reset_state`` (the preset semantics) overrides,
+        table instances and deletions are cleared, and objects they touched
+        are rebuilt from the new schema as well; otherwise the state is
+        re-applied on top of the new model.
+
+        Only MIBs already loaded into the builder can be swapped; any others
+        in ``new_jsons`` are left out and listed under ``skipped_mibs``.
+
+        Returns:
+            Summary with per-MIB counts, the skipped MIBs and the elapsed time
+            in milliseconds
+        """
+        return cast(dict[str, Any], self._run_state_command(self._reload_model, new_jsons, reset_state))
+
+    def _reload_model(self, new_jsons: Dict[str, Dict[str, Any]], reset_state: bool) -> dict[str, Any]:
+        started = time.perf_counter()
+        registrar = getattr(self, "mib_registrar", None)
+        if self.mib_builder is None or registrar is None:
+            raise RuntimeError("MIB registrar not initialized")
+
+        # Only MIBs already loaded into the builder can be hot-swapped
+        merged = dict(self.mib_jsons)
+        merged.update({mib: data for mib, data in new_jsons.items() if mib in self.mib_jsons})
+        skipped = sorted(mib for mib in new_jsons if mib not in self.mib_jsons)
+        if skipped:
+            self.logger.warning(f"MIBs not loaded in the running agent, restart to serve them: {skipped}")
+        self._carry_generated_sysor_rows(merged)
+
+        force_oids: set[str] = set()
+        if reset_state:
+            force_oids.update(self.overrides)
+            force_oids.update(self.table_instances)
+            # Rebuild tables with deleted rows so the rows are served again
+            force_oids.update(self.deleted_instances.tables())
+            self.deleted_instances.clear()
+            self._pending_row_visibility.clear()
+
+        # The registrar looks tables up in the graph while planning
+        self._build_augmented_index_map(merged)
+        type_registry = registrar.load_type_registry()
+        plans = [
+            registrar.plan_mib_reload(mib, self.mib_jsons[mib], merged[mib], type_registry, force_oids)
+            for mib in self.mib_jsons
+        ]
+        plans = [plan for plan in plans if not plan.is_empty]
+
+        def _swap() -> None:
+            for plan in plans:
+                registrar.apply_mib_reload(plan)
+            self.mib_jsons = merged
+            codecs = getattr(self, "_index_codecs", None)
+            if codecs is not None:
+                codecs.clear()
+
+        self._call_in_snmp_loop(_swap)
+
+        self._writable_oids = set()
+        self._capture_initial_values()
+        if reset_state:
+            self._reset_state()
+        else:
+            self._apply_overrides()
+            self._apply_table_instances()
+
+        summary = {
+            "mibs": {
+                plan.mib: {
+                    "changed_objects": len(plan.changed_objects),
+                    "removed_symbols": len(plan.remove_symbols),
+                    "added_symbols": len(plan.add_symbols),
+                }
+                for plan in plans
+            },
+            "skipped_mibs": skipped,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        self.logger.info(f"Hot-reloaded MIB model: {summary}")
+        return summary
+
+    def _carry_generated_sysor_rows(self, new_jsons: Dict[str, Dict[str, Any]]) -> None:
+        """Keep the generated sysORTable rows; they follow the served MIBs, not the schema."""
+        old = self.mib_jsons.get("SNMPv2-MIB")
+        new = new_jsons.get("SNMPv2-MIB")
+        if not isinstance(old, dict) or not isinstance(new, dict) or old is new:
+            return
+        old_objects = old.get("objects", old)
+        new_objects = new.get("objects", new)
+        old_table = old_objects.get("sysORTable") if isinstance(old_objects, dict) else None
+        new_table = new_objects.get("sysORTable") if isinstance(new_objects, dict) else None
+        if isinstance(old_table, dict) and isinstance(new_table, dict) and "rows" in old_table:
+            new_table["rows"] = old_table["rows"]
+
+    def _call_in_snmp_loop(self, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` between SNMP requests on the dispatcher's event loop and wait for it."""
+        import asyncio
+        from concurrent.futures import Future
+
+        dispatcher = getattr(self.snmpEngine, "transport_dispatcher", None) if self.snmpEngine else None
+        loop = getattr(dispatcher, "loop", None)
+        if not isinstance(loop, asyncio.AbstractEventLoop) or not loop.is_running():
+            return fn()
+        try:
+            if asyncio.get_running_loop() is loop:
+                return fn()
+        except RuntimeError:
+            pass
+
+        future: "Future[Any]" = Future()
+
+        def _run() -> None:
+            try:
+                future.set_result(fn())
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        loop.call_soon_threadsafe(_run)
+        return future.result()
+
     # The following methods have been moved to MibRegistrar:
     # - _register_mib()
     # - _build_mib_symbols()
@@ -611,7 +916,11 @@ class SNMPAgent:
             
         Raises:
             ValueError: If the OID is not found or is not a scalar
+            TypePlanError: If the value is outside the object's type (a ValueError)
         """
+        self._run_state_command(self._set_scalar_value, oid, value)
+
+    def _set_scalar_value(self, oid: tuple[int, ...], value: Any) -> None:
         if self.mib_builder is None:
             raise RuntimeError("MIB builder not initialized")
             
@@ -622,6 +931,10 @@ class SNMPAgent:
         for module_name, symbols in self.mib_builder.mibSymbols.items():
             for symbol_name, symbol_obj in symbols.items():
                 if isinstance(symbol_obj, MibScalarInstance) and symbol_obj.name == oid:
+                    # Reject values outside the object's type (raises TypePlanError)
+                    plan = getattr(symbol_obj, "type_plan", None)
+                    if plan is not None:
+                        plan.validate(value)
                     # Update in-memory value - must use clone() to preserve pysnmp type
                     try:
                         new_syntax = symbol_obj.syntax.clone(value)
@@ -659,26 +972,63 @@ class SNMPAgent:
                     except Exception:
                         pass
 
-                    if initial is None or new_serial != initial:
-                        # Save override
-                        self.overrides[dotted] = new_serial
-                        try:
-                            self._save_mib_state()
-                        except Exception:
-                            self.logger.exception("Failed to save MIB state")
-                    else:
-                        # If we've reverted to initial, remove any existing override
-                        if dotted in self.overrides:
-                            self.overrides.pop(dotted, None)
-                            try:
-                                self._save_mib_state()
-                            except Exception:
-                                self.logger.exception("Failed to save MIB state")
-
+                    self._record_override(dotted, new_serial)
                     return
                     
         raise ValueError(f"Scalar OID {oid} not found")
 
+    def _record_override(self, dotted: str, new_serial: object) -> None:
+        """Keep an override for a changed instance, or drop it once back at its initial value."""
+        initial = self._initial_values.get(dotted)
+        if initial is None or new_serial != initial:
+            self.overrides[dotted] = new_serial
+        elif dotted in self.overrides:
+            self.overrides.pop(dotted, None)
+        else:
+            return
+        self._touch_state(override=dotted)
+        try:
+            self._request_state_save()
+        except Exception:
+            self.logger.exception("Failed to save MIB state")
+
+    def _capture_network_sets(self, mib_instrum: Any) -> None:
+        """Persist SET PDUs from SNMP managers once pysnmp has committed them.
+
+        Each PDU becomes one state command, so all of its var-binds are
+        applied and saved together, and a burst of SETs shares the writer's
+        batched flush instead of saving per request.
+        """
+        write_variables = mib_instrum.write_variables
+
+        def _write_variables(*var_binds: Any, **context: Any) -> Any:
+            result = write_variables(*var_binds, **context)
+            changes = [
+                (tuple(int(x) for x in name), self._serialize_value(value))
+                for name, value in var_binds
+            ]
+            if changes:
+                self._state_queue.submit(self._apply_network_set, changes)
+            return result
+
+        mib_instrum.write_variables = _write_variables
+
+    def _apply_network_set(self, changes: list[tuple[tuple[int, ...], object]]) -> None:
+        """Record the var-binds of one committed SET PDU in the agent state."""
+        for oid, value in changes:
+            try:
+                location = self.table_graph.locate_cell(oid)
+                if location is not None:
+                    table_oid, column, instance_str = location
+                    # Stores the value on dynamic rows and propagates linked columns
+                    self._update_table_cell_values(table_oid, instance_str, {column: value})
+                    if instance_str in self.table_instances.get(table_oid, {}):
+                        self._request_state_save()
+                        continue
+                self._record_override(".".join(str(x) for x in oid), value)
+            except Exception:
+                self.logger.exception(f"Failed to record SNMP SET of {oid}")
+
 
     def get_all_oids(self) -> dict[str, tuple[int, ...]]:
         """Get all registered OIDs with their names.
@@ -759,8 +1109,15 @@ class SNMPAgent:
         self._normalize_loaded_table_instances()
         self._fill_missing_table_defaults()
         
-        # Extract deleted instances list
-        self.deleted_instances = mib_state.get("deleted_instances", [])
+        # Extract deleted instances (per-table mapping, or the legacy flat list)
+        self.deleted_instances = DeletedInstances.from_state(
+            mib_state.get("deleted_instances", {}), self._schema_table_oids()
+        )
+        registrar = getattr(self, "mib_registrar", None)
+        if registrar is not None:
+            registrar.deleted_instances = self.deleted_instances
+        self._touch_state(all_tables=True)
+        self._migrate_legacy_instance_keys()
         self._filter_deleted_instances_against_schema()
 
         # Extract links (state only) and load into link manager
@@ -775,173 +1132,150 @@ class SNMPAgent:
             f"{len(self.deleted_instances)} deleted instances"
         )
 
+    def _migrate_legacy_instance_keys(self) -> None:
+        """Re-key table instances and deletions saved with raw string index values.
+
+        State written before index codecs joined the raw values ("eth0",
+        "5.eth0"); they are converted to the encoded form SNMP serves
+        ("101.116.104.48"). Keys that do not fit the table's index are kept
+        as they are.
+        """
+        migrated = 0
+
+        def _canonical(table_oid: str, index_str: str) -> str:
+            nonlocal migrated
+            codec = self.index_codec(table_oid)
+            if codec is None:
+                return index_str
+            try:
+                canonical = codec.from_legacy_instance_str(index_str)
+            except ValueError as e:
+                self.logger.warning(f"Keeping unrecognised instance key {table_oid}.{index_str}: {e}")
+                return index_str
+            if canonical != index_str:
+                migrated += 1
+            return canonical
+
+        for table_oid, instances in self.table_instances.items():
+            self.table_instances[table_oid] = {
+                _canonical(table_oid, index_str): data for index_str, data in instances.items()
+            }
+        for table_oid, index_str in list(self.deleted_instances.items()):
+            canonical = _canonical(table_oid, index_str)
+            if canonical != index_str:
+                self.deleted_instances.discard(table_oid, index_str)
+                self.deleted_instances.add(table_oid, canonical)
+
+        if migrated:
+            self.logger.info(f"Migrated {migrated} legacy table instance key(s) to encoded indexes")
+            self._save_mib_state()
+
     def _filter_deleted_instances_against_schema(self) -> None:
         """Drop deleted instances that are not present in schema files."""
         if not self.deleted_instances:
             return
 
-        schema_instance_oids, saw_table = self._collect_schema_instance_oids()
-        if not saw_table:
+        if not self._schema_table_oids():
             return
 
         before = len(self.deleted_instances)
-        self.deleted_instances = [
-            oid for oid in self.deleted_instances if oid in schema_instance_oids
-        ]
+        for table_oid in self.deleted_instances.tables():
+            self.deleted_instances.retain(table_oid, self._schema_instance_strs(table_oid))
         if len(self.deleted_instances) != before:
             self._save_mib_state()
             self.logger.info(
                 f"Filtered deleted instances against schema: {before} -> {len(self.deleted_instances)}"
             )
 
-    def _collect_schema_instance_oids(self) -> tuple[set[str], bool]:
-        """Collect all instance OIDs that are defined in schema table rows."""
-        instance_oids: set[str] = set()
-        if not self.mib_jsons:
-            return instance_oids, False
-
-        saw_table = False
-
+    def _schema_table_oids(self) -> set[str]:
+        """Dotted OIDs of every table defined in the loaded schemas."""
+        table_oids: set[str] = set()
         for schema in self.mib_jsons.values():
             objects = schema.get("objects", schema) if isinstance(schema, dict) else {}
             if not isinstance(objects, dict):
                 continue
-
             for obj_data in objects.values():
-                if not isinstance(obj_data, dict):
-                    continue
-                if obj_data.get("type") != "MibTable":
+                if not isinstance(obj_data, dict) or obj_data.get("type") != "MibTable":
                     continue
-
-                saw_table = True
-
                 table_oid_list = obj_data.get("oid", [])
-                if not isinstance(table_oid_list, list) or not table_oid_list:
-                    continue
-                table_oid = ".".join(str(x) for x in table_oid_list)
-
-                entry_oid_list = list(table_oid_list) + [1]
-                entry_obj = None
-                for other_data in objects.values():
-                    if not isinstance(other_data, dict):
-                        continue
-                    if other_data.get("type") == "MibTableRow" and other_data.get("oid") == entry_oid_list:
-                        entry_obj = other_data
-                        break
-
-                if not entry_obj:
-                    continue
-
-                index_columns = entry_obj.get("indexes", [])
-                if not isinstance(index_columns, list):
-                    index_columns = []
-
-                columns_meta: dict[str, Any] = {}
-                for col_name in index_columns:
-                    if col_name in objects:
-                        columns_meta[col_name] = objects[col_name]
-
-                rows = obj_data.get("rows", [])
-                if not isinstance(rows, list):
-                    continue
-
-                for row in rows:
+                if isinstance(table_oid_list, list) and table_oid_list:
+                    table_oids.add(".".join(str(x) for x in table_oid_list))
+        return table_oids
+
+    def _schema_instance_strs(self, table_oid: str) -> frozenset[str]:
+        """Instance strings of a table's schema rows, cached until the schemas change."""
+        cache: Optional[tuple[Any, dict[str, frozenset[str]]]] = getattr(
+            self, "_schema_instance_cache", None
+        )
+        if cache is None or cache[0] is not self.mib_jsons:
+            cache = (self.mib_jsons, {})
+            self._schema_instance_cache = cache
+        instances = cache[1].get(table_oid)
+        if instances is None:
+            codec = self.index_codec(table_oid)
+            found: set[str] = set()
+            if codec is not None:
+                for row_idx, row in enumerate(self._schema_table_rows(table_oid)):
                     if not isinstance(row, dict):
                         continue
-                    instance_str = self._build_instance_str_from_row(
-                        row, index_columns, columns_meta
-                    )
-                    if instance_str:
-                        instance_oids.add(f"{table_oid}.{instance_str}")
-
-        return instance_oids, saw_table
-
-    def _build_instance_str_from_row(
-        self,
-        row: dict[str, Any],
-        index_columns: list[str],
-        columns_meta: dict[str, Any],
-    ) -> str:
-        """Build a dotted instance string from a schema table row."""
-        if not index_columns:
-            return "1"
-        parts: list[str] = []
-        for col_name in index_columns:
-            raw_val = row.get(col_name)
-            col_type = str(columns_meta.get(col_name, {}).get("type", "")).lower()
-            if col_type == "ipaddress":
-                if isinstance(raw_val, (list, tuple)):
-                    parts.extend(str(v) for v in raw_val)
-                else:
-                    raw_str = str(raw_val) if raw_val is not None else ""
-                    if raw_str:
-                        parts.extend(p for p in raw_str.split(".") if p)
-                    else:
-                        parts.append("")
-            else:
-                parts.append(str(raw_val) if raw_val is not None else "")
-        return ".".join(p for p in parts if p != "")
+                    if not codec.columns:
+                        found.add("1")
+                        continue
+                    try:
+                        found.add(codec.to_instance_str(row, codec.schema_row_defaults(row_idx)))
+                    except ValueError:
+                        continue  # the registrar skips it too
+            instances = frozenset(found)
+            cache[1][table_oid] = instances
+        return instances
 
     def _instance_defined_in_schema(self, table_oid: str, index_values: dict[str, Any]) -> bool:
         """Return True if a table instance exists in schema rows."""
         if not self.mib_jsons:
             return False
 
+        codec = self.index_codec(table_oid)
+        if codec is None:
+            return False
+
+        instances = self._schema_instance_strs(table_oid)
+        if not codec.columns:
+            return bool(instances)
+        return self._build_index_str(index_values, table_oid) in instances
+
+    def _schema_table_rows(self, table_oid: str) -> list[Any]:
+        """Return the schema rows of the table with the given dotted OID."""
         for schema in self.mib_jsons.values():
             objects = schema.get("objects", schema) if isinstance(schema, dict) else {}
             if not isinstance(objects, dict):
                 continue
-
             for obj_data in objects.values():
-                if not isinstance(obj_data, dict):
-                    continue
-                if obj_data.get("type") != "MibTable":
+                if not isinstance(obj_data, dict) or obj_data.get("type") != "MibTable":
                     continue
-
                 table_oid_list = obj_data.get("oid", [])
-                if not isinstance(table_oid_list, list) or not table_oid_list:
-                    continue
-                if ".".join(str(x) for x in table_oid_list) != table_oid:
-                    continue
-
-                entry_oid_list = list(table_oid_list) + [1]
-                entry_obj = None
-                for other_data in objects.values():
-                    if not isinstance(other_data, dict):
-                        continue
-                    if other_data.get("type") == "MibTableRow" and other_data.get("oid") == entry_oid_list:
-                        entry_obj = other_data
-                        break
-
-                if not entry_obj:
-                    return False
-
-                index_columns = entry_obj.get("indexes", [])
-                if not isinstance(index_columns, list):
-                    index_columns = []
-
-                rows = obj_data.get("rows", [])
-                if not isinstance(rows, list):
-                    return False
-
-                if not index_columns:
-                    return any(isinstance(row, dict) for row in rows)
-
-                for row in rows:
-                    if not isinstance(row, dict):
-                        continue
-                    matches = True
-                    for col_name in index_columns:
-                        row_val = row.get(col_name)
-                        row_val_str = self._format_index_value(row_val)
-                        idx_val_str = self._format_index_value(index_values.get(col_name))
-                        if row_val_str != idx_val_str:
-                            matches = False
-                            break
-                    if matches:
-                        return True
-
-        return False
+                if isinstance(table_oid_list, list) and ".".join(str(x) for x in table_oid_list) == table_oid:
+                    rows = obj_data.get("rows", [])
+                    return rows if isinstance(rows, list) else []
+        return []
+
+    def index_codec(self, table_oid: str) -> Optional[IndexCodec]:
+        """Return the compiled index codec for a table, or None if it is not in the schemas."""
+        cache = getattr(self, "_index_codecs", None)
+        if cache is None:
+            cache = IndexCodecCache(self._load_index_type_registry())
+            self._index_codecs = cache
+        return cache.get(self._normalize_oid_str(table_oid), self.mib_jsons)
+
+    def _load_index_type_registry(self) -> dict[str, Any]:
+        types_json_path = Path("data") / "types.json"
+        if not types_json_path.exists():
+            return {}
+        try:
+            registry = load_json(types_json_path)
+            return registry if isinstance(registry, dict) else {}
+        except Exception as e:
+            self.logger.warning(f"Could not load type registry for index codecs: {e}")
+            return {}
 
     def _normalize_loaded_table_instances(self) -> None:
         """Normalize loaded table OIDs to canonical string form."""
@@ -958,61 +1292,27 @@ class SNMPAgent:
         if not self.mib_jsons or not self.table_instances:
             return
 
+        graph = self.table_graph if self.table_graph.tables else TableGraph.build(self.mib_jsons)
         updated = False
 
-        for schema in self.mib_jsons.values():
-            objects = schema.get("objects", schema) if isinstance(schema, dict) else {}
-            if not isinstance(objects, dict):
+        for table_oid, instances in self.table_instances.items():
+            node = graph.tables.get(table_oid)
+            default_row = graph.defaults.get(table_oid)
+            if node is None or not node.entry_name or not default_row:
                 continue
 
-            for obj_name, obj_data in objects.items():
-                if not isinstance(obj_data, dict) or obj_data.get("type") != "MibTable":
+            for instance_data in instances.values():
+                col_values = instance_data.get("column_values", {})
+                if not isinstance(col_values, dict):
                     continue
 
-                table_oid_list = obj_data.get("oid", [])
-                if not isinstance(table_oid_list, list) or not table_oid_list:
-                    continue
-
-                table_oid = ".".join(str(x) for x in table_oid_list)
-                if table_oid not in self.table_instances:
-                    continue
-
-                entry_oid_list = list(table_oid_list) + [1]
-                entry_obj = None
-                for other_data in objects.values():
-                    if not isinstance(other_data, dict):
-                        continue
-                    if other_data.get("type") == "MibTableRow" and other_data.get("oid") == entry_oid_list:
-                        entry_obj = other_data
-                        break
-
-                if not entry_obj:
-                    continue
-
-                index_columns = entry_obj.get("indexes", [])
-                if not isinstance(index_columns, list):
-                    index_columns = []
-
-                rows = obj_data.get("rows", [])
-                if not isinstance(rows, list) or not rows:
-                    continue
-
-                default_row = rows[0] if isinstance(rows[0], dict) else {}
-                if not default_row:
-                    continue
-
-                for instance_data in self.table_instances.get(table_oid, {}).values():
-                    col_values = instance_data.get("column_values", {})
-                    if not isinstance(col_values, dict):
+                for col_name, default_val in default_row.items():
+                    if col_name in node.indexes:
                         continue
-
-                    for col_name, default_val in default_row.items():
-                        if col_name in index_columns:
-                            continue
-                        current_val = col_values.get(col_name)
-                        if current_val is None or (isinstance(current_val, str) and current_val.strip().lower() == "unset"):
-                            col_values[col_name] = default_val
-                            updated = True
+                    current_val = col_values.get(col_name)
+                    if current_val is None or (isinstance(current_val, str) and current_val.strip().lower() == "unset"):
+                        col_values[col_name] = default_val
+                        updated = True
 
         if updated:
             self._save_mib_state()
@@ -1031,191 +1331,15 @@ class SNMPAgent:
             return ""
         return ".".join(str(part) for part in oid_list if part is not None)
 
-    def _parse_index_from_entry(self, entry: Any) -> tuple[str, str] | None:
-        """Normalize different formats of index_from metadata."""
-        if isinstance(entry, dict):
-            mib = entry.get("mib")
-            column = entry.get("column")
-            if isinstance(mib, str) and isinstance(column, str):
-                return mib, column
-            return None
-        if isinstance(entry, (list, tuple)) and len(entry) >= 2:
-            mib = entry[0]
-            column = entry[-1]
-            if isinstance(mib, str) and isinstance(column, str):
-                return mib, column
-        return None
-
-    def _find_entry_name_by_oid(self, objects: dict[str, Any], entry_oid: tuple[Any, ...]) -> Optional[str]:
-        """Look up a table entry name by its OID."""
-        for name, obj in objects.items():
-            if not isinstance(obj, dict):
-                continue
-            if obj.get("type") != "MibTableRow":
-                continue
-            oid = tuple(obj.get("oid", []))
-            if oid == entry_oid:
-                return name
-        return None
-
-    def _find_table_name_by_oid(self, objects: dict[str, Any], table_oid: tuple[Any, ...]) -> Optional[str]:
-        """Look up a table name by OID."""
-        for name, obj in objects.items():
-            if not isinstance(obj, dict):
-                continue
-            if obj.get("type") != "MibTable":
-                continue
-            oid = tuple(obj.get("oid", []))
-            if oid == table_oid:
-                return name
-        return None
-
-    def _find_parent_table_for_column(self, module_name: str, column_name: str) -> Optional[dict[str, str]]:
-        """Locate the parent table metadata for an inherited column reference."""
-        module_schema = self.mib_jsons.get(module_name)
-        if not module_schema:
-            return None
-        objects = module_schema.get("objects", module_schema) if isinstance(module_schema, dict) else {}
-        column_obj = objects.get(column_name)
-        if not isinstance(column_obj, dict):
-            return None
-        column_oid = column_obj.get("oid", [])
-        if not isinstance(column_oid, list) or len(column_oid) < 2:
-            return None
-
-        entry_oid = tuple(column_oid[:-1])
-        table_oid = tuple(entry_oid[:-1])
-        table_name = self._find_table_name_by_oid(objects, table_oid)
-        if not table_name:
-            return None
-        entry_name = self._find_entry_name_by_oid(objects, entry_oid)
-        return {
-            "table_oid": self._oid_list_to_str(list(table_oid)),
-            "table_name": table_name,
-            "entry_name": entry_name or "",
-        }
-
-    def _build_augmented_index_map(self) -> None:
-        """Build parent -> child mappings for tables that AUGMENT indexes."""
-        self._augmented_parents.clear()
-        seen_defaults: dict[str, dict[str, Any]] = {}
-        table_entries: dict[str, tuple[str, tuple[str, ...]]] = {}
-
-        for module_schema in self.mib_jsons.values():
-            objects = module_schema.get("objects", module_schema) if isinstance(module_schema, dict) else {}
-            if not isinstance(objects, dict):
-                continue
-
-            # Cache default column values for each table
-            for name, table_obj in objects.items():
-                if not isinstance(table_obj, dict):
-                    continue
-                if table_obj.get("type") != "MibTable":
-                    continue
-                table_oid = self._oid_list_to_str(table_obj.get("oid", []))
-                table_oid_tuple = tuple(table_obj.get("oid", []))
-                rows = table_obj.get("rows", [])
-                if isinstance(rows, list) and rows:
-                    first_row = rows[0]
-                    if isinstance(first_row, dict):
-                        seen_defaults[table_oid] = dict(first_row)
-
-                entry_name = f"{name}Entry"
-                entry_obj = objects.get(entry_name)
-                if not (isinstance(entry_obj, dict) and entry_obj.get("type") == "MibTableRow"):
-                    candidates: list[tuple[str, dict[str, Any]]] = []
-                    for cand_name, cand_obj in objects.items():
-                        if not isinstance(cand_obj, dict):
-                            continue
-                        if cand_obj.get("type") != "MibTableRow":
-                            continue
-                        cand_oid = cand_obj.get("oid", [])
-                        if (
-                            isinstance(cand_oid, list)
-                            and len(cand_oid) > len(table_oid_tuple)
-                            and tuple(cand_oid[: len(table_oid_tuple)]) == table_oid_tuple
-                        ):
-                            candidates.append((cand_name, cand_obj))
-                    if candidates:
-                        candidates.sort(key=lambda item: len(item[1].get("oid", [])))
-                        entry_name, entry_obj = candidates[0]
-
-                if isinstance(entry_obj, dict) and entry_obj.get("type") == "MibTableRow":
-                    indexes = entry_obj.get("indexes", [])
-                    if isinstance(indexes, list):
-                        table_entries[table_oid] = (
-                            entry_name,
-                            tuple(idx for idx in indexes if isinstance(idx, str)),
-                        )
-
-            for entry_name, entry_obj in objects.items():
-                if not isinstance(entry_obj, dict):
-                    continue
-                if entry_obj.get("type") != "MibTableRow":
-                    continue
-                index_from = entry_obj.get("index_from")
-                if not index_from:
-                    continue
-                parsed_inherited: list[str] = []
-                parent_oids: set[str] = set()
-                valid = True
-
-                for inherit in index_from:
-                    parsed = self._parse_index_from_entry(inherit)
-                    if parsed is None:
-                        valid = False
-                        break
-                    parent_mib, parent_column = parsed
-                    parent_info = self._find_parent_table_for_column(parent_mib, parent_column)
-                    if not parent_info:
-                        valid = False
-                        break
-                    parent_oids.add(parent_info["table_oid"])
-                    parsed_inherited.append(parent_column)
-
-                if not valid or len(parent_oids) != 1:
-                    continue
-
-                parent_oid = next(iter(parent_oids))
-                entry_oid = tuple(entry_obj.get("oid", []))
-                if len(entry_oid) < 1:
-                    continue
-                child_table_oid = self._oid_list_to_str(list(entry_oid[:-1]))
-                indexes = entry_obj.get("indexes", [])
-                if not isinstance(indexes, list):
-                    indexes = []
-
-                child_meta = AugmentedTableChild(
-                    table_oid=child_table_oid,
-                    entry_name=entry_name,
-                    indexes=tuple(indexes),
-                    inherited_columns=tuple(parsed_inherited),
-                    default_columns=dict(seen_defaults.get(child_table_oid, {})),
-                )
-                self._augmented_parents.setdefault(parent_oid, []).append(child_meta)
-
-        for table_oid, (entry_name, indexes_tuple) in table_entries.items():
-            if table_oid in self._augmented_parents:
-                continue
-            if len(indexes_tuple) != 1:
-                continue
-
-            defaults = dict(seen_defaults.get(table_oid, {}))
-            non_index_cols = [name for name in defaults.keys() if name not in indexes_tuple]
-            synthetic_children = 2 if non_index_cols else 1
-
-            for _ in range(synthetic_children):
-                self._augmented_parents.setdefault(table_oid, []).append(
-                    AugmentedTableChild(
-                        table_oid=table_oid,
-                        entry_name=entry_name,
-                        indexes=indexes_tuple,
-                        inherited_columns=indexes_tuple,
-                        default_columns={},
-                    )
-                )
-
-        self._table_defaults = seen_defaults
+    def _build_augmented_index_map(self, schemas: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Build the table relationship graph (parent -> AUGMENTS children) for the schemas."""
+        graph = TableGraph.build(self.mib_jsons if schemas is None else schemas)
+        self.table_graph = graph
+        self._augmented_parents = graph.children
+        self._table_defaults = graph.defaults
+        registrar = getattr(self, "mib_registrar", None)
+        if registrar is not None:
+            registrar.table_graph = graph
 
     def _propagate_augmented_tables(
         self,
@@ -1224,32 +1348,19 @@ class SNMPAgent:
         index_str: str,
         visited: set[str],
     ) -> None:
-        """Create matching rows for tables that AUGMENT the given table."""
-        children = self._augmented_parents.get(table_oid, [])
-        if not children:
-            return
-
-        for child in children:
+        """Create matching rows in every table that AUGMENTS the given table, in one pass."""
+        for child in self.table_graph.augmenting_tables(table_oid):
             if child.table_oid in visited:
                 continue
-            if not child.table_oid:
-                continue
-            if child.indexes != child.inherited_columns:
+            if index_str in self.table_instances.get(child.table_oid, {}):
                 continue
-            if child.table_oid in self.table_instances and index_str in self.table_instances[child.table_oid]:
-                continue
-
-            child_defaults = dict(child.default_columns) if child.default_columns else {}
-            next_visited = set(visited)
-            next_visited.add(child.table_oid)
-
             try:
-                self.add_table_instance(
+                self._add_table_instance(
                     child.table_oid,
                     dict(index_values),
-                    column_values=child_defaults,
-                    propagate_augments=True,
-                    _augment_path=next_visited,
+                    dict(child.default_columns),
+                    False,
+                    None,
                 )
                 self.logger.debug(
                     f"Auto-created augmented row {child.table_oid}.{index_str} from {table_oid}"
@@ -1267,33 +1378,14 @@ class SNMPAgent:
         index_str: str,
         visited: set[str],
     ) -> None:
-        """Delete matching rows for tables that AUGMENT the given table."""
-        children = self._augmented_parents.get(table_oid, [])
-        if not children:
-            return
-
-        for child in children:
+        """Delete matching rows in every table that AUGMENTS the given table, in one pass."""
+        for child in self.table_graph.augmenting_tables(table_oid):
             if child.table_oid in visited:
                 continue
-            if not child.table_oid:
+            if index_str not in self.table_instances.get(child.table_oid, {}):
                 continue
-            if child.indexes != child.inherited_columns:
-                continue
-            if child.table_oid not in self.table_instances:
-                continue
-            if index_str not in self.table_instances[child.table_oid]:
-                continue
-
-            next_visited = set(visited)
-            next_visited.add(child.table_oid)
-
             try:
-                self.delete_table_instance(
-                    child.table_oid,
-                    dict(index_values),
-                    propagate_augments=True,
-                    _augment_path=next_visited,
-                )
+                self._delete_table_instance(child.table_oid, dict(index_values), False, None)
                 self.logger.debug(
                     f"Auto-deleted augmented row {child.table_oid}.{index_str} from {table_oid}"
                 )
@@ -1303,21 +1395,6 @@ class SNMPAgent:
                     exc_info=True,
                 )
 
-
-
-
-
-
-
-
-    def _format_index_value(self, value: Any) -> str:
-        """Normalize index values to a dotted string for comparison."""
-        if isinstance(value, (list, tuple)):
-            return ".".join(str(v) for v in value)
-        if value is None:
-            return ""
-        return str(value)
-
     def _migrate_legacy_state_files(self) -> None:
         """Migrate legacy overrides.json and table_instances.json to unified format."""
         legacy_overrides = Path(__file__).resolve().parent.parent / "data" / "overrides.json"
@@ -1326,7 +1403,7 @@ class SNMPAgent:
         mib_state: dict[str, Any] = {
             "scalars": {},
             "tables": {},
-            "deleted_instances": []
+            "deleted_instances": {}
         }
         
         if legacy_overrides.exists():
@@ -1358,13 +1435,17 @@ class SNMPAgent:
         mib_state = {
             "scalars": self.overrides,
             "tables": self.table_instances,
-            "deleted_instances": self.deleted_instances,
+            "deleted_instances": self.deleted_instances.to_state(),
             "links": link_manager.export_state_links(),
         }
         
         try:
-            with open(path, "w") as f:
+            # Write a sibling file and rename it over the state, so a crash
+            # mid-save never leaves a truncated mib_state.json behind
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
                 json.dump(mib_state, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
             self.logger.debug(f"Saved MIB state to {path}")
         except Exception as e:
             self.logger.error(f"Failed to save MIB state to {path}: {e}", exc_info=True)
@@ -1435,12 +1516,43 @@ class SNMPAgent:
                         # Convert dict to string representation
                         value = str(value)
                 
+                # Schema rows keep their cell instances (and type plans) in the registrar
+                registrar = getattr(self, "mib_registrar", None)
+                cell = (
+                    registrar.cell_instance(table_oid, instance_str, column_name)
+                    if registrar is not None
+                    else None
+                )
+                plan = getattr(cell, "type_plan", None)
+                if plan is not None and (status := plan.check(value)) is not None:
+                    self.logger.warning(
+                        f"Not updating {column_name} in {table_oid}.{instance_str}: "
+                        f"{status} for {plan.type_name} value {value!r}"
+                    )
+                    continue
+
                 # Keep table_instances in sync for API reads
                 stored = False
                 if table_oid in self.table_instances and instance_str in self.table_instances[table_oid]:
                     self.table_instances[table_oid][instance_str].setdefault("column_values", {})[column_name] = value
+                    self._touch_state(table_oid, instance=instance_str)
                     stored = True
 
+                if cell is not None:
+                    try:
+                        cell.syntax = cell.syntax.clone(value)
+                        updated = True
+                    except Exception as e:
+                        self.logger.error(
+                            f"Failed to update MibScalarInstance {cell.name} with value {value!r} "
+                            f"(type: {type(value).__name__}): {e}"
+                        )
+                        updated = False
+                    self._propagate_linked_cells(
+                        link_manager, table_oid, instance_str, column_name, value, updated or stored, _processed
+                    )
+                    continue
+
                 # Search through MIB symbols to find the column by name
                 column_oid = None
                 for module_name, symbols in self.mib_builder.mibSymbols.items():
@@ -1479,31 +1591,45 @@ class SNMPAgent:
                             break
                 
                 # If update succeeded or we stored in table_instances, propagate to linked columns
-                if updated or stored:
-                    linked_targets = link_manager.get_linked_targets(column_name, table_oid)
-                    if linked_targets:
-                        targets_display = [
-                            f"{t.table_oid}:{t.column_name}" for t in linked_targets
-                        ]
-                        self.logger.info(
-                            f"Propagating value from {column_name} to linked columns: {targets_display}"
-                        )
-                        for target in linked_targets:
-                            target_table = target.table_oid or table_oid
-                            linked_values = {target.column_name: value}
-                            self._update_table_cell_values(
-                                target_table,
-                                instance_str,
-                                linked_values,
-                                _processed,
-                            )
-                        
+                self._propagate_linked_cells(
+                    link_manager, table_oid, instance_str, column_name, value, updated or stored, _processed
+                )
+
             except Exception as e:
                 self.logger.error(f"Error updating column {column_name}: {e}", exc_info=True)
             finally:
                 # Always clear the update marker
                 link_manager.end_update(column_name, instance_key)
 
+    def _propagate_linked_cells(
+        self,
+        link_manager: Any,
+        table_oid: str,
+        instance_str: str,
+        column_name: str,
+        value: Any,
+        changed: bool,
+        processed: set[str],
+    ) -> None:
+        """Copy a changed cell value to the columns linked to it."""
+        if not changed:
+            return
+        linked_targets = link_manager.get_linked_targets(column_name, table_oid)
+        if not linked_targets:
+            return
+        targets_display = [f"{t.table_oid}:{t.column_name}" for t in linked_targets]
+        self.logger.info(
+            f"Propagating value from {column_name} to linked columns: {targets_display}"
+        )
+        for target in linked_targets:
+            target_table = target.table_oid or table_oid
+            self._update_table_cell_values(
+                target_table,
+                instance_str,
+                {target.column_name: value},
+                processed,
+            )
+
 
     def add_table_instance(
         self,
@@ -1525,6 +1651,26 @@ class SNMPAgent:
         Returns:
             The instance OID as a string
         """
+        return cast(
+            str,
+            self._run_state_command(
+                self._add_table_instance,
+                table_oid,
+                index_values,
+                column_values,
+                propagate_augments,
+                _augment_path,
+            ),
+        )
+
+    def _add_table_instance(
+        self,
+        table_oid: str,
+        index_values: dict[str, Any],
+        column_values: dict[str, Any] | None,
+        propagate_augments: bool,
+        _augment_path: set[str] | None,
+    ) -> str:
         if column_values is None:
             column_values = {}
         
@@ -1543,7 +1689,7 @@ class SNMPAgent:
         table_oid = self._normalize_oid_str(table_oid)
 
         # Create an instance key from index values
-        index_str = self._build_index_str(index_values)
+        index_str = self._build_index_str(index_values, table_oid)
         instance_oid = f"{table_oid}.{index_str}"
         
         # Store the instance
@@ -1554,15 +1700,18 @@ class SNMPAgent:
             "column_values": serialized_column_values
         }
         
-        # Remove from deleted list if it was previously deleted
-        if instance_oid in self.deleted_instances:
-            self.deleted_instances.remove(instance_oid)
+        # Un-delete a previously deleted schema row, serving it again before
+        # its cells are updated below
+        if self.deleted_instances.discard(table_oid, index_str):
+            self._pending_row_visibility[(table_oid, index_str)] = True
+            self._apply_row_visibility()
+        self._touch_state(table_oid, instance=index_str)
         
         # Update the actual MibScalarInstance objects for each column value
         self._update_table_cell_values(table_oid, index_str, serialized_column_values)
         
         # Persist to unified state file
-        self._save_mib_state()
+        self._request_state_save()
         
         self.logger.info(f"Added table instance: {instance_oid}")
 
@@ -1578,37 +1727,24 @@ class SNMPAgent:
                 )
         return instance_oid
 
-    def _build_index_str(self, index_values: dict[str, Any]) -> str:
-        """Build an instance index string, supporting implied/faux indices and multi-part indexes.
-        
-        Supports:
-        - __index__: "5" → "5"
-        - __index__, __index_2__: builds "5.10" from parts
-        - Regular index columns: joins all values with dots
+    def _build_index_str(self, index_values: dict[str, Any], table_oid: str | None = None) -> str:
+        """Build the canonical instance string for a row's index values.
+
+        When the table is known and all of its index columns are given, the
+        compiled index codec encodes them (IpAddress and string indexes expand
+        to several sub-identifiers). Otherwise implied/faux indices are used:
+        ``__index__``/``__index_N__`` parts, legacy ``__instance__``, or the
+        values joined in order.
         """
         if not index_values:
             return "1"
-        
-        # Handle multi-part __index__ values (__index__, __index_2__, __index_3__, etc.)
-        index_parts = []
-        i = 1
-        while True:
-            key = "__index__" if i == 1 else f"__index_{i}__"
-            if key in index_values:
-                index_parts.append(str(index_values[key]))
-                i += 1
-            else:
-                break
-        
-        if index_parts:
-            return ".".join(index_parts)
-        
-        # Legacy single __instance__ support
-        if "__instance__" in index_values:
-            return str(index_values["__instance__"])
-        
-        # Regular index columns
-        return ".".join(str(v) for v in index_values.values())
+
+        if table_oid is not None:
+            codec = self.index_codec(table_oid)
+            if codec is not None and codec.covers(index_values):
+                return codec.to_instance_str(index_values)
+
+        return faux_index_str(index_values)
 
     def delete_table_instance(
         self,
@@ -1618,8 +1754,26 @@ class SNMPAgent:
         _augment_path: set[str] | None = None,
     ) -> bool:
         """Mark a table instance as deleted and optionally cascade to AUGMENTS children."""
+        return cast(
+            bool,
+            self._run_state_command(
+                self._delete_table_instance,
+                table_oid,
+                index_values,
+                propagate_augments,
+                _augment_path,
+            ),
+        )
+
+    def _delete_table_instance(
+        self,
+        table_oid: str,
+        index_values: dict[str, Any],
+        propagate_augments: bool,
+        _augment_path: set[str] | None,
+    ) -> bool:
         table_oid = self._normalize_oid_str(table_oid)
-        index_str = self._build_index_str(index_values)
+        index_str = self._build_index_str(index_values, table_oid)
         instance_oid = f"{table_oid}.{index_str}"
         
         # Remove from active dynamic instances if it exists
@@ -1629,12 +1783,15 @@ class SNMPAgent:
             # Cleanup empty table entry
             if not self.table_instances[table_oid]:
                 del self.table_instances[table_oid]
+            self._touch_state(table_oid, instance=index_str)
+            self._request_state_save()
         
         # Track deletion only when the instance exists in schema rows
         if self._instance_defined_in_schema(table_oid, index_values):
-            if instance_oid not in self.deleted_instances:
-                self.deleted_instances.append(instance_oid)
-                self._save_mib_state()
+            if self.deleted_instances.add(table_oid, index_str):
+                self._request_row_visibility(table_oid, index_str, served=False)
+                self._touch_state(table_oid, instance=index_str)
+                self._request_state_save()
                 self.logger.info(f"Deleted table instance: {instance_oid}")
         else:
             self.logger.info(
@@ -1665,14 +1822,177 @@ class SNMPAgent:
         Returns:
             True if instance was restored
         """
-        instance_oid = f"{table_oid}.{self._build_index_str(index_values)}"
-        
-        if instance_oid in self.deleted_instances:
-            # Re-add the instance
-            self.add_table_instance(table_oid, index_values, column_values or {})
-            return True
-        
-        return False
+        def _restore() -> bool:
+            normalized_oid = self._normalize_oid_str(table_oid)
+            index_str = self._build_index_str(index_values, normalized_oid)
+            if self.deleted_instances.contains(normalized_oid, index_str):
+                # Re-add the instance
+                self.add_table_instance(table_oid, index_values, column_values or {})
+                return True
+            return False
+
+        return cast(bool, self._run_state_command(_restore))
+
+    def reset_state(self) -> None:
+        """Clear scalar overrides, table instances and deletions, and persist the empty state."""
+        self._run_state_command(self._reset_state)
+
+    def _reset_state(self) -> None:
+        self.overrides = {}
+        self.table_instances = {}
+        for table_oid, index_str in self.deleted_instances.items():
+            self._pending_row_visibility[(table_oid, index_str)] = True
+        self.deleted_instances.clear()
+        self._apply_row_visibility()
+        self._touch_state(all_tables=True)
+        self._request_state_save()
+
+    def run_state_command(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn`` on the state writer thread and return its result.
+
+        Use this for any multi-step change to overrides, table instances,
+        deletions or state links made from outside the agent (e.g. REST
+        handlers), so it is serialized with every other mutation.
+        """
+        return self._run_state_command(fn, *args, **kwargs)
+
+    def _run_state_command(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        state_queue = getattr(self, "_state_queue", None)
+        if state_queue is None:
+            return fn(*args, **kwargs)
+        return state_queue.call(fn, *args, **kwargs)
+
+    def _request_state_save(self) -> None:
+        """Persist state now, or once at the end of the current writer batch."""
+        state_queue = getattr(self, "_state_queue", None)
+        if state_queue is not None and state_queue.in_writer_thread():
+            self._state_save_pending = True
+            return
+        self._save_mib_state()
+
+    def _request_row_visibility(self, table_oid: str, index_str: str, served: bool) -> None:
+        """Hide a schema row from SNMP (or serve it again) now, or at the end of the writer batch."""
+        self._pending_row_visibility[(table_oid, index_str)] = served
+        state_queue = getattr(self, "_state_queue", None)
+        if state_queue is not None and state_queue.in_writer_thread():
+            return
+        self._apply_row_visibility()
+
+    def _apply_row_visibility(self) -> None:
+        """Export or unexport the pending rows' cell instances in one event-loop call."""
+        pending, self._pending_row_visibility = self._pending_row_visibility, {}
+        registrar = getattr(self, "mib_registrar", None)
+        if not pending or registrar is None or getattr(self, "mib_builder", None) is None:
+            return
+
+        def _apply() -> None:
+            for (table_oid, index_str), served in pending.items():
+                registrar.set_table_row_served(table_oid, index_str, served)
+
+        self._call_in_snmp_loop(_apply)
+
+    def _touch_state(
+        self,
+        table_oid: str | None = None,
+        all_tables: bool = False,
+        instance: str | None = None,
+        override: str | None = None,
+    ) -> None:
+        """Record what changed since the last published snapshot.
+
+        ``instance`` narrows a table change to one row; ``all_tables`` (state
+        loaded or reset) makes the next snapshot a full copy.
+        """
+        if getattr(self, "_state_snapshot", None) is None:
+            return
+        self._state_changed = True
+        if all_tables:
+            self._all_tables_dirty = True
+        elif table_oid is not None and instance is not None:
+            self._dirty_rows.setdefault(table_oid, set()).add(instance)
+        elif table_oid is not None:
+            self._dirty_tables.add(table_oid)
+        if override is not None:
+            self._dirty_overrides.add(override)
+
+    def _flush_state_batch(self) -> None:
+        """Writer-thread hook: persist once per batch and publish a new snapshot."""
+        if self._pending_row_visibility:
+            self._apply_row_visibility()
+        if self._state_save_pending:
+            self._state_save_pending = False
+            self._save_mib_state()
+        self._publish_state_snapshot()
+
+    def _publish_state_snapshot(self) -> StateSnapshot:
+        """Build a new snapshot, copying only the rows and overrides that changed.
+
+        Unchanged tables, rows and override values are shared with the
+        previous snapshot (they are never mutated once published), so a batch
+        costs time in proportion to what it changed, not to the state size.
+        """
+        previous = cast(Optional[StateSnapshot], getattr(self, "_state_snapshot", None))
+        if previous is not None and not self._state_changed:
+            return previous
+
+        base = None if self._all_tables_dirty else previous
+        tables: dict[str, Any] = {}
+        for table_oid, instances in self.table_instances.items():
+            shared = base.table_instances.get(table_oid) if base is not None else None
+            if shared is None or table_oid in self._dirty_tables:
+                tables[table_oid] = MappingProxyType(copy.deepcopy(instances))
+            elif table_oid in self._dirty_rows:
+                rows = dict(shared)
+                for index_str in self._dirty_rows[table_oid]:
+                    if index_str in instances:
+                        rows[index_str] = copy.deepcopy(instances[index_str])
+                    else:
+                        rows.pop(index_str, None)
+                tables[table_oid] = MappingProxyType(rows)
+            else:
+                tables[table_oid] = shared
+
+        if base is None:
+            overrides: Mapping[str, object] = MappingProxyType(copy.deepcopy(self.overrides))
+        elif self._dirty_overrides:
+            changed = dict(base.overrides)
+            for dotted in self._dirty_overrides:
+                if dotted in self.overrides:
+                    changed[dotted] = copy.deepcopy(self.overrides[dotted])
+                else:
+                    changed.pop(dotted, None)
+            overrides = MappingProxyType(changed)
+        else:
+            overrides = base.overrides
+
+        snapshot = StateSnapshot(
+            version=(previous.version + 1) if previous is not None else 1,
+            overrides=overrides,
+            table_instances=MappingProxyType(tables),
+            deleted_instances=self.deleted_instances.frozen(
+                base.deleted_instances if base is not None else None,
+                self._dirty_tables | set(self._dirty_rows),
+            ),
+        )
+        self._state_snapshot = snapshot
+        self._state_changed = False
+        self._dirty_tables = set()
+        self._dirty_rows = {}
+        self._dirty_overrides = set()
+        self._all_tables_dirty = False
+        return snapshot
+
+    def state_snapshot(self) -> StateSnapshot:
+        """Return a read-only snapshot of overrides, table instances and deletions.
+
+        While the writer thread is running this is the snapshot published after
+        the last applied batch; it is safe to iterate from any thread.
+        """
+        state_queue = getattr(self, "_state_queue", None)
+        snapshot = cast(Optional[StateSnapshot], getattr(self, "_state_snapshot", None))
+        if state_queue is not None and state_queue.running and snapshot is not None:
+            return snapshot
+        return self._publish_state_snapshot()
 
     def _serialize_value(self, value: Any) -> object:
         # Convert pysnmp types and other non-JSON-friendly values into JSON-serializable forms
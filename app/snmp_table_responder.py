@@ -7,9 +7,11 @@ by returning data from the behavior JSON files, enabling full SNMP queryability
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import AbstractSet, Any, Dict, List, Optional, Tuple
 from pysnmp.smi import builder
 
+from app.deleted_instances import DeletedInstances
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,7 +24,10 @@ class SNMPTableResponder:
     """
 
     def __init__(
-        self, behavior_jsons: Dict[str, Dict[str, Any]], mib_builder: Optional[builder.MibBuilder]
+        self,
+        behavior_jsons: Dict[str, Dict[str, Any]],
+        mib_builder: Optional[builder.MibBuilder],
+        deleted_instances: Optional[DeletedInstances] = None,
     ) -> None:
         """
         Initialize the table responder.
@@ -30,9 +35,11 @@ class SNMPTableResponder:
         Args:
             behavior_jsons: Dict of MIB name -> behavior JSON structure
             mib_builder: Optional pysnmp MibBuilder instance for type resolution (can be None)
+            deleted_instances: Optional deleted rows (e.g. the agent's), which are not served
         """
         self.behavior_jsons = behavior_jsons
         self.mib_builder = mib_builder
+        self.deleted_instances = deleted_instances
         self.logger = logging.getLogger(__name__)
 
         # Build a map of table OIDs to table info for fast lookup
@@ -87,6 +94,12 @@ class SNMPTableResponder:
         matches.sort(key=lambda item: (len(item[0]), item[0]))
         return matches[0][1]
 
+    def _deleted_rows(self, table_oid: Tuple[int, ...]) -> AbstractSet[str]:
+        """Deleted instance strings of a table."""
+        if self.deleted_instances is None:
+            return frozenset()
+        return self.deleted_instances.for_table(".".join(str(x) for x in table_oid))
+
     def is_table_oid(self, oid: Tuple[int, ...]) -> bool:
         """Check if an OID is a table or within a table."""
         # Check if it's a direct table OID
@@ -180,6 +193,7 @@ class SNMPTableResponder:
                             ):
                                 columns[col_name] = col_oid
 
+                        deleted = self._deleted_rows(table_oid)
                         for row in rows:
                             if not isinstance(row, dict):
                                 continue
@@ -197,6 +211,8 @@ class SNMPTableResponder:
                                         instance_parts.extend(str(v) for v in str(idx_val).split("."))
                                 if not instance_parts:
                                     instance_parts = ["1"]
+                            if deleted and ".".join(instance_parts) in deleted:
+                                continue
                             if len(columns) == 1:
                                 if isinstance(entry_oid, tuple):
                                     try:
@@ -262,6 +278,8 @@ class SNMPTableResponder:
                 return None
             instance_parts = oid[len(entry_oid) :]
             instance_str = ".".join(str(x) for x in instance_parts) if instance_parts else "1"
+            if instance_str in self._deleted_rows(table_oid):
+                return None
             col_name = next(iter(columns))
             rows = table_data.get("rows", [])
             if not isinstance(rows, list):
@@ -321,6 +339,8 @@ class SNMPTableResponder:
         # Instance parts follow the column id
         instance_parts = oid[len(entry_oid) + 1 :]
         instance_str = ".".join(str(x) for x in instance_parts) if instance_parts else "1"
+        if instance_str in self._deleted_rows(table_oid):
+            return None
 
         # Find which column has this OID
         for col_name, col_info in columns.items():
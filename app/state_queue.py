@@ -0,0 +1,211 @@
+"""
+Single-writer command queue for agent state mutation.
+
+All changes to the agent's mutable state (scalar overrides, table instances,
+deleted instances, state-backed links) are funnelled through one writer
+thread owned by the agent. Commands are applied strictly in submission order
+and in batches: after each batch the agent persists state once and publishes
+a new immutable snapshot for readers, so REST handlers never walk dicts that
+another thread is mutating.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """Read-only, versioned view of the agent state.
+
+    Snapshots are never mutated after publication; a new snapshot (with a
+    higher version) replaces the previous one after every applied batch.
+    ``deleted_instances`` maps a table OID to its deleted instance strings.
+    """
+
+    version: int
+    overrides: Mapping[str, object] = field(default_factory=lambda: MappingProxyType({}))
+    table_instances: Mapping[str, Mapping[str, Any]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    deleted_instances: Mapping[str, frozenset[str]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+
+@dataclass
+class _StateCommand:
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    future: "Future[Any]"
+
+
+class StateCommandQueue:
+    """Apply state mutations on a single writer thread, in batches.
+
+    Callers submit callables; the writer drains up to ``max_batch`` pending
+    commands, runs them in order, then invokes ``on_batch_applied`` once
+    (persistence and snapshot publication) before resolving the callers'
+    futures. Until ``start()`` is called, and for commands submitted from the
+    writer thread itself, commands run inline so start-up code and nested
+    mutations (e.g. AUGMENTS propagation) keep working unchanged. Commands
+    that race ``stop()`` and land behind its sentinel fail with
+    ``RuntimeError`` instead of waiting forever.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        on_batch_applied: Optional[Callable[[], None]] = None,
+        logger: Optional[logging.Logger] = None,
+        max_batch: int = 256,
+        name: str = "state-writer",
+    ) -> None:
+        self._on_batch_applied = on_batch_applied
+        self._logger = logger or logging.getLogger(__name__)
+        self._max_batch = max(1, max_batch)
+        self._name = name
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        # Guards _accepting so no command is queued after the writer's final drain
+        self._lock = threading.Lock()
+        self._accepting = False
+        self._stats = {"commands": 0, "batches": 0, "largest_batch": 0, "errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    def in_writer_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self) -> None:
+        """Start the writer thread (no-op if already running)."""
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        with self._lock:
+            self._accepting = True
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Apply all pending commands, then stop the writer thread.
+
+        If the writer does not finish within ``timeout`` it is left running
+        (and ``running`` stays true) so a later ``stop()`` can wait again.
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(self._STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            self._logger.warning("State writer still busy after %.1fs; not stopped", timeout)
+            return
+        self._thread = None
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> "Future[Any]":
+        """Queue a mutation and return a future for its result.
+
+        The future resolves after the batch containing the command has been
+        applied and flushed.
+        """
+        future: "Future[Any]" = Future()
+        if not self.in_writer_thread():
+            with self._lock:
+                if self._accepting:
+                    self._queue.put(_StateCommand(fn, args, kwargs, future))
+                    return future
+        self._run_inline(future, fn, args, kwargs)
+        return future
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Submit a mutation and block until it has been applied."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    @staticmethod
+    def _run_inline(
+        future: "Future[Any]",
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch: list[_StateCommand] = []
+            if item is self._STOP:
+                stopping = True
+            else:
+                batch.append(item)
+            # Drain whatever else is already waiting so it shares one flush
+            while len(batch) < self._max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    continue
+                batch.append(item)
+            if batch:
+                self._apply_batch(batch)
+        self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        """Stop accepting commands and fail any that were queued behind the stop sentinel."""
+        with self._lock:
+            self._accepting = False
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, _StateCommand):
+                item.future.set_exception(RuntimeError("State writer stopped before applying command"))
+
+    def _apply_batch(self, batch: list[_StateCommand]) -> None:
+        outcomes: list[tuple[bool, Any]] = []
+        for command in batch:
+            try:
+                outcomes.append((True, command.fn(*command.args, **command.kwargs)))
+            except BaseException as exc:
+                self._stats["errors"] += 1
+                outcomes.append((False, exc))
+
+        if self._on_batch_applied is not None:
+            try:
+                self._on_batch_applied()
+            except Exception:
+                self._logger.exception("Failed to flush state batch")
+
+        self._stats["commands"] += len(batch)
+        self._stats["batches"] += 1
+        self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+        self._logger.debug("Applied state batch of %d command(s)", len(batch))
+
+        for command, (ok, value) in zip(batch, outcomes):
+            if ok:
+                command.future.set_result(value)
+            else:
+                command.future.set_exception(value)
@@ -0,0 +1,285 @@
+"""
+Table relationship graph for the loaded MIB schemas.
+
+Built once per model load: every table with its entry, index columns,
+column names and default row, plus the ``index_from`` (AUGMENTS-style)
+links from parent tables to the tables that inherit their index. The
+agent uses it to fan row additions and deletions out to augmenting tables,
+``/tree/bulk`` to list instances, and the registrar to find a table's
+entry and columns without rescanning the schema.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Mapping, Optional
+
+
+@dataclass
+class AugmentedTableChild:
+    table_oid: str
+    entry_name: str
+    indexes: tuple[str, ...]
+    inherited_columns: tuple[str, ...]
+    default_columns: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class TableNode:
+    """One table of the schemas; ``rows`` is the schema's own list (not copied)."""
+
+    table_oid: str
+    mib: str
+    table_name: str
+    entry_name: str
+    entry_oid: tuple[int, ...]
+    indexes: tuple[str, ...]
+    index_types: tuple[Optional[str], ...]
+    columns: tuple[str, ...]
+    has_index_from: bool = False
+    # Parent table named by the first ``index_from`` entry, if it resolves
+    index_source: Optional[str] = None
+    rows: list[Any] = field(default_factory=list, compare=False, repr=False)
+
+
+def parse_index_from_entry(entry: Any) -> Optional[tuple[str, str]]:
+    """Normalize the ``{"mib", "column"}`` and ``[mib, ..., column]`` index_from forms."""
+    if isinstance(entry, dict):
+        mib = entry.get("mib")
+        column = entry.get("column")
+        if isinstance(mib, str) and isinstance(column, str):
+            return mib, column
+        return None
+    if isinstance(entry, (list, tuple)) and len(entry) >= 2:
+        mib = entry[0]
+        column = entry[-1]
+        if isinstance(mib, str) and isinstance(column, str):
+            return mib, column
+    return None
+
+
+def _oid_str(oid: Any) -> str:
+    return ".".join(str(part) for part in oid if part is not None)
+
+
+class TableGraph:
+    """Tables and parent -> augmenting-child links for a set of MIB schemas."""
+
+    def __init__(self) -> None:
+        self.tables: dict[str, TableNode] = {}
+        # Parent table OID -> children inheriting its index
+        self.children: dict[str, list[AugmentedTableChild]] = {}
+        # Table OID -> first schema row (defaults for new rows)
+        self.defaults: dict[str, dict[str, Any]] = {}
+        # Column OID -> (table OID, column name)
+        self.column_oids: dict[tuple[int, ...], tuple[str, str]] = {}
+        self._fan_out: dict[str, tuple[AugmentedTableChild, ...]] = {}
+
+    @classmethod
+    def build(cls, mib_jsons: Mapping[str, Any]) -> "TableGraph":
+        graph = cls()
+        # (mib, table OID tuple) -> table OID, for resolving index_from columns
+        tables_by_mib: dict[tuple[str, tuple[int, ...]], str] = {}
+        entries: list[tuple[str, str, dict[str, Any], dict[str, Any]]] = []
+        single_index: list[TableNode] = []
+
+        for mib, schema in mib_jsons.items():
+            objects = schema.get("objects", schema) if isinstance(schema, dict) else {}
+            if not isinstance(objects, dict):
+                continue
+
+            row_objects: dict[tuple[int, ...], tuple[str, dict[str, Any]]] = {}
+            members: dict[tuple[int, ...], list[tuple[tuple[int, ...], str]]] = {}
+            tables: list[tuple[str, dict[str, Any]]] = []
+            for name, obj in objects.items():
+                if not isinstance(obj, dict):
+                    continue
+                oid = obj.get("oid")
+                if not isinstance(oid, list) or not oid:
+                    continue
+                oid_tuple = tuple(oid)
+                obj_type = obj.get("type")
+                if obj_type == "MibTable":
+                    tables.append((name, obj))
+                elif obj_type == "MibTableRow":
+                    row_objects[oid_tuple] = (name, obj)
+                    entries.append((mib, name, obj, objects))
+                members.setdefault(oid_tuple[:-1], []).append((oid_tuple, name))
+
+            for name, table_obj in tables:
+                table_tuple = tuple(table_obj["oid"])
+                table_oid = _oid_str(table_tuple)
+                rows = table_obj.get("rows", [])
+                rows = rows if isinstance(rows, list) else []
+                if rows and isinstance(rows[0], dict):
+                    graph.defaults[table_oid] = dict(rows[0])
+
+                entry_name, entry_obj = cls._find_entry(objects, name, table_tuple, row_objects)
+                indexes: tuple[str, ...] = ()
+                entry_oid: tuple[int, ...] = ()
+                columns: tuple[str, ...] = ()
+                if entry_obj is not None:
+                    raw_indexes = entry_obj.get("indexes", [])
+                    if isinstance(raw_indexes, list):
+                        indexes = tuple(idx for idx in raw_indexes if isinstance(idx, str))
+                    entry_oid = tuple(entry_obj["oid"])
+                    columns = tuple(col for _, col in sorted(members.get(entry_oid, [])))
+                    for column_oid, column in members.get(entry_oid, []):
+                        graph.column_oids[column_oid] = (table_oid, column)
+
+                node = TableNode(
+                    table_oid=table_oid,
+                    mib=mib,
+                    table_name=name,
+                    entry_name=entry_name,
+                    entry_oid=entry_oid,
+                    indexes=indexes,
+                    index_types=tuple(
+                        objects[idx].get("type") if isinstance(objects.get(idx), dict) else None
+                        for idx in indexes
+                    ),
+                    columns=columns,
+                    rows=rows,
+                )
+                graph.tables[table_oid] = node
+                tables_by_mib[(mib, table_tuple)] = table_oid
+                if entry_obj is not None and len(indexes) == 1:
+                    single_index.append(node)
+
+        for mib, entry_name, entry_obj, objects in entries:
+            index_from = entry_obj.get("index_from")
+            if not index_from or not isinstance(index_from, list):
+                continue
+            entry_oid = tuple(entry_obj["oid"])
+            child_oid = _oid_str(entry_oid[:-1])
+
+            inherited: list[str] = []
+            parents: list[Optional[str]] = []
+            for inherit in index_from:
+                parsed = parse_index_from_entry(inherit)
+                parent = None
+                if parsed is not None:
+                    parent = cls._column_table(mib_jsons, tables_by_mib, *parsed)
+                    inherited.append(parsed[1])
+                parents.append(parent)
+
+            child_node: Optional[TableNode] = graph.tables.get(child_oid)
+            if child_node is not None and child_node.entry_name == entry_name:
+                graph.tables[child_oid] = replace(child_node, has_index_from=True, index_source=parents[0])
+
+            if None in parents or len(set(parents)) != 1:
+                continue
+            raw_indexes = entry_obj.get("indexes", [])
+            graph.children.setdefault(str(parents[0]), []).append(
+                AugmentedTableChild(
+                    table_oid=child_oid,
+                    entry_name=entry_name,
+                    indexes=tuple(raw_indexes) if isinstance(raw_indexes, list) else (),
+                    inherited_columns=tuple(inherited),
+                    default_columns=dict(graph.defaults.get(child_oid, {})),
+                )
+            )
+
+        # Single-index tables nothing augments list themselves as children
+        # (one entry for the index, one more when the rows carry other columns)
+        for node in single_index:
+            if node.table_oid in graph.children:
+                continue
+            defaults = graph.defaults.get(node.table_oid, {})
+            count = 2 if any(name not in node.indexes for name in defaults) else 1
+            graph.children[node.table_oid] = [
+                AugmentedTableChild(
+                    table_oid=node.table_oid,
+                    entry_name=node.entry_name,
+                    indexes=node.indexes,
+                    inherited_columns=node.indexes,
+                    default_columns={},
+                )
+                for _ in range(count)
+            ]
+
+        return graph
+
+    def locate_cell(self, oid: tuple[int, ...]) -> Optional[tuple[str, str, str]]:
+        """(table OID, column name, instance string) of a cell OID, or None."""
+        for length in range(len(oid) - 1, 0, -1):
+            found = self.column_oids.get(oid[:length])
+            if found is not None:
+                return found[0], found[1], ".".join(str(x) for x in oid[length:])
+        return None
+
+    def augmenting_tables(self, table_oid: str) -> tuple[AugmentedTableChild, ...]:
+        """Every table that inherits ``table_oid``'s index, directly or transitively.
+
+        Breadth-first, each table once, excluding ``table_oid`` itself and
+        children whose index is not exactly the inherited one.
+        """
+        cached = self._fan_out.get(table_oid)
+        if cached is not None:
+            return cached
+        seen = {table_oid}
+        order: list[AugmentedTableChild] = []
+        frontier = [table_oid]
+        while frontier:
+            next_frontier: list[str] = []
+            for parent in frontier:
+                for child in self.children.get(parent, ()):
+                    if not child.table_oid or child.table_oid in seen:
+                        continue
+                    if child.indexes != child.inherited_columns:
+                        continue
+                    seen.add(child.table_oid)
+                    order.append(child)
+                    next_frontier.append(child.table_oid)
+            frontier = next_frontier
+        result = tuple(order)
+        self._fan_out[table_oid] = result
+        return result
+
+    def index_source(self, table_oid: str) -> Optional[TableNode]:
+        """The table whose rows supply ``table_oid``'s instances, if it has ``index_from``."""
+        node = self.tables.get(table_oid)
+        if node is None or node.index_source is None:
+            return None
+        return self.tables.get(node.index_source)
+
+    @staticmethod
+    def _find_entry(
+        objects: Mapping[str, Any],
+        table_name: str,
+        table_oid: tuple[int, ...],
+        row_objects: Mapping[tuple[int, ...], tuple[str, dict[str, Any]]],
+    ) -> tuple[str, Optional[dict[str, Any]]]:
+        named = objects.get(f"{table_name}Entry")
+        if isinstance(named, dict) and named.get("type") == "MibTableRow" and isinstance(named.get("oid"), list):
+            return f"{table_name}Entry", named
+        found = row_objects.get(table_oid + (1,))
+        if found is not None:
+            return found
+        candidates = [
+            (oid, item)
+            for oid, item in row_objects.items()
+            if len(oid) > len(table_oid) and oid[: len(table_oid)] == table_oid
+        ]
+        if not candidates:
+            return "", None
+        candidates.sort(key=lambda candidate: len(candidate[0]))
+        return candidates[0][1]
+
+    @staticmethod
+    def _column_table(
+        mib_jsons: Mapping[str, Any],
+        tables_by_mib: Mapping[tuple[str, tuple[int, ...]], str],
+        mib: str,
+        column: str,
+    ) -> Optional[str]:
+        schema = mib_jsons.get(mib)
+        objects = schema.get("objects", schema) if isinstance(schema, dict) else {}
+        column_obj = objects.get(column) if isinstance(objects, dict) else None
+        if not isinstance(column_obj, dict):
+            return None
+        column_oid = column_obj.get("oid", [])
+        if not isinstance(column_oid, list) or len(column_oid) < 2:
+            return None
+        return tables_by_mib.get((mib, tuple(column_oid[:-2])))
+
@@ -0,0 +1,170 @@
+"""
+Capture of the SNMP traffic the agent receives and answers.
+
+``TrafficCapture`` observes the agent's SnmpEngine and appends every
+incoming request and outgoing response, as the raw BER message with its
+peer address and arrival time, to a compact binary capture file. The raw
+message is kept rather than a re-encoding of the decoded request, so a
+capture replays byte-for-byte; ``decode_message`` turns a record back into
+its version, community, PDU type, request-id and var-binds.
+
+File layout: the ``MAGIC`` header, then one record per message::
+
+    kind (u8: 0 request, 1 response) | timestamp (f64) | port (u16)
+    | host length (u16) | message length (u32) | host | message
+
+all little-endian. ``app.cli_replay_capture`` replays a capture against a
+running agent.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple, Optional, Union
+
+from pyasn1.codec.ber import decoder
+from pysnmp.proto import api
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SNMPCAP\x01"
+REQUEST = 0
+RESPONSE = 1
+
+_RECORD = struct.Struct("<BdHHI")
+_REQUEST_EXECPOINT = "rfc3412.receiveMessage:request"
+_RESPONSE_EXECPOINT = "rfc3412.returnResponsePdu"
+
+
+class CaptureRecord(NamedTuple):
+    kind: int
+    timestamp: float
+    host: str
+    port: int
+    message: bytes
+
+
+class CaptureWriter:
+    """Appends records to a capture file (thread-safe)."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def write(self, kind: int, timestamp: float, host: str, port: int, message: bytes) -> None:
+        host_bytes = host.encode("utf-8")
+        with self._lock:
+            self._file.write(_RECORD.pack(kind, timestamp, port, len(host_bytes), len(message)))
+            self._file.write(host_bytes)
+            self._file.write(message)
+            self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def read_capture(path: Union[str, Path]) -> Iterator[CaptureRecord]:
+    """Records of a capture file, in the order they were written."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an SNMP capture file")
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return  # end of file (or a record cut short by a crash)
+            kind, timestamp, port, host_len, msg_len = _RECORD.unpack(header)
+            host = f.read(host_len).decode("utf-8")
+            message = f.read(msg_len)
+            if len(message) < msg_len:
+                return
+            yield CaptureRecord(kind, timestamp, host, port, message)
+
+
+def decode_message(message: bytes) -> Optional[dict[str, Any]]:
+    """Decoded SNMPv1/v2c message, or None if it cannot be decoded (e.g. SNMPv3)."""
+    try:
+        version = int(api.decodeMessageVersion(message))
+        p_mod = api.PROTOCOL_MODULES[version]
+        msg, _ = decoder.decode(message, asn1Spec=p_mod.Message())
+        pdu = p_mod.apiMessage.get_pdu(msg)
+        decoded: dict[str, Any] = {
+            "version": "1" if version == api.SNMP_VERSION_1 else "2c",
+            "community": bytes(p_mod.apiMessage.get_community(msg)).decode("latin1"),
+            "pdu_type": pdu.__class__.__name__,
+            "request_id": int(p_mod.apiPDU.get_request_id(pdu)),
+            "var_binds": [
+                (".".join(map(str, name)), value.prettyPrint())
+                for name, value in p_mod.apiPDU.get_varbinds(pdu)
+            ],
+        }
+    except Exception:
+        return None
+    if "error-status" in pdu:
+        decoded["error_status"] = int(p_mod.apiPDU.get_error_status(pdu))
+    if "max-repetitions" in pdu:
+        decoded["non_repeaters"] = int(pdu["non-repeaters"])
+        decoded["max_repetitions"] = int(pdu["max-repetitions"])
+    return decoded
+
+
+class TrafficCapture:
+    """Records the requests an SnmpEngine receives and the responses it sends."""
+
+    def __init__(self) -> None:
+        self._writer: Optional[CaptureWriter] = None
+        self._attached: set[int] = set()
+
+    @property
+    def active(self) -> bool:
+        return self._writer is not None
+
+    def attach(self, snmp_engine: Any) -> None:
+        """Observe an engine's message dispatcher (once per engine)."""
+        if id(snmp_engine) in self._attached:
+            return
+        snmp_engine.observer.register_observer(self._observe, _REQUEST_EXECPOINT, _RESPONSE_EXECPOINT)
+        self._attached.add(id(snmp_engine))
+
+    def start(self, path: Union[str, Path]) -> None:
+        """Start appending to ``path``, replacing any capture in progress."""
+        self.stop()
+        self._writer = CaptureWriter(path)
+        logger.info("Capturing SNMP traffic to %s", path)
+
+    def stop(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+            logger.info("Stopped capture to %s (%d records)", writer.path, writer.records)
+
+    def status(self) -> dict[str, Any]:
+        writer = self._writer
+        return {
+            "active": writer is not None,
+            "path": str(writer.path) if writer is not None else None,
+            "records": writer.records if writer is not None else 0,
+        }
+
+    def _observe(self, snmp_engine: Any, execpoint: str, variables: dict[str, Any], _cb_ctx: Any) -> None:
+        writer = self._writer
+        if writer is None or variables.get("deferred"):
+            return  # not capturing, or a delayed request being processed (already captured)
+        if execpoint == _REQUEST_EXECPOINT:
+            kind, message = REQUEST, variables.get("wholeMsg")
+        else:
+            kind, message = RESPONSE, variables.get("outgoingMessage")
+        address = variables.get("transportAddress") or ("", 0)
+        try:
+            writer.write(kind, time.time(), str(address[0]), int(address[1]), bytes(message or b""))
+        except ValueError:
+            pass  # closed by a concurrent stop()
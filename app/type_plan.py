@@ -0,0 +1,283 @@
+"""
+Compiled type plans for MIB objects.
+
+Every scalar and table cell of an object is built the same way: resolve the
+pysnmp syntax class for its declared type, decode the schema value, run the
+registered type encoder and wrap the result. A ``TypePlan`` does the type
+resolution once per (type, access, enums) and keeps the constraints a
+written value must satisfy, so registering a large table and validating a
+SET are both dictionary lookups and range checks.
+
+``TypePlan.check`` reports violations with the SNMP error-status names
+(``wrongType``, ``wrongLength``, ``wrongValue``); the registrar turns them
+into pysnmp errors for network SETs and ``TypePlanError`` is raised for
+REST writes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+# Declared type names used as-is rather than through the registry's base type
+PREFERRED_SNMP_TYPES = frozenset(
+    {
+        "Counter32",
+        "Counter64",
+        "Gauge32",
+        "Unsigned32",
+        "Integer32",
+        "TimeTicks",
+        "DisplayString",
+        "OctetString",
+        "DateAndTime",  # TEXTUAL-CONVENTION with type encoder
+    }
+)
+
+ACCESS_MAP = {
+    "read-only": "readonly",
+    "read-write": "readwrite",
+    "read-create": "readcreate",
+    "not-accessible": "noaccess",
+    "accessible-for-notify": "notify",
+}
+
+_INTEGER_DEFAULT_TYPES = {
+    "Integer32",
+    "Integer",
+    "Gauge32",
+    "Counter32",
+    "Counter64",
+    "TimeTicks",
+    "Unsigned32",
+}
+
+Ranges = tuple[tuple[int, int], ...]
+
+
+class TypePlanError(ValueError):
+    """A value rejected by a type plan; ``status`` is the SNMP error-status name."""
+
+    def __init__(self, status: str, message: str) -> None:
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+@dataclass(frozen=True)
+class TypePlan:
+    """How to build and validate values of one MIB object type."""
+
+    type_name: str
+    snmp_type: str
+    pysnmp_type: Any
+    max_access: str
+    encode_type: str
+    encode: Callable[[Any, str], Any]
+    decode: Callable[[Any], Any]
+    enums: Optional[frozenset[int]] = None
+    enum_names: Mapping[str, int] = field(default_factory=dict)
+    value_ranges: Ranges = ()
+    size_ranges: Ranges = ()
+
+    @property
+    def is_writable(self) -> bool:
+        return self.max_access in ("readwrite", "readcreate")
+
+    @property
+    def default_value(self) -> Any:
+        """Value used for objects without one, or None when the type has no default."""
+        if self.snmp_type in _INTEGER_DEFAULT_TYPES:
+            return 0
+        if self.snmp_type in ("OctetString", "DisplayString"):
+            return ""
+        if self.snmp_type == "ObjectIdentifier":
+            return "0.0"
+        return None
+
+    def convert(self, value: Any) -> Any:
+        """Decode a schema value and apply the registered type encoder."""
+        return self.encode(self.decode(value), self.encode_type)
+
+    def syntax(self, value: Any) -> Any:
+        """pysnmp syntax object for a schema value."""
+        return self.pysnmp_type(self.convert(value))
+
+    def check(self, value: Any) -> Optional[str]:
+        """Error-status name for a value this type does not accept, else None."""
+        if self.size_ranges:
+            length = _length(value)
+            if length is not None and not _in_ranges(length, self.size_ranges):
+                return "wrongLength"
+        if self.enums is not None or self.value_ranges:
+            number = _number(value, self.enum_names)
+            if number is None:
+                return "wrongType"
+            if self.enums is not None and number not in self.enums:
+                return "wrongValue"
+            if self.value_ranges and not _in_ranges(number, self.value_ranges):
+                return "wrongValue"
+        return None
+
+    def validate(self, value: Any) -> None:
+        """Raise ``TypePlanError`` unless ``check`` accepts the value."""
+        status = self.check(value)
+        if status is not None:
+            raise TypePlanError(status, f"{value!r} is not a valid {self.type_name}")
+
+
+def compile_type_plan(
+    type_name: str,
+    access: Optional[str],
+    type_registry: Mapping[str, Any],
+    resolve: Callable[[str], Any],
+    encode: Callable[[Any, str], Any],
+    decode: Callable[[Any], Any],
+    enums: Optional[Mapping[str, int]] = None,
+    has_encoder: Callable[[str], bool] = lambda _name: False,
+) -> TypePlan:
+    """Compile the plan for a declared type.
+
+    Args:
+        type_name: Declared type of the object (e.g. ``InterfaceIndex``)
+        access: MAX-ACCESS from the schema (``read-write`` etc.)
+        type_registry: Type registry (types.json) used for base types and constraints
+        resolve: Maps an SNMP type name to its pysnmp class (None if unknown)
+        encode: Type encoder entry point, ``encode(value, type_name)``
+        decode: Decoder for encoded schema values
+        enums: Object-level enumeration, overriding the registry's
+        has_encoder: Whether an encoder is registered for a type name
+    """
+    type_info = type_registry.get(type_name) or {}
+    base_type = type_info.get("base_type") or type_name
+    snmp_type = type_name if type_name in PREFERRED_SNMP_TYPES else base_type
+    access = access or "read-only"
+
+    enum_names = dict(enums) if enums else _registry_enums(type_info.get("enums"))
+    constraints = [c for c in type_info.get("constraints") or [] if isinstance(c, dict)]
+    allowed: Optional[frozenset[int]] = frozenset(enum_names.values()) if enum_names else None
+    if allowed is None:
+        singles = [
+            int(v)
+            for c in constraints
+            if c.get("type") == "SingleValueConstraint"
+            for v in c.get("values", [])
+        ]
+        allowed = frozenset(singles) if singles else None
+
+    value_ranges = _effective_ranges(
+        (c.get("min"), c.get("max")) for c in constraints if c.get("type") == "ValueRangeConstraint"
+    )
+    size_ranges = _size_ranges(type_info.get("size"))
+    if snmp_type == "IpAddress":
+        # Written as dotted quads; the pysnmp class enforces the four octets
+        size_ranges = ()
+    elif not size_ranges:
+        size_ranges = _effective_ranges(
+            (c.get("min"), c.get("max"))
+            for c in constraints
+            if c.get("type") == "ValueSizeConstraint"
+        )
+
+    return TypePlan(
+        type_name=type_name,
+        snmp_type=snmp_type,
+        pysnmp_type=resolve(snmp_type),
+        max_access=ACCESS_MAP.get(access, access),
+        encode_type=type_name if has_encoder(type_name) else snmp_type,
+        encode=encode,
+        decode=decode,
+        enums=allowed,
+        enum_names=enum_names,
+        value_ranges=value_ranges,
+        size_ranges=size_ranges,
+    )
+
+
+def _registry_enums(raw: Any) -> dict[str, int]:
+    if isinstance(raw, dict):
+        return {str(k): int(v) for k, v in raw.items()}
+    if isinstance(raw, list):
+        return {
+            str(item["name"]): int(item["value"])
+            for item in raw
+            if isinstance(item, dict) and "name" in item and "value" in item
+        }
+    return {}
+
+
+def _effective_ranges(bounds: Iterable[tuple[Any, Any]]) -> Ranges:
+    """Intersect nested range constraints; keep them as a union if they are disjoint.
+
+    A union such as (1..10 | 20..30) comes flattened alongside the ranges of
+    the types it refines. Ranges enclosing another range are those outer
+    constraints: they clip the union rather than join it.
+    """
+    ranges = sorted({(int(lo), int(hi)) for lo, hi in bounds if lo is not None and hi is not None})
+    if not ranges:
+        return ()
+    lo = max(r[0] for r in ranges)
+    hi = min(r[1] for r in ranges)
+    if lo <= hi:
+        return ((lo, hi),)
+    outer = [r for r in ranges if any(o != r and r[0] <= o[0] and o[1] <= r[1] for o in ranges)]
+    members = [r for r in ranges if r not in outer]
+    outer_lo = max((r[0] for r in outer), default=members[0][0])
+    outer_hi = min((r[1] for r in outer), default=max(m[1] for m in members))
+    return tuple(
+        (max(m_lo, outer_lo), min(m_hi, outer_hi))
+        for m_lo, m_hi in members
+        if max(m_lo, outer_lo) <= min(m_hi, outer_hi)
+    )
+
+
+def _size_ranges(size: Any) -> Ranges:
+    if not isinstance(size, dict):
+        return ()
+    kind = size.get("type")
+    if kind == "set":
+        return tuple((int(n), int(n)) for n in size.get("allowed", []))
+    if kind == "range" and size.get("min") is not None and size.get("max") is not None:
+        return ((int(size["min"]), int(size["max"])),)
+    if kind == "union":
+        return tuple(
+            (int(r["min"]), int(r["max"])) for r in size.get("ranges", []) if isinstance(r, dict)
+        )
+    return ()
+
+
+def _in_ranges(number: int, ranges: Ranges) -> bool:
+    return any(lo <= number <= hi for lo, hi in ranges)
+
+
+def _length(value: Any) -> Optional[int]:
+    if hasattr(value, "asOctets"):
+        try:
+            return len(value.asOctets())
+        except Exception:
+            return None
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return None
+
+
+def _number(value: Any, enum_names: Mapping[str, int]) -> Optional[int]:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        if text in enum_names:
+            return enum_names[text]
+        try:
+            return int(text)
+        except ValueError:
+            return None
+    if isinstance(value, (bytes, bytearray)) or hasattr(value, "asOctets"):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
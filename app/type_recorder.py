@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import argparse
+import copy
+import hashlib
 import inspect
 import json
+import os
 import re
 from pathlib import Path
 from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Mapping,
     Optional,
@@ -20,9 +24,10 @@ from typing import (
 )
 
 import pysnmp.entity.engine as _engine
+from pysnmp import __version__ as _pysnmp_version
 import pysnmp.proto.rfc1902 as _rfc1902
-import pysnmp.smi.builder as _builder
 
+from app.mib_build_context import MibBuildContext
 from app.types import JsonDict
 
 
@@ -50,6 +55,12 @@ _EXPECTED_SNMPV2_SMI_TYPES: set[str] = {
 }
 
 
+# Bump when the recording or shard layout changes so stored shards are re-recorded
+_SHARD_FORMAT = 1
+# Entry fields a later module may fill in when earlier ones left them unset
+_MERGE_FILL_FIELDS = ("base_type", "display_hint", "size", "enums", "constraints_repr", "defined_in")
+
+
 class HasGetSyntax(Protocol):
     def getSyntax(self) -> object: ...
 
@@ -76,8 +87,19 @@ class TypeRecorder:
         self,
         compiled_dir: Path,
         progress_callback: Optional[Callable[[str], None]] = None,
+        modules: Optional[Iterable[str]] = None,
+        build_context: Optional[MibBuildContext] = None,
+        shard_dir: Optional[Path] = None,
     ):
         self.compiled_dir = compiled_dir
+        # Modules to load (their imports are pulled in by pysnmp); None loads every compiled module
+        self.modules = list(modules) if modules is not None else None
+        # Shared builder to load into (and leave loaded for later pipeline steps)
+        self.build_context = build_context
+        # Directory of per-module type shards; None records every module in memory
+        self.shard_dir = shard_dir
+        # Modules whose types the last build() recorded rather than read from a shard
+        self.recorded_modules: List[str] = []
         self._registry: Optional[Dict[str, TypeEntry]] = None
         self._snmpv2_smi_types: Optional[set[str]] = None
         self._progress_callback = progress_callback
@@ -707,247 +729,346 @@ class TypeRecorder:
         return out
 
     def build(self) -> None:
-        types: Dict[str, TypeEntry] = self._seed_base_types()
+        """Record the types of every loaded module and merge them into the registry.
 
-        snmp_engine = cast(Any, _engine.SnmpEngine())
-        mib_builder = cast(Any, snmp_engine.get_mib_builder())
-        mib_builder.add_mib_sources(_builder.DirMibSource(str(self.compiled_dir)))
+        Each module's types (and the ``used_by`` links of its symbols) form a
+        shard keyed by a fingerprint of the compiled module. With a
+        ``shard_dir``, shards whose fingerprint is unchanged are read back
+        instead of re-recorded, so only new or recompiled modules are walked.
+        """
+        seed: Dict[str, TypeEntry] = self._seed_base_types()
 
-        for path in self.compiled_dir.glob("*.py"):
-            if path.name == "__init__.py":
-                continue
-            try:
-                mib_builder.load_modules(path.stem)
-            except Exception:
-                continue
+        build_context = self.build_context
+        if build_context is None:
+            build_context = MibBuildContext(self.compiled_dir, cast(Any, _engine.SnmpEngine()))
+        else:
+            build_context.add_source(self.compiled_dir)
+        mib_builder = cast(Any, build_context.mib_builder)
+
+        if self.modules is None:
+            module_names = [
+                path.stem for path in self.compiled_dir.glob("*.py") if path.name != "__init__.py"
+            ]
+        else:
+            module_names = self.modules
+
+        build_context.load_each(module_names)
 
         mib_symbols = cast(Mapping[str, Mapping[str, object]], mib_builder.mibSymbols)
 
+        self.recorded_modules = []
+        shards: List[Dict[str, TypeEntry]] = []
         for mib_name, symbols in mib_symbols.items():
             if self._progress_callback:
                 self._progress_callback(mib_name)
 
-            for sym_name, sym_obj in symbols.items():
-                # First, check if this is a TEXTUAL-CONVENTION class definition
-                is_tc_class = self._is_textual_convention_symbol(sym_obj)
-
-                if is_tc_class:
-                    # This is a TC class definition - extract type info from the class itself
-                    tc_class = cast(type, sym_obj)
-
-                    # Infer base type from the class MRO
-                    base_type_name: Optional[str] = None
-                    snmp_types = self.get_snmpv2_smi_types()
-                    for base in tc_class.__mro__[1:]:  # Skip the TC class itself
-                        if base.__name__ in snmp_types:
-                            base_type_name = base.__name__
-                            break
-
-                    # Try to get display hint and constraints from class attributes
-                    display_hint = getattr(tc_class, "displayHint", None)
-                    if display_hint and not isinstance(display_hint, str):
-                        display_hint = None
-
-                    # Get subtypeSpec from class if available
-                    subtype_spec = getattr(tc_class, "subtypeSpec", None)
-                    tc_size: Optional[JsonDict] = None
-                    tc_constraints: List[JsonDict] = []
-                    tc_constraints_repr: Optional[str] = None
-                    if subtype_spec is not None:
-                        subtype_repr = repr(subtype_spec)
-                        tc_size, tc_constraints = self.parse_constraints_from_repr(
-                            subtype_repr
-                        )
-                        # Set constraints_repr if there are actual constraints
-                        if tc_constraints or tc_size:
-                            tc_constraints_repr = subtype_repr
-
-                    if sym_name not in types:
-                        # TEXTUAL-CONVENTIONs are concrete types, not abstract
-                        types[sym_name] = {
-                            "base_type": base_type_name,
-                            "display_hint": display_hint,
-                            "size": tc_size,
-                            "constraints": tc_constraints,
-                            "constraints_repr": tc_constraints_repr,
-                            "enums": None,
-                            "used_by": [],
-                            "defined_in": mib_name,
-                            "abstract": False,
-                        }
-                    elif types[sym_name]["defined_in"] is None:
-                        # Update the defined_in field if not already set
-                        types[sym_name]["defined_in"] = mib_name
-                        # Also update base_type if not set
-                        if (
-                            types[sym_name]["base_type"] is None
-                            and base_type_name is not None
-                        ):
-                            types[sym_name]["base_type"] = base_type_name
-                    continue
+            fingerprint = self._module_fingerprint(mib_name)
+            shard = self._read_shard(mib_name, fingerprint)
+            if shard is None:
+                shard = self._record_module(mib_name, symbols, seed)
+                self.recorded_modules.append(mib_name)
+                self._write_shard(mib_name, fingerprint, shard)
+            shards.append(shard)
 
-                # Now process OBJECT-TYPE instances
-                if not hasattr(sym_obj, "getSyntax"):
-                    continue
+        self._registry = self.merge_shards(seed, shards)
 
-                snmp_obj = cast(HasGetSyntax, sym_obj)
-                try:
-                    syntax = snmp_obj.getSyntax()
-                except Exception:
-                    continue
+    def _record_module(
+        self, mib_name: str, symbols: Mapping[str, object], seed: Mapping[str, TypeEntry]
+    ) -> Dict[str, TypeEntry]:
+        """Type entries one module defines or uses, recorded against the seeded base types.
 
-                if syntax is None:
-                    continue
+        Returns only the entries the module added or changed (seeded types
+        it uses carry its ``used_by`` links).
+        """
+        types: Dict[str, TypeEntry] = copy.deepcopy(dict(seed))
+
+        for sym_name, sym_obj in symbols.items():
+            # First, check if this is a TEXTUAL-CONVENTION class definition
+            is_tc_class = self._is_textual_convention_symbol(sym_obj)
+
+            if is_tc_class:
+                # This is a TC class definition - extract type info from the class itself
+                tc_class = cast(type, sym_obj)
+
+                # Infer base type from the class MRO
+                base_type_name: Optional[str] = None
+                snmp_types = self.get_snmpv2_smi_types()
+                for base in tc_class.__mro__[1:]:  # Skip the TC class itself
+                    if base.__name__ in snmp_types:
+                        base_type_name = base.__name__
+                        break
+
+                # Try to get display hint and constraints from class attributes
+                display_hint = getattr(tc_class, "displayHint", None)
+                if display_hint and not isinstance(display_hint, str):
+                    display_hint = None
+
+                # Get subtypeSpec from class if available
+                subtype_spec = getattr(tc_class, "subtypeSpec", None)
+                tc_size: Optional[JsonDict] = None
+                tc_constraints: List[JsonDict] = []
+                tc_constraints_repr: Optional[str] = None
+                if subtype_spec is not None:
+                    subtype_repr = repr(subtype_spec)
+                    tc_size, tc_constraints = self.parse_constraints_from_repr(
+                        subtype_repr
+                    )
+                    # Set constraints_repr if there are actual constraints
+                    if tc_constraints or tc_size:
+                        tc_constraints_repr = subtype_repr
+
+                if sym_name not in types:
+                    # TEXTUAL-CONVENTIONs are concrete types, not abstract
+                    types[sym_name] = {
+                        "base_type": base_type_name,
+                        "display_hint": display_hint,
+                        "size": tc_size,
+                        "constraints": tc_constraints,
+                        "constraints_repr": tc_constraints_repr,
+                        "enums": None,
+                        "used_by": [],
+                        "defined_in": mib_name,
+                        "abstract": False,
+                    }
+                elif types[sym_name]["defined_in"] is None:
+                    # Update the defined_in field if not already set
+                    types[sym_name]["defined_in"] = mib_name
+                    # Also update base_type if not set
+                    if (
+                        types[sym_name]["base_type"] is None
+                        and base_type_name is not None
+                    ):
+                        types[sym_name]["base_type"] = base_type_name
+                continue
 
-                t_name, base_type_raw, base_obj = self.unwrap_syntax(syntax)
-
-                # Keep base_type even if it equals type name - plugins need it to match types.
-                # For SNMP application types (Counter32, Integer32, etc.), base_type should be the same as t_name.
-                # For TEXTUAL-CONVENTIONs, base_type will differ from t_name.
-                base_type_out: Optional[str] = base_type_raw if base_type_raw else None
-                # If the base_type_out refers to a seeded type that itself has no
-                # canonical base_type (eg ...: None), treat the base_type_out as
-                # effectively None so we don't drop useful constraints_repr.
-                if base_type_out is not None and base_type_out in types and types[base_type_out].get("base_type") is None:
-                    base_type_out = None
-
-                is_tc_def = self._is_textual_convention_symbol(sym_obj)
-                is_application_type = t_name in self.get_snmpv2_smi_types()
-
-                allow_metadata = is_tc_def or not is_application_type
-
-                display: Optional[str]
-                enums: Optional[List[JsonDict]]
-                size: Optional[JsonDict]
-                constraints: List[JsonDict]
-                constraints_repr: Optional[str]
-
-                if not allow_metadata:
-                    display = None
-                    enums = None
-                    size = None
-                    constraints = []
-                    constraints_repr = None
-                else:
-                    if base_type_out is None:
-                        # For types whose base is unknown/None, we still capture
-                        # display hints from the syntax if available and also
-                        # inherit constraints/enums from the base_obj when
-                        # syntax itself does not provide them.
-                        display = self.extract_display_hint(syntax)
-
-                        size, constraints, constraints_repr = self.extract_constraints(
-                            syntax
-                        )
+            # Now process OBJECT-TYPE instances
+            if not hasattr(sym_obj, "getSyntax"):
+                continue
 
-                        # If the syntax itself has no constraints, but the base
-                        # object (from getSyntax()) does, inherit those.
-                        if base_obj is not syntax:
-                            size2, constraints2, repr2 = self.extract_constraints(
-                                base_obj
-                            )
-                            if not constraints and constraints2:
-                                size, constraints, constraints_repr = (
-                                    size2,
-                                    constraints2,
-                                    repr2,
-                                )
-
-                        # Extract enums from syntax or fallback to base object
-                        enums = self.extract_enums_list(syntax)
-                        if enums is None and base_obj is not syntax:
-                            enums = self.extract_enums_list(base_obj)
-                    else:
-                        display = self.extract_display_hint(syntax)
-
-                        size, constraints, constraints_repr = self.extract_constraints(
-                            syntax
+            snmp_obj = cast(HasGetSyntax, sym_obj)
+            try:
+                syntax = snmp_obj.getSyntax()
+            except Exception:
+                continue
+
+            if syntax is None:
+                continue
+
+            t_name, base_type_raw, base_obj = self.unwrap_syntax(syntax)
+
+            # Keep base_type even if it equals type name - plugins need it to match types.
+            # For SNMP application types (Counter32, Integer32, etc.), base_type should be the same as t_name.
+            # For TEXTUAL-CONVENTIONs, base_type will differ from t_name.
+            base_type_out: Optional[str] = base_type_raw if base_type_raw else None
+            # If the base_type_out refers to a seeded type that itself has no
+            # canonical base_type (eg ...: None), treat the base_type_out as
+            # effectively None so we don't drop useful constraints_repr.
+            if base_type_out is not None and base_type_out in types and types[base_type_out].get("base_type") is None:
+                base_type_out = None
+
+            is_tc_def = self._is_textual_convention_symbol(sym_obj)
+            is_application_type = t_name in self.get_snmpv2_smi_types()
+
+            allow_metadata = is_tc_def or not is_application_type
+
+            display: Optional[str]
+            enums: Optional[List[JsonDict]]
+            size: Optional[JsonDict]
+            constraints: List[JsonDict]
+            constraints_repr: Optional[str]
+
+            if not allow_metadata:
+                display = None
+                enums = None
+                size = None
+                constraints = []
+                constraints_repr = None
+            else:
+                if base_type_out is None:
+                    # For types whose base is unknown/None, we still capture
+                    # display hints from the syntax if available and also
+                    # inherit constraints/enums from the base_obj when
+                    # syntax itself does not provide them.
+                    display = self.extract_display_hint(syntax)
+
+                    size, constraints, constraints_repr = self.extract_constraints(
+                        syntax
+                    )
+
+                    # If the syntax itself has no constraints, but the base
+                    # object (from getSyntax()) does, inherit those.
+                    if base_obj is not syntax:
+                        size2, constraints2, repr2 = self.extract_constraints(
+                            base_obj
                         )
-                        if base_obj is not syntax:
-                            size2, constraints2, repr2 = self.extract_constraints(
-                                base_obj
+                        if not constraints and constraints2:
+                            size, constraints, constraints_repr = (
+                                size2,
+                                constraints2,
+                                repr2,
                             )
-                            if not constraints and constraints2:
-                                size, constraints, constraints_repr = (
-                                    size2,
-                                    constraints2,
-                                    repr2,
-                                )
-
-                        enums = self.extract_enums_list(syntax)
-                        if enums is None and base_obj is not syntax:
-                            enums = self.extract_enums_list(base_obj)
-
-                    size, constraints, constraints_repr = (
-                        self._canonicalise_constraints(
-                            size=size,
-                            constraints=constraints,
-                            enums=enums,
-                            constraints_repr=constraints_repr,
-                            drop_repr=(base_type_out is not None),
+
+                    # Extract enums from syntax or fallback to base object
+                    enums = self.extract_enums_list(syntax)
+                    if enums is None and base_obj is not syntax:
+                        enums = self.extract_enums_list(base_obj)
+                else:
+                    display = self.extract_display_hint(syntax)
+
+                    size, constraints, constraints_repr = self.extract_constraints(
+                        syntax
+                    )
+                    if base_obj is not syntax:
+                        size2, constraints2, repr2 = self.extract_constraints(
+                            base_obj
                         )
+                        if not constraints and constraints2:
+                            size, constraints, constraints_repr = (
+                                size2,
+                                constraints2,
+                                repr2,
+                            )
+
+                    enums = self.extract_enums_list(syntax)
+                    if enums is None and base_obj is not syntax:
+                        enums = self.extract_enums_list(base_obj)
+
+                size, constraints, constraints_repr = (
+                    self._canonicalise_constraints(
+                        size=size,
+                        constraints=constraints,
+                        enums=enums,
+                        constraints_repr=constraints_repr,
+                        drop_repr=(base_type_out is not None),
                     )
+                )
 
-                if base_type_out is not None and constraints:
-                    constraints = self._drop_redundant_base_value_range(
+            if base_type_out is not None and constraints:
+                constraints = self._drop_redundant_base_value_range(
+                    base_type=base_type_out,
+                    constraints=constraints,
+                    types=types,
+                )
+                constraints = self._drop_dominated_value_ranges(constraints)
+                if base_type_out is not None:
+                    constraints = self._drop_redundant_base_range_for_enums(
                         base_type=base_type_out,
                         constraints=constraints,
+                        enums=enums,
                         types=types,
                     )
-                    constraints = self._drop_dominated_value_ranges(constraints)
-                    if base_type_out is not None:
-                        constraints = self._drop_redundant_base_range_for_enums(
-                            base_type=base_type_out,
-                            constraints=constraints,
-                            enums=enums,
-                            types=types,
-                        )
 
-                # Check if this type is abstract (CHOICE types, aliases, etc.)
-                is_abstract = self._is_abstract_type(t_name, syntax)
-
-                entry = types.setdefault(
-                    t_name,
-                    {
-                        "base_type": base_type_out,
-                        "display_hint": display,
-                        "size": size,
-                        "constraints": constraints,
-                        "constraints_repr": constraints_repr,
-                        "enums": enums,
-                        "used_by": [],
-                        "defined_in": None,
-                        "abstract": is_abstract,
-                    },
-                )
+            # Check if this type is abstract (CHOICE types, aliases, etc.)
+            is_abstract = self._is_abstract_type(t_name, syntax)
+
+            entry = types.setdefault(
+                t_name,
+                {
+                    "base_type": base_type_out,
+                    "display_hint": display,
+                    "size": size,
+                    "constraints": constraints,
+                    "constraints_repr": constraints_repr,
+                    "enums": enums,
+                    "used_by": [],
+                    "defined_in": None,
+                    "abstract": is_abstract,
+                },
+            )
 
-                # If this is a TEXTUAL-CONVENTION definition, record where it's defined
-                if is_tc_def and entry["defined_in"] is None:
-                    entry["defined_in"] = mib_name
+            # If this is a TEXTUAL-CONVENTION definition, record where it's defined
+            if is_tc_def and entry["defined_in"] is None:
+                entry["defined_in"] = mib_name
+
+            # Update base_type if it's not set (for TC placeholders)
+            if entry["base_type"] is None and base_type_out is not None:
+                entry["base_type"] = base_type_out
+
+            if allow_metadata:
+                if entry["display_hint"] is None and display is not None:
+                    entry["display_hint"] = display
+                if entry["size"] is None and size is not None:
+                    entry["size"] = size
+                if entry["enums"] is None and enums is not None:
+                    entry["enums"] = enums
+
+                if (
+                    entry["constraints_repr"] is None
+                    and constraints_repr is not None
+                ):
+                    entry["constraints_repr"] = constraints_repr
+                if not entry["constraints"] and constraints:
+                    entry["constraints"] = constraints
 
-                # Update base_type if it's not set (for TC placeholders)
-                if entry["base_type"] is None and base_type_out is not None:
-                    entry["base_type"] = base_type_out
+            entry["used_by"].append(f"{mib_name}::{sym_name}")
 
-                if allow_metadata:
-                    if entry["display_hint"] is None and display is not None:
-                        entry["display_hint"] = display
-                    if entry["size"] is None and size is not None:
-                        entry["size"] = size
-                    if entry["enums"] is None and enums is not None:
-                        entry["enums"] = enums
+        return {name: entry for name, entry in types.items() if seed.get(name) != entry}
 
-                    if (
-                        entry["constraints_repr"] is None
-                        and constraints_repr is not None
-                    ):
-                        entry["constraints_repr"] = constraints_repr
-                    if not entry["constraints"] and constraints:
-                        entry["constraints"] = constraints
+    @staticmethod
+    def merge_shards(
+        seed: Mapping[str, TypeEntry], shards: Iterable[Mapping[str, TypeEntry]]
+    ) -> Dict[str, TypeEntry]:
+        """Merge per-module shards, in load order, over the seeded base types.
 
-                entry["used_by"].append(f"{mib_name}::{sym_name}")
+        The first module to record a type creates its entry; later modules
+        only fill fields still unset and append their ``used_by`` links.
+        """
+        merged: Dict[str, TypeEntry] = copy.deepcopy(dict(seed))
+        for shard in shards:
+            for name, shard_entry in shard.items():
+                entry = merged.get(name)
+                if entry is None:
+                    merged[name] = copy.deepcopy(shard_entry)
+                    continue
+                # Seeded entries already hold their own (empty) used_by list
+                seeded_links = len(seed[name].get("used_by", [])) if name in seed else 0
+                target = cast(Dict[str, Any], entry)
+                for field in _MERGE_FILL_FIELDS:
+                    if target.get(field) is None and shard_entry.get(field) is not None:
+                        target[field] = copy.deepcopy(shard_entry.get(field))
+                if not target.get("constraints") and shard_entry.get("constraints"):
+                    target["constraints"] = copy.deepcopy(shard_entry["constraints"])
+                target.setdefault("used_by", []).extend(shard_entry.get("used_by", [])[seeded_links:])
+        return merged
+
+    def _module_fingerprint(self, mib_name: str) -> str:
+        """Hash of the compiled module (or of the pysnmp release for bundled modules)."""
+        digest = hashlib.sha256(f"{_SHARD_FORMAT}:{mib_name}:".encode())
+        compiled = self.compiled_dir / f"{mib_name}.py"
+        try:
+            digest.update(compiled.read_bytes())
+        except OSError:
+            digest.update(f"pysnmp-{_pysnmp_version}".encode())
+        return digest.hexdigest()
+
+    def _shard_path(self, mib_name: str) -> Optional[Path]:
+        if self.shard_dir is None:
+            return None
+        return Path(self.shard_dir) / f"{mib_name}.json"
 
-        self._registry = types
+    def _read_shard(self, mib_name: str, fingerprint: str) -> Optional[Dict[str, TypeEntry]]:
+        path = self._shard_path(mib_name)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+            return None
+        types = data.get("types")
+        return cast(Dict[str, TypeEntry], types) if isinstance(types, dict) else None
+
+    def _write_shard(self, mib_name: str, fingerprint: str, shard: Mapping[str, TypeEntry]) -> None:
+        path = self._shard_path(mib_name)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"module": mib_name, "fingerprint": fingerprint, "types": shard}, fh, indent=2)
+        os.replace(tmp_path, path)
 
     @property
     def registry(self) -> Dict[str, TypeEntry]:
@@ -968,12 +1089,21 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("compiled_dir", type=Path)
     parser.add_argument("-o", "--output", type=Path, default=Path("types.json"))
+    parser.add_argument(
+        "--shard-dir",
+        type=Path,
+        default=None,
+        help="Keep per-module type shards here and re-record only changed modules",
+    )
     args = parser.parse_args()
 
-    recorder = TypeRecorder(args.compiled_dir)
+    recorder = TypeRecorder(args.compiled_dir, shard_dir=args.shard_dir)
     recorder.build()
     recorder.export_to_json(str(args.output))
-    print(f"Wrote {len(recorder.registry)} types to {args.output}")
+    print(
+        f"Wrote {len(recorder.registry)} types to {args.output} "
+        f"({len(recorder.recorded_modules)} module(s) recorded)"
+    )
 
 
 if __name__ == "__main__": # pragma: no cover
@@ -6,23 +6,39 @@ Manages build, export, and access to the registry after MIB compilation.
 import os
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Iterable, Optional, Callable
 
+from app.mib_build_context import MibBuildContext
 # Import the TypeRecorder from app.type_recorder
 from app.type_recorder import TypeRecorder
 
 
 class TypeRegistry:
-    def __init__(self, compiled_mibs_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        compiled_mibs_dir: Optional[Path] = None,
+        modules: Optional[Iterable[str]] = None,
+        build_context: Optional[MibBuildContext] = None,
+        shard_dir: Optional[Path] = None,
+    ):
         self.compiled_mibs_dir = compiled_mibs_dir or (
             Path(__file__).parent.parent / "compiled-mibs"
         )
+        # Restrict the build to these modules (plus their imports); None means all
+        self.modules = list(modules) if modules is not None else None
+        self.build_context = build_context
+        # Per-module type shards reused across builds (see TypeRecorder.build)
+        self.shard_dir = shard_dir
         self._registry: Optional[Dict[str, Any]] = None
 
     def build(self, progress_callback: Optional[Callable[[str], None]] = None) -> None:
         """Build the canonical type registry from compiled-mibs using TypeRecorder."""
         recorder = TypeRecorder(
-            self.compiled_mibs_dir, progress_callback=progress_callback
+            self.compiled_mibs_dir,
+            progress_callback=progress_callback,
+            modules=self.modules,
+            build_context=self.build_context,
+            shard_dir=self.shard_dir,
         )
         recorder.build()
         self._registry = recorder.registry
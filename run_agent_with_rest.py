@@ -6,6 +6,7 @@ import argparse
 from pathlib import Path
 import shutil
 from app.snmp_agent import SNMPAgent
+from app.oid_search import get_search_index
 import app.api
 
 def run_snmp_agent(agent: SNMPAgent) -> None:
@@ -70,6 +71,11 @@ if __name__ == "__main__": # pragma: no cover
         # Start SNMP agent in background thread
         snmp_thread = threading.Thread(target=run_snmp_agent, args=(agent,), daemon=True)
         snmp_thread.start()
+
+        # Build the /search index in the background so the first query is fast
+        threading.Thread(
+            target=get_search_index().refresh_from_dir, args=("agent-model",), daemon=True
+        ).start()
         
         print("Starting SNMP Agent with REST API...")
         print("SNMP Agent running in background")
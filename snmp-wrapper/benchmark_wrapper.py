@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Benchmark the SNMP wrapper clients against a live agent (or fleet).
+
+Compares, for the same workload:
+  • StatelessSnmpClient: fresh engine per GET, targets one after another
+  • PersistentSnmpClient: one engine per target, targets one after another
+  • SnmpClientPool: one engine, all targets in flight together
+
+and, for a subtree walk, GET-NEXT stepping versus PersistentSnmpClient.walk()
+(GET-BULK).
+
+Examples:
+    python benchmark_wrapper.py --target parrot:161
+    python benchmark_wrapper.py --target 10.0.0.1:161 --target 10.0.0.2:161 --rounds 5
+    python benchmark_wrapper.py --target 127.0.0.1:11161 --repeat 50   # one agent, 50 "targets"
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+from pysnmp.hlapi.asyncio import CommunityData, ObjectType
+from pysnmp.proto.rfc1905 import EndOfMibView
+
+from snmp_wrapper import (
+    PersistentSnmpClient,
+    PollRequest,
+    SnmpClientPool,
+    StatelessSnmpClient,
+    make_oid,
+    shutdown_sync_wrapper,
+)
+
+Address = Tuple[str, int]
+
+
+def _parse_target(text: str) -> Address:
+    host, _, port = text.rpartition(":")
+    if not host:
+        return text, 161
+    return host, int(port)
+
+
+def _timed(label: str, operations: int, func: Callable[[], int]) -> float:
+    start = time.perf_counter()
+    ok = func()
+    elapsed = time.perf_counter() - start
+    rate = operations / elapsed if elapsed > 0 else float("inf")
+    print(f"  {label:<34} {elapsed:8.3f}s  {rate:9.1f} ops/s  ({ok}/{operations} ok)")
+    return elapsed
+
+
+def bench_polling(args: argparse.Namespace, targets: List[Address]) -> None:
+    auth = CommunityData(args.community, mpModel=1)
+    oids = [ObjectType(make_oid(oid)) for oid in args.oid]
+    operations = len(targets) * len(oids) * args.rounds
+    print(f"\nPolling {len(targets)} target(s) x {len(oids)} OID(s) x {args.rounds} round(s)")
+
+    def stateless() -> int:
+        ok = 0
+        for _ in range(args.rounds):
+            for address in targets:
+                client = StatelessSnmpClient(auth=auth, address=address, timeout=args.timeout, retries=args.retries)
+                for oid in oids:
+                    try:
+                        client.get(oid)
+                        ok += 1
+                    except Exception:
+                        pass
+        return ok
+
+    def persistent() -> int:
+        ok = 0
+        clients = [
+            PersistentSnmpClient(auth=auth, address=address, timeout=args.timeout, retries=args.retries)
+            for address in targets
+        ]
+        for _ in range(args.rounds):
+            for client in clients:
+                for oid in oids:
+                    try:
+                        client.get(oid)
+                        ok += 1
+                    except Exception:
+                        pass
+        return ok
+
+    def pooled() -> int:
+        pool = SnmpClientPool(
+            auth=auth, timeout=args.timeout, retries=args.retries, max_in_flight=args.in_flight
+        )
+        requests = [
+            PollRequest(address, (oid,))
+            for _ in range(args.rounds)
+            for address in targets
+            for oid in oids
+        ]
+        return sum(1 for result in pool.poll(requests) if result.ok)
+
+    baseline = _timed("StatelessSnmpClient (sequential)", operations, stateless)
+    _timed("PersistentSnmpClient (sequential)", operations, persistent)
+    pooled_time = _timed(f"SnmpClientPool (in flight {args.in_flight})", operations, pooled)
+    if pooled_time > 0:
+        print(f"  Pool speedup over stateless: {baseline / pooled_time:.1f}x")
+
+
+def bench_walk(args: argparse.Namespace, address: Address) -> None:
+    auth = CommunityData(args.community, mpModel=1)
+    root = make_oid(args.walk_oid)
+    client = PersistentSnmpClient(auth=auth, address=address, timeout=args.timeout, retries=args.retries)
+    print(f"\nWalking {args.walk_oid} on {address[0]}:{address[1]}")
+
+    def next_walk() -> int:
+        count = 0
+        current = ObjectType(root)
+        prefix = args.walk_oid + "."
+        while True:
+            result = client.get_next(current)
+            oid_str = str(result[0][0].get_oid()) if result else ""
+            if not oid_str.startswith(prefix) or isinstance(result[0][1], EndOfMibView):
+                return count
+            count += 1
+            current = ObjectType(result[0][0])
+
+    def bulk_walk() -> int:
+        return sum(1 for _ in client.walk(ObjectType(root), max_repetitions=args.max_repetitions))
+
+    objects = next_walk()
+    _timed("GET-NEXT loop", objects, next_walk)
+    _timed(f"walk() GET-BULK x{args.max_repetitions}", objects, bulk_walk)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark snmp_wrapper client variants")
+    parser.add_argument("--target", action="append", default=None, help="host:port (repeatable, default parrot:161)")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeat the target list N times to simulate a fleet")
+    parser.add_argument("--community", default="public")
+    parser.add_argument("--oid", action="append", default=None, help="OID to GET (repeatable, default sysUpTime.0)")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--in-flight", type=int, default=64, help="SnmpClientPool max_in_flight")
+    parser.add_argument("--walk-oid", default="1.3.6.1.2.1.1", help="Subtree for the walk benchmark")
+    parser.add_argument("--max-repetitions", type=int, default=25)
+    args = parser.parse_args()
+
+    args.oid = args.oid or ["1.3.6.1.2.1.1.3.0"]
+    targets = [_parse_target(t) for t in (args.target or ["parrot:161"])] * max(1, args.repeat)
+
+    try:
+        bench_polling(args, targets)
+        bench_walk(args, targets[0])
+    finally:
+        # All persistent variants share the background loop
+        shutdown_sync_wrapper()
+
+
+if __name__ == "__main__":
+    main()
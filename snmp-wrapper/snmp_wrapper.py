@@ -1,9 +1,10 @@
 # pyright: reportAttributeAccessIssue=false, reportCallIssue=false
 """Optimized synchronous wrapper for PySNMP 7.x async HLAPI.
 
-Provides two main client patterns:
+Provides three main client patterns:
   • StatelessSnmpClient: Fresh engine per call (simple, safe)
-  • PersistentSnmpClient: Reused engine (efficient, for loops)
+  • PersistentSnmpClient: Reused engine (efficient, for loops and walks)
+  • SnmpClientPool: One engine polling many targets concurrently
 
 For direct use, the sync functions work with either pattern:
   • get_sync(..., use_persistent_loop=False)  # Fresh loop per call (default)
@@ -13,10 +14,12 @@ For direct use, the sync functions work with either pattern:
 from __future__ import annotations
 
 import asyncio
+import queue
 import threading
+import time
 from concurrent.futures import Future
 from dataclasses import dataclass, field
-from typing import Any, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
 
 # PySNMP imports
 from pysnmp.hlapi.asyncio import (
@@ -27,10 +30,13 @@ from pysnmp.hlapi.asyncio import (
     SnmpEngine,
     UdpTransportTarget,
     UsmUserData,
+    bulk_cmd,
     get_cmd,
     set_cmd,
     next_cmd,
 )
+from pysnmp.hlapi.v3arch.asyncio.cmdgen import VB_PROCESSOR
+from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchInstance, NoSuchObject
 
 
 VarBinds = Sequence[ObjectType]
@@ -178,6 +184,27 @@ async def _next_async(
     return error_indication, error_status, error_index, result_var_binds
 
 
+async def _bulk_async(
+    engine: SnmpEngine,
+    auth: Union[CommunityData, UsmUserData],
+    address: Tuple[str, int],
+    var_binds: VarBinds,
+    non_repeaters: int = 0,
+    max_repetitions: int = 25,
+    timeout: float = 1.0,
+    retries: int = 5,
+    context: Optional[ContextData] = None,
+) -> GetResult:
+    """Async GET-BULK operation (SNMPv2c/v3 only)."""
+    if context is None:
+        context = ContextData()
+    target = await UdpTransportTarget.create(address, timeout=timeout, retries=retries)
+    error_indication, error_status, error_index, result_var_binds = await bulk_cmd(
+        engine, auth, target, context, non_repeaters, max_repetitions, *var_binds
+    )
+    return error_indication, error_status, error_index, result_var_binds
+
+
 def _raise_on_error(error_indication: Any, error_status: Any, error_index: Any) -> None:
     """Raise if SNMP operation failed."""
     if error_indication:
@@ -299,6 +326,75 @@ def get_next_sync(
     return tuple(result_var_binds)
 
 
+def get_bulk_sync(
+    engine: SnmpEngine,
+    auth: Union[CommunityData, UsmUserData],
+    address: Tuple[str, int],
+    var_binds: VarBinds,
+    non_repeaters: int = 0,
+    max_repetitions: int = 25,
+    timeout: float = 1.0,
+    retries: int = 5,
+    context: Optional[ContextData] = None,
+    use_persistent_loop: bool = False,
+) -> Tuple[ObjectType, ...]:
+    """Synchronous SNMP GET-BULK.
+
+    Args:
+        engine: SnmpEngine instance
+        auth: CommunityData (v2c) or UsmUserData (v3)
+        address: (hostname, port) tuple
+        var_binds: [ObjectType(...), ...]
+        non_repeaters: leading var_binds fetched once (GET-NEXT semantics)
+        max_repetitions: successors returned for each remaining var_bind
+        timeout: seconds (default 1.0)
+        retries: count (default 5)
+        context: ContextData or None
+        use_persistent_loop: Use persistent background loop (for engine reuse)
+
+    Returns:
+        Flat tuple of ObjectType results (non-repeaters first, then
+        repetitions interleaved by var_bind)
+
+    Raises:
+        SnmpSyncError: If operation fails
+    """
+    runner = run_sync_persistent if use_persistent_loop else run_sync
+    error_indication, error_status, error_index, result_var_binds = runner(
+        _bulk_async(
+            engine, auth, address, var_binds, non_repeaters, max_repetitions,
+            timeout=timeout, retries=retries, context=context,
+        )
+    )
+    _raise_on_error(error_indication, error_status, error_index)
+    return tuple(result_var_binds)
+
+
+def _oid_of(name: Any) -> Tuple[int, ...]:
+    """OID of an ObjectIdentity/ObjectName as a tuple of ints."""
+    if hasattr(name, "get_oid"):
+        name = name.get_oid()
+    return tuple(int(x) for x in name)
+
+
+def _walk_page(
+    var_binds: Sequence[ObjectType], root: Tuple[int, ...], last: Tuple[int, ...]
+) -> Tuple[list[ObjectType], bool]:
+    """Split one GET-BULK page into in-subtree results and a 'walk finished' flag."""
+    page: list[ObjectType] = []
+    for var_bind in var_binds:
+        oid = _oid_of(var_bind[0])
+        if (
+            isinstance(var_bind[1], (EndOfMibView, NoSuchObject, NoSuchInstance))
+            or oid[: len(root)] != root
+            or oid <= last
+        ):
+            return page, True
+        page.append(var_bind)
+        last = oid
+    return page, not var_binds
+
+
 # ============================================================================
 # Client Classes
 # ============================================================================
@@ -404,11 +500,225 @@ class PersistentSnmpClient:
             use_persistent_loop=True
         )
 
+    def get_bulk(
+        self, *var_binds: ObjectType, non_repeaters: int = 0, max_repetitions: int = 25
+    ) -> Tuple[ObjectType, ...]:
+        """Synchronous GET-BULK (reused engine + persistent loop)."""
+        engine = self._ensure_engine()
+        return get_bulk_sync(
+            engine, self.auth, self.address, var_binds, non_repeaters, max_repetitions,
+            self.timeout, self.retries, self.context, use_persistent_loop=True
+        )
+
+    def walk(self, var_bind: ObjectType, max_repetitions: int = 25) -> Iterator[ObjectType]:
+        """Walk the subtree under ``var_bind`` with GET-BULK, yielding results.
+
+        Each page is fetched only when the previous one has been consumed,
+        so stopping iteration early stops the walk.
+
+        Example:
+            for obj_type in client.walk(ObjectType(make_oid("1.3.6.1.2.1.2.2"))):
+                print(obj_type)
+        """
+        engine = self._ensure_engine()
+        # Resolve symbolic names (e.g. ObjectIdentity("IF-MIB", "ifTable")) once
+        root = _oid_of(VB_PROCESSOR.make_varbinds(engine.cache, (var_bind,))[0][0])
+        last = root
+        current = ObjectType(ObjectIdentity(root))
+        while True:
+            result = get_bulk_sync(
+                engine, self.auth, self.address, (current,), 0, max_repetitions,
+                self.timeout, self.retries, self.context, use_persistent_loop=True
+            )
+            page, finished = _walk_page(result, root, last)
+            yield from page
+            if finished or not page:
+                return
+            last = _oid_of(page[-1][0])
+            current = ObjectType(ObjectIdentity(last))
+
+    def shutdown(self) -> None:
+        """Cleanup: call when completely done."""
+        self._engine = None
+        shutdown_sync_wrapper()
+
+
+# ============================================================================
+# Concurrent Multi-Target Polling
+# ============================================================================
+
+@dataclass(frozen=True)
+class PollRequest:
+    """One operation against one target for SnmpClientPool.poll().
+
+    ``operation`` is "get", "next" or "bulk"; ``auth`` overrides the pool's
+    credentials for this target; ``tag`` is passed through to the result.
+    """
+
+    address: Tuple[str, int]
+    var_binds: Tuple[ObjectType, ...]
+    operation: str = "get"
+    auth: Optional[Union[CommunityData, UsmUserData]] = None
+    max_repetitions: int = 25
+    tag: Any = None
+
+
+@dataclass
+class PollResult:
+    """Outcome of a PollRequest: var_binds on success, error otherwise."""
+
+    request: PollRequest
+    var_binds: Tuple[ObjectType, ...] = ()
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_POLL_DONE = object()
+
+
+@dataclass(slots=True)
+class SnmpClientPool:
+    """SNMP client for many targets: one engine, one loop, many requests in flight.
+
+    ✓ Targets are polled concurrently (bounded by max_in_flight)
+    ✓ Results are streamed back as each target answers
+    ✓ A slow or dead target only costs its own deadline
+    ✗ Must call shutdown() when done
+
+    Example:
+        pool = SnmpClientPool(auth=CommunityData("public", mpModel=1), max_in_flight=100)
+        oid = ObjectType(make_oid("1.3.6.1.2.1.1.3.0"))
+        requests = [PollRequest((host, 161), (oid,)) for host in hosts]
+        for result in pool.poll(requests):
+            print(result.request.address, result.var_binds if result.ok else result.error)
+        pool.shutdown()
+    """
+
+    auth: Union[CommunityData, UsmUserData]
+    timeout: float = 1.0
+    retries: int = 1
+    max_in_flight: int = 64
+    target_timeout: Optional[float] = None
+    context: ContextData = field(default_factory=ContextData)
+    _engine: Optional[SnmpEngine] = field(default=None, init=False, repr=False)
+    _targets: Dict[Tuple[str, int], UdpTransportTarget] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def deadline(self) -> float:
+        """Overall per-target time limit (all retries included)."""
+        if self.target_timeout is not None:
+            return self.target_timeout
+        return self.timeout * (self.retries + 1) + 0.5
+
+    def poll(self, requests: Iterable[PollRequest]) -> Iterator[PollResult]:
+        """Run ``requests`` concurrently and yield results in completion order.
+
+        Requests are started lazily, at most ``max_in_flight`` at a time, so
+        ``requests`` may be a generator over a very large fleet. Failures are
+        reported on the result (``error``) rather than raised. Closing the
+        iterator early cancels whatever is still outstanding.
+        """
+        results: "queue.Queue[Any]" = queue.Queue()
+        loop_thread = _get_global_loop_thread()
+        future: Future[None] = asyncio.run_coroutine_threadsafe(
+            self._poll_async(iter(requests), results.put), loop_thread.loop
+        )
+        try:
+            while True:
+                item = results.get()
+                if item is _POLL_DONE:
+                    break
+                yield item
+            future.result()
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def poll_all(self, requests: Iterable[PollRequest]) -> list[PollResult]:
+        """Run ``requests`` concurrently and return all results."""
+        return list(self.poll(requests))
+
+    def get_many(
+        self, addresses: Iterable[Tuple[str, int]], *var_binds: ObjectType
+    ) -> Dict[Tuple[str, int], PollResult]:
+        """GET the same var_binds from every address."""
+        return {
+            result.request.address: result
+            for result in self.poll(PollRequest(address, var_binds) for address in addresses)
+        }
+
     def shutdown(self) -> None:
         """Cleanup: call when completely done."""
         self._engine = None
+        self._targets.clear()
         shutdown_sync_wrapper()
 
+    # Helpers below run on the background loop
+
+    async def _poll_async(self, requests: Iterator[PollRequest], emit: Callable[[Any], None]) -> None:
+        window = asyncio.Semaphore(max(1, self.max_in_flight))
+        pending: set[asyncio.Task[PollResult]] = set()
+
+        def _finished(task: asyncio.Task[PollResult]) -> None:
+            pending.discard(task)
+            window.release()
+            if not task.cancelled():
+                emit(task.result())
+
+        try:
+            for request in requests:
+                await window.acquire()
+                task = asyncio.ensure_future(self._poll_one(request))
+                pending.add(task)
+                task.add_done_callback(_finished)
+            while pending:
+                await asyncio.wait(set(pending))
+        finally:
+            for task in pending:
+                task.cancel()
+            emit(_POLL_DONE)
+
+    async def _poll_one(self, request: PollRequest) -> PollResult:
+        started = time.monotonic()
+        try:
+            var_binds = await asyncio.wait_for(self._execute(request), timeout=self.deadline)
+        except asyncio.TimeoutError:
+            error: Exception = SnmpSyncError(f"SNMP error: no response from {request.address} within {self.deadline:.1f}s")
+            return PollResult(request, error=error, elapsed=time.monotonic() - started)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return PollResult(request, error=e, elapsed=time.monotonic() - started)
+        return PollResult(request, var_binds=var_binds, elapsed=time.monotonic() - started)
+
+    async def _execute(self, request: PollRequest) -> Tuple[ObjectType, ...]:
+        if self._engine is None:
+            self._engine = SnmpEngine()
+        target = self._targets.get(request.address)
+        if target is None:
+            target = await UdpTransportTarget.create(request.address, timeout=self.timeout, retries=self.retries)
+            self._targets[request.address] = target
+        auth = request.auth or self.auth
+
+        if request.operation == "get":
+            reply = await get_cmd(self._engine, auth, target, self.context, *request.var_binds)
+        elif request.operation == "next":
+            reply = await next_cmd(self._engine, auth, target, self.context, *request.var_binds)
+        elif request.operation == "bulk":
+            reply = await bulk_cmd(
+                self._engine, auth, target, self.context, 0, request.max_repetitions, *request.var_binds
+            )
+        else:
+            raise ValueError(f"Unsupported poll operation: {request.operation!r}")
+
+        error_indication, error_status, error_index, result_var_binds = reply
+        _raise_on_error(error_indication, error_status, error_index)
+        return tuple(result_var_binds)
+
 
 # ============================================================================
 # Utility Functions
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
-"""Optimized tests for SNMP wrapper: get_sync, set_sync, get_next_sync."""
+"""Optimized tests for SNMP wrapper: get_sync, set_sync, get_next_sync, get_bulk_sync, pooling."""
 
 import sys
 import time
 from snmp_wrapper import (
     StatelessSnmpClient,
     PersistentSnmpClient,
+    PollRequest,
+    SnmpClientPool,
     SnmpSyncError,
     make_oid,
 )
@@ -184,6 +186,67 @@ def test_snmpwalk_simulation() -> None:
         client.shutdown()
 
 
+def test_persistent_client_get_bulk() -> None:
+    """Test: PersistentSnmpClient.get_bulk() returns max_repetitions successors."""
+    client = PersistentSnmpClient(auth=PUBLIC_AUTH, address=PARROT_ADDRESS, timeout=1.0, retries=1)
+
+    try:
+        result = client.get_bulk(ObjectType(make_oid("1.3.6.1.2.1.1")), max_repetitions=3)
+        assert len(result) == 3, f"Expected 3 results, got {len(result)}"
+        oids = [str(obj_type[0].get_oid()) for obj_type in result]
+        assert all(oid.startswith("1.3.6.1.2.1.1.") for oid in oids), f"Unexpected OIDs: {oids}"
+        print("✅ PersistentSnmpClient.get_bulk() works")
+    finally:
+        client.shutdown()
+
+
+def test_walk_matches_get_next() -> None:
+    """Test: PersistentSnmpClient.walk() yields the same subtree as GET-NEXT stepping."""
+    client = PersistentSnmpClient(auth=PUBLIC_AUTH, address=PARROT_ADDRESS, timeout=1.0, retries=1)
+
+    try:
+        root = "1.3.6.1.2.1.1"
+        walked = [str(obj_type[0].get_oid()) for obj_type in client.walk(ObjectType(make_oid(root)), max_repetitions=4)]
+        assert walked, "Expected walk to return objects"
+        assert all(oid.startswith(root + ".") for oid in walked), "Walk left the subtree"
+
+        stepped = []
+        current = ObjectType(make_oid(root))
+        while True:
+            obj_type = client.get_next(current)[0]
+            oid_str = str(obj_type[0].get_oid())
+            if not oid_str.startswith(root + "."):
+                break
+            stepped.append(oid_str)
+            current = ObjectType(obj_type[0])
+
+        assert walked == stepped, f"walk() returned {len(walked)} OIDs, GET-NEXT {len(stepped)}"
+        print(f"✅ walk() matches GET-NEXT ({len(walked)} OIDs)")
+    finally:
+        client.shutdown()
+
+
+def test_pool_polls_many_targets() -> None:
+    """Test: SnmpClientPool polls targets concurrently and reports dead ones as errors."""
+    pool = SnmpClientPool(auth=PUBLIC_AUTH, timeout=0.5, retries=0, max_in_flight=4)
+    oid = ObjectType(make_oid("1.3.6.1.2.1.1.3.0"))
+    dead_address = ("127.0.0.1", 1)
+
+    try:
+        requests = [PollRequest(PARROT_ADDRESS, (oid,), tag=i) for i in range(10)]
+        requests.append(PollRequest(dead_address, (oid,), tag="dead"))
+        results = pool.poll_all(requests)
+
+        assert len(results) == len(requests), "Expected one result per request"
+        ok = [r for r in results if r.ok]
+        failed = [r for r in results if not r.ok]
+        assert len(ok) == 10, f"Expected 10 successful polls, got {len(ok)}"
+        assert [r.request.tag for r in failed] == ["dead"], "Expected only the dead target to fail"
+        print(f"✅ SnmpClientPool polled {len(ok)} targets (1 dead target reported)")
+    finally:
+        pool.shutdown()
+
+
 # ============================================================================
 # Test 4: Performance Comparison
 # ============================================================================
@@ -259,6 +322,9 @@ def main() -> None:
         ("PersistentSnmpClient (interleaved ops)", test_persistent_client_interleaved_ops),
         ("PersistentSnmpClient (SET operation)", test_persistent_client_set),
         ("Snmpwalk simulation", test_snmpwalk_simulation),
+        ("PersistentSnmpClient.get_bulk()", test_persistent_client_get_bulk),
+        ("walk() vs GET-NEXT", test_walk_matches_get_next),
+        ("SnmpClientPool (many targets)", test_pool_polls_many_targets),
         ("Performance comparison", test_performance_comparison),
         ("Error handling", test_error_handling),
     ]
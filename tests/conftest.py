@@ -164,6 +164,121 @@ def mib_class_mocks(agent: Any, mocker: Any) -> Dict[str, Any]:
     return mocks
 
 
+class ResponderHarness:
+    """A schema served through pysnmp command responders on a fake engine.
+
+    Responses are captured in-process as ``(stateReference, var_binds)``
+    instead of going out through a transport. ``sources`` maps a
+    stateReference to the manager address the transport would report.
+    """
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        import logging
+        import time
+        import types
+
+        from pysnmp.proto.api import v2c
+        from pysnmp.smi import builder, instrum
+
+        from app.mib_registrar import MibRegistrar
+
+        self.mib_builder = builder.MibBuilder()
+        self.mib_builder.load_modules("SNMPv2-SMI", "SNMPv2-TC")
+        scalar_inst, table, row, column, mib_scalar = self.mib_builder.import_symbols(
+            "SNMPv2-SMI", "MibScalarInstance", "MibTable", "MibTableRow", "MibTableColumn", "MibScalar"
+        )
+        # The compiled module would define the scalars' MibScalar objects
+        scalars = {
+            name: mib_scalar(tuple(info["oid"]), v2c.OctetString()).setMaxAccess(info.get("access", "read-only"))
+            for name, info in schema.items()
+            if "initial" in info
+        }
+        if scalars:
+            self.mib_builder.export_symbols("TEST-MIB-DEFS", **scalars)
+        registrar = MibRegistrar(
+            self.mib_builder, scalar_inst, table, row, column, logging.getLogger("test"), time.time()
+        )
+        registrar.register_mib("TEST-MIB", schema, {})
+        self.mib_instrum = instrum.MibInstrumController(self.mib_builder)
+
+        self.sources: Dict[Any, str] = {}
+
+        def _no_context(execpoint: str) -> Any:
+            raise KeyError(execpoint)
+
+        self.engine = types.SimpleNamespace(
+            message_dispatcher=types.SimpleNamespace(
+                register_context_engine_id=lambda *_a, **_k: None,
+                get_transport_info=lambda ref: (
+                    (1, 3, 6, 1, 6, 1, 1), (self.sources.get(ref, "10.0.0.1"), 161)
+                ),
+            ),
+            observer=types.SimpleNamespace(get_execution_context=_no_context),
+        )
+        self.context = types.SimpleNamespace(
+            contextEngineId=b"ctx", get_mib_instrum=lambda _name=b"": self.mib_instrum
+        )
+
+    def responder(self, base: type, *mixins: type) -> tuple[Any, list[tuple[Any, Any]]]:
+        """``base`` composed with ``mixins``, and the list its responses are appended to."""
+        from app.bulk_responder import FastPathMixin, InstanceIndex, compose_responder
+
+        responder = compose_responder(base, *mixins)(self.engine, self.context)
+        if any(issubclass(mixin, FastPathMixin) for mixin in mixins):
+            responder.instance_index = InstanceIndex(self.mib_builder, self.mib_instrum)
+        # Full read view: no access control callback
+        responder.verify_access = None
+        sent: list[tuple[Any, Any]] = []
+        responder.send_varbinds = lambda _e, ref, _es, _ei, var_binds: sent.append((ref, var_binds))
+        return responder, sent
+
+    def send(self, responder: Any, pdu: Any, ref: Any) -> None:
+        """Deliver ``pdu`` as an SNMPv2c request from community ``public``."""
+        responder.process_pdu(self.engine, 1, 2, "public-area", 1, b"ctx", b"", 1, pdu, 65507, ref)
+
+
+@pytest.fixture
+def responder_harness() -> Any:
+    """Factory for a ``ResponderHarness`` serving the given schema."""
+    return ResponderHarness
+
+
+@pytest.fixture(autouse=True)
+def isolated_model_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep parsed-model cache entries out of the working tree's data/model-cache."""
+    from app import model_cache
+
+    monkeypatch.setattr(model_cache, "DEFAULT_CACHE_DIR", tmp_path / "model-cache")
+
+
+@pytest.fixture(autouse=True)
+def isolated_type_shards(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep per-module type records out of the working tree's data/type-shards."""
+    from app import snmp_agent
+
+    monkeypatch.setattr(snmp_agent, "DEFAULT_TYPE_SHARD_DIR", tmp_path / "type-shards")
+
+
+@pytest.fixture(autouse=True)
+def isolated_mib_catalogue(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the shared MIB catalogue's cache file out of the working tree's data/."""
+    from app import mib_catalogue
+    from app.mib_catalogue import MibCatalogue
+
+    default_file = mib_catalogue.DEFAULT_CACHE_FILE
+    isolated_file = tmp_path / "mib_catalogue.json"
+    shared = MibCatalogue.shared.__func__  # type: ignore[attr-defined]
+
+    def _shared(cls: type, *args: Any, **kwargs: Any) -> Any:
+        if len(args) < 2 and kwargs.get("cache_file", default_file) == default_file:
+            kwargs["cache_file"] = isolated_file
+        return shared(cls, *args, **kwargs)
+
+    monkeypatch.setattr(mib_catalogue, "DEFAULT_CACHE_FILE", isolated_file)
+    monkeypatch.setattr(MibCatalogue, "_shared", {})
+    monkeypatch.setattr(MibCatalogue, "shared", classmethod(_shared))
+
+
 @pytest.fixture(autouse=True)
 def cleanup_asyncio_and_imports() -> Generator[None, None, None]:
     """Auto-use fixture to clean up asyncio event loops and pysnmp imports between tests.
@@ -0,0 +1,146 @@
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from pysnmp.entity.rfc3413 import cmdrsp
+from pysnmp.proto.api import v2c
+
+import app.admission as admission_module
+import app.api as api
+from app.admission import AdmissionController, AdmissionMixin
+from app.bulk_responder import FastGetMixin
+from app.snmp_agent import SNMPAgent
+
+BASE = [1, 3, 6, 1, 4, 1, 99999]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_buckets_and_caps() -> None:
+    clock = _Clock()
+    depth = 0
+    admission = AdmissionController(
+        {"source_rate": 2, "community_rate": 3, "max_in_flight": 2, "max_varbinds": 10, "max_queue_depth": 5},
+        queue_depth=lambda: depth,
+        clock=clock,
+    )
+
+    assert admission.admit(1, "10.0.0.1", "public") is None
+    assert admission.admit(2, "10.0.0.1", "public") is None
+    # In-flight cap reached until a response is sent
+    assert admission.admit(3, "10.0.0.2", "public") == "in_flight"
+    admission.release(1)
+    admission.release(2)
+    admission.release(2)
+
+    # The source's bucket (burst defaults to the rate) is empty; another source is not
+    assert admission.admit(4, "10.0.0.1", "public") == "source_rate"
+    assert admission.admit(5, "10.0.0.2", "public") is None
+    admission.release(5)
+    # ...but the community's bucket is now empty too
+    assert admission.admit(6, "10.0.0.3", "public") == "community_rate"
+    assert admission.admit(7, "10.0.0.3", "private") is None
+    admission.release(7)
+
+    clock.now += 1.0
+    assert admission.admit(8, "10.0.0.1", "public") is None
+    admission.release(8)
+    assert admission.admit(9, "10.0.0.4", "private", var_binds=11) == "varbinds"
+
+    # The state-writer backlog only turns SETs away
+    depth = 6
+    assert admission.admit(10, "10.0.0.4", "private", write=True) == "queue_depth"
+    assert admission.admit(11, "10.0.0.4", "private") is None
+    admission.release(11)
+
+    stats = admission.snapshot()
+    assert stats["in_flight"] == 0
+    assert stats["admitted"] == 6
+    assert stats["dropped"] == {
+        "in_flight": 1,
+        "source_rate": 1,
+        "community_rate": 1,
+        "varbinds": 1,
+        "queue_depth": 1,
+    }
+    assert stats["dropped_by_source"]["10.0.0.1"] == 1
+    assert not AdmissionController({}).enabled
+
+
+def test_dropped_sources_are_capped(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(admission_module, "_MAX_TRACKED_SOURCES", 3)
+    admission = AdmissionController({"max_varbinds": 1})
+
+    for n in range(10):
+        assert admission.admit(n, f"10.0.0.{n}", "public", var_binds=2) == "varbinds"
+    admission.admit(10, "10.0.0.0", "public", var_binds=2)
+
+    # Known sources keep counting; the rest are folded together
+    assert admission.snapshot()["dropped_by_source"] == {"10.0.0.0": 2, "10.0.0.1": 1, "10.0.0.2": 1, "other": 7}
+
+
+def test_responder_drops_requests_over_the_limit(responder_harness: Any) -> None:
+    harness = responder_harness(
+        {"descr": {"oid": BASE + [1], "type": "DisplayString", "access": "read-only", "initial": "sim"}}
+    )
+    harness.sources.update({1: "10.0.0.1", 2: "10.0.0.1", 3: "10.0.0.2"})
+    responder, sent = harness.responder(cmdrsp.GetCommandResponder, AdmissionMixin, FastGetMixin)
+    responder.admission = AdmissionController({"source_rate": 1, "source_burst": 1})
+    responder.communities = SNMPAgent.COMMUNITIES
+
+    pdu = v2c.GetRequestPDU()
+    v2c.apiPDU.set_defaults(pdu)
+    v2c.apiPDU.set_varbinds(pdu, [(tuple(BASE + [1, 0]), v2c.null)])
+    for ref in (1, 2, 3):
+        harness.send(responder, pdu, ref)
+
+    assert [ref for ref, _ in sent] == [1, 3]
+    assert str(sent[0][1][0][1]) == "sim"
+    stats = responder.admission.snapshot()
+    assert stats["in_flight"] == 0
+    assert stats["dropped"] == {"source_rate": 1}
+
+
+def test_admission_is_visible_through_the_api() -> None:
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent.admission = AdmissionController({"max_in_flight": 8, "max_varbinds": 500})
+    agent.admission.admit(1, "10.0.0.1", "public", var_binds=600)
+
+    original = api.snmp_agent
+    api.snmp_agent = agent
+    try:
+        body = TestClient(api.app).get("/admission").json()
+    finally:
+        api.snmp_agent = original
+    assert body["enabled"] is True
+    assert body["limits"]["max_varbinds"] == 500
+    assert body["limits"]["source_rate"] is None
+    assert body["dropped"] == {"varbinds": 1}
+
+
+def test_stock_getbulk_is_capped_to_max_varbinds(responder_harness: Any) -> None:
+    harness = responder_harness({
+        "testTable": {"oid": BASE + [4], "type": "MibTable", "rows": [{"testIndex": i, "testCount": i} for i in range(1, 51)]},
+        "testEntry": {"oid": BASE + [4, 1], "type": "MibTableRow", "indexes": ["testIndex"]},
+        "testIndex": {"oid": BASE + [4, 1, 1], "type": "Integer32", "access": "not-accessible"},
+        "testCount": {"oid": BASE + [4, 1, 2], "type": "Integer32", "access": "read-only"},
+    })
+    # bulk_fast_path: false - admission in front of pysnmp's own GETBULK
+    responder, sent = harness.responder(cmdrsp.BulkCommandResponder, AdmissionMixin)
+    responder.admission = AdmissionController({"max_varbinds": 10})
+
+    pdu = v2c.GetBulkRequestPDU()
+    v2c.apiBulkPDU.set_defaults(pdu)
+    v2c.apiBulkPDU.set_non_repeaters(pdu, 1)
+    v2c.apiBulkPDU.set_max_repetitions(pdu, 1000)
+    v2c.apiBulkPDU.set_varbinds(pdu, [(tuple(BASE), v2c.null), (tuple(BASE + [4, 1, 2]), v2c.null), (tuple(BASE + [4, 1, 2]), v2c.null)])
+    harness.send(responder, pdu, 1)
+
+    # One non-repeater plus two repeaters of (10 - 1) // 2 repetitions
+    assert len(sent[0][1]) == 1 + 2 * 4
@@ -0,0 +1,145 @@
+import threading
+from typing import Any, Callable, Iterator
+
+import pytest
+
+from ui.api_client import GuiApiClient
+
+
+class _Root:
+    """Stands in for the Tk root: ``after`` runs the callback straight away."""
+
+    def after(self, _ms: int, callback: Callable[[], None]) -> None:
+        callback()
+
+
+@pytest.fixture
+def client() -> Iterator[GuiApiClient]:
+    client = GuiApiClient(_Root(), "http://127.0.0.1:1", max_workers=1)
+    yield client
+    client.close()
+
+
+def _occupy_worker(client: GuiApiClient) -> threading.Event:
+    """Keep the single worker busy until the returned event is set."""
+    started, gate = threading.Event(), threading.Event()
+
+    def _block() -> None:
+        started.set()
+        gate.wait(5)
+
+    client.submit(_block)
+    assert started.wait(5)
+    return gate
+
+
+def _wait_for(done: threading.Event) -> None:
+    assert done.wait(5)
+
+
+def _append_then_set(sink: list[Any], done: threading.Event) -> Callable[[Any], None]:
+    def _callback(value: Any) -> None:
+        sink.append(value)
+        done.set()
+
+    return _callback
+
+
+def test_identical_in_flight_requests_share_one_call(client: GuiApiClient) -> None:
+    gate = _occupy_worker(client)
+    calls: list[int] = []
+    results: list[Any] = []
+    done = threading.Event()
+
+    def _work() -> str:
+        calls.append(1)
+        return "value"
+
+    def _collect(value: Any) -> None:
+        results.append(value)
+        if len(results) == 3:
+            done.set()
+
+    for _ in range(3):
+        client.submit(_work, key="same", on_success=_collect)
+    gate.set()
+    _wait_for(done)
+
+    assert calls == [1]
+    assert results == ["value", "value", "value"]
+
+
+def test_errors_go_to_on_error(client: GuiApiClient) -> None:
+    errors: list[Exception] = []
+    done = threading.Event()
+
+    def _fail() -> None:
+        raise ValueError("boom")
+
+    client.submit(_fail, on_error=_append_then_set(errors, done))
+    _wait_for(done)
+
+    assert isinstance(errors[0], ValueError)
+
+
+def test_cancel_before_start_skips_the_call(client: GuiApiClient) -> None:
+    gate = _occupy_worker(client)
+    calls: list[int] = []
+    results: list[Any] = []
+
+    handle = client.submit(lambda: calls.append(1), key="k", on_success=results.append)
+    handle.cancel()
+    gate.set()
+    # A later request runs after the cancelled one would have
+    done = threading.Event()
+    client.submit(done.set)
+    _wait_for(done)
+
+    assert handle.cancelled
+    assert calls == []
+    assert results == []
+
+
+def test_cancelling_one_subscriber_keeps_the_shared_call(client: GuiApiClient) -> None:
+    gate = _occupy_worker(client)
+    first: list[Any] = []
+    second: list[Any] = []
+    done = threading.Event()
+
+    cancelled = client.submit(lambda: "v", key="k", on_success=first.append)
+    client.submit(lambda: "v", key="k", on_success=_append_then_set(second, done))
+    cancelled.cancel()
+    gate.set()
+    _wait_for(done)
+
+    assert first == []
+    assert second == ["v"]
+
+
+def test_cancel_group_drops_only_that_group(client: GuiApiClient) -> None:
+    gate = _occupy_worker(client)
+    seen: list[str] = []
+    done = threading.Event()
+
+    client.submit(lambda: "a", group="selection", on_success=seen.append)
+    client.submit(lambda: "b", group="selection", on_success=seen.append)
+    client.submit(lambda: "c", group="other", on_success=_append_then_set(seen, done))
+    client.cancel_group("selection")
+    gate.set()
+    _wait_for(done)
+
+    assert seen == ["c"]
+    # Finished requests leave no group bookkeeping behind
+    assert client._groups == {}
+
+
+def test_completed_key_allows_a_fresh_call(client: GuiApiClient) -> None:
+    calls: list[int] = []
+    results: list[Any] = []
+    for _ in range(2):
+        done = threading.Event()
+        client.submit(lambda: calls.append(1), key="k", on_success=_append_then_set(results, done))
+        _wait_for(done)
+
+    assert calls == [1, 1]
+    assert client._inflight == {}
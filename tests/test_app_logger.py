@@ -0,0 +1,70 @@
+import logging
+from pathlib import Path
+
+from app.app_logger import AppLogger, BatchingQueueListener, BoundedQueueHandler, LoggingConfig
+
+
+def test_queued_logging_writes_through_listener(tmp_path: Path) -> None:
+    AppLogger._configured = False
+    log_dir = tmp_path / "logs-queued"
+    config = LoggingConfig(level="INFO", log_dir=log_dir, console=False, queued=True, queue_size=100)
+
+    root = logging.getLogger()
+    old_handlers = list(root.handlers)
+    try:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        AppLogger(config)
+        # Logging threads only see the queue handler
+        assert [type(h) for h in root.handlers] == [BoundedQueueHandler]
+
+        for i in range(20):
+            root.info("queued message %d", i)
+        stats = AppLogger.queue_stats()
+        assert stats is not None and stats["enqueued"] == 20
+
+        AppLogger.shutdown()
+        content = (log_dir / "snmp-agent.log").read_text()
+        assert "queued message 0" in content
+        assert "queued message 19" in content
+        assert AppLogger.queue_stats() is None
+    finally:
+        AppLogger.shutdown()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in old_handlers:
+            root.addHandler(handler)
+        AppLogger._configured = False
+
+
+def test_bounded_queue_handler_drops_instead_of_blocking() -> None:
+    handler = BoundedQueueHandler(maxsize=2)
+    logger = logging.getLogger("test.bounded-queue")
+    for i in range(5):
+        handler.handle(logger.makeRecord(logger.name, logging.INFO, __file__, 0, "msg %d", (i,), None))
+    assert handler.stats() == {"enqueued": 2, "dropped": 3, "overflows": 1, "pending": 2, "capacity": 2}
+
+
+def test_listener_respects_handler_levels_and_reports_drops() -> None:
+    queue_handler = BoundedQueueHandler(maxsize=3)
+    seen: list[str] = []
+
+    class _Collect(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            seen.append(record.getMessage())
+
+    warnings_only = _Collect(logging.WARNING)
+    everything = _Collect()
+    logger = logging.getLogger("test.batching-listener")
+    for i in range(5):
+        queue_handler.handle(logger.makeRecord(logger.name, logging.INFO, __file__, 0, "msg %d", (i,), None))
+
+    listener = BatchingQueueListener(queue_handler, warnings_only, everything)
+    listener.start()
+    listener.stop()
+    listener.stop()
+
+    # Three records fitted; the two dropped ones are reported to both handlers
+    assert seen == ["msg 0", "msg 1", "msg 2"] + ["Logging queue full: dropped 2 record(s)"] * 2
+    assert listener.batches >= 1
+    assert getattr(everything, "defer_flush", False) is False
@@ -0,0 +1,181 @@
+from typing import Any
+
+from pysnmp.entity import config, engine
+from pysnmp.entity.rfc3413 import cmdrsp, context
+from pysnmp.proto.api import v2c
+from pysnmp.smi import exval
+
+from app.bulk_responder import FastBulkMixin, FastGetMixin, FastNextCommandResponder, FastNextMixin, InstanceIndex
+
+BASE = [1, 3, 6, 1, 4, 1, 99999]
+ROWS = 200
+
+
+def _schema() -> dict[str, Any]:
+    return {
+        "contact": {"oid": BASE + [1], "type": "DisplayString", "access": "read-write", "initial": "nobody"},
+        "testTable": {
+            "oid": BASE + [4],
+            "type": "MibTable",
+            "rows": [{"testIndex": i, "testName": f"row{i}", "testCount": i * 10} for i in range(1, ROWS + 1)],
+        },
+        "testEntry": {"oid": BASE + [4, 1], "type": "MibTableRow", "indexes": ["testIndex"]},
+        "testIndex": {"oid": BASE + [4, 1, 1], "type": "Integer32", "access": "not-accessible"},
+        "testName": {"oid": BASE + [4, 1, 2], "type": "DisplayString", "access": "read-only"},
+        "testCount": {"oid": BASE + [4, 1, 3], "type": "Integer32", "access": "read-only"},
+    }
+
+
+def _bulk_pdu(names: list[tuple[int, ...]], non_repeaters: int, max_repetitions: int) -> Any:
+    pdu = v2c.GetBulkRequestPDU()
+    v2c.apiBulkPDU.set_defaults(pdu)
+    v2c.apiBulkPDU.set_non_repeaters(pdu, non_repeaters)
+    v2c.apiBulkPDU.set_max_repetitions(pdu, max_repetitions)
+    v2c.apiBulkPDU.set_varbinds(pdu, [(name, v2c.null) for name in names])
+    return pdu
+
+
+def _plain(var_binds: list[Any]) -> list[tuple[tuple[int, ...], Any]]:
+    return [(tuple(name), value if value is exval.endOfMibView else value.prettyPrint()) for name, value in var_binds]
+
+
+def test_getbulk_matches_the_stock_responder(responder_harness: Any) -> None:
+    harness = responder_harness(_schema())
+    pdu = _bulk_pdu([tuple(BASE), tuple(BASE + [4, 1, 2]), tuple(BASE + [4, 1, 3])], 1, 20)
+
+    stock, stock_sent = harness.responder(cmdrsp.BulkCommandResponder)
+    stock.handle_management_operation(None, 1, b"", pdu)
+    fast, fast_sent = harness.responder(cmdrsp.BulkCommandResponder, FastBulkMixin)
+    fast.handle_management_operation(None, 1, b"", pdu)
+
+    assert len(fast_sent[0][1]) == 1 + 2 * 20
+    assert _plain(fast_sent[0][1]) == _plain(stock_sent[0][1])
+    assert _plain(fast_sent[0][1])[:2] == [(tuple(BASE + [1, 0]), "nobody"), (tuple(BASE + [4, 1, 2, 1]), "row1")]
+
+    next_pdu = v2c.GetNextRequestPDU()
+    v2c.apiPDU.set_defaults(next_pdu)
+    v2c.apiPDU.set_varbinds(next_pdu, [(tuple(BASE + [4, 1, 2, ROWS]), v2c.null), (tuple(BASE + [9]), v2c.null)])
+    responder, sent = harness.responder(cmdrsp.NextCommandResponder, FastNextMixin)
+    responder.handle_management_operation(None, 1, b"", next_pdu)
+    assert _plain(sent[0][1]) == [(tuple(BASE + [4, 1, 3, 1]), "10"), (tuple(BASE + [9]), exval.endOfMibView)]
+
+
+def test_getbulk_stops_at_end_of_mib_and_size_limit(responder_harness: Any) -> None:
+    responder, sent = responder_harness(_schema()).responder(cmdrsp.BulkCommandResponder, FastBulkMixin)
+
+    # Past the last instance: one endOfMibView per repeater, then the response ends
+    responder.handle_management_operation(None, 1, b"", _bulk_pdu([tuple(BASE + [4, 1, 3, ROWS - 1])], 0, 50))
+    assert _plain(sent[-1][1]) == [
+        (tuple(BASE + [4, 1, 3, ROWS]), str(ROWS * 10)),
+        (tuple(BASE + [4, 1, 3, ROWS]), exval.endOfMibView),
+    ]
+
+    # The response is cut short rather than exceeding the manager's size limit
+    responder._max_response_size = 484
+    responder.handle_management_operation(None, 1, b"", _bulk_pdu([tuple(BASE)], 0, 100))
+    assert 0 < len(sent[-1][1]) < 100
+
+
+def test_index_follows_exported_symbols(responder_harness: Any) -> None:
+    mib_builder = responder_harness(_schema()).mib_builder
+    index = InstanceIndex(mib_builder)
+    count = len(index)
+    assert count == 1 + 2 * ROWS
+
+    mib_builder.unexport_symbols("TEST-MIB", "contactInst")
+    assert len(index) == count - 1
+    assert index.successors(tuple(BASE), 1)[0].name == tuple(BASE + [4, 1, 2, 1])
+
+
+def test_immutable_instances_are_served_pre_encoded(responder_harness: Any) -> None:
+    name = tuple(BASE + [4, 1, 2, 5])
+    get_pdu = v2c.GetRequestPDU()
+    v2c.apiPDU.set_defaults(get_pdu)
+    v2c.apiPDU.set_varbinds(get_pdu, [(name, v2c.null), (tuple(BASE + [1, 0]), v2c.null)])
+    responder, sent = responder_harness(_schema()).responder(cmdrsp.GetCommandResponder, FastGetMixin)
+    index = responder.instance_index
+
+    responder.handle_management_operation(None, 1, b"", get_pdu)
+    responder.handle_management_operation(None, 1, b"", get_pdu)
+    assert _plain(sent[-1][1]) == [(name, "row5"), (tuple(BASE + [1, 0]), "nobody")]
+    # The read-only cell is encoded once; the writable scalar is never cached
+    assert index.stats == {"hits": 1, "misses": 1}
+
+    # A write replaces the syntax object, which invalidates the cached encoding
+    cell = index.instance(name)
+    cell.syntax = cell.syntax.clone("renamed")
+    responder.handle_management_operation(None, 1, b"", get_pdu)
+    assert _plain(sent[-1][1])[0] == (name, "renamed")
+    assert index.stats["misses"] == 2
+
+    # OIDs that are not served instances are answered by pysnmp
+    v2c.apiPDU.set_varbinds(get_pdu, [(tuple(BASE + [4, 1, 2, ROWS + 1]), v2c.null)])
+    responder.handle_management_operation(None, 1, b"", get_pdu)
+    assert sent[-1][1][0][1] is exval.noSuchInstance
+
+
+def _engine_walk(snmp_engine: Any, snmp_context: Any, cls: type, fast: bool, start: tuple[int, ...] = (1, 3, 6)) -> list[Any]:
+    """GETNEXT walk through a responder on a real engine, checked by its VACM."""
+    responder = cls(snmp_engine, snmp_context)
+    if fast:
+        responder.instance_index = InstanceIndex(snmp_engine.get_mib_builder(), snmp_context.get_mib_instrum())
+    sent: list[Any] = []
+    responder.send_varbinds = lambda _e, _s, _es, _ei, var_binds: sent.append(var_binds)
+    responder.release_state_information = lambda _s: None
+    walked: list[Any] = []
+    name = start
+    try:
+        for _ in range(1000):
+            pdu = v2c.GetNextRequestPDU()
+            v2c.apiPDU.set_defaults(pdu)
+            v2c.apiPDU.set_varbinds(pdu, [(name, v2c.null)])
+            # What the message processing layer records for the access check
+            snmp_engine.observer.store_execution_context(
+                snmp_engine, "rfc3412.receiveMessage:request",
+                {"securityModel": 2, "securityName": v2c.OctetString("my-area"),
+                 "securityLevel": 1, "contextName": b"", "pdu": pdu},
+            )
+            try:
+                responder.handle_management_operation(snmp_engine, 1, b"", pdu)
+            finally:
+                snmp_engine.observer.clear_execution_context(snmp_engine, "rfc3412.receiveMessage:request")
+            name, value = sent[-1][0]
+            if value is exval.endOfMibView:
+                break
+            walked.append((tuple(name), value.prettyPrint()))
+    finally:
+        responder.close(snmp_engine)
+    return walked
+
+
+def _community_engine() -> tuple[Any, Any]:
+    snmp_engine = engine.SnmpEngine()
+    config.add_v1_system(snmp_engine, "my-area", "public")
+    config.add_vacm_user(snmp_engine, 2, "my-area", "noAuthNoPriv", (1, 3, 6))
+    return snmp_engine, context.SnmpContext(snmp_engine)
+
+
+def test_walk_includes_rows_pysnmp_creates_under_table_columns() -> None:
+    snmp_engine, snmp_context = _community_engine()
+
+    stock = _engine_walk(snmp_engine, snmp_context, cmdrsp.NextCommandResponder, fast=False)
+    fast = _engine_walk(snmp_engine, snmp_context, FastNextCommandResponder, fast=True)
+
+    # The community and VACM rows exist only as children of their columns
+    community_name = (1, 3, 6, 1, 6, 3, 18, 1, 1, 1, 2) + tuple(b"my-area")
+    assert (community_name, "public") in stock
+    assert [name for name, _ in fast] == [name for name, _ in stock]
+
+
+def test_index_picks_up_rows_created_after_it_was_built() -> None:
+    snmp_engine, snmp_context = _community_engine()
+    index = InstanceIndex(snmp_engine.get_mib_builder(), snmp_context.get_mib_instrum())
+    community_table = (1, 3, 6, 1, 6, 3, 18, 1, 1, 1, 2)
+    before = [tuple(inst.name) for inst in index.successors(community_table, 10)]
+
+    config.add_v1_system(snmp_engine, "other-area", "private")
+
+    after = [tuple(inst.name) for inst in index.successors(community_table, 10)]
+    assert community_table + tuple(b"other-area") not in before
+    assert community_table + tuple(b"other-area") in after
+    assert index.instance(community_table + tuple(b"other-area")) is not None
@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from app.cli_bake_state import bake_state_into_schemas
+
+TABLE_OID = [1, 3, 6, 1, 4, 1, 99999, 3]
+
+
+def _schema() -> dict[str, Any]:
+    return {
+        "objects": {
+            "testScalar": {"oid": [1, 3, 6, 1, 4, 1, 99999, 1], "type": "Integer32", "initial": 1},
+            "testTable": {"oid": TABLE_OID, "type": "MibTable", "rows": []},
+            "testEntry": {"oid": TABLE_OID + [1], "type": "MibTableRow", "indexes": ["testIndex", "testAddr"]},
+            "testIndex": {"oid": TABLE_OID + [1, 1], "type": "Integer32"},
+            "testAddr": {"oid": TABLE_OID + [1, 2], "type": "IpAddress"},
+            "testValue": {"oid": TABLE_OID + [1, 3], "type": "DisplayString"},
+        },
+        "traps": {},
+    }
+
+
+def _write(schema_dir: Path, mib: str, schema: dict[str, Any]) -> Path:
+    path = schema_dir / mib / "schema.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(schema, indent=2))
+    return path
+
+
+def test_bake_scalars_and_tables(tmp_path: Path) -> None:
+    target = _write(tmp_path, "TEST-MIB", _schema())
+    state = {
+        "scalars": {"1.3.6.1.4.1.99999.1.0": 42},
+        "tables": {
+            "1.3.6.1.4.1.99999.3": {"7.10.0.0.1": {"column_values": {"testValue": "seven"}}},
+        },
+        "deleted_instances": [],
+    }
+
+    assert bake_state_into_schemas(tmp_path, state) == 2
+
+    objects = json.loads(target.read_text())["objects"]
+    assert objects["testScalar"]["initial"] == 42
+    assert objects["testTable"]["rows"] == [{"testIndex": 7, "testAddr": "10.0.0.1", "testValue": "seven"}]
+
+
+def test_bake_only_rewrites_files_that_change(tmp_path: Path) -> None:
+    untouched = _write(tmp_path, "OTHER-MIB", {"objects": {"x": {"oid": [1, 3, 6, 1, 4, 1, 1], "type": "Integer32"}}})
+    target = _write(tmp_path, "TEST-MIB", _schema())
+    untouched_mtime = untouched.stat().st_mtime_ns
+
+    state = {"scalars": {"1.3.6.1.4.1.99999.1.0": 1}, "tables": {}}
+    # Value already matches the schema: counted, but nothing is rewritten
+    target_mtime = target.stat().st_mtime_ns
+    assert bake_state_into_schemas(tmp_path, state) == 1
+    assert target.stat().st_mtime_ns == target_mtime
+    assert untouched.stat().st_mtime_ns == untouched_mtime
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_bake_skips_unreadable_schema(tmp_path: Path) -> None:
+    bad = tmp_path / "BAD-MIB" / "schema.json"
+    bad.parent.mkdir()
+    bad.write_text("{ not json")
+    target = _write(tmp_path, "TEST-MIB", _schema())
+
+    state = {"scalars": {"1.3.6.1.4.1.99999.1.0": 5}, "tables": {}}
+    assert bake_state_into_schemas(tmp_path, state) == 1
+    assert json.loads(target.read_text())["objects"]["testScalar"]["initial"] == 5
+
+
+def test_bake_decodes_string_indexes(tmp_path: Path) -> None:
+    schema = {
+        "objects": {
+            "nTable": {"oid": TABLE_OID, "type": "MibTable", "rows": []},
+            "nEntry": {"oid": TABLE_OID + [1], "type": "MibTableRow", "indexes": ["nName"]},
+            "nName": {"oid": TABLE_OID + [1, 1], "type": "SnmpAdminString"},
+            "nVal": {"oid": TABLE_OID + [1, 2], "type": "Integer32"},
+        }
+    }
+    target = _write(tmp_path, "TEST-MIB", schema)
+    state = {
+        "tables": {
+            "1.3.6.1.4.1.99999.3": {
+                "101.116.104.48": {"column_values": {"nVal": 3}},
+                # Key saved before string indexes were encoded
+                "lo": {"column_values": {"nVal": 4}},
+            }
+        }
+    }
+
+    registry = {"SnmpAdminString": {"base_type": "OctetString"}}
+    assert bake_state_into_schemas(tmp_path, state, type_registry=registry) == 2
+    assert json.loads(target.read_text())["objects"]["nTable"]["rows"] == [
+        {"nName": "eth0", "nVal": 3},
+        {"nName": "lo", "nVal": 4},
+    ]
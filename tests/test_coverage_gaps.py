@@ -229,7 +229,7 @@ def test_type_recorder_build_handles_symbol_with_no_getsyntax(tmp_path: Path, mo
     recorder = TypeRecorder(tmp_path)
     
     mock_engine = mocker.patch('app.type_recorder._engine.SnmpEngine')
-    mocker.patch('app.type_recorder._builder.DirMibSource')
+    mocker.patch('app.type_recorder.MibBuildContext.add_source')
     mock_glob = mocker.patch.object(Path, 'glob')
     
     # Create a symbol without getSyntax
@@ -256,7 +256,7 @@ def test_type_recorder_build_getsyntax_raises_exception(tmp_path: Path, mocker:
     recorder = TypeRecorder(tmp_path)
     
     mock_engine = mocker.patch('app.type_recorder._engine.SnmpEngine')
-    mocker.patch('app.type_recorder._builder.DirMibSource')
+    mocker.patch('app.type_recorder.MibBuildContext.add_source')
     mock_glob = mocker.patch.object(Path, 'glob')
     
     class FailingSymbol:
@@ -283,7 +283,7 @@ def test_type_recorder_build_getsyntax_returns_none(tmp_path: Path, mocker: Any)
     recorder = TypeRecorder(tmp_path)
     
     mock_engine = mocker.patch('app.type_recorder._engine.SnmpEngine')
-    mocker.patch('app.type_recorder._builder.DirMibSource')
+    mocker.patch('app.type_recorder.MibBuildContext.add_source')
     mock_glob = mocker.patch.object(Path, 'glob')
     
     class NoneSymbol:
@@ -0,0 +1,141 @@
+import logging
+import time
+from typing import Any
+
+import pytest
+from pysnmp.smi import builder
+
+from app.deleted_instances import DeletedInstances
+from app.mib_registrar import MibRegistrar
+from app.snmp_agent import SNMPAgent
+from app.snmp_table_responder import SNMPTableResponder
+
+BASE = [1, 3, 6, 1, 4, 1, 99999]
+TABLE_OID = ".".join(map(str, BASE + [3]))
+
+
+def _schema(rows: int = 3) -> dict[str, Any]:
+    return {
+        "objects": {
+            "testTable": {
+                "oid": BASE + [3],
+                "type": "MibTable",
+                "rows": [{"testIndex": i, "testValue": f"v{i}"} for i in range(1, rows + 1)],
+            },
+            "testEntry": {"oid": BASE + [3, 1], "type": "MibTableRow", "indexes": ["testIndex"]},
+            "testIndex": {"oid": BASE + [3, 1, 1], "type": "Integer32", "access": "not-accessible"},
+            "testValue": {"oid": BASE + [3, 1, 2], "type": "DisplayString", "access": "read-write"},
+        },
+        "traps": {},
+    }
+
+
+@pytest.fixture
+def registrar() -> MibRegistrar:
+    mib_builder = builder.MibBuilder()
+    mib_builder.load_modules("SNMPv2-SMI", "SNMPv2-TC")
+    scalar_inst, table, row, column = mib_builder.import_symbols(
+        "SNMPv2-SMI", "MibScalarInstance", "MibTable", "MibTableRow", "MibTableColumn"
+    )
+    return MibRegistrar(mib_builder, scalar_inst, table, row, column, logging.getLogger("test"), time.time())
+
+
+def _agent(registrar: MibRegistrar, rows: int = 3) -> SNMPAgent:
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent.mib_builder = registrar.mib_builder
+    agent.mib_registrar = registrar
+    agent.mib_jsons = {"TEST-MIB": _schema(rows)}
+    agent._save_mib_state = lambda: None  # type: ignore[method-assign]
+    registrar.deleted_instances = agent.deleted_instances
+    registrar.register_mib("TEST-MIB", agent.mib_jsons["TEST-MIB"], {})
+    return agent
+
+
+def test_per_table_sets_and_compact_state() -> None:
+    deleted = DeletedInstances()
+    assert deleted.add("1.3.6.1.2.1.2.2", "10") is True
+    assert deleted.add("1.3.6.1.2.1.2.2", "10") is False
+    deleted.add("1.3.6.1.2.1.2.2", "9")
+    deleted.add("1.3.6.1.2.1.4.20", "10.0.0.1")
+
+    assert len(deleted) == 3
+    assert deleted.contains("1.3.6.1.2.1.2.2", "9")
+    assert "1.3.6.1.2.1.4.20.10.0.0.1" in deleted
+    assert deleted.to_state() == {"1.3.6.1.2.1.2.2": ["9", "10"], "1.3.6.1.2.1.4.20": ["10.0.0.1"]}
+    assert deleted.retain("1.3.6.1.2.1.2.2", {"10"}) == 1
+    assert deleted.discard("1.3.6.1.2.1.4.20", "10.0.0.1") is True
+    assert deleted.tables() == ["1.3.6.1.2.1.2.2"]
+
+    # Legacy flat list: split at the longest known table OID
+    legacy = DeletedInstances.from_state(
+        ["1.3.6.1.2.1.4.20.10.0.0.1", "1.3.6.1.2.1.2.2.7"], ["1.3.6.1.2.1.2.2", "1.3.6.1.2.1.4.20"]
+    )
+    assert legacy.to_state() == {"1.3.6.1.2.1.2.2": ["7"], "1.3.6.1.2.1.4.20": ["10.0.0.1"]}
+    assert DeletedInstances.from_state(legacy.to_state()).to_state() == legacy.to_state()
+
+
+def test_delete_and_restore_hide_rows_from_snmp(registrar: MibRegistrar) -> None:
+    agent = _agent(registrar)
+    symbols = registrar.mib_builder.mibSymbols["TEST-MIB"]
+    assert "testValueInst_2" in symbols
+
+    agent.delete_table_instance(TABLE_OID, {"testIndex": 2})
+    assert agent.deleted_instances.for_table(TABLE_OID) == {"2"}
+    assert "testValueInst_2" not in symbols
+    assert agent.state_snapshot().deleted_instances[TABLE_OID] == frozenset({"2"})
+
+    # Rows outside the schema are never tracked
+    agent.delete_table_instance(TABLE_OID, {"testIndex": 99})
+    assert len(agent.deleted_instances) == 1
+
+    assert agent.restore_table_instance(TABLE_OID, {"testIndex": 2}, {"testValue": "back"})
+    assert len(agent.deleted_instances) == 0
+    assert str(symbols["testValueInst_2"].syntax) == "back"
+
+
+def test_registration_skips_deleted_rows(registrar: MibRegistrar) -> None:
+    registrar.deleted_instances = DeletedInstances.from_state({TABLE_OID: ["1", "3"]})
+    registrar.register_mib("TEST-MIB", _schema(), {})
+    symbols = registrar.mib_builder.mibSymbols["TEST-MIB"]
+
+    assert "testValueInst_1" not in symbols
+    assert "testValueInst_2" in symbols
+    assert registrar.set_table_row_served(TABLE_OID, "3", True) is True
+    assert str(symbols["testValueInst_3"].syntax) == "v3"
+    assert registrar.set_table_row_served(TABLE_OID, "42", True) is False
+
+
+def test_reset_state_serves_deleted_rows_again(registrar: MibRegistrar) -> None:
+    agent = _agent(registrar)
+    agent.delete_table_instance(TABLE_OID, {"testIndex": 1})
+    assert "testValueInst_1" not in registrar.mib_builder.mibSymbols["TEST-MIB"]
+
+    agent.reset_state()
+    assert "testValueInst_1" in registrar.mib_builder.mibSymbols["TEST-MIB"]
+
+
+def test_mass_delete_and_filter_use_per_table_sets(registrar: MibRegistrar) -> None:
+    agent = _agent(registrar, rows=2000)
+    for i in range(1, 2001):
+        agent.delete_table_instance(TABLE_OID, {"testIndex": i}, propagate_augments=False)
+    assert len(agent.deleted_instances) == 2000
+    assert not any(name.startswith("testValueInst_") for name in registrar.mib_builder.mibSymbols["TEST-MIB"])
+
+    agent.deleted_instances.add(TABLE_OID, "5000")
+    agent.deleted_instances.add("1.3.6.1.4.1.12345.1", "1")
+    agent._filter_deleted_instances_against_schema()
+    assert agent.deleted_instances.tables() == [TABLE_OID]
+    assert len(agent.deleted_instances) == 2000
+
+
+def test_table_responder_skips_deleted_rows() -> None:
+    deleted = DeletedInstances()
+    deleted.add(TABLE_OID, "2")
+    responder = SNMPTableResponder(_schema(), mib_builder=None, deleted_instances=deleted)
+
+    row_two = tuple(BASE + [3, 1, 2, 2])
+    assert responder.handle_get_request(row_two) is None
+    assert responder.handle_get_request(tuple(BASE + [3, 1, 2, 1])) == "v1"
+    assert row_two not in responder._get_all_table_oids()
+    nxt = responder.handle_getnext_request(tuple(BASE + [3, 1, 2, 1]))
+    assert nxt is not None and nxt[0] == tuple(BASE + [3, 1, 2, 3])
@@ -0,0 +1,90 @@
+import asyncio
+import random
+from typing import Any
+
+from pysnmp.entity.rfc3413 import cmdrsp
+from pysnmp.proto.api import v2c
+
+from app.bulk_responder import FastGetMixin, FastNextMixin
+from app.fault_injection import FaultInjectionMixin, FaultInjector
+
+BASE = [1, 3, 6, 1, 4, 1, 99999]
+FAST = tuple(BASE + [1, 0])
+SLOW = tuple(BASE + [2, 0])
+SCHEMA: dict[str, Any] = {
+    "fast": {"oid": BASE + [1], "type": "DisplayString", "access": "read-only", "initial": "quick"},
+    "slow": {"oid": BASE + [2], "type": "DisplayString", "access": "read-only", "initial": "sluggish"},
+}
+
+
+def _responder(harness: Any, mixin: type, injector: FaultInjector) -> tuple[Any, list[Any]]:
+    base = cmdrsp.NextCommandResponder if mixin is FastNextMixin else cmdrsp.GetCommandResponder
+    responder, sent = harness.responder(base, FaultInjectionMixin, mixin)
+    responder.fault_injector = injector
+    return responder, sent
+
+
+def _pdu(pdu_class: Any, oid: tuple[int, ...]) -> Any:
+    pdu = pdu_class()
+    v2c.apiPDU.set_defaults(pdu)
+    v2c.apiPDU.set_varbinds(pdu, [(oid, v2c.null)])
+    return pdu
+
+
+def _answers(sent: list[Any]) -> list[tuple[int, str]]:
+    return [(ref, str(var_binds[0][1])) for ref, var_binds in sent]
+
+
+def test_profiles_match_subtrees_and_sources() -> None:
+    subtrees = {"TEST-MIB": [tuple(BASE + [2])]}
+    injector = FaultInjector.from_config(
+        [
+            {"name": "slow", "mib": "TEST-MIB", "delay_ms": 800},
+            {"oid": ".".join(map(str, BASE + [2])), "sources": ["10.0.0.9"], "timeout": True},
+            {"oid": "1.3.6.1.2.1.4", "drop_percent": 50},
+            {"mib": "UNKNOWN-MIB", "delay_ms": 5},
+        ],
+        lambda mib: subtrees.get(mib, []),
+    )
+    injector._rng = random.Random(1)
+
+    assert len(injector.profiles) == 3
+    assert injector.decide("10.0.0.1", [SLOW]) == (False, 0.8)
+    assert injector.decide("10.0.0.9", [SLOW]) == (True, 0.8)
+    assert injector.decide("10.0.0.1", [FAST]) == (False, 0.0)
+    drops = sum(injector.decide("10.0.0.1", [(1, 3, 6, 1, 2, 1, 4, 3, 0)])[0] for _ in range(1000))
+    assert 400 < drops < 600
+    assert injector.snapshot()["stats"]["matched"] == 1002
+
+
+def test_delayed_replies_do_not_block_other_requests(responder_harness: Any) -> None:
+    harness = responder_harness(SCHEMA)
+    injector = FaultInjector.from_config([{"oid": list(BASE + [2]), "delay_ms": 200}])
+    responder, sent = _responder(harness, FastGetMixin, injector)
+
+    async def _run() -> None:
+        for ref in range(1, 2001):
+            harness.send(responder, _pdu(v2c.GetRequestPDU, SLOW), ref)
+        harness.send(responder, _pdu(v2c.GetRequestPDU, FAST), 0)
+        # The unaffected request is answered at once; the slow ones are all pending
+        assert _answers(sent) == [(0, "quick")]
+        assert injector.stats["pending"] == 2000
+        await asyncio.sleep(0.4)
+
+    asyncio.run(_run())
+    assert len(sent) == 2001
+    assert _answers(sent)[-1] == (2000, "sluggish")
+    assert injector.stats["pending"] == 0
+    assert injector.stats["max_pending"] == 2000
+
+
+def test_walk_into_a_subtree_is_affected_and_drops_are_silent(responder_harness: Any) -> None:
+    harness = responder_harness(SCHEMA)
+    injector = FaultInjector.from_config([{"oid": list(BASE + [2]), "timeout": True}])
+    responder, sent = _responder(harness, FastNextMixin, injector)
+
+    # GETNEXT from the fast object lands in the dropped subtree
+    harness.send(responder, _pdu(v2c.GetNextRequestPDU, FAST), 1)
+    harness.send(responder, _pdu(v2c.GetNextRequestPDU, tuple(BASE)), 2)
+    assert _answers(sent) == [(2, "quick")]
+    assert injector.stats["dropped"] == 1
@@ -0,0 +1,109 @@
+import copy
+import logging
+import time
+from typing import Any
+
+import pytest
+from pysnmp.smi import builder
+
+from app.mib_registrar import MibRegistrar
+from app.snmp_agent import SNMPAgent
+
+BASE = [1, 3, 6, 1, 4, 1, 99999]
+
+
+def _schema() -> dict[str, Any]:
+    return {
+        "objects": {
+            "testA": {"oid": BASE + [1], "type": "Integer32", "access": "read-write", "initial": 1},
+            "testB": {"oid": BASE + [2], "type": "DisplayString", "access": "read-only", "initial": "b"},
+            "testTable": {"oid": BASE + [3], "type": "MibTable", "rows": [{"testIndex": 1, "testValue": "one"}]},
+            "testEntry": {"oid": BASE + [3, 1], "type": "MibTableRow", "indexes": ["testIndex"]},
+            "testIndex": {"oid": BASE + [3, 1, 1], "type": "Integer32", "access": "not-accessible"},
+            "testValue": {"oid": BASE + [3, 1, 2], "type": "DisplayString", "access": "read-write"},
+        },
+        "traps": {},
+    }
+
+
+@pytest.fixture
+def registrar() -> MibRegistrar:
+    mib_builder = builder.MibBuilder()
+    mib_builder.load_modules("SNMPv2-SMI", "SNMPv2-TC")
+    scalar_inst, table, row, column = mib_builder.import_symbols(
+        "SNMPv2-SMI", "MibScalarInstance", "MibTable", "MibTableRow", "MibTableColumn"
+    )
+    reg = MibRegistrar(mib_builder, scalar_inst, table, row, column, logging.getLogger("test"), time.time())
+    reg.register_mib("TEST-MIB", _schema(), {})
+    return reg
+
+
+def test_plan_only_touches_changed_scalar(registrar: MibRegistrar) -> None:
+    symbols = registrar.mib_builder.mibSymbols["TEST-MIB"]
+    test_a = symbols["testAInst"]
+    new = _schema()
+    new["objects"]["testB"]["initial"] = "changed"
+
+    plan = registrar.plan_mib_reload("TEST-MIB", _schema(), new, {})
+    assert plan.changed_objects == ["testB"]
+    assert plan.remove_symbols == ["testBInst"]
+    assert list(plan.add_symbols) == ["testBInst"]
+
+    registrar.apply_mib_reload(plan)
+    assert str(symbols["testBInst"].syntax) == "changed"
+    assert symbols["testAInst"] is test_a
+
+
+def test_plan_rebuilds_table_rows(registrar: MibRegistrar) -> None:
+    new = _schema()
+    new["objects"]["testTable"]["rows"] = [{"testIndex": 2, "testValue": "two"}]
+
+    plan = registrar.plan_mib_reload("TEST-MIB", _schema(), new, {})
+    assert plan.changed_objects == ["testTable"]
+    registrar.apply_mib_reload(plan)
+
+    symbols = registrar.mib_builder.mibSymbols["TEST-MIB"]
+    assert "testValueInst_1" not in symbols
+    assert str(symbols["testValueInst_2"].syntax) == "two"
+
+
+def test_unchanged_schema_yields_empty_plan(registrar: MibRegistrar) -> None:
+    plan = registrar.plan_mib_reload("TEST-MIB", _schema(), _schema(), {})
+    assert plan.is_empty
+
+
+def test_agent_reload_model_resets_state_and_rebuilds_touched_objects(registrar: MibRegistrar) -> None:
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent.mib_builder = registrar.mib_builder
+    agent.mib_registrar = registrar
+    agent.mib_jsons = {"TEST-MIB": _schema()}
+    agent._save_mib_state = lambda: None  # type: ignore[method-assign]
+    registrar.load_type_registry = lambda type_registry_path=None: {}  # type: ignore[method-assign]
+
+    symbols = registrar.mib_builder.mibSymbols["TEST-MIB"]
+    symbols["testAInst"].syntax = symbols["testAInst"].syntax.clone(42)
+    agent.overrides = {".".join(map(str, BASE + [1, 0])): 42}
+
+    new = copy.deepcopy(_schema())
+    new["objects"]["testB"]["initial"] = "new"
+    summary = agent.reload_model({"TEST-MIB": new})
+
+    assert summary["mibs"]["TEST-MIB"]["changed_objects"] == 2
+    assert int(symbols["testAInst"].syntax) == 1
+    assert str(symbols["testBInst"].syntax) == "new"
+    assert agent.overrides == {}
+    assert agent.mib_jsons["TEST-MIB"]["objects"]["testB"]["initial"] == "new"
+
+
+def test_agent_reload_model_reports_mibs_it_cannot_swap_in(registrar: MibRegistrar) -> None:
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent.mib_builder = registrar.mib_builder
+    agent.mib_registrar = registrar
+    agent.mib_jsons = {"TEST-MIB": _schema()}
+    agent._save_mib_state = lambda: None  # type: ignore[method-assign]
+    registrar.load_type_registry = lambda type_registry_path=None: {}  # type: ignore[method-assign]
+
+    summary = agent.reload_model({"TEST-MIB": _schema(), "OTHER-MIB": _schema()})
+
+    assert summary["skipped_mibs"] == ["OTHER-MIB"]
+    assert list(agent.mib_jsons) == ["TEST-MIB"]
@@ -0,0 +1,107 @@
+import pytest
+
+from app.index_codec import (
+    AUTO,
+    INT,
+    IPADDRESS,
+    OCTETS,
+    IndexCodec,
+    IndexCodecCache,
+    faux_index_str,
+    faux_index_values,
+    index_kind,
+)
+
+
+def test_index_kind_uses_type_registry_base_type() -> None:
+    registry = {"InterfaceIndex": {"base_type": "Integer32"}, "SnmpAdminString": {"base_type": "OctetString"}}
+    assert index_kind("IpAddress") == IPADDRESS
+    assert index_kind("InterfaceIndex", registry) == INT
+    assert index_kind("SnmpAdminString", registry) == OCTETS
+    assert index_kind("SomeTC") == AUTO
+
+
+def test_round_trip_mixed_index() -> None:
+    codec = IndexCodec(["ifIndex", "addr", "name"], [INT, IPADDRESS, OCTETS])
+    values = {"ifIndex": 3, "addr": "10.0.0.1", "name": "ab"}
+
+    suffix = codec.to_oid_suffix(values)
+    assert suffix == (3, 10, 0, 0, 1, 97, 98)
+    assert codec.to_instance_str(values) == "3.10.0.0.1.97.98"
+    assert codec.from_oid_suffix(suffix) == values
+    assert codec.from_instance_str("3.10.0.0.1.97.98") == values
+
+
+def test_defaults_fill_missing_columns() -> None:
+    codec = IndexCodec(["a", "b"], [INT, INT])
+    assert codec.to_oid_suffix({"b": 7}, {"a": 1, "b": 0}) == (1, 7)
+    assert not codec.covers({"b": 7})
+
+
+def test_auto_kind_accepts_dotted_numbers_and_text() -> None:
+    codec = IndexCodec(["x"], [AUTO])
+    assert codec.to_instance_str({"x": "1.2"}) == "1.2"
+    assert codec.to_instance_str({"x": 5}) == "5"
+    assert codec.to_instance_str({"x": "A"}) == "65"
+
+
+def test_decode_rejects_mismatched_suffix() -> None:
+    codec = IndexCodec(["a", "addr"], [INT, IPADDRESS])
+    with pytest.raises(ValueError):
+        codec.from_oid_suffix((1, 10, 0))
+    with pytest.raises(ValueError):
+        IndexCodec(["a"], [INT]).from_oid_suffix((1, 2))
+
+
+def test_suffix_cache_handles_unhashable_values() -> None:
+    codec = IndexCodec(["addr"], [IPADDRESS])
+    assert codec.to_oid_suffix({"addr": [192, 168, 0, 1]}) == (192, 168, 0, 1)
+    assert codec.to_oid_suffix({"addr": "192.168.0.1"}) is codec.to_oid_suffix({"addr": "192.168.0.1"})
+
+
+def test_codec_cache_compiles_from_schemas() -> None:
+    schemas = {
+        "TEST-MIB": {
+            "objects": {
+                "addrTable": {"oid": [1, 3, 6, 1, 4, 1, 1, 1], "type": "MibTable"},
+                "addrEntry": {"oid": [1, 3, 6, 1, 4, 1, 1, 1, 1], "type": "MibTableRow", "indexes": ["addrIp"]},
+                "addrIp": {"oid": [1, 3, 6, 1, 4, 1, 1, 1, 1, 1], "type": "IpAddress"},
+            }
+        }
+    }
+    cache = IndexCodecCache()
+    codec = cache.get("1.3.6.1.4.1.1.1", schemas)
+    assert codec is not None
+    assert codec.columns == ("addrIp",)
+    assert codec.kinds == (IPADDRESS,)
+    assert cache.get("1.3.6.1.4.1.1.1", schemas) is codec
+    assert cache.get("1.3.6.1.4.1.9", schemas) is None
+
+
+def test_faux_index_helpers() -> None:
+    assert faux_index_str({}) == "1"
+    assert faux_index_str({"__index__": 1, "__index_2__": 4}) == "1.4"
+    assert faux_index_str({"__instance__": "7"}) == "7"
+    assert faux_index_str({"index": 9}, legacy_keys=("index",)) == "9"
+    assert faux_index_values("1.2") == {"__index__": "1", "__index_2__": "2"}
+
+
+def test_invalid_values_raise_instead_of_encoding_zero() -> None:
+    with pytest.raises(ValueError):
+        IndexCodec(["a"], [INT]).to_instance_str({"a": "abc"})
+    with pytest.raises(ValueError):
+        IndexCodec(["addr"], [IPADDRESS]).to_instance_str({"addr": "10.0.1"})
+    with pytest.raises(ValueError):
+        IndexCodec(["addr"], [IPADDRESS]).to_instance_str({"addr": "10.0.0.256"})
+    assert IndexCodec(["a"], [INT]).to_instance_str({"a": "12"}) == "12"
+
+
+def test_legacy_instance_keys_are_reencoded() -> None:
+    codec = IndexCodec(["ifIndex", "addr", "name"], [INT, IPADDRESS, OCTETS])
+    assert codec.from_legacy_instance_str("3.10.0.0.1.eth.0") == "3.10.0.0.1.101.116.104.46.48"
+    # Already-encoded keys are left alone
+    assert codec.from_legacy_instance_str("3.10.0.0.1.97") == "3.10.0.0.1.97"
+    with pytest.raises(ValueError):
+        IndexCodec(["a", "b"], [INT, INT]).from_legacy_instance_str("x.1")
+    # A trailing index of unknown type decodes as the dotted value it was encoded from
+    assert IndexCodec(["a", "x"], [INT, AUTO]).from_instance_str("1.97.98") == {"a": 1, "x": "97.98"}
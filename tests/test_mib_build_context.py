@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from app.generator import BehaviourGenerator
+from app.mib_build_context import MibBuildContext
+from app.type_recorder import TypeRecorder
+
+COMPILED_MIB = '''
+(MibScalar, Integer32) = mibBuilder.import_symbols("SNMPv2-SMI", "MibScalar", "Integer32")
+with open(r"{counter}", "a") as counter:
+    counter.write("x")
+countValue = MibScalar((1, 3, 6, 1, 4, 1, 99999, 9, 1), Integer32()).setMaxAccess("read-write")
+mibBuilder.export_symbols("COUNT-MIB", countValue=countValue)
+'''
+
+
+def _compiled_dir(tmp_path: Path) -> tuple[Path, Path]:
+    compiled = tmp_path / "compiled-mibs"
+    compiled.mkdir()
+    counter = tmp_path / "executions"
+    (compiled / "COUNT-MIB.py").write_text(COMPILED_MIB.format(counter=counter))
+    return compiled, counter
+
+
+def test_pipeline_executes_each_module_once(tmp_path: Path) -> None:
+    compiled, counter = _compiled_dir(tmp_path)
+    context = MibBuildContext(compiled)
+    assert context.available_modules() == ["COUNT-MIB"]
+
+    recorder = TypeRecorder(compiled, modules=["COUNT-MIB"], build_context=context)
+    recorder.build()
+    assert "COUNT-MIB::countValue" in recorder.registry["Integer32"]["used_by"]
+
+    generator = BehaviourGenerator(str(tmp_path / "model"), build_context=context)
+    generator._type_registry = recorder.registry
+    schema = generator._extract_mib_info(str(compiled / "COUNT-MIB.py"), "COUNT-MIB")
+    assert schema["objects"]["countValue"]["oid"] == (1, 3, 6, 1, 4, 1, 99999, 9, 1)
+
+    # The agent's load of its served modules is then a no-op
+    assert context.load("COUNT-MIB", "SNMPv2-SMI") == []
+    assert counter.read_text() == "x"
+    assert context.load_counts["COUNT-MIB"] == 1
+
+
+def test_load_each_reports_missing_modules(tmp_path: Path) -> None:
+    compiled, _ = _compiled_dir(tmp_path)
+    context = MibBuildContext(compiled)
+
+    assert context.load_each(["NO-SUCH-MIB", "COUNT-MIB"]) == ["NO-SUCH-MIB"]
+    assert context.is_loaded("COUNT-MIB")
+    assert "countValue" in context.symbols("COUNT-MIB")
@@ -0,0 +1,77 @@
+import os
+from pathlib import Path
+
+from app.mib_catalogue import MibCatalogue, parse_mib_imports
+
+IF_MIB = """IF-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+    MODULE-IDENTITY, Counter32 FROM SNMPv2-SMI
+    DisplayString FROM SNMPv2-TC;
+END
+"""
+
+
+def test_parse_mib_imports_source_and_compiled() -> None:
+    assert parse_mib_imports(IF_MIB) == {"SNMPv2-SMI", "SNMPv2-TC"}
+    compiled = '(x,) = mibBuilder.import_symbols(\n    "SNMPv2-SMI",\n    "x")\n'
+    assert parse_mib_imports(compiled, compiled=True) == {"SNMPv2-SMI"}
+
+
+def test_refresh_reparses_only_changed_files(tmp_path: Path) -> None:
+    (tmp_path / "IF-MIB.txt").write_text(IF_MIB)
+    (tmp_path / "OTHER-MIB.txt").write_text("OTHER-MIB DEFINITIONS ::= BEGIN\nEND\n")
+    catalogue = MibCatalogue([str(tmp_path)])
+
+    assert catalogue.refresh() == 2
+    assert catalogue.imports("IF-MIB") == {"SNMPv2-SMI", "SNMPv2-TC"}
+    assert catalogue.refresh() == 0
+
+    other = tmp_path / "OTHER-MIB.txt"
+    other.write_text("OTHER-MIB DEFINITIONS ::= BEGIN\nIMPORTS x FROM IF-MIB;\nEND\n")
+    os.utime(other, (1, 1))
+    assert catalogue.refresh() == 1
+    assert catalogue.imports("OTHER-MIB") == {"IF-MIB"}
+
+
+def test_catalogue_persists_between_instances(tmp_path: Path) -> None:
+    mibs = tmp_path / "mibs"
+    mibs.mkdir()
+    (mibs / "IF-MIB.txt").write_text(IF_MIB)
+    cache_file = tmp_path / "catalogue.json"
+
+    first = MibCatalogue([str(mibs)], cache_file=cache_file)
+    assert first.refresh() == 1
+    entry = first.entry("IF-MIB")
+    assert entry is not None and entry.digest
+
+    second = MibCatalogue([str(mibs)], cache_file=cache_file)
+    assert second.refresh() == 0
+    assert second.imports("IF-MIB") == {"SNMPv2-SMI", "SNMPv2-TC"}
+
+
+def test_lookup_prefers_earlier_dirs_shallower_files_and_extension_order(tmp_path: Path) -> None:
+    first, second = tmp_path / "a", tmp_path / "b"
+    (first / "vendor").mkdir(parents=True)
+    second.mkdir()
+    (first / "vendor" / "X-MIB.txt").write_text("")
+    (first / "X-MIB.py").write_text("")
+    (first / "X-MIB.mib").write_text("")
+    (second / "Y-MIB.txt").write_text("")
+    catalogue = MibCatalogue([str(first), str(second)])
+
+    assert catalogue.find("X-MIB") == str(first / "X-MIB.mib")
+    assert catalogue.find("Y-MIB") == str(second / "Y-MIB.txt")
+    assert catalogue.find("MISSING-MIB") is None
+    assert catalogue.directories(under=str(first)) == [str(first), str(first / "vendor")]
+
+
+def test_shared_catalogues_are_keyed_by_scan_depth(tmp_path: Path) -> None:
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "X-MIB.txt").write_text("")
+
+    deep = MibCatalogue.shared([str(tmp_path)])
+    flat = MibCatalogue.shared([str(tmp_path)], max_depth=0)
+
+    assert MibCatalogue.shared([str(tmp_path)], max_depth=0) is flat
+    assert deep.find("X-MIB") == str(tmp_path / "vendor" / "X-MIB.txt")
+    assert flat.find("X-MIB") is None
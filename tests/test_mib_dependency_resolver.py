@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from app.mib_catalogue import MibCatalogue
+from app.mib_dependency_resolver import MibDependencyResolver
+
+
+def _write_compiled(directory: Path, name: str, imports: list[str]) -> None:
+    lines = [f'(x,) = mibBuilder.import_symbols(\n    "{dep}",\n    "x")' for dep in imports]
+    (directory / f"{name}.py").write_text("\n".join(lines) + "\n")
+
+
+def test_compiled_module_imports_are_parsed(tmp_path: Path) -> None:
+    _write_compiled(tmp_path, "A-MIB", ["B-MIB", "SNMPv2-SMI"])
+    resolver = MibDependencyResolver([str(tmp_path)], catalogue_file=tmp_path / "catalogue.json")
+
+    assert resolver.get_direct_dependencies("A-MIB") == {"B-MIB", "SNMPv2-SMI"}
+
+
+def test_load_closure_includes_transitive_imports_only(tmp_path: Path) -> None:
+    _write_compiled(tmp_path, "A-MIB", ["B-MIB"])
+    _write_compiled(tmp_path, "B-MIB", ["C-MIB"])
+    _write_compiled(tmp_path, "C-MIB", [])
+    _write_compiled(tmp_path, "OTHER-MIB", ["C-MIB"])
+    resolver = MibDependencyResolver([str(tmp_path)], catalogue_file=None)
+
+    assert resolver.get_load_closure(["A-MIB"]) == ["A-MIB", "B-MIB", "C-MIB"]
+
+
+def test_resolvers_share_one_catalogue_scan(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _write_compiled(tmp_path, "A-MIB", ["B-MIB"])
+    cache_file = tmp_path / "catalogue.json"
+    scans: list[int] = []
+    original = MibCatalogue.refresh
+
+    def _counting_refresh(self: MibCatalogue) -> int:
+        scans.append(1)
+        return original(self)
+
+    monkeypatch.setattr(MibCatalogue, "refresh", _counting_refresh)
+
+    for _ in range(3):
+        resolver = MibDependencyResolver([str(tmp_path)], catalogue_file=cache_file)
+        assert resolver.get_direct_dependencies("A-MIB") == {"B-MIB"}
+
+    assert resolver.catalogue is MibCatalogue.shared([str(tmp_path)], cache_file=cache_file)
+    assert len(scans) == 1
+    assert cache_file.exists()
@@ -0,0 +1,85 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app import model_cache
+from app.model_cache import cache_path_for, load_json, prune_cache
+
+
+def test_cache_is_written_and_reused(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "IF-MIB" / "schema.json"
+    source.parent.mkdir()
+    source.write_text(json.dumps({"objects": {"ifNumber": {"oid": [1, 3, 6, 1, 2, 1, 2, 1]}}}, indent=2))
+    cache_dir = tmp_path / "cache"
+
+    first = load_json(source, cache_dir)
+    assert cache_path_for(source, cache_dir).exists()
+
+    # A fresh cache entry is served without reading, hashing or parsing the source
+    monkeypatch.setattr(model_cache.json, "loads", lambda _raw: pytest.fail("JSON was re-parsed"))
+    monkeypatch.setattr(model_cache, "content_digest", lambda _raw: pytest.fail("source was hashed"))
+    second = load_json(source, cache_dir)
+    assert second == first
+    assert second is not first
+
+
+def test_touched_source_reuses_the_payload(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "types.json"
+    cache_dir = tmp_path / "cache"
+    source.write_text('{"a": 1}')
+    load_json(source, cache_dir)
+
+    # Same bytes, new mtime: the digest still matches, so nothing is re-parsed
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    monkeypatch.setattr(model_cache.json, "loads", lambda _raw: pytest.fail("JSON was re-parsed"))
+    assert load_json(source, cache_dir) == {"a": 1}
+    monkeypatch.setattr(model_cache, "content_digest", lambda _raw: pytest.fail("source was hashed"))
+    assert load_json(source, cache_dir) == {"a": 1}
+
+
+def test_prune_evicts_missing_sources_and_caps_entries(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    sources = []
+    for i in range(4):
+        source = tmp_path / f"m{i}" / "schema.json"
+        source.parent.mkdir()
+        source.write_text(json.dumps({"i": i}))
+        load_json(source, cache_dir)
+        sources.append(source)
+    (cache_dir / "junk.pickle").write_bytes(b"not a pickle")
+
+    sources[0].unlink()
+    assert prune_cache(cache_dir, max_entries=2) == 3
+    assert len(list(cache_dir.glob("*.pickle"))) == 2
+
+
+def test_changed_source_invalidates_cache(tmp_path: Path) -> None:
+    source = tmp_path / "types.json"
+    cache_dir = tmp_path / "cache"
+    source.write_text(json.dumps({"Integer32": {"base_type": "Integer32"}}))
+    assert "Integer32" in load_json(source, cache_dir)
+
+    source.write_text(json.dumps({"DisplayString": {"base_type": "OctetString"}}))
+    assert load_json(source, cache_dir) == {"DisplayString": {"base_type": "OctetString"}}
+
+
+def test_corrupt_cache_falls_back_to_json(tmp_path: Path) -> None:
+    source = tmp_path / "types.json"
+    cache_dir = tmp_path / "cache"
+    source.write_text('{"a": 1}')
+    cache_dir.mkdir()
+    cache_path_for(source, cache_dir).write_bytes(b"not a pickle")
+
+    assert load_json(source, cache_dir) == {"a": 1}
+    # The bad entry has been replaced with a readable one
+    assert load_json(source, cache_dir) == {"a": 1}
+
+
+def test_invalid_json_still_raises(tmp_path: Path) -> None:
+    source = tmp_path / "schema.json"
+    source.write_text("{not json")
+    with pytest.raises(json.JSONDecodeError):
+        load_json(source, tmp_path / "cache")
@@ -0,0 +1,113 @@
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+from pysnmp.proto import rfc1902
+from pysnmp.smi import builder, instrum
+
+from app.mib_registrar import MibRegistrar
+from app.snmp_agent import SNMPAgent
+from app.table_graph import TableGraph
+
+BASE = [1, 3, 6, 1, 4, 1, 99999]
+TABLE_OID = ".".join(map(str, BASE + [4]))
+CONTACT = tuple(BASE + [1, 0])
+
+
+def _schema() -> dict[str, Any]:
+    return {
+        "contact": {"oid": BASE + [1], "type": "DisplayString", "access": "read-write", "initial": "nobody"},
+        "testTable": {
+            "oid": BASE + [4],
+            "type": "MibTable",
+            "rows": [{"testIndex": 1, "testName": "row1"}],
+        },
+        "testEntry": {"oid": BASE + [4, 1], "type": "MibTableRow", "indexes": ["testIndex"]},
+        "testIndex": {"oid": BASE + [4, 1, 1], "type": "Integer32", "access": "not-accessible"},
+        "testName": {"oid": BASE + [4, 1, 2], "type": "DisplayString", "access": "read-write"},
+    }
+
+
+def _agent(tmp_path: Path) -> tuple[SNMPAgent, Any]:
+    mib_builder = builder.MibBuilder()
+    mib_builder.load_modules("SNMPv2-SMI", "SNMPv2-TC")
+    scalar_inst, table, row, column = mib_builder.import_symbols(
+        "SNMPv2-SMI", "MibScalarInstance", "MibTable", "MibTableRow", "MibTableColumn"
+    )
+    registrar = MibRegistrar(mib_builder, scalar_inst, table, row, column, logging.getLogger("test"), time.time())
+
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent._state_file_path = lambda: str(tmp_path / "mib_state.json")  # type: ignore[method-assign]
+    agent.mib_builder = mib_builder
+    agent.mib_registrar = registrar
+    agent.mib_jsons = {"TEST-MIB": _schema()}
+    agent.table_graph = TableGraph.build(agent.mib_jsons)
+    # The compiled module would define the scalar's MibScalar
+    (mib_scalar,) = mib_builder.import_symbols("SNMPv2-SMI", "MibScalar")
+    mib_builder.export_symbols(
+        "TEST-MIB-DEFS", contact=mib_scalar(tuple(BASE + [1]), rfc1902.OctetString()).setMaxAccess("read-write")
+    )
+    registrar.register_mib("TEST-MIB", agent.mib_jsons["TEST-MIB"], {})
+    agent._capture_initial_values()
+
+    mib_instrum = instrum.MibInstrumController(mib_builder)
+    agent._capture_network_sets(mib_instrum)
+    return agent, mib_instrum
+
+
+def _saved(tmp_path: Path) -> dict[str, Any]:
+    return json.loads((tmp_path / "mib_state.json").read_text())
+
+
+def test_set_pdu_is_persisted_as_one_change(tmp_path: Path) -> None:
+    agent, mib_instrum = _agent(tmp_path)
+    agent.add_table_instance(TABLE_OID, {"testIndex": 7}, {"testName": "dyn"})
+
+    mib_instrum.write_variables(
+        (CONTACT, rfc1902.OctetString("ops")),
+        (tuple(BASE + [4, 1, 2, 1]), rfc1902.OctetString("renamed")),
+    )
+
+    state = _saved(tmp_path)
+    assert state["scalars"][".".join(map(str, CONTACT))] == "ops"
+    # A schema row cell is kept as an instance override
+    assert state["scalars"][".".join(map(str, BASE + [4, 1, 2, 1]))] == "renamed"
+
+    # A SET on a row created at runtime updates the row's stored column values
+    mib_instrum.write_variables((tuple(BASE + [4, 1, 2, 7]), rfc1902.OctetString("changed")))
+    assert _saved(tmp_path)["tables"][TABLE_OID]["7"]["column_values"]["testName"] == "changed"
+
+    # Setting a value back to its initial value drops the override
+    mib_instrum.write_variables((CONTACT, rfc1902.OctetString("nobody")))
+    assert ".".join(map(str, CONTACT)) not in _saved(tmp_path)["scalars"]
+
+    # The saved state is what a restarted agent loads
+    restarted, _ = _agent(tmp_path)
+    restarted._load_mib_state()
+    restarted._apply_overrides()
+    assert str(restarted.get_scalar_value(tuple(BASE + [4, 1, 2, 1]))) == "renamed"
+
+
+def test_burst_of_sets_is_batched(tmp_path: Path) -> None:
+    agent, mib_instrum = _agent(tmp_path)
+    saves = 0
+    save = agent._save_mib_state
+
+    def _counting_save() -> None:
+        nonlocal saves
+        saves += 1
+        save()
+
+    agent._save_mib_state = _counting_save  # type: ignore[method-assign]
+    agent._state_queue.start()
+    try:
+        for i in range(2000):
+            mib_instrum.write_variables((CONTACT, rfc1902.OctetString(f"ops-{i}")))
+    finally:
+        agent._state_queue.stop()
+
+    assert _saved(tmp_path)["scalars"][".".join(map(str, CONTACT))] == "ops-1999"
+    assert saves < 2000
+    assert agent._state_queue.stats["commands"] == 2000
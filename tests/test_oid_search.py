@@ -0,0 +1,111 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+from fastapi.testclient import TestClient
+
+import app.api as api
+from app.oid_search import OidSearchIndex, name_tokens
+
+IF_SCHEMA: Dict[str, Any] = {
+    "objects": {
+        "ifTable": {"oid": [1, 3, 6, 1, 2, 1, 2, 2], "type": "MibTable"},
+        "ifEntry": {"oid": [1, 3, 6, 1, 2, 1, 2, 2, 1], "type": "MibTableRow"},
+        "ifDescr": {"oid": [1, 3, 6, 1, 2, 1, 2, 2, 1, 2], "type": "DisplayString"},
+        "ifAdminStatus": {
+            "oid": [1, 3, 6, 1, 2, 1, 2, 2, 1, 7],
+            "type": "Integer32",
+            "enums": {"up": 1, "down": 2, "testing": 3},
+        },
+        "ifOperStatus": {"oid": [1, 3, 6, 1, 2, 1, 2, 2, 1, 8], "type": "Integer32"},
+    },
+    "traps": {
+        "linkDown": {
+            "oid": [1, 3, 6, 1, 6, 3, 1, 1, 5, 3],
+            "description": "A linkDown trap signifies a communication link failure",
+        },
+    },
+}
+
+
+def _write_schema(schema_dir: Path, mib: str, schema: Dict[str, Any]) -> Path:
+    path = schema_dir / mib / "schema.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(schema))
+    return path
+
+
+def test_name_tokens_split_camel_case() -> None:
+    assert {"ifadminstatus", "if", "admin", "status"} <= name_tokens("ifAdminStatus")
+    assert {"http", "server"} <= name_tokens("HTTPServer")
+
+
+def test_prefix_substring_and_fuzzy_ranking() -> None:
+    index = OidSearchIndex()
+    index.update_mib("IF-MIB", IF_SCHEMA)
+
+    hits = index.search("ifAdmin")
+    assert hits[0].entry.name == "ifAdminStatus"
+    assert hits[0].matched == "name"
+
+    # Both words must match; exact name beats partial
+    assert [h.entry.name for h in index.search("oper status")] == ["ifOperStatus"]
+    assert index.search("ifDescr")[0].score > index.search("descr")[0].score
+
+    assert [h.entry.name for h in index.search("minstat", mode="substring")] == ["ifAdminStatus"]
+    assert index.search("minstat", mode="prefix") == []
+    assert index.search("ifAdminStatsu")[0].entry.name == "ifAdminStatus"
+
+    enum_hit = index.search("testing")[0]
+    assert (enum_hit.entry.name, enum_hit.matched) == ("ifAdminStatus", "enum")
+    trap_hit = index.search("failure")[0]
+    assert (trap_hit.entry.name, trap_hit.entry.kind) == ("linkDown", "notification")
+
+
+def test_oid_queries_return_subtree_in_order() -> None:
+    index = OidSearchIndex()
+    index.update_mib("IF-MIB", IF_SCHEMA)
+
+    names = [h.entry.name for h in index.search(".1.3.6.1.2.1.2.2")]
+    assert names[:2] == ["ifTable", "ifEntry"]
+    assert set(names) == {"ifTable", "ifEntry", "ifDescr", "ifAdminStatus", "ifOperStatus"}
+    # 1.3.6.1.2.1.2.2 must not match 1.3.6.1.2.1.2.22...
+    assert index.search("1.3.6.1.2.1.2.2.1.7")[0].to_dict()["path"] == [1, 3, 6, 1, 2, 1, 2, 2, 1, 7]
+    assert [h.entry.name for h in index.search("2.2.1.8", mode="substring")] == ["ifOperStatus"]
+
+
+def test_refresh_reindexes_only_changed_schemas(tmp_path: Path) -> None:
+    _write_schema(tmp_path, "IF-MIB", IF_SCHEMA)
+    other = _write_schema(tmp_path, "OTHER-MIB", {"objects": {"fooBar": {"oid": [1, 3, 6, 1, 4, 1, 99, 1]}}})
+    index = OidSearchIndex()
+
+    assert index.refresh_from_dir(str(tmp_path)) == 2
+    assert index.refresh_from_dir(str(tmp_path), force=True) == 0
+
+    other.write_text(json.dumps({"objects": {"bazQux": {"oid": [1, 3, 6, 1, 4, 1, 99, 2]}}}))
+    os.utime(other, (1, 1))
+    assert index.refresh_from_dir(str(tmp_path), force=True) == 1
+    assert index.search("fooBar") == []
+    assert index.search("bazQux", mib="OTHER-MIB")[0].entry.oid_str == "1.3.6.1.4.1.99.2"
+
+    (tmp_path / "IF-MIB" / "schema.json").unlink()
+    index.refresh_from_dir(str(tmp_path), force=True)
+    assert index.mibs() == ["OTHER-MIB"]
+    assert index.search("ifDescr") == []
+
+
+def test_search_endpoint(tmp_path: Path, monkeypatch: Any) -> None:
+    _write_schema(tmp_path / "agent-model", "IF-MIB", IF_SCHEMA)
+    monkeypatch.chdir(tmp_path)
+    client = TestClient(api.app)
+
+    r = client.get("/search", params={"q": "admin"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["count"] == 1
+    assert body["results"][0]["oid"] == "1.3.6.1.2.1.2.2.1.7"
+    assert body["results"][0]["mib"] == "IF-MIB"
+
+    r = client.get("/search", params={"q": "admin", "mode": "regex"})
+    assert r.status_code == 400
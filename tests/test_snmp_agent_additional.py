@@ -8,6 +8,7 @@ from types import SimpleNamespace
 
 import pytest
 
+from app.app_logger import AppLogger
 from app.snmp_agent import SNMPAgent
 
 
@@ -49,7 +50,7 @@ def test_run_compile_failure_logs_and_continues(monkeypatch: pytest.MonkeyPatch,
     caplog.set_level("ERROR")
     agent = SNMPAgent(config_path="agent_config.yaml")
     # Configure one MIB to compile
-    monkeypatch.setattr(agent.app_config, "get", lambda _key, _default=None: ["FOO"])
+    monkeypatch.setattr(agent.app_config, "get", lambda key, default=None: ["FOO"] if key == "mibs" else default)
 
     # Make compile raise
     def bad_compile(self: Any, mib_name: str) -> str:
@@ -71,7 +72,7 @@ def test_run_compile_failure_logs_and_continues(monkeypatch: pytest.MonkeyPatch,
 def test_run_generator_failure_logged(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture, tmp_path: Path) -> None:
     agent = SNMPAgent(config_path="agent_config.yaml")
     # Setup compiled file list to simulate compiled_mib_paths
-    monkeypatch.setattr(agent.app_config, "get", lambda _key, _default=None: ["FOO"])
+    monkeypatch.setattr(agent.app_config, "get", lambda key, default=None: ["FOO"] if key == "mibs" else default)
     compiled_dir = str(tmp_path / "compiled")
     os.makedirs(compiled_dir, exist_ok=True)
     py_path = os.path.join(compiled_dir, "FOO.py")
@@ -325,7 +326,7 @@ def test_run_success_path_with_mib_compilation_and_generation(monkeypatch: pytes
             return str(py_path)
 
     class FakeTypeRegistry:
-        def __init__(self, path: Path) -> None:
+        def __init__(self, path: Path, modules: Any = None) -> None:
             self.registry: dict[str, Any] = {}
         def build(self) -> None:
             pass
@@ -425,6 +426,24 @@ def test_setup_signal_handlers_sets_up_handlers(monkeypatch: pytest.MonkeyPatch)
         assert signal.SIGHUP in signals
 
 
+def test_exit_paths_drain_state_queue_and_log_listener(monkeypatch: pytest.MonkeyPatch) -> None:
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    calls: list[str] = []
+    monkeypatch.setattr(agent._state_queue, "stop", lambda: calls.append("state_queue"))
+    monkeypatch.setattr(AppLogger, "shutdown", staticmethod(lambda: calls.append("logging")))
+    monkeypatch.setattr(os, "_exit", lambda code: calls.append(f"exit {code}"))
+    handlers: dict[Any, Any] = {}
+    monkeypatch.setattr("signal.signal", lambda sig, handler: handlers.__setitem__(sig, handler))
+    agent._setup_signal_handlers()
+
+    handlers[signal.SIGTERM](signal.SIGTERM, None)
+    assert calls == ["state_queue", "logging", "exit 0"]
+
+    calls.clear()
+    agent._shutdown()
+    assert calls == ["state_queue", "logging", "exit 0"]
+
+
 def test_augmented_child_tables_follow_parent(monkeypatch: pytest.MonkeyPatch) -> None:
     schema_path = (Path(__file__).resolve().parent.parent / "agent-model" / "TEST-ENUM-MIB" / "schema.json")
     schema = json.loads(schema_path.read_text())
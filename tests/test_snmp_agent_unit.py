@@ -247,6 +247,7 @@ def test_setup_snmpEngine_loads_compiled_modules(tmp_path: Path, monkeypatch: py
     compiled_dir = tmp_path / 'compiled-mibs'
     compiled_dir.mkdir()
     (compiled_dir / 'TEST-MIB.py').write_text('# fake compiled mib')
+    (compiled_dir / 'UNSERVED-MIB.py').write_text('# fake compiled mib')
 
     # Fake pysnmp.engine
     class FakeEngine:
@@ -299,12 +300,17 @@ def test_setup_snmpEngine_loads_compiled_modules(tmp_path: Path, monkeypatch: py
     monkeypatch.setitem(sys.modules, 'pysnmp.smi.builder', types.SimpleNamespace(DirMibSource=lambda p: f"DirMibSource({p})"))
 
     agent = SNMPAgent(preloaded_model={})
+    agent.app_config = types.SimpleNamespace(get=lambda key, default=None: [])
+    agent.mib_jsons = {'TEST-MIB': {}}
     caplog.set_level('INFO')
     agent._setup_snmpEngine(str(compiled_dir))
 
     assert agent.snmpEngine is not None
     assert agent.mib_builder is not None
     assert 'Loaded compiled MIB modules' in caplog.text
+    # Only served MIBs are loaded up front
+    assert 'TEST-MIB' in caplog.text
+    assert 'UNSERVED-MIB' not in caplog.text
 
 
 def test_setup_snmpEngine_handles_no_compiled_modules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
@@ -430,3 +436,16 @@ def test_setup_responders_registers_responders(monkeypatch: pytest.MonkeyPatch)
 
     assert len(calls) == 4
     assert all(c == (engine_obj, context_obj) for c in calls)
+
+
+def test_served_mib_modules_means_all_when_nothing_is_configured(tmp_path: Path) -> None:
+    (tmp_path / 'TEST-MIB.py').write_text('# fake compiled mib')
+    agent = SNMPAgent(preloaded_model={})
+    agent.app_config = types.SimpleNamespace(get=lambda key, default=None: [])
+    agent.mib_jsons = {}
+
+    # No MIBs configured: the type registry and builder cover every compiled module
+    assert agent._served_mib_modules(tmp_path) is None
+    assert agent._served_mib_modules(tmp_path / 'empty') is None
+    agent.mib_jsons = {'TEST-MIB': {}}
+    assert agent._served_mib_modules(tmp_path) == ['TEST-MIB']
@@ -0,0 +1,148 @@
+import threading
+from typing import Any, Iterator
+
+import pytest
+from pysnmp.proto import errind
+from pysnmp.proto.rfc1902 import Integer32, ObjectName
+from pysnmp.proto.rfc1905 import EndOfMibView
+
+import ui.snmp_session as snmp_session
+from ui.snmp_session import (
+    FAST_RESPONSE,
+    MAX_REPETITIONS,
+    MIN_REPETITIONS,
+    SnmpSession,
+    WalkCancelled,
+    next_max_repetitions,
+)
+
+ROOT = (1, 3, 6, 1, 4, 1, 99999)
+
+
+def test_next_max_repetitions_halves_on_too_big() -> None:
+    assert next_max_repetitions(40, 0, 0.01, too_big=True) == 20
+    assert next_max_repetitions(1, 0, 0.01, too_big=True) == 1
+
+
+def test_next_max_repetitions_grows_only_on_fast_full_pages() -> None:
+    assert next_max_repetitions(10, 10, FAST_RESPONSE / 2) == 20
+    assert next_max_repetitions(MAX_REPETITIONS, MAX_REPETITIONS, 0.0) == MAX_REPETITIONS
+    # Slow or short pages keep the window
+    assert next_max_repetitions(10, 10, FAST_RESPONSE * 2) == 10
+    assert next_max_repetitions(10, 3, 0.0) == 10
+
+
+class _FakeAgent:
+    """Answers GETBULK from a sorted list of OIDs, recording each window asked for."""
+
+    def __init__(self, oids: list[tuple[int, ...]]) -> None:
+        self.oids = sorted(oids)
+        self.windows: list[int] = []
+        self.errors: list[Any] = []
+
+    async def bulk_cmd(self, _engine: Any, _auth: Any, _target: Any, _ctx: Any,
+                       _non_repeaters: int, repetitions: int, var_bind: Any) -> tuple[Any, ...]:
+        self.windows.append(repetitions)
+        if self.errors:
+            error = self.errors.pop(0)
+            if error is not None:
+                return error, 0, 0, []
+        start = tuple(int(x) for x in var_bind[0])
+        following = [oid for oid in self.oids if oid > start][:repetitions]
+        var_binds: list[Any] = [(ObjectName(oid), Integer32(1)) for oid in following]
+        if len(following) < repetitions:
+            var_binds.append((ObjectName(start), EndOfMibView()))
+        return None, 0, 0, var_binds
+
+
+@pytest.fixture
+def session(monkeypatch: pytest.MonkeyPatch) -> Iterator[SnmpSession]:
+    session = SnmpSession()
+
+    async def _target(_host: str, _port: int) -> Any:
+        return object()
+
+    monkeypatch.setattr(session, "_target", _target)
+    monkeypatch.setattr(
+        snmp_session.VB_PROCESSOR, "make_varbinds",
+        lambda _cache, var_binds: [(ObjectName(var_binds[0][0]), var_binds[0][1])],
+    )
+    yield session
+    session.close()
+
+
+def _walk(session: SnmpSession, agent: _FakeAgent, monkeypatch: pytest.MonkeyPatch,
+          **kwargs: Any) -> tuple[int, list[list[tuple[int, ...]]]]:
+    monkeypatch.setattr(snmp_session, "bulk_cmd", agent.bulk_cmd)
+    batches: list[list[tuple[int, ...]]] = []
+    delivered = session.submit(session.walk(
+        "127.0.0.1", 161, "public", (ROOT, None),
+        lambda batch: batches.append([tuple(int(x) for x in vb[0]) for vb in batch]),
+        **kwargs,
+    )).result(timeout=5)
+    return delivered, batches
+
+
+def test_walk_pages_through_the_subtree_and_stops_at_its_end(
+    session: SnmpSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inside = [ROOT + (1, i) for i in range(1, 31)]
+    agent = _FakeAgent(inside + [(1, 3, 6, 1, 4, 1, 99999 + 1, 1)])
+
+    delivered, batches = _walk(session, agent, monkeypatch, max_repetitions=10)
+
+    assert delivered == 30
+    assert [oid for batch in batches for oid in batch] == inside
+    # Each full, fast page doubles the window; the third page leaves the subtree
+    assert agent.windows == [10, 20, 40]
+
+
+def test_walk_shrinks_only_on_too_big(session: SnmpSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    agent = _FakeAgent([ROOT + (i,) for i in range(1, 4)])
+
+    async def _too_big_once(*args: Any) -> tuple[Any, ...]:
+        if len(agent.windows) == 0:
+            agent.windows.append(args[5])
+            return None, Integer32(1), 0, []  # tooBig
+        return await _FakeAgent.bulk_cmd(agent, *args)
+
+    monkeypatch.setattr(agent, "bulk_cmd", _too_big_once)
+    delivered, _ = _walk(session, agent, monkeypatch, max_repetitions=40)
+
+    assert delivered == 3
+    assert agent.windows == [40, 20]
+
+
+def test_walk_timeout_retries_once_at_minimum_then_fails(
+    session: SnmpSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    agent = _FakeAgent([ROOT + (1,)])
+    agent.errors = [errind.RequestTimedOut(), errind.RequestTimedOut(), errind.RequestTimedOut()]
+
+    with pytest.raises(RuntimeError):
+        _walk(session, agent, monkeypatch, max_repetitions=40)
+
+    # No halving ladder: straight to the minimum window, then give up
+    assert agent.windows == [40, MIN_REPETITIONS]
+
+
+def test_walk_timeout_at_minimum_fails_immediately(
+    session: SnmpSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    agent = _FakeAgent([ROOT + (1,)])
+    agent.errors = [errind.RequestTimedOut()]
+
+    with pytest.raises(RuntimeError):
+        _walk(session, agent, monkeypatch, max_repetitions=MIN_REPETITIONS)
+
+    assert agent.windows == [MIN_REPETITIONS]
+
+
+def test_walk_honours_cancel(session: SnmpSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    cancel = threading.Event()
+    cancel.set()
+    agent = _FakeAgent([ROOT + (1,)])
+
+    with pytest.raises(WalkCancelled):
+        _walk(session, agent, monkeypatch, cancel=cancel)
+    assert agent.windows == []
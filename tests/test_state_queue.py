@@ -0,0 +1,217 @@
+import threading
+from typing import Any
+
+import pytest
+
+from app.snmp_agent import SNMPAgent
+from app.state_queue import StateCommandQueue
+
+
+def test_commands_run_inline_until_started() -> None:
+    flushes: list[int] = []
+    q = StateCommandQueue(on_batch_applied=lambda: flushes.append(1))
+
+    assert q.call(lambda x: x * 2, 21) == 42
+    # Inline execution does not go through the batch flush
+    assert flushes == []
+
+
+def test_commands_apply_in_order_on_writer_thread() -> None:
+    seen: list[tuple[int, str]] = []
+    q = StateCommandQueue()
+    q.start()
+    try:
+        futures = [
+            q.submit(lambda i=i: seen.append((i, threading.current_thread().name)))
+            for i in range(20)
+        ]
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        q.stop()
+
+    assert [i for i, _ in seen] == list(range(20))
+    assert {name for _, name in seen} == {"state-writer"}
+
+
+def _block_writer(q: StateCommandQueue, gate: threading.Event) -> Any:
+    started = threading.Event()
+
+    def _wait() -> None:
+        started.set()
+        gate.wait(5)
+
+    blocker = q.submit(_wait)
+    started.wait(5)
+    return blocker
+
+
+def test_pending_commands_share_one_flush() -> None:
+    gate = threading.Event()
+    flushes: list[int] = []
+    q = StateCommandQueue(on_batch_applied=lambda: flushes.append(1))
+    q.start()
+    try:
+        blocker = _block_writer(q, gate)
+        futures = [q.submit(lambda: None) for _ in range(10)]
+        gate.set()
+        blocker.result(timeout=5)
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        q.stop()
+
+    # The blocking command forms its own batch; the rest drain together
+    assert len(flushes) == 2
+    assert q.stats["largest_batch"] == 10
+    assert q.stats["commands"] == 11
+
+
+def test_command_errors_propagate_to_caller() -> None:
+    q = StateCommandQueue()
+    q.start()
+    try:
+        with pytest.raises(ValueError):
+            q.call(lambda: (_ for _ in ()).throw(ValueError("boom")))
+        # The writer keeps serving after a failed command
+        assert q.call(lambda: "ok") == "ok"
+    finally:
+        q.stop()
+    assert q.stats["errors"] == 1
+
+
+def test_nested_calls_from_writer_run_inline() -> None:
+    q = StateCommandQueue()
+    q.start()
+    try:
+        assert q.call(lambda: q.call(lambda: "inner")) == "inner"
+    finally:
+        q.stop()
+
+
+def test_stop_drains_pending_commands() -> None:
+    gate = threading.Event()
+    seen: list[int] = []
+    q = StateCommandQueue()
+    q.start()
+    _block_writer(q, gate)
+    futures = [q.submit(seen.append, i) for i in range(5)]
+    gate.set()
+    q.stop()
+
+    assert seen == [0, 1, 2, 3, 4]
+    assert all(f.done() for f in futures)
+    assert not q.running
+
+
+def test_stop_keeps_a_busy_writer_and_fails_commands_behind_the_sentinel() -> None:
+    gate = threading.Event()
+    final: list[bool] = []
+    late: list[Any] = []
+
+    def _flush() -> None:
+        # Another thread submits while the writer applies its final batch
+        if final and not late:
+            submitter = threading.Thread(target=lambda: late.append(q.submit(lambda: "late")))
+            submitter.start()
+            submitter.join()
+
+    q = StateCommandQueue(on_batch_applied=_flush)
+    q.start()
+    blocker = _block_writer(q, gate)
+
+    q.stop(timeout=0.05)
+    # The join timed out: the writer still owns the state
+    assert q.running
+    last = q.submit(final.append, True)
+    gate.set()
+    blocker.result(timeout=5)
+    q.stop()
+
+    assert not q.running
+    assert last.done() and final == [True]
+    with pytest.raises(RuntimeError):
+        late[0].result(timeout=5)
+    # Once stopped, commands run inline again
+    assert q.call(lambda: "inline") == "inline"
+
+
+def _make_agent() -> SNMPAgent:
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent.mib_builder = None
+    agent.mib_jsons = {}
+    return agent
+
+
+def test_agent_mutations_save_once_per_batch() -> None:
+    agent = _make_agent()
+    saves: list[int] = []
+    agent._save_mib_state = lambda: saves.append(1)  # type: ignore[method-assign]
+    agent._publish_state_snapshot()
+
+    gate = threading.Event()
+    agent._state_queue.start()
+    try:
+        blocker = _block_writer(agent._state_queue, gate)
+        futures = [
+            agent._state_queue.submit(agent.add_table_instance, "1.3.6.1.4.1.99998.1.3", {"idx": i})
+            for i in range(1, 6)
+        ]
+        gate.set()
+        blocker.result(timeout=5)
+        results = [f.result(timeout=5) for f in futures]
+    finally:
+        agent._state_queue.stop()
+
+    assert results[0] == "1.3.6.1.4.1.99998.1.3.1"
+    assert len(saves) == 1
+    assert set(agent.table_instances["1.3.6.1.4.1.99998.1.3"]) == {"1", "2", "3", "4", "5"}
+
+
+def test_state_snapshot_is_immutable_and_copy_on_write() -> None:
+    agent = _make_agent()
+    agent._save_mib_state = lambda: None  # type: ignore[method-assign]
+    agent.add_table_instance("1.3.6.1.4.1.99998.1.3", {"idx": 1}, {"col": "a"})
+    agent.add_table_instance("1.3.6.1.4.1.99998.1.4", {"idx": 1}, {"col": "b"})
+
+    first = agent.state_snapshot()
+    with pytest.raises(TypeError):
+        first.table_instances["x"] = {}  # type: ignore[index]
+
+    agent.add_table_instance("1.3.6.1.4.1.99998.1.3", {"idx": 2})
+    second = agent.state_snapshot()
+
+    assert second.version == first.version + 1
+    assert "2" not in first.table_instances["1.3.6.1.4.1.99998.1.3"]
+    assert "2" in second.table_instances["1.3.6.1.4.1.99998.1.3"]
+    # Untouched tables are shared between snapshots rather than re-copied
+    assert second.table_instances["1.3.6.1.4.1.99998.1.4"] is first.table_instances["1.3.6.1.4.1.99998.1.4"]
+    # Within a changed table only the changed row is copied
+    assert second.table_instances["1.3.6.1.4.1.99998.1.3"]["1"] is first.table_instances["1.3.6.1.4.1.99998.1.3"]["1"]
+
+    agent.delete_table_instance("1.3.6.1.4.1.99998.1.3", {"idx": 1})
+    agent.overrides["1.3.6.1.2.1.1.5.0"] = "name"
+    agent._touch_state(override="1.3.6.1.2.1.1.5.0")
+    third = agent.state_snapshot()
+    assert set(third.table_instances["1.3.6.1.4.1.99998.1.3"]) == {"2"}
+    assert third.overrides == {"1.3.6.1.2.1.1.5.0": "name"}
+    assert second.overrides == {}
+
+
+def test_reset_state_clears_everything() -> None:
+    agent = _make_agent()
+    saved: list[dict[str, Any]] = []
+    agent._save_mib_state = lambda: saved.append(  # type: ignore[method-assign]
+        {"tables": dict(agent.table_instances), "scalars": dict(agent.overrides)}
+    )
+    agent.overrides = {"1.3.6.1.2.1.1.5.0": "name"}
+    agent.table_instances = {"1.3.6.1.4.1.99998.1.3": {"1": {"column_values": {}}}}
+    agent.deleted_instances.add("1.3.6.1.4.1.99998.1.3", "2")
+
+    agent.reset_state()
+
+    assert agent.overrides == {}
+    assert agent.table_instances == {}
+    assert len(agent.deleted_instances) == 0
+    assert saved[-1] == {"tables": {}, "scalars": {}}
+    assert agent.state_snapshot().table_instances == {}
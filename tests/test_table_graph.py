@@ -0,0 +1,94 @@
+from typing import Any, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api as api
+from app.snmp_agent import SNMPAgent
+from app.table_graph import TableGraph
+
+BASE = [1, 3, 6, 1, 4, 1, 99999]
+PARENT = ".".join(map(str, BASE + [1]))
+CHILD = ".".join(map(str, BASE + [2]))
+GRANDCHILD = ".".join(map(str, BASE + [3]))
+
+
+def _schema() -> dict[str, Any]:
+    def table(n: int, name: str, indexes: list[str], rows: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            f"{name}Table": {"oid": BASE + [n], "type": "MibTable", "rows": rows},
+            f"{name}Entry": {"oid": BASE + [n, 1], "type": "MibTableRow", "indexes": indexes},
+            f"{name}Value": {"oid": BASE + [n, 1, 2], "type": "DisplayString", "access": "read-write"},
+        }
+
+    objects: dict[str, Any] = {
+        "parentIndex": {"oid": BASE + [1, 1, 1], "type": "Integer32", "access": "not-accessible"},
+        "childIndex": {"oid": BASE + [2, 1, 1], "type": "Integer32", "access": "not-accessible"},
+    }
+    objects.update(table(1, "parent", ["parentIndex"], [{"parentIndex": 1, "parentValue": "p1"}, {"parentIndex": 2}]))
+    objects.update(table(2, "child", ["parentIndex"], [{"childValue": "c"}]))
+    objects.update(table(3, "grand", ["childIndex"], [{"grandValue": "g"}]))
+    # Both index_from forms: {"mib", "column"} and [mib, ..., column]
+    objects["childEntry"]["index_from"] = [{"mib": "TEST-MIB", "column": "parentIndex"}]
+    objects["grandEntry"]["index_from"] = [["TEST-MIB", "childEntry", "childIndex"]]
+    return {"TEST-MIB": {"objects": objects, "traps": {}}}
+
+
+@pytest.fixture
+def restore_snmp_agent() -> Generator[None, None, None]:
+    original = api.snmp_agent
+    yield
+    api.snmp_agent = original
+
+
+def test_graph_links_tables_once() -> None:
+    graph = TableGraph.build(_schema())
+
+    parent = graph.tables[PARENT]
+    assert (parent.entry_name, parent.indexes, parent.columns) == (
+        "parentEntry", ("parentIndex",), ("parentIndex", "parentValue")
+    )
+    assert graph.defaults[PARENT] == {"parentIndex": 1, "parentValue": "p1"}
+
+    assert [c.table_oid for c in graph.children[PARENT]] == [CHILD]
+    assert [c.table_oid for c in graph.children[CHILD]] == [GRANDCHILD]
+    assert graph.tables[CHILD].has_index_from
+    assert graph.index_source(CHILD) is parent
+    assert graph.index_source(PARENT) is None
+
+    # Transitive, breadth-first, each table once
+    assert [c.table_oid for c in graph.augmenting_tables(PARENT)] == [CHILD, GRANDCHILD]
+    assert graph.augmenting_tables(PARENT) is graph.augmenting_tables(PARENT)
+
+
+def test_agent_fans_rows_out_to_augmenting_tables() -> None:
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent.mib_builder = None
+    agent.mib_jsons = _schema()
+    agent._save_mib_state = lambda: None  # type: ignore[method-assign]
+    agent._build_augmented_index_map()
+
+    agent.add_table_instance(PARENT, {"parentIndex": 7}, {"parentValue": "x"})
+    assert "7" in agent.table_instances[CHILD]
+    assert agent.table_instances[CHILD]["7"]["column_values"]["childValue"] == "c"
+    assert agent.table_instances[GRANDCHILD]["7"]["column_values"] == {"grandValue": "g"}
+
+    agent.delete_table_instance(PARENT, {"parentIndex": 7})
+    assert agent.table_instances == {}
+
+
+def test_tree_bulk_uses_graph(restore_snmp_agent: None) -> None:
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent.mib_builder = None
+    agent.mib_jsons = _schema()
+    agent._save_mib_state = lambda: None  # type: ignore[method-assign]
+    agent._build_augmented_index_map()
+    agent.add_table_instance(PARENT, {"parentIndex": 9})
+    agent.deleted_instances.add(PARENT, "2")
+    api.snmp_agent = agent
+
+    tables = TestClient(api.app).get("/tree/bulk").json()["tables"]
+    assert tables[PARENT]["instances"] == ["1", "9"]
+    assert tables[PARENT]["entry_name"] == "parentEntry"
+    # Augmented tables list the parent's schema rows only
+    assert tables[CHILD]["instances"] == ["1"]
@@ -0,0 +1,146 @@
+import logging
+import time
+from typing import Any, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from pysnmp.smi import builder
+
+import app.api as api
+from app.mib_registrar import MibRegistrar
+from app.snmp_agent import SNMPAgent
+
+BASE = [1, 3, 6, 1, 4, 1, 99999]
+TABLE_OID = ".".join(map(str, BASE + [4]))
+
+
+def _schema(rows: int) -> dict[str, Any]:
+    return {
+        "objects": {
+            "testTable": {
+                "oid": BASE + [4],
+                "type": "MibTable",
+                "rows": [
+                    {"testIndex": i, "testName": f"row{i}", "testStatus": 1 + i % 2}
+                    for i in range(1, rows + 1)
+                ],
+            },
+            "testEntry": {"oid": BASE + [4, 1], "type": "MibTableRow", "indexes": ["testIndex"]},
+            "testIndex": {"oid": BASE + [4, 1, 1], "type": "Integer32", "access": "not-accessible"},
+            "testName": {"oid": BASE + [4, 1, 2], "type": "DisplayString", "access": "read-write"},
+            "testStatus": {
+                "oid": BASE + [4, 1, 3],
+                "type": "Integer32",
+                "access": "read-write",
+                "enums": {"up": 1, "down": 2},
+            },
+        },
+        "traps": {},
+    }
+
+
+@pytest.fixture
+def restore_snmp_agent() -> Generator[None, None, None]:
+    original = api.snmp_agent
+    yield
+    api.snmp_agent = original
+
+
+def _agent(rows: int) -> SNMPAgent:
+    mib_builder = builder.MibBuilder()
+    mib_builder.load_modules("SNMPv2-SMI", "SNMPv2-TC")
+    scalar_inst, table, row, column = mib_builder.import_symbols(
+        "SNMPv2-SMI", "MibScalarInstance", "MibTable", "MibTableRow", "MibTableColumn"
+    )
+    registrar = MibRegistrar(mib_builder, scalar_inst, table, row, column, logging.getLogger("test"), time.time())
+
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent.mib_builder = mib_builder
+    agent.mib_registrar = registrar
+    agent.mib_jsons = {"TEST-MIB": _schema(rows)}
+    agent._save_mib_state = lambda: None  # type: ignore[method-assign]
+    agent._build_augmented_index_map()
+    registrar.deleted_instances = agent.deleted_instances
+    registrar.register_mib("TEST-MIB", agent.mib_jsons["TEST-MIB"], {})
+    return agent
+
+
+def test_table_rows_pages_live_values(restore_snmp_agent: None) -> None:
+    agent = _agent(rows=12)
+    agent.add_table_instance(TABLE_OID, {"testIndex": 100}, {"testName": "dyn", "testStatus": 2})
+    agent.delete_table_instance(TABLE_OID, {"testIndex": 3})
+    agent.set_scalar_value(tuple(BASE + [4, 1, 2, 2]), "changed")
+    api.snmp_agent = agent
+    client = TestClient(api.app)
+
+    body = client.get("/table-rows", params={"oid": TABLE_OID, "limit": 5}).json()
+    assert body["total"] == 12
+    assert body["index_columns"] == ["testIndex"]
+    assert [row["instance"] for row in body["rows"]] == ["1", "2", "4", "5", "6"]
+    first, second = body["rows"][:2]
+    assert first["index"] == {"testIndex": 1}
+    assert first["values"] == {"testIndex": 1, "testName": "row1", "testStatus": "2"}
+    assert first["labels"] == {"testStatus": "down"}
+    assert second["values"]["testName"] == "changed"
+
+    # The page holding a given instance, and a dynamic row after the schema rows
+    last = client.get("/table-rows", params={"oid": TABLE_OID, "limit": 5, "instance": "100"}).json()
+    assert last["offset"] == 10
+    assert last["rows"][-1] == {
+        "instance": "100",
+        "index": {"testIndex": 100},
+        "values": {"testIndex": 100, "testName": "dyn", "testStatus": 2},
+        "labels": {"testStatus": "down"},
+    }
+
+    assert client.get("/table-rows", params={"oid": "1.3.6.1.4.1.1"}).status_code == 404
+    assert client.get("/table-rows", params={"oid": TABLE_OID, "offset": -1}).status_code == 400
+
+
+def test_table_rows_large_table_is_fast(restore_snmp_agent: None) -> None:
+    api.snmp_agent = _agent(rows=5000)
+    client = TestClient(api.app)
+
+    start = time.perf_counter()
+    body = client.get("/table-rows", params={"oid": TABLE_OID, "offset": 4800}).json()
+    elapsed = time.perf_counter() - start
+
+    assert body["total"] == 5000
+    assert [row["instance"] for row in body["rows"]][:2] == ["4801", "4802"]
+    assert len(body["rows"]) == 200
+    assert elapsed < 1.0
+
+
+def test_create_row_with_invalid_index_is_rejected(restore_snmp_agent: None) -> None:
+    agent = _agent(rows=2)
+    api.snmp_agent = agent
+
+    response = TestClient(api.app).post(
+        "/table-row", json={"table_oid": TABLE_OID, "index_values": {"testIndex": "abc"}}
+    )
+    assert response.status_code == 400
+    assert TABLE_OID not in agent.table_instances
+
+
+def test_legacy_string_instance_keys_are_migrated_on_load() -> None:
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    saves: list[int] = []
+    agent._save_mib_state = lambda: saves.append(1)  # type: ignore[method-assign]
+    agent.mib_jsons = {
+        "TEST-MIB": {
+            "objects": {
+                "nTable": {"oid": BASE + [5], "type": "MibTable", "rows": [{"nName": "lo"}]},
+                "nEntry": {"oid": BASE + [5, 1], "type": "MibTableRow", "indexes": ["nName"]},
+                "nName": {"oid": BASE + [5, 1, 1], "type": "DisplayString"},
+            }
+        }
+    }
+    table_oid = ".".join(map(str, BASE + [5]))
+    agent.table_instances = {table_oid: {"eth0": {"column_values": {}}, "97": {"column_values": {}}}}
+    agent.deleted_instances.add(table_oid, "lo")
+
+    agent._migrate_legacy_instance_keys()
+
+    assert set(agent.table_instances[table_oid]) == {"101.116.104.48", "97"}
+    assert set(agent.deleted_instances.for_table(table_oid)) == {"108.111"}
+    assert saves == [1]
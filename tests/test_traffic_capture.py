@@ -0,0 +1,177 @@
+import asyncio
+import types
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.entity.observer import MetaObserver
+from pysnmp.proto.api import v2c
+
+import app.api as api
+from app.cli_replay_capture import load_requests, main, replay
+from app.traffic_capture import REQUEST, RESPONSE, CaptureWriter, TrafficCapture, decode_message, read_capture
+
+DESCR = (1, 3, 6, 1, 2, 1, 1, 1, 0)
+
+
+def _message(pdu: Any, request_id: int, var_binds: list[Any], community: str = "public") -> bytes:
+    v2c.apiPDU.set_defaults(pdu)
+    v2c.apiPDU.set_request_id(pdu, request_id)
+    v2c.apiPDU.set_varbinds(pdu, var_binds)
+    msg = v2c.Message()
+    v2c.apiMessage.set_defaults(msg)
+    v2c.apiMessage.set_community(msg, community)
+    v2c.apiMessage.set_pdu(msg, pdu)
+    return bytes(encoder.encode(msg))
+
+
+def _request(request_id: int) -> bytes:
+    return _message(v2c.GetRequestPDU(), request_id, [(DESCR, v2c.null)])
+
+
+def _response(request_id: int, value: str) -> bytes:
+    return _message(v2c.ResponsePDU(), request_id, [(DESCR, v2c.OctetString(value))])
+
+
+def test_capture_file_roundtrip_and_decoding(tmp_path: Path) -> None:
+    path = tmp_path / "traffic.snmpcap"
+    writer = CaptureWriter(path)
+    writer.write(REQUEST, 10.5, "10.0.0.1", 40000, _request(7))
+    writer.write(RESPONSE, 10.6, "10.0.0.1", 40000, _response(7, "sim"))
+    writer.close()
+    # Appending to an existing capture keeps a single header
+    writer = CaptureWriter(path)
+    writer.write(REQUEST, 11.0, "::1", 40001, b"\x30\x00")
+    writer.close()
+
+    records = list(read_capture(path))
+    assert [(r.kind, r.timestamp, r.host, r.port) for r in records] == [
+        (REQUEST, 10.5, "10.0.0.1", 40000),
+        (RESPONSE, 10.6, "10.0.0.1", 40000),
+        (REQUEST, 11.0, "::1", 40001),
+    ]
+    request = decode_message(records[0].message)
+    assert request == {
+        "version": "2c",
+        "community": "public",
+        "pdu_type": "GetRequestPDU",
+        "request_id": 7,
+        "var_binds": [("1.3.6.1.2.1.1.1.0", "")],
+        "error_status": 0,
+    }
+    assert decode_message(records[1].message)["var_binds"] == [("1.3.6.1.2.1.1.1.0", "sim")]
+    assert decode_message(records[2].message) is None
+
+    (tmp_path / "other.bin").write_bytes(b"not a capture")
+    try:
+        list(read_capture(tmp_path / "other.bin"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_capture_observes_engine_messages(tmp_path: Path) -> None:
+    engine = types.SimpleNamespace(observer=MetaObserver())
+    capture = TrafficCapture()
+    capture.attach(engine)
+    capture.attach(engine)
+    request = {"wholeMsg": _request(1), "transportAddress": ("10.0.0.1", 40000)}
+
+    # Nothing is recorded until a capture is started
+    engine.observer.store_execution_context(engine, "rfc3412.receiveMessage:request", request)
+    capture.start(tmp_path / "live.snmpcap")
+    engine.observer.store_execution_context(engine, "rfc3412.receiveMessage:request", request)
+    # A request replayed after an injected delay was already captured on arrival
+    engine.observer.store_execution_context(
+        engine, "rfc3412.receiveMessage:request", dict(request, deferred=True)
+    )
+    engine.observer.store_execution_context(
+        engine,
+        "rfc3412.returnResponsePdu",
+        {"outgoingMessage": _response(1, "sim"), "transportAddress": ("10.0.0.1", 40000)},
+    )
+    assert capture.status() == {"active": True, "path": str(tmp_path / "live.snmpcap"), "records": 2}
+    capture.stop()
+    assert not capture.active
+
+    records = list(read_capture(tmp_path / "live.snmpcap"))
+    assert [r.kind for r in records] == [REQUEST, RESPONSE]
+    assert records[0].message == request["wholeMsg"]
+
+
+class _Agent(asyncio.DatagramProtocol):
+    """Answers sysDescr requests; a few differently from the capture, one not at all."""
+
+    def connection_made(self, transport: Any) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        msg, _ = decoder.decode(data, asn1Spec=v2c.Message())
+        request_id = int(v2c.apiPDU.get_request_id(v2c.apiMessage.get_pdu(msg)))
+        if request_id == 5:
+            return
+        self.transport.sendto(_response(request_id, "changed" if request_id == 3 else "sim"), addr)
+
+
+def test_replay_reports_latency_losses_and_diffs(tmp_path: Path) -> None:
+    path = tmp_path / "traffic.snmpcap"
+    writer = CaptureWriter(path)
+    for i in range(10):
+        # Two managers happened to use the same request-ids
+        host = "10.0.0.1" if i % 2 else "10.0.0.2"
+        writer.write(REQUEST, 100.0 + i * 0.01, host, 40000, _request(i // 2))
+        writer.write(RESPONSE, 100.0 + i * 0.01, host, 40000, _response(i // 2, "sim"))
+    writer.close()
+
+    requests, skipped = load_requests(read_capture(path))
+    assert skipped == 0
+    assert [r.index for r in requests] == list(range(1, 11))
+    assert all(r.expected is not None for r in requests)
+
+    async def _run(speed: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(_Agent, local_addr=("127.0.0.1", 0))
+        port = transport.get_extra_info("sockname")[1]
+        try:
+            return await replay(requests, "127.0.0.1", port, speed=speed, timeout=0.3, window=4)
+        finally:
+            transport.close()
+
+    for speed in (None, 10.0):
+        result = asyncio.run(_run(speed))
+        report = result.report()
+        assert (report["sent"], report["received"], report["lost"]) == (10, 9, 1)
+        assert report["compared"] == 9
+        assert set(report["latency_ms"]) == {"min", "p50", "p90", "p99", "max"}
+        assert result.diffs == [
+            {
+                "request": 3,
+                "var_binds": {
+                    "expected": [("1.3.6.1.2.1.1.1.0", "sim")],
+                    "actual": [("1.3.6.1.2.1.1.1.0", "changed")],
+                },
+            }
+        ]
+    # At 10x the 90 ms of captured traffic takes at least 9 ms
+    assert result.elapsed >= 0.009
+
+    assert main([str(tmp_path / "missing.snmpcap")]) == 1
+
+
+def test_api_capture_names_stay_under_the_capture_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    capture = TrafficCapture()
+    monkeypatch.setattr(api, "snmp_agent", types.SimpleNamespace(traffic_capture=capture))
+    monkeypatch.setattr(api, "CAPTURE_DIR", tmp_path / "captures")
+    client = TestClient(api.app)
+
+    for name in ("../escape.snmpcap", "/tmp/abs.snmpcap", "sub/dir.snmpcap", "..\\win.snmpcap", ".."):
+        assert client.post("/capture/start", json={"name": name}).status_code == 400
+    assert not capture.active
+
+    body = client.post("/capture/start", json={"name": "run1.snmpcap"}).json()
+    assert body["path"] == str(tmp_path / "captures" / "run1.snmpcap")
+    client.post("/capture/stop")
+    assert (tmp_path / "captures" / "run1.snmpcap").exists()
@@ -0,0 +1,158 @@
+import logging
+import time
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from pysnmp.smi import builder, error
+
+import app.api as api
+from app.mib_registrar import MibRegistrar
+from app.snmp_agent import SNMPAgent
+from app.type_plan import TypePlanError, compile_type_plan
+
+BASE = [1, 3, 6, 1, 4, 1, 99999]
+
+TYPE_REGISTRY: dict[str, Any] = {
+    "Integer32": {
+        "base_type": "INTEGER",
+        "constraints": [{"type": "ValueRangeConstraint", "min": -2147483648, "max": 2147483647}],
+    },
+    "DisplayString": {"base_type": "OCTET STRING", "size": {"type": "range", "min": 0, "max": 255}},
+    "PortNumber": {
+        "base_type": "Unsigned32",
+        "constraints": [
+            {"type": "ValueRangeConstraint", "min": 0, "max": 4294967295},
+            {"type": "ValueRangeConstraint", "min": 1, "max": 65535},
+        ],
+    },
+    "ShortName": {"base_type": "OctetString", "size": {"type": "range", "min": 1, "max": 4}},
+    "SplitRange": {
+        "base_type": "Integer32",
+        "constraints": [
+            {"type": "ValueRangeConstraint", "min": -2147483648, "max": 2147483647},
+            {"type": "ValueRangeConstraint", "min": 0, "max": 100},
+            {"type": "ValueRangeConstraint", "min": 1, "max": 10},
+            {"type": "ValueRangeConstraint", "min": 20, "max": 30},
+        ],
+    },
+}
+
+
+def _registrar() -> MibRegistrar:
+    mib_builder = builder.MibBuilder()
+    mib_builder.load_modules("SNMPv2-SMI", "SNMPv2-TC")
+    scalar_inst, table, row, column = mib_builder.import_symbols(
+        "SNMPv2-SMI", "MibScalarInstance", "MibTable", "MibTableRow", "MibTableColumn"
+    )
+    return MibRegistrar(mib_builder, scalar_inst, table, row, column, logging.getLogger("test"), time.time())
+
+
+def _schema() -> dict[str, Any]:
+    return {
+        "port": {"oid": BASE + [1], "type": "PortNumber", "access": "read-write", "initial": 161},
+        "label": {"oid": BASE + [2], "type": "ShortName", "access": "read-write", "initial": "ab"},
+        "testTable": {
+            "oid": BASE + [4],
+            "type": "MibTable",
+            "rows": [{"testIndex": i, "testStatus": 1} for i in range(1, 4)],
+        },
+        "testEntry": {"oid": BASE + [4, 1], "type": "MibTableRow", "indexes": ["testIndex"]},
+        "testIndex": {"oid": BASE + [4, 1, 1], "type": "Integer32", "access": "not-accessible"},
+        "testStatus": {
+            "oid": BASE + [4, 1, 2],
+            "type": "Integer32",
+            "access": "read-write",
+            "enums": {"up": 1, "down": 2},
+        },
+    }
+
+
+def test_compiled_plan_checks_constraints() -> None:
+    plan = compile_type_plan(
+        "PortNumber", "read-write", TYPE_REGISTRY, lambda _name: int, lambda v, _t: v, lambda v: v
+    )
+    assert plan.snmp_type == "Unsigned32"
+    assert plan.value_ranges == ((1, 65535),)
+    assert plan.is_writable
+    assert plan.check(80) is None
+    assert plan.check("8080") is None
+    assert plan.check(0) == "wrongValue"
+    assert plan.check("http") == "wrongType"
+
+    status = compile_type_plan(
+        "Integer32", "read-only", TYPE_REGISTRY, lambda _name: int, lambda v, _t: v, lambda v: v,
+        enums={"up": 1, "down": 2},
+    )
+    assert status.max_access == "readonly"
+    assert status.check("down") is None
+    assert status.check(3) == "wrongValue"
+
+    with pytest.raises(TypePlanError) as excinfo:
+        compile_type_plan(
+            "DisplayString", "read-write", TYPE_REGISTRY, lambda _name: str, lambda v, _t: v, lambda v: v
+        ).validate("x" * 256)
+    assert excinfo.value.status == "wrongLength"
+
+
+def test_disjoint_ranges_form_a_union_clipped_by_the_outer_types() -> None:
+    plan = compile_type_plan(
+        "SplitRange", "read-write", TYPE_REGISTRY, lambda _name: int, lambda v, _t: v, lambda v: v
+    )
+    # The Integer32 range and the 0..100 refinement bound the union, not join it
+    assert plan.value_ranges == ((1, 10), (20, 30))
+    assert plan.check(5) is None
+    assert plan.check(22) is None
+    assert plan.check(15) == "wrongValue"
+    assert plan.check(50) == "wrongValue"
+    assert plan.check(1000) == "wrongValue"
+
+
+def test_write_test_rejects_values_outside_the_type() -> None:
+    registrar = _registrar()
+    symbols = registrar._build_mib_symbols("TEST-MIB", _schema(), TYPE_REGISTRY)
+
+    port = symbols["portInst"]
+    port.writeTest((port.name, port.syntax.clone(8080)))
+    with pytest.raises(error.WrongValueError):
+        port.writeTest((port.name, port.syntax.clone(70000)))
+
+    label = symbols["labelInst"]
+    with pytest.raises(error.WrongLengthError):
+        label.writeTest((label.name, label.syntax.clone("toolong")))
+
+    # Every cell of a column shares the column's compiled plan
+    cells = [symbols[f"testStatusInst_{i}"] for i in range(1, 4)]
+    assert len({id(cell.type_plan) for cell in cells}) == 1
+    with pytest.raises(error.WrongValueError):
+        cells[0].writeTest((cells[0].name, cells[0].syntax.clone(5)))
+    cells[0].writeTest((cells[0].name, cells[0].syntax.clone(2)))
+
+
+def test_rest_write_outside_the_type_is_rejected() -> None:
+    registrar = _registrar()
+    agent = SNMPAgent(config_path="agent_config.yaml")
+    agent.mib_builder = registrar.mib_builder
+    agent.mib_registrar = registrar
+    agent._save_mib_state = lambda: None  # type: ignore[method-assign]
+    registrar.register_mib("TEST-MIB", _schema(), TYPE_REGISTRY)
+
+    original = api.snmp_agent
+    api.snmp_agent = agent
+    try:
+        client = TestClient(api.app)
+        oid = ".".join(map(str, BASE + [1, 0]))
+        response = client.post("/value", json={"oid": oid, "value": "0"})
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "wrongValue"
+        assert client.post("/value", json={"oid": oid, "value": "443"}).status_code == 200
+        assert int(agent.get_scalar_value(tuple(BASE + [1, 0]))) == 443
+    finally:
+        api.snmp_agent = original
+
+    # Table cells keep their value when an update is out of range
+    table_oid = ".".join(map(str, BASE + [4]))
+    agent._update_table_cell_values(table_oid, "2", {"testStatus": 7})
+    assert int(registrar.cell_instance(table_oid, "2", "testStatus").syntax) == 1
+    agent._update_table_cell_values(table_oid, "2", {"testStatus": 2})
+    assert int(registrar.cell_instance(table_oid, "2", "testStatus").syntax) == 2
@@ -1,3 +1,4 @@
+import json
 import types
 from pathlib import Path
 from typing import Any
@@ -88,3 +89,59 @@ def test_build_with_textual_convention_and_scalar(monkeypatch: pytest.MonkeyPatc
     # Expect MyTC to be recorded and myScalar to be referenced in used_by
     assert "MyTC" in reg
     assert any("TEST-MIB::myScalar" in v.get("used_by", []) for v in reg.values())
+
+
+def test_build_loads_only_requested_modules(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    (tmp_path / "A-MIB.py").write_text("# fake")
+    (tmp_path / "B-MIB.py").write_text("# fake")
+    loaded: list[object] = []
+    fake_builder = make_fake_builder({})
+    fake_builder.load_modules = lambda *mods: loaded.extend(mods)
+
+    class FakeEngine:
+        def get_mib_builder(self) -> Any:
+            return fake_builder
+
+    monkeypatch.setattr("app.type_recorder._engine.SnmpEngine", lambda: FakeEngine())
+    monkeypatch.setattr(TypeRecorder, "_seed_base_types", staticmethod(lambda: {}))
+
+    TypeRecorder(tmp_path, modules=["A-MIB"]).build()
+    assert loaded == ["A-MIB"]
+
+
+SCALAR_MIB = '''
+(MibScalar, Integer32) = mibBuilder.import_symbols("SNMPv2-SMI", "MibScalar", "Integer32")
+{name}Value = MibScalar((1, 3, 6, 1, 4, 1, 99999, {arc}, 1), Integer32()).setMaxAccess("read-write")
+mibBuilder.export_symbols("{module}", {name}Value={name}Value)
+'''
+
+
+def _write_scalar_mib(compiled: Path, module: str, name: str, arc: int) -> None:
+    (compiled / f"{module}.py").write_text(SCALAR_MIB.format(module=module, name=name, arc=arc))
+
+
+def test_build_rerecords_only_changed_modules(tmp_path: Path) -> None:
+    compiled = tmp_path / "compiled"
+    compiled.mkdir()
+    shards = tmp_path / "shards"
+    _write_scalar_mib(compiled, "A-MIB", "alpha", 1)
+    _write_scalar_mib(compiled, "B-MIB", "beta", 2)
+
+    first = TypeRecorder(compiled, modules=["A-MIB", "B-MIB"], shard_dir=shards)
+    first.build()
+    assert {"A-MIB", "B-MIB", "SNMPv2-SMI"} <= set(first.recorded_modules)
+    assert {"A-MIB::alphaValue", "B-MIB::betaValue"} <= set(first.registry["Integer32"]["used_by"])
+
+    # Unchanged modules are read back from their shards
+    second = TypeRecorder(compiled, modules=["A-MIB", "B-MIB"], shard_dir=shards)
+    second.build()
+    assert second.recorded_modules == []
+    assert second.registry == json.loads(json.dumps(first.registry))
+
+    _write_scalar_mib(compiled, "B-MIB", "gamma", 2)
+    third = TypeRecorder(compiled, modules=["A-MIB", "B-MIB"], shard_dir=shards)
+    third.build()
+    assert third.recorded_modules == ["B-MIB"]
+    used_by = third.registry["Integer32"]["used_by"]
+    assert "B-MIB::gammaValue" in used_by and "B-MIB::betaValue" not in used_by
+    assert "A-MIB::alphaValue" in used_by
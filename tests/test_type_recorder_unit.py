@@ -964,7 +964,7 @@ class TestBuild:
         recorder = TypeRecorder(compiled_dir)
 
         mock_engine = mocker.patch("app.type_recorder._engine.SnmpEngine")
-        mocker.patch("app.type_recorder._builder.DirMibSource")
+        mocker.patch("app.type_recorder.MibBuildContext.add_source")
         mock_glob = mocker.patch.object(Path, "glob")
         
         # Setup mocks
@@ -986,7 +986,7 @@ class TestBuild:
         recorder = TypeRecorder(compiled_dir)
         
         mock_engine = mocker.patch("app.type_recorder._engine.SnmpEngine")
-        mocker.patch("app.type_recorder._builder.DirMibSource")
+        mocker.patch("app.type_recorder.MibBuildContext.add_source")
         mock_glob = mocker.patch.object(Path, "glob")
         
         mock_mib_builder = mocker.MagicMock()
@@ -1012,7 +1012,7 @@ class TestBuild:
         recorder = TypeRecorder(compiled_dir)
 
         mock_engine = mocker.patch("app.type_recorder._engine.SnmpEngine")
-        mocker.patch("app.type_recorder._builder.DirMibSource")
+        mocker.patch("app.type_recorder.MibBuildContext.add_source")
 
         mock_mib_builder = mocker.MagicMock()
         mock_mib_builder.mibSymbols = {}
@@ -1089,7 +1089,7 @@ class TestBuild:
 
         mocker.patch.object(TypeRecorder, "_seed_base_types", return_value={"Integer32": base_entry, "CustomType": custom_entry})
         mock_engine = mocker.patch("app.type_recorder._engine.SnmpEngine")
-        mocker.patch("app.type_recorder._builder.DirMibSource")
+        mocker.patch("app.type_recorder.MibBuildContext.add_source")
         mock_glob = mocker.patch.object(Path, "glob")
 
         mock_mib_builder = mocker.MagicMock()
@@ -1151,7 +1151,7 @@ class TestBuild:
 
         mocker.patch.object(TypeRecorder, "_seed_base_types", return_value={"CustomType": custom_entry})
         mock_engine = mocker.patch("app.type_recorder._engine.SnmpEngine")
-        mocker.patch("app.type_recorder._builder.DirMibSource")
+        mocker.patch("app.type_recorder.MibBuildContext.add_source")
         mock_glob = mocker.patch.object(Path, "glob")
 
         mock_mib_builder = mocker.MagicMock()
@@ -1201,7 +1201,7 @@ class TestBuild:
 
         mocker.patch.object(TypeRecorder, "_seed_base_types", return_value={"CustomNoBase": custom_entry})
         mock_engine = mocker.patch("app.type_recorder._engine.SnmpEngine")
-        mocker.patch("app.type_recorder._builder.DirMibSource")
+        mocker.patch("app.type_recorder.MibBuildContext.add_source")
         mock_glob = mocker.patch.object(Path, "glob")
 
         mock_mib_builder = mocker.MagicMock()
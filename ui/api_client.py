@@ -0,0 +1,243 @@
+"""Background REST client for the GUI.
+
+All API I/O runs on a small worker pool over keep-alive ``requests``
+sessions; results are marshalled back to the Tk thread with ``root.after``.
+Identical in-flight requests (same ``key``) share one HTTP call, and
+requests tagged with a ``group`` can be cancelled together, e.g. when the
+user moves the selection before the previous lookup has answered.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import requests
+
+SuccessCallback = Callable[[Any], None]
+ErrorCallback = Callable[[Exception], None]
+
+
+class ApiRequest:
+    """Handle for a submitted request; ``cancel()`` drops its callbacks."""
+
+    def __init__(
+        self,
+        on_success: Optional[SuccessCallback],
+        on_error: Optional[ErrorCallback],
+        group: Optional[str],
+    ) -> None:
+        self.on_success = on_success
+        self.on_error = on_error
+        self.group = group
+        self._cancelled = threading.Event()
+        self._job: Optional[_Job] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Stop callbacks for this request; the HTTP call is abandoned if nobody else waits on it."""
+        self._cancelled.set()
+        if self._job is not None:
+            self._job.maybe_cancel()
+
+
+class _Job:
+    """One unit of work on the pool, shared by every request with the same key."""
+
+    def __init__(self, key: Optional[Hashable]) -> None:
+        self.key = key
+        self.future: Optional[concurrent.futures.Future[Any]] = None
+        self.subscribers: List[ApiRequest] = []
+        self.lock = threading.Lock()
+
+    def maybe_cancel(self) -> None:
+        with self.lock:
+            future = self.future
+            abandoned = future is not None and all(r.cancelled for r in self.subscribers)
+        if abandoned and future is not None:
+            # Only succeeds if the worker has not started it yet. Outside the
+            # lock: cancel() runs the done callback, which takes it again.
+            future.cancel()
+
+
+class GuiApiClient:
+    """Runs REST calls off the Tk thread and delivers results back onto it."""
+
+    def __init__(self, root: Any, base_url: str, max_workers: int = 6) -> None:
+        self.root = root
+        self.base_url = base_url
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gui-api"
+        )
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Job] = {}
+        self._groups: Dict[str, List[ApiRequest]] = {}
+        self._closed = False
+
+    # Blocking calls (for worker threads, or rare modal flows)
+
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive session for the calling thread."""
+        session: Optional[requests.Session] = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """Blocking request on this thread's keep-alive session."""
+        kwargs.setdefault("timeout", 5)
+        return self.session.request(method, self.url(path), **kwargs)
+
+    def get(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    # Asynchronous calls (from the Tk thread)
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        on_success: Optional[SuccessCallback] = None,
+        on_error: Optional[ErrorCallback] = None,
+        key: Optional[Hashable] = None,
+        group: Optional[str] = None,
+    ) -> ApiRequest:
+        """Run ``func(*args)`` on the worker pool.
+
+        ``on_success(result)`` or ``on_error(exc)`` is then called on the Tk
+        thread unless the request was cancelled. With ``key``, a call made
+        while an identical one is still running joins it instead of issuing
+        another. With ``group``, the request is cancelled by
+        ``cancel_group(group)``.
+        """
+        handle = ApiRequest(on_success, on_error, group)
+        if group is not None:
+            with self._lock:
+                self._groups.setdefault(group, []).append(handle)
+
+        with self._lock:
+            job = self._inflight.get(key) if key is not None else None
+            if job is not None:
+                with job.lock:
+                    if job.future is not None and not job.future.cancelled():
+                        job.subscribers.append(handle)
+                        handle._job = job
+                        return handle
+            job = _Job(key)
+            job.subscribers.append(handle)
+            handle._job = job
+            if key is not None:
+                self._inflight[key] = job
+            if self._closed:
+                self._inflight.pop(key, None)
+                return handle
+            with job.lock:
+                job.future = self._executor.submit(func, *args)
+        job.future.add_done_callback(lambda future: self._finished(job, future))
+        return handle
+
+    def fetch(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        timeout: float = 5,
+        on_success: Optional[SuccessCallback] = None,
+        on_error: Optional[ErrorCallback] = None,
+        key: Optional[Hashable] = None,
+        group: Optional[str] = None,
+    ) -> ApiRequest:
+        """Asynchronous JSON request; ``on_success`` receives the decoded body.
+
+        GETs are de-duplicated by method, path and params unless ``key`` is
+        given. Non-2xx responses are reported to ``on_error`` as
+        ``requests.HTTPError``.
+        """
+        if key is None and method.upper() == "GET":
+            key = (method.upper(), path, tuple(sorted((params or {}).items())))
+
+        def _call() -> Any:
+            response = self.request(method, path, params=params, json=json, timeout=timeout)
+            response.raise_for_status()
+            return response.json() if response.content else None
+
+        return self.submit(_call, on_success=on_success, on_error=on_error, key=key, group=group)
+
+    def cancel_group(self, group: str) -> None:
+        """Cancel every outstanding request submitted with ``group``."""
+        with self._lock:
+            handles = self._groups.pop(group, [])
+        for handle in handles:
+            handle.cancel()
+
+    def close(self) -> None:
+        """Cancel queued work and release the HTTP connections."""
+        with self._lock:
+            self._closed = True
+            groups = list(self._groups)
+        for group in groups:
+            self.cancel_group(group)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    def _finished(self, job: _Job, future: concurrent.futures.Future[Any]) -> None:
+        with self._lock:
+            if job.key is not None and self._inflight.get(job.key) is job:
+                del self._inflight[job.key]
+            with job.lock:
+                subscribers = list(job.subscribers)
+            for handle in subscribers:
+                if handle.group is not None:
+                    members = self._groups.get(handle.group)
+                    if members is not None and handle in members:
+                        members.remove(handle)
+                        if not members:
+                            del self._groups[handle.group]
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        result = None if error is not None else future.result()
+        for handle in subscribers:
+            callback = handle.on_error if error is not None else handle.on_success
+            if callback is None:
+                continue
+            self._deliver(handle, callback, error if error is not None else result)
+
+    def _deliver(self, handle: ApiRequest, callback: Callable[[Any], None], value: Any) -> None:
+        def _run() -> None:
+            # Re-check on the Tk thread: a cancel may have raced the response
+            if not handle.cancelled:
+                callback(value)
+
+        try:
+            self.root.after(0, _run)
+        except Exception:
+            # Window already destroyed
+            pass
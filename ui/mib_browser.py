@@ -4,23 +4,18 @@ This module can be run independently or embedded in other applications.
 """
 from __future__ import annotations
 
-import asyncio
+import queue
+import threading
+import time
 import customtkinter as ctk
 import tkinter as tk
+from concurrent.futures import Future
 from tkinter import messagebox, ttk
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Coroutine
 
 from pysnmp.hlapi.v3arch.asyncio import (
-    SnmpEngine,
-    CommunityData,
-    UdpTransportTarget,
-    ContextData,
     ObjectType,
     ObjectIdentity,
-    get_cmd,
-    next_cmd,
-    set_cmd,
-    walk_cmd,
 )
 from pysnmp.proto.rfc1902 import OctetString
 from pysnmp.smi import builder, view
@@ -28,9 +23,23 @@ from pathlib import Path
 
 try:
     from ui.common import Logger, format_snmp_value
+    from ui.snmp_session import SnmpSession, WalkCancelled
 except ImportError:
     # Fallback for when running from ui directory
     from common import Logger, format_snmp_value  # type: ignore[no-redef]
+    from snmp_session import SnmpSession, WalkCancelled  # type: ignore[no-redef]
+
+try:
+    from app.mib_catalogue import MibCatalogue
+except ImportError:
+    # Running without the agent package: fall back to scanning files directly
+    MibCatalogue = None  # type: ignore[assignment,misc]
+
+MIB_FILE_EXTENSIONS = (".py", ".mib", ".txt", ".my", ".asn", ".asn1")
+
+# Tk-side delivery of SNMP results: poll interval and per-tick time budget
+UI_DRAIN_INTERVAL_MS = 30
+UI_DRAIN_BUDGET = 0.03
 
 
 class MIBBrowserWindow:
@@ -78,6 +87,11 @@ class MIBBrowserWindow:
         self.icons: Dict[str, Any] = {}
         self._load_icons()
         
+        # One SNMP engine on a background loop for all operations
+        self.snmp_session = SnmpSession()
+        self._ui_queue: "queue.SimpleQueue[tuple[Callable[..., None], tuple[Any, ...]]]" = queue.SimpleQueue()
+        self._walk_cancel: Optional[threading.Event] = None
+        
         # Track agent results separately
         self.agent_results: Dict[str, Dict[str, Any]] = {}  # host:port -> {operations, etc.}
         self.agent_tree_items: Dict[str, str] = {}  # host:port -> tree_item_id
@@ -95,6 +109,7 @@ class MIBBrowserWindow:
             self.window = parent
         
         self._setup_ui()
+        self.window.after(UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
     
     def _setup_mib_paths(self) -> None:
         """Setup MIB search paths for pysnmp."""
@@ -121,6 +136,16 @@ class MIBBrowserWindow:
             if mib_path.exists():
                 self.mib_builder.addMibSources(builder.DirMibSource(str(mib_path)))
                 self.logger.log(f"Added MIB source: {mib_path}", "DEBUG")
+
+        # Catalogue of MIB files (name -> path + parsed imports) for dependency checks
+        self._mib_catalogue: Any = None
+        if MibCatalogue is not None:
+            compiled_dir = Path(__file__).parent.parent / "compiled-mibs"
+            self._mib_catalogue = MibCatalogue.shared(
+                [str(self.mib_cache_dir), str(compiled_dir), *(str(p) for p in system_mib_paths)],
+                extensions=MIB_FILE_EXTENSIONS,
+                max_depth=0,
+            )
     
     def _load_icons(self) -> None:
         """Load icons for the results tree (same as OID tree)."""
@@ -257,6 +282,9 @@ class MIBBrowserWindow:
         walk_btn = ctk.CTkButton(buttons_frame, text="WALK", command=self._snmp_walk, width=100)
         walk_btn.pack(side="left", padx=5)
         
+        stop_btn = ctk.CTkButton(buttons_frame, text="STOP", command=self._cancel_walk, width=70)
+        stop_btn.pack(side="left", padx=5)
+        
         set_btn = ctk.CTkButton(buttons_frame, text="SET", command=self._snmp_set, width=100)
         set_btn.pack(side="left", padx=5)
         
@@ -394,6 +422,11 @@ class MIBBrowserWindow:
         Returns:
             List of imported MIB names
         """
+        if self._mib_catalogue is not None:
+            entry = self._mib_catalogue.entry(mib_file_path.stem)
+            if entry is not None and Path(entry.path) == mib_file_path:
+                return list(entry.imports)
+
         imports = []
         try:
             content = mib_file_path.read_text(encoding='utf-8', errors='ignore')
@@ -462,6 +495,10 @@ class MIBBrowserWindow:
         Returns:
             Path to MIB file or None if not found
         """
+        if self._mib_catalogue is not None:
+            path = self._mib_catalogue.find(mib_name)
+            return Path(path) if path else None
+
         # Check cache first
         cache_py = self.mib_cache_dir / f"{mib_name}.py"
         cache_mib = self.mib_cache_dir / f"{mib_name}.mib"
@@ -940,6 +977,9 @@ class MIBBrowserWindow:
         # Scan cache directory
         if not self.mib_cache_dir.exists():
             self.mib_cache_dir.mkdir(parents=True, exist_ok=True)
+        if self._mib_catalogue is not None:
+            # Re-parse only MIB files added or changed since the last scan
+            self._mib_catalogue.refresh()
         
         mib_files = (
             sorted(self.mib_cache_dir.glob("*.mib")) + 
@@ -1343,6 +1383,97 @@ class MIBBrowserWindow:
         
         return op_item
     
+    def _post_ui(self, fn: Callable[..., None], *args: Any) -> None:
+        """Queue ``fn(*args)`` to run on the Tk thread (safe from any thread)."""
+        self._ui_queue.put((fn, args))
+
+    def _drain_ui_queue(self) -> None:
+        """Run queued UI callbacks within a small time budget, then yield to Tk."""
+        deadline = time.monotonic() + UI_DRAIN_BUDGET
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    fn, args = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    fn(*args)
+                except Exception as e:
+                    self.logger.log(f"MIB Browser UI update failed: {e}", "ERROR")
+        finally:
+            try:
+                self.window.after(UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
+            except tk.TclError:
+                # Window destroyed
+                pass
+
+    def _run_snmp(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        on_done: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+    ) -> None:
+        """Run an SNMP coroutine on the session and deliver its outcome on the Tk thread."""
+        def _finished(future: "Future[Any]") -> None:
+            try:
+                result = future.result()
+            except Exception as e:
+                self._post_ui(on_error, e)
+            else:
+                self._post_ui(on_done, result)
+
+        self.snmp_session.submit(coro).add_done_callback(_finished)
+
+    @staticmethod
+    async def _guard_status(coro: Coroutine[Any, Any, tuple[Any, ...]]) -> tuple[Any, ...]:
+        """Turn pysnmp serialization errors into an errorIndication result."""
+        from pysnmp.proto.error import StatusInformation
+
+        try:
+            return await coro
+        except StatusInformation as e:
+            error_indication = e.get('errorIndication', str(e))
+            return (error_indication, None, None, [])
+
+    def _show_snmp_exception(self, operation: str, error: Exception) -> None:
+        error_msg = self._format_mib_error(error)
+        self.status_var.set(f"Error: {error_msg.split(chr(10))[0]}")
+        self.logger.log(f"MIB Browser {operation} error: {error}", "ERROR")
+        messagebox.showerror(f"SNMP {operation} Error", error_msg, parent=self.window)
+
+    def _report_snmp_errors(self, operation: str, errorIndication: Any, errorStatus: Any) -> bool:
+        """Show an SNMP error indication/status; returns True if there was one."""
+        if errorIndication:
+            self.status_var.set(f"Error: {errorIndication}")
+            self.logger.log(f"MIB Browser {operation} error: {errorIndication}", "ERROR")
+            messagebox.showerror(f"SNMP {operation} Error", str(errorIndication), parent=self.window)
+            return True
+        if errorStatus:
+            self.status_var.set(f"Error: {errorStatus.prettyPrint()}")
+            self.logger.log(f"MIB Browser {operation} error: {errorStatus.prettyPrint()}", "ERROR")
+            messagebox.showerror(f"SNMP {operation} Error", errorStatus.prettyPrint(), parent=self.window)
+            return True
+        return False
+
+    def _insert_var_binds(self, op_item: str, rows: list[tuple[str, str, str]]) -> None:
+        """Insert (oid, type, value) rows under an operation node."""
+        for oid_str, type_str, value in rows:
+            name = self._get_name_from_oid(oid_str)
+            icon = self._get_icon_for_oid(oid_str)
+            self.results_tree.insert(
+                op_item, "end",
+                text=name,
+                image=icon if icon else "",
+                values=(oid_str, type_str, value)
+            )
+
+    @staticmethod
+    def _var_bind_rows(varBinds: Any) -> list[tuple[str, str, str]]:
+        return [
+            (str(varBind[0]), type(varBind[1]).__name__, format_snmp_value(varBind[1]))
+            for varBind in varBinds
+        ]
+
     def _snmp_get(self) -> None:
         """Execute SNMP GET command."""
         oid = self.oid_var.get().strip()
@@ -1361,36 +1492,11 @@ class MIBBrowserWindow:
         host, port, community = self._get_connection_params()
         self.status_var.set(f"Executing GET on {display_oid}...")
         self.logger.log(f"MIB Browser: GET {display_oid} from {host}:{port}")
-        
-        try:
-            async def async_get() -> tuple[Any, ...]:
-                from pysnmp.proto.error import StatusInformation
-                
-                try:
-                    return await get_cmd(  # type: ignore[no-any-return]
-                        SnmpEngine(),
-                        CommunityData(community, mpModel=1),
-                        await UdpTransportTarget.create((host, port)),
-                        ContextData(),
-                        ObjectType(obj_identity)
-                    )
-                except StatusInformation as e:
-                    # Handle any serialization errors
-                    error_indication = e.get('errorIndication', str(e))
-                    return (error_indication, None, None, [])
 
-            errorIndication, errorStatus, errorIndex, varBinds = asyncio.run(async_get())
+        def _show(result: tuple[Any, ...]) -> None:
+            errorIndication, errorStatus, errorIndex, varBinds = result
             _ = errorIndex  # Unused but part of SNMP response tuple
-            
-            if errorIndication:
-                self.status_var.set(f"Error: {errorIndication}")
-                self.logger.log(f"MIB Browser GET error: {errorIndication}", "ERROR")
-                messagebox.showerror("SNMP GET Error", str(errorIndication), parent=self.window)
-                return
-            elif errorStatus:
-                self.status_var.set(f"Error: {errorStatus.prettyPrint()}")
-                self.logger.log(f"MIB Browser GET error: {errorStatus.prettyPrint()}", "ERROR")
-                messagebox.showerror("SNMP GET Error", errorStatus.prettyPrint(), parent=self.window)
+            if self._report_snmp_errors("GET", errorIndication, errorStatus):
                 return
             
             # Get or create agent node
@@ -1398,30 +1504,16 @@ class MIBBrowserWindow:
             
             # Get or create operation node
             op_item = self._get_or_create_operation_node(agent_item, "GET", display_oid)
-            
-            # Add results
-            for varBind in varBinds:
-                oid_str = str(varBind[0])
-                value = format_snmp_value(varBind[1])
-                type_str = type(varBind[1]).__name__
-                name = self._get_name_from_oid(oid_str)
-                icon = self._get_icon_for_oid(oid_str)
-                
-                self.results_tree.insert(
-                    op_item, "end",
-                    text=name,
-                    image=icon if icon else "",
-                    values=(oid_str, type_str, value)
-                )
+            self._insert_var_binds(op_item, self._var_bind_rows(varBinds))
             
             self.status_var.set(f"GET completed: {len(varBinds)} result(s)")
             self.logger.log(f"MIB Browser: GET {display_oid} returned {len(varBinds)} result(s)")
-        
-        except Exception as e:
-            error_msg = self._format_mib_error(e)
-            self.status_var.set(f"Error: {error_msg.split(chr(10))[0]}")
-            self.logger.log(f"MIB Browser GET error: {e}", "ERROR")
-            messagebox.showerror("SNMP GET Error", error_msg, parent=self.window)
+
+        self._run_snmp(
+            self._guard_status(self.snmp_session.get(host, port, community, ObjectType(obj_identity))),
+            _show,
+            lambda e: self._show_snmp_exception("GET", e),
+        )
     
     def _snmp_getnext(self) -> None:
         """Execute SNMP GETNEXT command."""
@@ -1441,38 +1533,11 @@ class MIBBrowserWindow:
         host, port, community = self._get_connection_params()
         self.status_var.set(f"Executing GETNEXT on {display_oid}...")
         self.logger.log(f"MIB Browser: GETNEXT {display_oid} from {host}:{port}")
-        
-        try:
-            async def async_next() -> tuple[Any, ...]:
-                # next_cmd returns a coroutine that yields ONE result
-                from pysnmp.proto.error import StatusInformation
-                target = await UdpTransportTarget.create((host, port))
-                
-                try:
-                    return await next_cmd(  # type: ignore[no-any-return]
-                        SnmpEngine(),
-                        CommunityData(community, mpModel=1),
-                        target,
-                        ContextData(),
-                        ObjectType(obj_identity)
-                    )
-                except StatusInformation as e:
-                    # Handle any serialization errors
-                    error_indication = e.get('errorIndication', str(e))
-                    return (error_indication, None, None, [])
 
-            errorIndication, errorStatus, errorIndex, varBinds = asyncio.run(async_next())
+        def _show(result: tuple[Any, ...]) -> None:
+            errorIndication, errorStatus, errorIndex, varBinds = result
             _ = errorIndex  # Unused but part of SNMP response tuple
-            
-            if errorIndication:
-                self.status_var.set(f"Error: {errorIndication}")
-                self.logger.log(f"MIB Browser GETNEXT error: {errorIndication}", "ERROR")
-                messagebox.showerror("SNMP GETNEXT Error", str(errorIndication), parent=self.window)
-                return
-            elif errorStatus:
-                self.status_var.set(f"Error: {errorStatus.prettyPrint()}")
-                self.logger.log(f"MIB Browser GETNEXT error: {errorStatus.prettyPrint()}", "ERROR")
-                messagebox.showerror("SNMP GETNEXT Error", errorStatus.prettyPrint(), parent=self.window)
+            if self._report_snmp_errors("GETNEXT", errorIndication, errorStatus):
                 return
             
             # Get or create agent node
@@ -1480,21 +1545,7 @@ class MIBBrowserWindow:
             
             # Get or create operation node
             op_item = self._get_or_create_operation_node(agent_item, "GETNEXT", display_oid)
-            
-            # Add results
-            for varBind in varBinds:
-                oid_str = str(varBind[0])
-                value = format_snmp_value(varBind[1])
-                type_str = type(varBind[1]).__name__
-                name = self._get_name_from_oid(oid_str)
-                icon = self._get_icon_for_oid(oid_str)
-                
-                self.results_tree.insert(
-                    op_item, "end",
-                    text=name,
-                    image=icon if icon else "",
-                    values=(oid_str, type_str, value)
-                )
+            self._insert_var_binds(op_item, self._var_bind_rows(varBinds))
             
             # Update OID field with returned OID for easy iteration
             if varBinds:
@@ -1504,15 +1555,15 @@ class MIBBrowserWindow:
             
             self.status_var.set(f"GETNEXT completed: {len(varBinds)} result(s)")
             self.logger.log(f"MIB Browser: GETNEXT {display_oid} returned {len(varBinds)} result(s)")
-        
-        except Exception as e:
-            error_msg = self._format_mib_error(e)
-            self.status_var.set(f"Error: {error_msg.split(chr(10))[0]}")
-            self.logger.log(f"MIB Browser GETNEXT error: {e}", "ERROR")
-            messagebox.showerror("SNMP GETNEXT Error", error_msg, parent=self.window)
+
+        self._run_snmp(
+            self._guard_status(self.snmp_session.next(host, port, community, ObjectType(obj_identity))),
+            _show,
+            lambda e: self._show_snmp_exception("GETNEXT", e),
+        )
     
     def _snmp_walk(self) -> None:
-        """Execute SNMP WALK command."""
+        """Execute SNMP WALK (GETBULK), streaming results into the tree."""
         oid = self.oid_var.get().strip()
         if not oid:
             messagebox.showwarning("No OID", "Please enter an OID", parent=self.window)
@@ -1526,81 +1577,58 @@ class MIBBrowserWindow:
             self.status_var.set(f"Error: {e}")
             return
         
+        # Only one walk at a time: a new walk cancels the running one
+        self._cancel_walk()
+        cancel = threading.Event()
+        self._walk_cancel = cancel
+
         host, port, community = self._get_connection_params()
         self.status_var.set(f"Executing WALK on {display_oid}...")
         self.logger.log(f"MIB Browser: WALK {display_oid} from {host}:{port}")
+
+        # Get or create agent node
+        agent_item = self._get_or_create_agent_node(host, port)
         
-        try:
-            async def async_walk() -> list[tuple[Any, ...]]:
-                from pysnmp.proto.error import StatusInformation
-                
-                walk_results = []
-                target = await UdpTransportTarget.create((host, port))
-                
-                try:
-                    # walk_cmd returns async generator directly
-                    iterator = walk_cmd(
-                        SnmpEngine(),
-                        CommunityData(community, mpModel=1),
-                        target,
-                        ContextData(),
-                        ObjectType(obj_identity)
-                    )
-                    async for errorIndication, errorStatus, errorIndex, varBinds in iterator:
-                        walk_results.append((errorIndication, errorStatus, errorIndex, varBinds))
-                except StatusInformation as e:
-                    # Handle any serialization errors
-                    error_indication = e.get('errorIndication', str(e))
-                    walk_results.append((error_indication, None, None, []))
-                
-                return walk_results
+        # Get or create operation node
+        op_item = self._get_or_create_operation_node(agent_item, "WALK", display_oid)
+        received = [0]
 
-            walk_results = asyncio.run(async_walk())
-            
-            # Get or create agent node
-            agent_item = self._get_or_create_agent_node(host, port)
-            
-            # Get or create operation node
-            op_item = self._get_or_create_operation_node(agent_item, "WALK", display_oid)
-            
-            result_count = 0
-            for errorIndication, errorStatus, errorIndex, varBinds in walk_results:
-                _ = errorIndex  # Unused but part of SNMP response tuple
-                if errorIndication:
-                    self.status_var.set(f"Error: {errorIndication}")
-                    self.logger.log(f"MIB Browser WALK error: {errorIndication}", "ERROR")
-                    messagebox.showerror("SNMP WALK Error", str(errorIndication), parent=self.window)
-                    return
-                elif errorStatus:
-                    self.status_var.set(f"Error: {errorStatus}")
-                    self.logger.log(f"MIB Browser WALK error: {errorStatus}", "ERROR")
-                    messagebox.showerror("SNMP WALK Error", str(errorStatus), parent=self.window)
-                    return
-                
-                # Process results
-                for varBind in varBinds:
-                    oid_str = str(varBind[0])
-                    value = format_snmp_value(varBind[1])
-                    type_str = type(varBind[1]).__name__
-                    name = self._get_name_from_oid(oid_str)
-                    icon = self._get_icon_for_oid(oid_str)
-                    
-                    self.results_tree.insert(
-                        op_item, "end",
-                        text=name,
-                        image=icon if icon else "",
-                        values=(oid_str, type_str, value)
-                    )
-                    result_count += 1
-            
+        def _insert(rows: list[tuple[str, str, str]]) -> None:
+            self._insert_var_binds(op_item, rows)
+            received[0] += len(rows)
+            if not cancel.is_set():
+                self.status_var.set(f"WALK {display_oid}: {received[0]} result(s) so far...")
+
+        def _on_batch(batch: Any) -> None:
+            # Runs on the session loop: format there, insert on the Tk thread
+            self._post_ui(_insert, self._var_bind_rows(batch))
+
+        def _done(result_count: int) -> None:
+            if self._walk_cancel is cancel:
+                self._walk_cancel = None
             self.status_var.set(f"WALK completed: {result_count} result(s)")
             self.logger.log(f"MIB Browser: WALK {display_oid} returned {result_count} result(s)")
-        
-        except Exception as e:
-            error_msg = self._format_mib_error(e)
-            self.status_var.set(f"Error: {error_msg.split(chr(10))[0]}")
-            self.logger.log(f"MIB Browser WALK error: {e}", "ERROR")
-            messagebox.showerror("SNMP WALK Error", error_msg, parent=self.window)
+
+        def _failed(error: Exception) -> None:
+            if self._walk_cancel is cancel:
+                self._walk_cancel = None
+            if isinstance(error, WalkCancelled):
+                self.status_var.set(f"WALK cancelled after {received[0]} result(s)")
+                self.logger.log(f"MIB Browser: WALK {display_oid} cancelled after {received[0]} result(s)")
+                return
+            self._show_snmp_exception("WALK", error)
+
+        self._run_snmp(
+            self.snmp_session.walk(host, port, community, ObjectType(obj_identity), _on_batch, cancel),
+            _done,
+            _failed,
+        )
+
+    def _cancel_walk(self) -> None:
+        """Stop the running WALK (results received so far stay in the tree)."""
+        if self._walk_cancel is not None:
+            self._walk_cancel.set()
+            self._walk_cancel = None
     
     def _snmp_set(self) -> None:
         """Execute SNMP SET command."""
@@ -1625,38 +1653,11 @@ class MIBBrowserWindow:
         host, port, community = self._get_connection_params()
         self.status_var.set(f"Executing SET on {display_oid}...")
         self.logger.log(f"MIB Browser: SET {display_oid} = {value} on {host}:{port}")
-        
-        try:
-            # SNMP SET - using OctetString by default
-            # In a production tool, you'd want type selection UI
-            async def async_set() -> tuple[Any, ...]:
-                from pysnmp.proto.error import StatusInformation
-                
-                try:
-                    return await set_cmd(  # type: ignore[no-any-return]
-                        SnmpEngine(),
-                        CommunityData(community, mpModel=1),
-                        await UdpTransportTarget.create((host, port)),
-                        ContextData(),
-                        ObjectType(obj_identity, OctetString(value))
-                    )
-                except StatusInformation as e:
-                    # Handle any serialization errors
-                    error_indication = e.get('errorIndication', str(e))
-                    return (error_indication, None, None, [])
 
-            errorIndication, errorStatus, errorIndex, varBinds = asyncio.run(async_set())
-            _ = errorIndex  # Unused but part of SNMP response tuple
-            
-            if errorIndication:
-                self.status_var.set(f"Error: {errorIndication}")
-                self.logger.log(f"MIB Browser SET error: {errorIndication}", "ERROR")
-                messagebox.showerror("SNMP SET Error", str(errorIndication), parent=self.window)
-                return
-            elif errorStatus:
-                self.status_var.set(f"Error: {errorStatus.prettyPrint()}")
-                self.logger.log(f"MIB Browser SET error: {errorStatus.prettyPrint()}", "ERROR")
-                messagebox.showerror("SNMP SET Error", errorStatus.prettyPrint(), parent=self.window)
+        def _show(result: tuple[Any, ...]) -> None:
+            errorIndication, errorStatus, errorIndex, varBinds = result
+            _ = errorIndex, varBinds  # Unused but part of SNMP response tuple
+            if self._report_snmp_errors("SET", errorIndication, errorStatus):
                 return
             
             # Get or create agent node
@@ -1677,12 +1678,16 @@ class MIBBrowserWindow:
             
             self.status_var.set("SET completed successfully")
             self.logger.log(f"MIB Browser: SET {display_oid} = {value} successful")
-        
-        except Exception as e:
-            error_msg = self._format_mib_error(e)
-            self.status_var.set(f"Error: {error_msg.split(chr(10))[0]}")
-            self.logger.log(f"MIB Browser SET error: {e}", "ERROR")
-            messagebox.showerror("SNMP SET Error", error_msg, parent=self.window)
+
+        # SNMP SET - using OctetString by default
+        # In a production tool, you'd want type selection UI
+        self._run_snmp(
+            self._guard_status(
+                self.snmp_session.set(host, port, community, ObjectType(obj_identity, OctetString(value)))
+            ),
+            _show,
+            lambda e: self._show_snmp_exception("SET", e),
+        )
     
     def _get_name_from_oid(self, oid_str: str) -> str:
         """Get human-readable name from OID using loaded MIBs."""
@@ -1736,7 +1741,15 @@ class MIBBrowserWindow:
     def run(self) -> None:
         """Run the standalone browser window."""
         if isinstance(self.window, ctk.CTk):
-            self.window.mainloop()
+            try:
+                self.window.mainloop()
+            finally:
+                self.close()
+
+    def close(self) -> None:
+        """Cancel any running walk and stop the SNMP session."""
+        self._cancel_walk()
+        self.snmp_session.close()
     
     def set_oid_metadata(self, metadata: Dict[str, Dict[str, Any]]) -> None:
         """Update OID metadata for name resolution."""
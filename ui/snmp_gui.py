@@ -4,7 +4,7 @@ import customtkinter as ctk
 from tkinter import messagebox, ttk
 import tkinter as tk
 import tkinter.font as tkfont
-from typing import Any, Dict, Tuple, List, Literal,cast, TypedDict, Optional
+from typing import Any, Callable, Dict, Tuple, List, Literal,cast, TypedDict, Optional
 import concurrent.futures
 import requests
 from datetime import datetime
@@ -15,11 +15,13 @@ from pathlib import Path
 
 # Import common utilities and MIB browser
 try:
+    from ui.api_client import GuiApiClient
     from ui.common import Logger, save_gui_log
     from ui.mib_browser import MIBBrowserWindow
 except ImportError:
     # Fallback for when running from ui directory
     try:
+        from api_client import GuiApiClient  # type: ignore[no-redef]
         from common import Logger, save_gui_log  # type: ignore[no-redef]
         from mib_browser import MIBBrowserWindow  # type: ignore[no-redef]
     except ImportError:
@@ -29,6 +31,7 @@ except ImportError:
         ui_dir = str(Path(__file__).parent)
         if ui_dir not in sys.path:
             sys.path.insert(0, ui_dir)
+        from api_client import GuiApiClient  # type: ignore[no-redef]
         from common import Logger, save_gui_log  # type: ignore[no-redef]
         from mib_browser import MIBBrowserWindow  # type: ignore[no-redef]
 
@@ -67,10 +70,17 @@ class SNMPControllerGUI:
         self.oid_metadata: Dict[str, Dict[str, Any]] = {}  # oid_str -> metadata
         self.table_instances_data: Dict[str, Dict[str, Any]] = {}  # Pre-loaded table instances data
         self.oid_to_item: Dict[str, str] = {}  # oid_str -> tree item id
+        # OID trie the tree is built from; children are inserted when a node is first opened
+        self._oid_trie: Dict[Any, Any] = {}
+        self._unmaterialised: Dict[str, Tuple[Dict[Any, Any], Tuple[int, ...]]] = {}  # item -> (trie node, oid)
+        self._tree_width_cache: Dict[str, int] = {}  # item -> column #0 width its text needs
+        self._tree_fonts: Dict[int, tkfont.Font] = {}
         self._pending_oid_focus: Dict[str, Optional[str]] | None = None
         self._pending_oid_focus_retries: int = 0
         # Executor for background value fetching
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+        # REST calls: keep-alive sessions, results delivered on the Tk thread
+        self.api = GuiApiClient(self.root, api_url)
         
         # Initialize logger (will set log widget after UI setup)
         self.logger = Logger()
@@ -431,10 +441,23 @@ class SNMPControllerGUI:
         self.add_index_col_btn = ctk.CTkButton(buttons_frame, text="Add Index Column", command=self._add_index_column, fg_color="green", hover_color="darkgreen")
         self.add_index_col_btn.pack(side="left")
 
+        # Pager: the table view shows one page of /table-rows at a time
+        self.table_next_btn = ctk.CTkButton(buttons_frame, text="Next ▶", width=80, command=lambda: self._change_table_page(1))
+        self.table_next_btn.pack(side="right")
+        self.table_page_label = ctk.CTkLabel(buttons_frame, text="")
+        self.table_page_label.pack(side="right", padx=10)
+        self.table_prev_btn = ctk.CTkButton(buttons_frame, text="◀ Prev", width=80, command=lambda: self._change_table_page(-1))
+        self.table_prev_btn.pack(side="right")
+        self._table_page_size = 200
+        self._table_page_offset = 0
+        self._table_total_rows = 0
+
         # Initially disable buttons
         self.add_instance_btn.configure(state="disabled")
         self.remove_instance_btn.configure(state="disabled")
         self.add_index_col_btn.configure(state="disabled")
+        self.table_prev_btn.configure(state="disabled")
+        self.table_next_btn.configure(state="disabled")
 
         # Table view treeview
         self.table_tree = ttk.Treeview(table_frame, columns=("index",), show="headings", style="OID.Treeview")
@@ -548,11 +571,16 @@ class SNMPControllerGUI:
     def _refresh_links(self) -> None:
         if not self.connected:
             return
+        self.api.fetch(
+            "GET",
+            "/links",
+            on_success=self._show_links,
+            on_error=lambda exc: self._log(f"Failed to refresh links: {exc}", "WARNING"),
+        )
+
+    def _show_links(self, data: Dict[str, Any]) -> None:
         try:
-            resp = requests.get(f"{self.api_url}/links", timeout=5)
-            resp.raise_for_status()
-            data = resp.json()
-            self.links_data = data.get("links", [])
+            self.links_data = (data or {}).get("links", [])
 
             for item in self.links_tree.get_children():
                 self.links_tree.delete(item)
@@ -601,12 +629,12 @@ class SNMPControllerGUI:
             return
         if not messagebox.askyesno("Delete Link", f"Delete link '{link.get('id')}'?"):
             return
-        try:
-            resp = requests.delete(f"{self.api_url}/links/{link.get('id')}", timeout=5)
-            resp.raise_for_status()
-            self._refresh_links()
-        except Exception as exc:
-            messagebox.showerror("Links", f"Failed to delete link: {exc}")
+        self.api.fetch(
+            "DELETE",
+            f"/links/{link.get('id')}",
+            on_success=lambda _data: self._refresh_links(),
+            on_error=lambda exc: messagebox.showerror("Links", f"Failed to delete link: {exc}"),
+        )
 
     def _parse_endpoints_text(self, text_value: str) -> list[dict[str, Any]]:
         endpoints: list[dict[str, Any]] = []
@@ -852,14 +880,21 @@ class SNMPControllerGUI:
                 "description": desc_var.get().strip() or None,
                 "create_missing": False,
             }
-            try:
-                resp = requests.post(f"{self.api_url}/links", json=payload, timeout=5)
-                resp.raise_for_status()
-                dialog.destroy()
+            def _saved(_data: Any) -> None:
+                try:
+                    dialog.destroy()
+                except tk.TclError:
+                    pass
                 self._refresh_links()
-            except Exception as exc:
+
+            def _failed(exc: Exception) -> None:
+                save_btn.configure(state="normal")
                 messagebox.showerror("Links", f"Failed to save link: {exc}")
 
+            # Disabled until the API answers, so a slow save is not submitted twice
+            save_btn.configure(state="disabled")
+            self.api.fetch("POST", "/links", json=payload, on_success=_saved, on_error=_failed)
+
         def _close() -> None:
             dialog.destroy()
 
@@ -1516,6 +1551,9 @@ class SNMPControllerGUI:
         if self._last_trap_index and self._last_trap_index != current_index:
             self._save_all_overrides_silent(trap_name_override=trap_name)
 
+        # Drop lookups still running for the previous index
+        self.api.cancel_group("trap")
+
         self._update_override_labels()
         self._load_trap_overrides(trap_name)
         self._refresh_current_values()
@@ -1603,80 +1641,69 @@ class SNMPControllerGUI:
 
     def _load_trap_overrides(self, trap_name: str) -> None:
         """Load stored overrides for the specified trap and update table."""
+        self.api.fetch(
+            "GET",
+            f"/trap-overrides/{trap_name}",
+            on_success=lambda data: self._apply_trap_overrides_to_rows((data or {}).get("overrides", {})),
+            on_error=self._on_trap_overrides_failed,
+            group="trap",
+        )
+
+    def _on_trap_overrides_failed(self, error: Exception) -> None:
+        if not isinstance(error, requests.HTTPError):
+            self._log(f"Failed to load trap overrides: {error}", "WARNING")
+        self._apply_trap_overrides_to_rows({})
+
+    def _apply_trap_overrides_to_rows(self, overrides: Dict[str, Any]) -> None:
+        """Show ``overrides`` in the OID table (empty clears every row)."""
         self._loading_trap_overrides = True
         try:
-            response = requests.get(f"{self.api_url}/trap-overrides/{trap_name}", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                self.current_trap_overrides = data.get("overrides", {})
-                
-                # Update table rows with override values
-                for row in self.oid_rows:
-                    # Skip sysUpTime and index varbinds
-                    if row.get("is_sysuptime", False) or row.get("is_index", False):
-                        continue
+            self.current_trap_overrides = overrides
+            
+            # Update table rows with override values
+            for row in self.oid_rows:
+                # Skip sysUpTime and index varbinds
+                if row.get("is_sysuptime", False) or row.get("is_index", False):
+                    continue
 
-                    oid_name = row["oid_name"]
-                    if oid_name in self.current_trap_overrides:
-                        saved_entry = self.current_trap_overrides[oid_name]
-                        if isinstance(saved_entry, dict):
-                            enabled = bool(saved_entry.get("enabled"))
-                            override_val = str(saved_entry.get("value", ""))
-                        else:
-                            enabled = True
-                            override_val = str(saved_entry)
-
-                        row["use_override_var"].set(enabled)
-                        if row.get("is_enum"):
-                            display_val = self._format_enum_display(override_val, row.get("enums", {}))
-                            if row.get("override_var") is not None:
-                                row["override_var"].set(display_val)
-                            else:
-                                row["override_entry"].set(display_val)
+                oid_name = row["oid_name"]
+                if oid_name in self.current_trap_overrides:
+                    saved_entry = self.current_trap_overrides[oid_name]
+                    if isinstance(saved_entry, dict):
+                        enabled = bool(saved_entry.get("enabled"))
+                        override_val = str(saved_entry.get("value", ""))
+                    else:
+                        enabled = True
+                        override_val = str(saved_entry)
+
+                    row["use_override_var"].set(enabled)
+                    if row.get("is_enum"):
+                        display_val = self._format_enum_display(override_val, row.get("enums", {}))
+                        if row.get("override_var") is not None:
+                            row["override_var"].set(display_val)
                         else:
-                            # Entry will be enabled by the trace callback
-                            if row.get("override_var") is not None:
-                                row["override_var"].set(override_val)
-                            else:
-                                row["override_entry"].delete(0, "end")
-                                row["override_entry"].insert(0, override_val)
+                            row["override_entry"].set(display_val)
                     else:
-                        row["use_override_var"].set(False)
-                        if row.get("is_enum"):
-                            if row.get("override_var") is not None:
-                                row["override_var"].set("")
-                            else:
-                                row["override_entry"].set("")
+                        # Entry will be enabled by the trace callback
+                        if row.get("override_var") is not None:
+                            row["override_var"].set(override_val)
                         else:
-                            if row.get("override_var") is not None:
-                                row["override_var"].set("")
-                            else:
-                                row["override_entry"].delete(0, "end")
-            else:
-                self.current_trap_overrides = {}
-                # Clear all checkboxes and entries
-                for row in self.oid_rows:
-                    # Skip sysUpTime and index varbinds
-                    if row.get("is_sysuptime", False) or row.get("is_index", False):
-                        continue
+                            row["override_entry"].delete(0, "end")
+                            row["override_entry"].insert(0, override_val)
+                else:
                     row["use_override_var"].set(False)
                     if row.get("is_enum"):
-                        row["override_entry"].set("")
+                        if row.get("override_var") is not None:
+                            row["override_var"].set("")
+                        else:
+                            row["override_entry"].set("")
                     else:
-                        row["override_entry"].delete(0, "end")
+                        if row.get("override_var") is not None:
+                            row["override_var"].set("")
+                        else:
+                            row["override_entry"].delete(0, "end")
         except Exception as e:
-            self._log(f"Failed to load trap overrides: {e}", "WARNING")
-            self.current_trap_overrides = {}
-            # Clear all checkboxes and entries
-            for row in self.oid_rows:
-                # Skip sysUpTime and index varbinds
-                if row.get("is_sysuptime", False) or row.get("is_index", False):
-                    continue
-                row["use_override_var"].set(False)
-                if row.get("is_enum"):
-                    row["override_entry"].set("")
-                else:
-                    row["override_entry"].delete(0, "end")
+            self._log(f"Failed to apply trap overrides: {e}", "WARNING")
         finally:
             self._loading_trap_overrides = False
 
@@ -1685,6 +1712,8 @@ class SNMPControllerGUI:
         if not self.connected:
             return
         
+        # Resolve OIDs here, fetch values in the background
+        lookups: list[tuple[Dict[str, Any], str]] = []
         for row in self.oid_rows:
             oid_name = row.get("oid_name")
             if not oid_name:
@@ -1699,18 +1728,7 @@ class SNMPControllerGUI:
                 # Resolve OID to actual dotted notation
                 actual_oid = self._resolve_table_oid(oid_name, row)
                 if actual_oid:
-                    response = requests.get(f"{self.api_url}/value?oid={actual_oid}", timeout=5)
-                    if response.status_code == 200:
-                        data = response.json()
-                        current_value = str(data.get("value", "N/A"))
-                        if row.get("is_enum"):
-                            display_value = self._format_enum_display(current_value, row.get("enums", {}))
-                            row["current_label"].configure(text=display_value)
-                        else:
-                            row["current_label"].configure(text=current_value)
-                    else:
-                        if row.get("current_label") is not None:
-                            row["current_label"].configure(text="")
+                    lookups.append((row, actual_oid))
                 else:
                     if row.get("current_label") is not None:
                         row["current_label"].configure(text="")
@@ -1719,6 +1737,43 @@ class SNMPControllerGUI:
                     row["current_label"].configure(text="")
                 self._log(f"Failed to get current value for {oid_name}: {e}", "WARNING")
 
+        if not lookups:
+            return
+
+        def _fetch(oids: list[str]) -> list[str | Exception | None]:
+            results: list[str | Exception | None] = []
+            for actual_oid in oids:
+                try:
+                    response = self.api.get("/value", params={"oid": actual_oid}, timeout=5)
+                    if response.status_code == 200:
+                        results.append(str(response.json().get("value", "N/A")))
+                    else:
+                        results.append(None)
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        def _apply(values: list[str | Exception | None]) -> None:
+            for (row, _actual_oid), current_value in zip(lookups, values):
+                label = row.get("current_label")
+                if label is None:
+                    continue
+                try:
+                    if isinstance(current_value, Exception):
+                        label.configure(text="")
+                        self._log(f"Failed to get current value for {row.get('oid_name')}: {current_value}", "WARNING")
+                    elif current_value is None:
+                        label.configure(text="")
+                    elif row.get("is_enum"):
+                        label.configure(text=self._format_enum_display(current_value, row.get("enums", {})))
+                    else:
+                        label.configure(text=current_value)
+                except tk.TclError:
+                    # Row was rebuilt while the values were loading
+                    continue
+
+        self.api.submit(_fetch, [oid for _row, oid in lookups], on_success=_apply, group="trap")
+
     def _refresh_sysuptime_value(self, oid_name: str, label_widget: Any) -> None:
         """Refresh the sysUpTime value for a specific label widget."""
         if not self.connected:
@@ -1726,7 +1781,7 @@ class SNMPControllerGUI:
 
         try:
             # sysUpTime OID: 1.3.6.1.2.1.1.3.0
-            response = requests.get(f"{self.api_url}/value?oid=1.3.6.1.2.1.1.3.0", timeout=5)
+            response = self.api.get("/value?oid=1.3.6.1.2.1.1.3.0", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 current_value = str(data.get("value", "N/A"))
@@ -1751,7 +1806,7 @@ class SNMPControllerGUI:
             "trap_overrides": self.current_trap_overrides
         }
         try:
-            resp = requests.post(f"{self.api_url}/config", json=cfg, timeout=5)
+            resp = self.api.post("/config", json=cfg, timeout=5)
             resp.raise_for_status()
             self._log("Configuration saved to server")
             messagebox.showinfo("Success", "Configuration saved successfully")
@@ -1809,8 +1864,8 @@ class SNMPControllerGUI:
 
         # Save to API
         try:
-            response = requests.post(
-                f"{self.api_url}/trap-overrides/{trap_name}",
+            response = self.api.post(
+                f"/trap-overrides/{trap_name}",
                 json=merged_overrides,
                 timeout=5,
             )
@@ -1823,7 +1878,7 @@ class SNMPControllerGUI:
     def _load_trap_destinations(self) -> None:
         """Load trap destinations from app config via API."""
         try:
-            response = requests.get(f"{self.api_url}/trap-destinations", timeout=5)
+            response = self.api.get("/trap-destinations", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 destinations = data.get("destinations", [])
@@ -1864,8 +1919,8 @@ class SNMPControllerGUI:
                 return
 
             # Add via API
-            response = requests.post(
-                f"{self.api_url}/trap-destinations",
+            response = self.api.post(
+                "/trap-destinations",
                 json={"host": host, "port": port},
                 timeout=5
             )
@@ -1946,7 +2001,7 @@ class SNMPControllerGUI:
 
         # Clear from API
         try:
-            response = requests.delete(f"{self.api_url}/trap-overrides/{trap_name}", timeout=5)
+            response = self.api.delete(f"/trap-overrides/{trap_name}", timeout=5)
             if response.status_code == 200:
                 # Clear table checkboxes and entries
                 for row in self.oid_rows:
@@ -1970,7 +2025,7 @@ class SNMPControllerGUI:
             return
             
         try:
-            response = requests.get(f"{self.api_url}/traps", timeout=5)
+            response = self.api.get("/traps", timeout=5)
             response.raise_for_status()
             data = response.json()
             
@@ -2049,17 +2104,21 @@ class SNMPControllerGUI:
         self.trap_info_text.insert("1.0", "\n".join(info_lines))
         self.trap_info_text.configure(state="disabled")
         
-        # Configure index selectors for this trap
-        self._setup_trap_index_selectors(trap_name)
-        
-        # Update available OIDs for this trap
-        self._update_available_oids(trap_name, trap_data)
-        
-        # Update override labels with current index
-        self._update_override_labels()
+        # Lookups for the previously selected trap are no longer wanted
+        self.api.cancel_group("trap")
+
+        def _selectors_ready() -> None:
+            # Update available OIDs for this trap
+            self._update_available_oids(trap_name, trap_data)
+            
+            # Update override labels with current index
+            self._update_override_labels()
+
+            self._last_trap_name = trap_name
+            self._last_trap_index = self._get_selected_trap_index()
 
-        self._last_trap_name = trap_name
-        self._last_trap_index = self._get_selected_trap_index()
+        # Configure index selectors for this trap, then the OID table
+        self._setup_trap_index_selectors(trap_name, on_ready=_selectors_ready)
     
     def _trap_has_index_objects(self, trap_data: Dict[str, Any]) -> bool:
         """Check if the trap contains any Index-type varbinds that require instance values."""
@@ -2095,8 +2154,8 @@ class SNMPControllerGUI:
         """Get available interface indices."""
         try:
             # Prefer the actual ifTable instances for accurate indices
-            schema_resp = requests.get(
-                f"{self.api_url}/table-schema",
+            schema_resp = self.api.get(
+                "/table-schema",
                 params={"oid": "1.3.6.1.2.1.2.2"},
                 timeout=3,
             )
@@ -2114,8 +2173,8 @@ class SNMPControllerGUI:
 
         try:
             # Fallback: use ifNumber to build a range
-            resp = requests.get(
-                f"{self.api_url}/value",
+            resp = self.api.get(
+                "/value",
                 params={"oid": "1.3.6.1.2.1.2.1.0"},
                 timeout=2,
             )
@@ -2130,8 +2189,8 @@ class SNMPControllerGUI:
         indices = []
         for i in range(1, 11):
             try:
-                resp = requests.get(
-                    f"{self.api_url}/value",
+                resp = self.api.get(
+                    "/value",
                     params={"oid": f"1.3.6.1.2.1.2.2.1.1.{i}"},
                     timeout=1,
                 )
@@ -2175,39 +2234,66 @@ class SNMPControllerGUI:
             self._trap_index_columns_meta,
         )
 
-    def _setup_trap_index_selectors(self, trap_name: str) -> None:
-        """Create index dropdowns for traps with index varbinds."""
+    def _setup_trap_index_selectors(
+        self, trap_name: str, on_ready: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Create index dropdowns for traps with index varbinds.
+
+        The varbind lookup runs in the background; ``on_ready`` is called on
+        the Tk thread once the selectors (if any) are in place.
+        """
         self._clear_trap_index_selectors()
 
+        def _apply(data: Dict[str, Any] | None) -> None:
+            if data:
+                self._build_trap_index_selectors(data)
+            if on_ready is not None:
+                on_ready()
+
+        self.api.submit(
+            self._fetch_trap_index_data,
+            trap_name,
+            on_success=_apply,
+            on_error=lambda _exc: _apply(None),
+            key=("trap-varbinds", trap_name),
+            group="trap",
+        )
+
+    def _fetch_trap_index_data(self, trap_name: str) -> Dict[str, Any] | None:
+        """Trap varbind index info, with instances from the parent table if needed (worker thread)."""
         try:
-            response = requests.get(f"{self.api_url}/trap-varbinds/{trap_name}", timeout=5)
+            response = self.api.get(f"/trap-varbinds/{trap_name}", timeout=5)
             if response.status_code != 200:
-                return
-            data = response.json()
+                return None
+            data: Dict[str, Any] = response.json()
         except Exception:
-            return
+            return None
 
-        index_columns = data.get("index_columns", [])
-        columns_meta = data.get("columns_meta", {})
         parent_table_oid = data.get("parent_table_oid")
-        instances = data.get("instances", [])
-
-        if not index_columns:
-            return
-
-        if not instances and parent_table_oid:
+        if data.get("index_columns") and not data.get("instances") and parent_table_oid:
             try:
                 table_oid = ".".join(str(x) for x in parent_table_oid)
-                schema_resp = requests.get(
-                    f"{self.api_url}/table-schema",
+                schema_resp = self.api.get(
+                    "/table-schema",
                     params={"oid": table_oid},
                     timeout=3,
                 )
                 if schema_resp.status_code == 200:
                     schema = schema_resp.json()
-                    instances = schema.get("instances", [])
+                    data["instances"] = schema.get("instances", [])
             except Exception:
                 pass
+        return data
+
+    def _build_trap_index_selectors(self, data: Dict[str, Any]) -> None:
+        """Create the index dropdowns from _fetch_trap_index_data results."""
+        index_columns = data.get("index_columns", [])
+        columns_meta = data.get("columns_meta", {})
+        parent_table_oid = data.get("parent_table_oid")
+        instances = data.get("instances", [])
+
+        if not index_columns:
+            return
 
         self._trap_index_columns = list(index_columns)
         self._trap_index_columns_meta = columns_meta
@@ -2363,7 +2449,7 @@ class SNMPControllerGUI:
                 "community": "public"
             }
 
-            response = requests.post(f"{self.api_url}/trap-receiver/start", json=payload, timeout=5)
+            response = self.api.post("/trap-receiver/start", json=payload, timeout=5)
             response.raise_for_status()
             result = response.json()
 
@@ -2385,7 +2471,7 @@ class SNMPControllerGUI:
     def _stop_trap_receiver(self) -> None:
         """Stop the trap receiver."""
         try:
-            response = requests.post(f"{self.api_url}/trap-receiver/stop", timeout=5)
+            response = self.api.post("/trap-receiver/stop", timeout=5)
             response.raise_for_status()
             response.json()
 
@@ -2471,10 +2557,14 @@ class SNMPControllerGUI:
         dialog.geometry(f"+{x}+{y}")
 
     def _expand_all(self) -> None:
-        """Expand all nodes in the tree."""
+        """Expand all nodes in the tree (materialising every lazily built level)."""
         def _recurse(item: str) -> None:
+            self._materialise_children(item)
+            children = self.oid_tree.get_children(item)
+            if self._only_placeholder(children):
+                return
             self.oid_tree.item(item, open=True)
-            for c in self.oid_tree.get_children(item):
+            for c in children:
                 _recurse(c)
 
         for root in self.oid_tree.get_children(""):
@@ -2508,11 +2598,19 @@ class SNMPControllerGUI:
         )
 
     def _populate_oid_tree(self) -> None:
-        """Populate the OID tree with data."""
+        """Populate the OID tree with data.
+
+        Only the top level is inserted up front; every folder gets a
+        placeholder child and is filled in from ``self._oid_trie`` the first
+        time it is opened, so large models open instantly.
+        """
         # Clear existing
         for item in self.oid_tree.get_children():
             self.oid_tree.delete(item)
         self.oid_to_item.clear()
+        self._unmaterialised.clear()
+        self._tree_width_cache.clear()
+        self._oid_trie = {}
 
         if self.oids_data:
             # Build hierarchical tree
@@ -2523,16 +2621,17 @@ class SNMPControllerGUI:
             self.executor.submit(self._fetch_values_for_node, root)
             # Expand common MIB groups like system
             system_oid = "1.3.6.1.2.1.1"
-            if system_oid in self.oid_to_item:
-                self._expand_path_to_item(self.oid_to_item[system_oid])
+            system_item = self._materialise_path(system_oid)
+            if system_item is not None:
+                self._expand_path_to_item(system_item)
                 # Fetch values for system scalars
-                self.executor.submit(self._fetch_values_for_node, self.oid_to_item[system_oid])
+                self.executor.submit(self._fetch_values_for_node, system_item)
             # Ensure tree column width accommodates visible items
             self._ensure_tree_column_width()
         # If not connected or no data, leave empty
     
     def _build_tree_from_oids(self, parent: str, oids: Dict[str, Tuple[int, ...]]) -> None:
-        """Recursively build the tree from OID dict."""
+        """Build the OID trie from the OID dict and insert its first level."""
         # Filter out scalar instance OIDs (those ending with .0)
         # We'll show them as instance "0" in the parent OID row instead
         filtered_oids: Dict[str, Tuple[int, ...]] = {}
@@ -2570,8 +2669,9 @@ class SNMPControllerGUI:
                 current['__has_instance__'] = True
 
         self._mark_tables(tree)
+        self._oid_trie = tree
 
-        # Now build the Treeview from the tree dict
+        # Insert the first level; deeper levels are materialised on open
         self._insert_tree_nodes(parent, tree, ())
     
     def _mark_tables(self, tree: Dict[Any, Any]) -> None:
@@ -2583,26 +2683,30 @@ class SNMPControllerGUI:
                 if '__name__' in value and 'Table' in value['__name__']:
                     value['__is_table__'] = True
                 self._mark_tables(value)
-    
+
+    @staticmethod
+    def _trie_children(tree: Dict[Any, Any]) -> List[Tuple[int, Dict[Any, Any]]]:
+        """Child (arc, node) pairs of an OID trie node, in tree display order."""
+        # Sort keys without comparing ints to strings (avoid TypeError)
+        return sorted(
+            ((key, value) for key, value in tree.items() if isinstance(key, int)),
+            key=lambda kv: str(kv[0]),
+        )
+
     def _insert_tree_nodes(self, parent: str, tree: Dict[Any, Any], current_oid: Tuple[int, ...], row_count: int = 0) -> int:
-        """Insert nodes into Treeview recursively.
+        """Insert one level of the OID trie under ``parent``.
+
+        Folders and tables get a placeholder child and are recorded in
+        ``self._unmaterialised`` until they are opened.
 
         Returns the updated row count for alternating row colors.
         """
-        # Sort keys without comparing ints to strings (avoid TypeError)
-        for key, value in sorted(tree.items(), key=lambda kv: (isinstance(kv[0], str), str(kv[0]))):
-            if key == '__name__' or key == '__has_instance__':
-                continue
-            # Ensure key is an int before extending current_oid so typing stays as tuple[int, ...]
-            if not isinstance(key, int):
-                continue
-
+        for key, value in self._trie_children(tree):
             new_oid = current_oid + (key,)
             oid_str = ".".join(str(x) for x in new_oid)
 
             # Determine if this node is a leaf (only a name) or a folder (has children)
-            child_keys = [k for k in value.keys() if k not in ('__name__', '__has_instance__')]
-            is_leaf = len(child_keys) == 0
+            is_leaf = not any(isinstance(k, int) for k in value)
 
             # Prefer stored name for leaves, otherwise try name on this node
             stored_name = value.get('__name__')
@@ -2683,48 +2787,73 @@ class SNMPControllerGUI:
                 # Folder/container node
                 if value.get('__is_table__'):
                     icon_key = "table"
-                    display_text = stored_name if stored_name else str(key)
-
-                    type_val = self.oid_metadata.get(oid_str, {}).get("type") or "branch"
                     access_val = self.oid_metadata.get(oid_str, {}).get("access") or ""
-                    mib_val = self.oid_metadata.get(oid_str, {}).get("mib") or "N/A"
-                    img = None
-                    if getattr(self, 'oid_icon_images', None):
-                        img = self.oid_icon_images.get(icon_key)
-                    img_ref = cast(Any, img) if img is not None else ""
-                    node = self.oid_tree.insert(parent, "end", text=display_text, image=img_ref,
-                                               values=(oid_str, "", "", type_val, access_val, mib_val),
-                                               tags=(row_tag, 'table'))
-                    self.oid_to_item[oid_str] = node
-                    # Populate table instances immediately if we have the data
-                    if hasattr(self, 'table_instances_data') and oid_str in self.table_instances_data:
-                        self._log(f"Pre-populating table {oid_str} from table_instances_data", "DEBUG")
-                        self._populate_table_instances_immediate(node, oid_str)
-                    else:
-                        if hasattr(self, 'table_instances_data'):
-                            self._log(f"Table {oid_str} NOT in table_instances_data (have {len(self.table_instances_data)} tables)", "DEBUG")
-                        else:
-                            self._log(f"table_instances_data not loaded yet for table {oid_str}", "DEBUG")
+                    tags: Tuple[str, ...] = (row_tag, 'table')
                 else:
                     icon_key = "folder"
-                    display_text = stored_name if stored_name else str(key)
-
-                    type_val = self.oid_metadata.get(oid_str, {}).get("type") or "branch"
                     access_val = self.oid_metadata.get(oid_str, {}).get("access") or "N/A"
-                    mib_val = self.oid_metadata.get(oid_str, {}).get("mib") or "N/A"
-                    img = None
-                    if getattr(self, 'oid_icon_images', None):
-                        img = self.oid_icon_images.get(icon_key)
-                    img_ref = cast(Any, img) if img is not None else ""
-                    node = self.oid_tree.insert(parent, "end", text=display_text, image=img_ref,
-                                               values=(oid_str, "", "", type_val, access_val, mib_val),
-                                               tags=(row_tag,))
-                    self.oid_to_item[oid_str] = node
-                    # Recurse into children
-                    row_count = self._insert_tree_nodes(node, value, new_oid, row_count)
+                    tags = (row_tag,)
+                display_text = stored_name if stored_name else str(key)
+
+                type_val = self.oid_metadata.get(oid_str, {}).get("type") or "branch"
+                mib_val = self.oid_metadata.get(oid_str, {}).get("mib") or "N/A"
+                img = None
+                if getattr(self, 'oid_icon_images', None):
+                    img = self.oid_icon_images.get(icon_key)
+                img_ref = cast(Any, img) if img is not None else ""
+                node = self.oid_tree.insert(parent, "end", text=display_text, image=img_ref,
+                                           values=(oid_str, "", "", type_val, access_val, mib_val),
+                                           tags=tags)
+                self.oid_to_item[oid_str] = node
+                # Children (or table instances) are inserted when the node is opened
+                self.oid_tree.insert(node, "end", text="Loading...", values=("", "", "", "", "", ""),
+                                     tags=("placeholder",))
+                self._unmaterialised[node] = (value, new_oid)
 
         return row_count
 
+    def _only_placeholder(self, children: Tuple[str, ...]) -> bool:
+        return len(children) == 1 and 'placeholder' in self.oid_tree.item(children[0], 'tags')
+
+    def _materialise_children(self, item: str) -> None:
+        """Replace a lazily built node's placeholder with its real children.
+
+        Tables are filled from ``table_instances_data`` when it has them;
+        otherwise the placeholder stays until instance discovery replaces it.
+        """
+        pending = self._unmaterialised.pop(item, None)
+        if pending is None:
+            return
+        subtree, oid = pending
+
+        if 'table' in self.oid_tree.item(item, 'tags'):
+            oid_str = ".".join(str(x) for x in oid)
+            if oid_str in self.table_instances_data:
+                self._log(f"Pre-populating table {oid_str} from table_instances_data", "DEBUG")
+                for child in self.oid_tree.get_children(item):
+                    self.oid_tree.delete(child)
+                self._populate_table_instances_immediate(item, oid_str)
+            else:
+                self._log(f"Table {oid_str} NOT in table_instances_data (have {len(self.table_instances_data)} tables)", "DEBUG")
+            return
+
+        for child in self.oid_tree.get_children(item):
+            self.oid_tree.delete(child)
+        self._insert_tree_nodes(item, subtree, oid)
+        self._ensure_tree_column_width(self.oid_tree.get_children(item))
+
+    def _materialise_path(self, oid_str: str) -> Optional[str]:
+        """Materialise every ancestor of ``oid_str`` and return its tree item, if any."""
+        item = self.oid_to_item.get(oid_str)
+        if item is not None:
+            return item
+        parts = oid_str.split(".")
+        for depth in range(1, len(parts)):
+            ancestor = self.oid_to_item.get(".".join(parts[:depth]))
+            if ancestor is not None and ancestor in self._unmaterialised:
+                self._materialise_children(ancestor)
+        return self.oid_to_item.get(oid_str)
+
     def _on_node_open(self, event: Any) -> None:
         """Handler called when a tree node is expanded; fetch values for its immediate children."""
         try:
@@ -2735,6 +2864,9 @@ class SNMPControllerGUI:
         if not item:
             return
 
+        # Insert this level from the trie the first time it is opened
+        self._materialise_children(item)
+
         # Ensure the tree column is wide enough for this item
         self._ensure_oid_name_width(item)
 
@@ -2890,6 +3022,8 @@ class SNMPControllerGUI:
 
     def _update_selected_info(self, item: str | None) -> None:
         """Update the toolbar display with OID, value, and type for the selected item."""
+        # A lookup for the previous selection is no longer wanted
+        self.api.cancel_group("selected-info")
         if not item:
             self._set_selected_info_text("")
             return
@@ -2908,64 +3042,89 @@ class SNMPControllerGUI:
 
         # For index columns, the value is already extracted and stored in the tree
         value_str = self.oid_tree.set(item, "value")
-        if not value_str:
-            try:
-                resp = requests.get(
-                    f"{self.api_url}/value",
-                    params={"oid": full_oid},
-                    timeout=2,
-                )
-                if resp.status_code == 200:
-                    value_str = str(resp.json().get("value", ""))
-                else:
-                    value_str = "N/A"
-            except Exception:
-                value_str = "N/A"
+        if value_str:
+            self._set_selected_info_text(self._format_selected_info(full_oid, type_str, value_str))
+            return
+
+        self._set_selected_info_text(self._format_selected_info(full_oid, type_str, "…"))
+        self.api.fetch(
+            "GET",
+            "/value",
+            params={"oid": full_oid},
+            timeout=2,
+            on_success=lambda data: self._set_selected_info_text(
+                self._format_selected_info(full_oid, type_str, str((data or {}).get("value", "")))
+            ),
+            on_error=lambda _exc: self._set_selected_info_text(
+                self._format_selected_info(full_oid, type_str, "N/A")
+            ),
+            group="selected-info",
+        )
+
+    def _tree_font(self) -> tkfont.Font:
+        """Font used to measure tree text, cached per size."""
+        size = int(getattr(self, "tree_font_size", 22))
+        font = self._tree_fonts.get(size)
+        if font is None:
+            font = tkfont.Font(family='Helvetica', size=size)
+            self._tree_fonts[size] = font
+        return font
+
+    def _tree_item_width(self, item: str, depth: Optional[int] = None) -> int:
+        """Column #0 width needed to show ``item``'s text (cached per item)."""
+        cached = self._tree_width_cache.get(item)
+        if cached is not None:
+            return cached
+
+        text = self.oid_tree.item(item, "text")
+        if not text:
+            return 0
+        if depth is None:
+            depth = 0
+            parent = self.oid_tree.parent(item)
+            while parent:
+                depth += 1
+                parent = self.oid_tree.parent(parent)
+        try:
+            text_width = self._tree_font().measure(str(text))
+        except Exception:
+            text_width = len(text) * 10
 
-        display = self._format_selected_info(full_oid, type_str, value_str)
-        self._set_selected_info_text(display)
+        indent_per_level = 20
+        icon_width = 20
+        padding = 40
+        width = depth * indent_per_level + icon_width + text_width + padding
+        self._tree_width_cache[item] = width
+        return width
 
-    def _ensure_tree_column_width(self) -> None:
-        """Scan visible tree items and ensure column #0 is wide enough for all of them."""
+    def _ensure_tree_column_width(self, items: Optional[Tuple[str, ...]] = None) -> None:
+        """Ensure column #0 is wide enough for ``items`` (default: all visible items).
+
+        Pass just the newly inserted items to keep this incremental; widths
+        already measured are cached.
+        """
         try:
             if getattr(self, "_oid_tree_user_resized", False):
                 return  # User manually resized, don't auto-adjust
             
             max_width = int(self.oid_tree.column("#0", "width"))
-            
-            def check_item(item: str, depth: int = 0) -> int:
-                """Recursively check item and its open children, return max width needed."""
-                nonlocal max_width
-                
-                # Check this item
-                text = self.oid_tree.item(item, "text")
-                if text:
-                    # Calculate text width
-                    try:
-                        font_obj = tkfont.Font(family='Helvetica', size=int(getattr(self, "tree_font_size", 22)))
-                        text_width = font_obj.measure(str(text))
-                    except Exception:
-                        text_width = len(text) * 10
-                    
-                    indent_per_level = 20
-                    icon_width = 20
-                    padding = 40
-                    indentation = depth * indent_per_level + icon_width
-                    desired_width = indentation + text_width + padding
-                    
-                    if desired_width > max_width:
-                        max_width = desired_width
-                
-                # Check children if item is open
-                if self.oid_tree.item(item, "open"):
-                    for child in self.oid_tree.get_children(item):
-                        check_item(child, depth + 1)
-                
-                return max_width
-            
-            # Check all root items
-            for root_item in self.oid_tree.get_children():
-                check_item(root_item, 0)
+
+            if items is not None:
+                for item in items:
+                    max_width = max(max_width, self._tree_item_width(item))
+            else:
+                def check_item(item: str, depth: int = 0) -> None:
+                    """Recursively check item and its open children."""
+                    nonlocal max_width
+                    max_width = max(max_width, self._tree_item_width(item, depth))
+                    # Check children if item is open
+                    if self.oid_tree.item(item, "open"):
+                        for child in self.oid_tree.get_children(item):
+                            check_item(child, depth + 1)
+
+                # Check all root items
+                for root_item in self.oid_tree.get_children():
+                    check_item(root_item, 0)
             
             # Update column width if needed
             current_width = int(self.oid_tree.column("#0", "width"))
@@ -2989,7 +3148,7 @@ class SNMPControllerGUI:
             
             # Get the actual font size from our stored value
             size = getattr(self, "tree_font_size", 22)
-            font = tkfont.Font(family="Helvetica", size=size)
+            font = self._tree_font()
             
             text_width = font.measure(text)
             
@@ -3048,6 +3207,7 @@ class SNMPControllerGUI:
             size = max(12, min(34, size))
             self.tree_font_size = size
             self.tree_row_height = max(24, size + 8)
+            self._tree_width_cache.clear()
             style = ttk.Style()
             style.configure("Treeview", font=('Helvetica', size), rowheight=self.tree_row_height)
             style.configure("Treeview.Heading", font=('Helvetica', size + 1, 'bold'))
@@ -3455,11 +3615,10 @@ class SNMPControllerGUI:
                             val = val.split(' (')[0]
                         column_values[c_name] = val
                 
-                try:
-                    # Delete old instance
-                    self._log("DEBUG: Calling DELETE /table-row for index update", "DEBUG")
-                    del_resp = requests.delete(
-                        f"{self.api_url}/table-row",
+                def _reindex() -> tuple[requests.Response, requests.Response | None]:
+                    # Delete old instance, then create it under the new index
+                    del_resp = self.api.delete(
+                        "/table-row",
                         json={
                             "table_oid": table_oid,
                             "index_values": old_index_values,
@@ -3467,21 +3626,10 @@ class SNMPControllerGUI:
                         },
                         timeout=5,
                     )
-                    self._log(f"DEBUG: DELETE response: {del_resp.status_code}", "DEBUG")
-                    
                     if del_resp.status_code != 200:
-                        messagebox.showerror("Error", f"Failed to delete old instance: {del_resp.text}")
-                        return
-
-                    # Immediately remove old instance from OID tree
-                    old_instance_str = ".".join(str(old_index_values[k]) for k in index_columns)
-                    if hasattr(self, "_current_table_item") and self._current_table_item:
-                        self._remove_instance_from_oid_tree(self._current_table_item, old_instance_str)
-
-                    # Create new instance with new index values
-                    self._log("DEBUG: Calling POST /table-row for index update", "DEBUG")
-                    create_resp = requests.post(
-                        f"{self.api_url}/table-row",
+                        return del_resp, None
+                    create_resp = self.api.post(
+                        "/table-row",
                         json={
                             "table_oid": table_oid,
                             "index_values": new_index_values,
@@ -3489,6 +3637,19 @@ class SNMPControllerGUI:
                         },
                         timeout=5,
                     )
+                    return del_resp, create_resp
+
+                def _reindexed(responses: tuple[requests.Response, requests.Response | None]) -> None:
+                    del_resp, create_resp = responses
+                    self._log(f"DEBUG: DELETE response: {del_resp.status_code}", "DEBUG")
+                    if create_resp is None:
+                        messagebox.showerror("Error", f"Failed to delete old instance: {del_resp.text}")
+                        return
+
+                    # Immediately remove old instance from OID tree
+                    old_instance_str = ".".join(str(old_index_values[k]) for k in index_columns)
+                    if hasattr(self, "_current_table_item") and self._current_table_item:
+                        self._remove_instance_from_oid_tree(self._current_table_item, old_instance_str)
 
                     if create_resp.status_code == 200:
                         self._log(f"Updated index {col_name} from {old_index_values[col_name]} to {new_value}")
@@ -3504,9 +3665,13 @@ class SNMPControllerGUI:
                                 self._set_pending_oid_focus(table_oid, new_instance, col_oid)
                     else:
                         messagebox.showerror("Error", f"Failed to create new instance: {create_resp.text}")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to update index: {e}")
-                    self._log(f"Error updating index: {e}", "ERROR")
+
+                def _reindex_failed(exc: Exception) -> None:
+                    messagebox.showerror("Error", f"Failed to update index: {exc}")
+                    self._log(f"Error updating index: {exc}", "ERROR")
+
+                self._log("DEBUG: Calling DELETE and POST /table-row for index update", "DEBUG")
+                self.api.submit(_reindex, on_success=_reindexed, on_error=_reindex_failed)
             else:
                 # For non-index column updates, use the table-row API
                 # which handles both creating and updating cell values
@@ -3535,68 +3700,71 @@ class SNMPControllerGUI:
                             else:
                                 column_values[c_name] = "unset"
                 
-                try:
-                    # Check if this instance exists in the OID tree before saving
-                    # If it doesn't exist, we're creating a new instance
-                    full_oid = f"{col_oid}.{instance_index}"
-                    is_new_instance = full_oid not in self.oid_values
-
-                    # Use table-row endpoint to update (creates if doesn't exist)
-                    self._log(f"DEBUG: Calling POST /table-row for cell update (col={col_name}, val={new_value}, new_instance={is_new_instance})", "DEBUG")
-                    resp = requests.post(
-                        f"{self.api_url}/table-row",
-                        json={
-                            "table_oid": table_oid,
-                            "index_values": index_values,
-                            "column_values": column_values
-                        },
-                        timeout=5,
-                    )
-                    self._log(f"DEBUG: POST response: {resp.status_code}", "DEBUG")
+                # Check if this instance exists in the OID tree before saving
+                # If it doesn't exist, we're creating a new instance
+                full_oid = f"{col_oid}.{instance_index}"
+                is_new_instance = full_oid not in self.oid_values
 
-                    if resp.status_code == 200:
-                        self._log("DEBUG: Starting UI update for cell", "DEBUG")
-                        # Format value with enum name if applicable
-                        display_value = new_value
-                        col_metadata = self.oid_metadata.get(col_oid, {})
-                        enums = col_metadata.get("enums")
-                        if enums and new_value:
-                            try:
-                                int_value = int(new_value)
-                                for enum_name, enum_value in enums.items():
-                                    if enum_value == int_value:
-                                        display_value = f"{new_value} ({enum_name})"
-                                        break
-                            except (ValueError, TypeError):
-                                pass
+                def _cell_saved(_result: Any) -> None:
+                    self._log("DEBUG: Starting UI update for cell", "DEBUG")
+                    # Format value with enum name if applicable
+                    display_value = new_value
+                    col_metadata = self.oid_metadata.get(col_oid, {})
+                    enums = col_metadata.get("enums")
+                    if enums and new_value:
+                        try:
+                            int_value = int(new_value)
+                            for enum_name, enum_value in enums.items():
+                                if enum_value == int_value:
+                                    display_value = f"{new_value} ({enum_name})"
+                                    break
+                        except (ValueError, TypeError):
+                            pass
 
-                        # Update the cell display
-                        updated_values = list(item_values)
-                        updated_values[col_num] = display_value
+                    # Update the cell display (the row may be gone if the table was redrawn meanwhile)
+                    updated_values = list(item_values)
+                    updated_values[col_num] = display_value
+                    try:
                         self.table_tree.item(editing_item, values=updated_values)
                         self._log("DEBUG: Cell display updated in treeview", "DEBUG")
-                        self._log(f"Updated {col_name} (OID {full_oid}) to: {new_value}")
-                        # Also update the oid_values cache
-                        self.oid_values[full_oid] = new_value
-                        self._log("DEBUG: Cache updated, cell save complete", "DEBUG")
-
-                        # Refresh the OID tree to show the updated value
-                        self._refresh_oid_tree_value(full_oid, display_value)
-                        if table_oid:
-                            self._set_pending_oid_focus(table_oid, str(instance_index), col_oid)
-
-                        # If this was a new instance, also refresh the entire table to show the new row
-                        if is_new_instance and hasattr(self, "_current_table_item") and self._current_table_item:
-                            self._log("DEBUG: New instance detected, refreshing OID tree table", "DEBUG")
-                            self._refresh_oid_tree_table(self._current_table_item)
+                    except tk.TclError:
+                        pass
+                    self._log(f"Updated {col_name} (OID {full_oid}) to: {new_value}")
+                    # Also update the oid_values cache
+                    self.oid_values[full_oid] = new_value
+                    self._log("DEBUG: Cache updated, cell save complete", "DEBUG")
+
+                    # Refresh the OID tree to show the updated value
+                    self._refresh_oid_tree_value(full_oid, display_value)
+                    if table_oid:
+                        self._set_pending_oid_focus(table_oid, str(instance_index), col_oid)
+
+                    # If this was a new instance, also refresh the entire table to show the new row
+                    if is_new_instance and hasattr(self, "_current_table_item") and self._current_table_item:
+                        self._log("DEBUG: New instance detected, refreshing OID tree table", "DEBUG")
+                        self._refresh_oid_tree_table(self._current_table_item)
+
+                def _cell_failed(exc: Exception) -> None:
+                    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+                        error_msg = f"Failed to update value: {exc.response.status_code} - {exc.response.text}"
                     else:
-                        error_msg = f"Failed to update value: {resp.status_code} - {resp.text}"
-                        self._log(error_msg, "ERROR")
-                        messagebox.showerror("Error", error_msg)
-                except Exception as e:
-                    error_msg = f"Failed to update cell via table-row API: {e}"
+                        error_msg = f"Failed to update cell via table-row API: {exc}"
                     self._log(error_msg, "ERROR")
                     messagebox.showerror("Error", error_msg)
+
+                # Use table-row endpoint to update (creates if doesn't exist)
+                self._log(f"DEBUG: Calling POST /table-row for cell update (col={col_name}, val={new_value}, new_instance={is_new_instance})", "DEBUG")
+                self.api.fetch(
+                    "POST",
+                    "/table-row",
+                    json={
+                        "table_oid": table_oid,
+                        "index_values": index_values,
+                        "column_values": column_values
+                    },
+                    on_success=_cell_saved,
+                    on_error=_cell_failed,
+                )
         except Exception as e:
             error_msg = f"Failed to save cell: {e}"
             self._log(error_msg, "ERROR")
@@ -3616,17 +3784,26 @@ class SNMPControllerGUI:
             self.root.after(150, self._hide_edit_overlay)
             self._log("DEBUG: finally block complete, hide deferred 150ms", "DEBUG")
 
-    def _populate_table_view(self, table_item: str, selected_instance: str | None = None) -> None:
-        """Populate the table view with data from the selected table."""
+    def _populate_table_view(
+        self, table_item: str, selected_instance: str | None = None, offset: int | None = None
+    ) -> None:
+        """Populate the table view with one page of rows from the selected table.
+
+        Without ``offset`` the current page is kept for the same table (or the
+        page holding ``selected_instance``); another table starts at its first page.
+        """
         oid_str = self.oid_tree.set(table_item, "oid")
         if not oid_str:
             self._log("No OID found for table item", "WARNING")
             return
 
+        if offset is None:
+            offset = self._table_page_offset if table_item == self._current_table_item else 0
+
         preserved_yview = None
         if self.table_tree.winfo_exists():
             preserved_yview = self.table_tree.yview()
-        if selected_instance is None:
+        if selected_instance is None and table_item == self._current_table_item:
             selected_rows = self.table_tree.selection()
             if selected_rows:
                 selected_values = self.table_tree.item(selected_rows[0], "values")
@@ -3642,10 +3819,6 @@ class SNMPControllerGUI:
             except Exception:
                 continue
 
-        # Clear existing
-        for child in self.table_tree.get_children():
-            self.table_tree.delete(child)
-
         # Find entry OID (assume .1 is the entry)
         entry_oid = oid_str + ".1"
         entry_tuple = tuple(int(x) for x in entry_oid.split("."))
@@ -3674,44 +3847,102 @@ class SNMPControllerGUI:
         
         self._log(f"Found {len(columns)} columns for table {oid_str}")
 
-        # Get table schema including instances from API
-        index_columns: list[str] = []
-        schema: Dict[str, Any] = {}  # Initialize to empty dict
-        try:
-            resp = requests.get(f"{self.api_url}/table-schema", params={"oid": oid_str}, timeout=5)
-            if resp.status_code == 200:
-                schema = resp.json()
-                instances = schema.get("instances", [])
-                index_columns = schema.get("index_columns", [])
-                if not index_columns:
-                    index_columns = ["__index__"]
-                self._log(
-                    f"Loaded {len(instances)} instances from table schema for {oid_str}: "
-                    f"instances={instances}, index_columns={index_columns}",
-                    "DEBUG",
-                )
-            else:
-                self._log("Failed to get table schema, using fallback discovery", "WARNING")
-                instances = self._discover_instances_fallback(columns[0][1])
-        except Exception as e:
-            self._log(f"Error loading table schema: {e}, using fallback discovery", "WARNING")
-            instances = self._discover_instances_fallback(columns[0][1])
-
-        def _instance_sort_key(inst: Any) -> list[tuple[int, Any]]:
-            parts = str(inst).split(".")
-            key: list[tuple[int, Any]] = []
-            for part in parts:
-                if part.isdigit():
-                    key.append((0, int(part)))
-                else:
-                    key.append((1, part))
-            return key
+        # The page of rows is fetched off the Tk thread. Selecting another
+        # table cancels this one; no de-duplication key, so a refresh after an
+        # edit never joins a read that started before it.
+        self.api.cancel_group("table-view")
+        self.api.submit(
+            self._fetch_table_view_data,
+            oid_str,
+            columns,
+            offset,
+            selected_instance,
+            on_success=lambda data: self._render_table_view(
+                table_item, oid_str, columns, data, selected_instance, preserved_yview, preserved_widths
+            ),
+            on_error=lambda exc: self._log(f"Failed to load table {oid_str}: {exc}", "ERROR"),
+            group="table-view",
+        )
 
-        instances = sorted(instances, key=_instance_sort_key)
+    def _fetch_table_view_data(
+        self,
+        oid_str: str,
+        columns: list[tuple[str, str, int]],
+        offset: int,
+        selected_instance: str | None,
+    ) -> Dict[str, Any]:
+        """Fetch one page of materialised rows for the table view (worker thread)."""
+        params: Dict[str, Any] = {"oid": oid_str, "offset": offset, "limit": self._table_page_size}
+        if selected_instance:
+            # The agent returns the page holding this row instead of ``offset``
+            params["instance"] = selected_instance
+        resp = self.api.get("/table-rows", params=params, timeout=5)
+        if resp.status_code != 200:
+            raise RuntimeError(f"/table-rows returned {resp.status_code}: {resp.text}")
+        page = resp.json()
+        index_columns: list[str] = page.get("index_columns") or ["__index__"]
+        self._log(
+            f"Loaded rows {page.get('offset', 0) + 1}-{page.get('offset', 0) + len(page.get('rows', []))} "
+            f"of {page.get('total', 0)} for {oid_str}",
+            "DEBUG",
+        )
 
-        # Set columns
-        col_names = [col[0] for col in columns]
-        self.table_tree["columns"] = ("index",) + tuple(col_names)
+        index_column_set = {name.lower() for name in index_columns}
+        rows: list[list[Any]] = []
+        for row in page.get("rows", []):
+            inst_str = str(row.get("instance", ""))
+            index_values = row.get("index", {})
+            cell_values = row.get("values", {})
+            labels = row.get("labels", {})
+            values: list[Any] = [inst_str]
+            for name, _col_oid, _col_num in columns:
+                if name.lower() in index_column_set:
+                    val = index_values.get(name, inst_str)
+                else:
+                    val = cell_values.get(name)
+                    if val is None:
+                        val = "unset"
+                    elif name in labels:
+                        # Add enum name if available
+                        val = f"{val} ({labels[name]})"
+                values.append(val)
+            rows.append(values)
+
+        return {
+            "columns_meta": page.get("columns", {}),
+            "index_columns": index_columns,
+            "rows": rows,
+            "offset": int(page.get("offset", offset)),
+            "total": int(page.get("total", len(rows))),
+        }
+
+    def _render_table_view(
+        self,
+        table_item: str,
+        oid_str: str,
+        columns: list[tuple[str, str, int]],
+        data: Dict[str, Any],
+        selected_instance: str | None,
+        preserved_yview: Any,
+        preserved_widths: dict[str, int],
+    ) -> None:
+        """Fill the table view from _fetch_table_view_data results (Tk thread)."""
+        index_columns: list[str] = data["index_columns"]
+        total: int = data["total"]
+        offset: int = data["offset"]
+        if not data["rows"] and 0 < total <= offset:
+            # Rows were removed from the last page; show the new last page
+            last_page = ((total - 1) // self._table_page_size) * self._table_page_size
+            self._populate_table_view(table_item, offset=last_page)
+            return
+
+        # Clear existing
+        for child in self.table_tree.get_children():
+            self.table_tree.delete(child)
+
+        # Set columns
+        col_names = [col[0] for col in columns]
+        self.table_tree["columns"] = ("index",) + tuple(col_names)
         index_header = "__Index__" if index_columns == ["__index__"] else "Index"
         self.table_tree.heading("index", text=index_header)
         
@@ -3759,53 +3990,18 @@ class SNMPControllerGUI:
         # Store columns for later use in cell editing
         self._current_table_columns = columns
         self._current_index_columns = index_columns
-        self._current_columns_meta = schema.get("columns", {})
+        self._current_columns_meta = data["columns_meta"]
         self._current_table_item = table_item
         self._current_table_oid = oid_str
+        self._table_page_offset = offset
+        self._table_total_rows = total
+        self._update_table_pager()
 
         # Populate rows
         row_items = []
-        index_column_set = {name.lower() for name in index_columns}
-        columns_meta = schema.get("columns", {})
-        for inst in instances:
-            values = [inst]
-            inst_str = str(inst)
-            index_values = self._extract_index_values(inst_str, index_columns, columns_meta)
-            for name, col_oid, col_num in columns:
-                if name.lower() in index_column_set:
-                    val = index_values.get(name, inst_str)
-                else:
-                    full_oid = f"{col_oid}.{inst_str}"
-                    try:
-                        resp = requests.get(
-                            f"{self.api_url}/value",
-                            params={"oid": full_oid},
-                            timeout=1,
-                        )
-                        if resp.status_code == 200:
-                            val = resp.json().get("value", "unset")
-                        else:
-                            val = "unset"
-                    except Exception:
-                        val = "unset"
-                    
-                    # Add enum name if available
-                    if val not in ("unset", "N/A", ""):
-                        col_metadata = self.oid_metadata.get(col_oid, {})
-                        enums = col_metadata.get("enums")
-                        if enums:
-                            try:
-                                int_value = int(val)
-                                for enum_name, enum_value in enums.items():
-                                    if enum_value == int_value:
-                                        val = f"{val} ({enum_name})"
-                                        break
-                            except (ValueError, TypeError):
-                                pass
-                
-                values.append(val)
+        for values in data["rows"]:
             item = self.table_tree.insert("", "end", values=values)
-            row_items.append((inst, item))
+            row_items.append((values[0], item))
 
         # Select the row corresponding to selected_instance if provided
         found_selection = False
@@ -3830,31 +4026,28 @@ class SNMPControllerGUI:
         else:
             self.add_index_col_btn.configure(state="disabled")
 
-    def _discover_instances_fallback(self, first_col_oid: str) -> list[str]:
-        """Fallback method to discover table instances by trying sequential indexes.
-        
-        This is used when the table-schema API doesn't return instances.
-        Only works for simple single-index tables.
-        """
-        instances: list[str] = []
-        index = 1
-        max_attempts = 20  # Limit the number of attempts to prevent infinite loading
-        while len(instances) < max_attempts:
-            try:
-                resp = requests.get(f"{self.api_url}/value", params={"oid": first_col_oid + "." + str(index)}, timeout=1)
-                if resp.status_code == 200:
-                    instances.append(str(index))
-                    index += 1
-                else:
-                    break
-            except Exception as e:
-                self._log(f"Error loading instance {index}: {e}", "DEBUG")
-                break
-        
-        if len(instances) == max_attempts:
-            self._log("Reached maximum attempts while discovering instances", "WARNING")
-        
-        return instances
+    def _update_table_pager(self) -> None:
+        """Show the visible row range and enable the pager buttons that apply."""
+        offset, total = self._table_page_offset, self._table_total_rows
+        if total:
+            last = min(offset + self._table_page_size, total)
+            self.table_page_label.configure(text=f"Rows {offset + 1}–{last} of {total}")
+        else:
+            self.table_page_label.configure(text="No rows")
+        self.table_prev_btn.configure(state="normal" if offset > 0 else "disabled")
+        self.table_next_btn.configure(
+            state="normal" if offset + self._table_page_size < total else "disabled"
+        )
+
+    def _change_table_page(self, step: int) -> None:
+        """Move the table view ``step`` pages forward (or back)."""
+        if not self._current_table_item:
+            return
+        offset = self._table_page_offset + step * self._table_page_size
+        if offset < 0 or offset >= self._table_total_rows:
+            return
+        self.table_tree.selection_remove(self.table_tree.selection())
+        self._populate_table_view(self._current_table_item, offset=offset)
 
     def _add_instance(self) -> None:
         """Add a new instance to the current table."""
@@ -3893,16 +4086,53 @@ class SNMPControllerGUI:
         if not table_oid:
             return
 
-        # Get table schema to find index columns
-        try:
-            resp = requests.get(f"{self.api_url}/table-schema", params={"oid": table_oid}, timeout=5)
-            if resp.status_code != 200:
-                messagebox.showerror("Error", "Failed to get table schema")
-                return
-            schema = resp.json()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to get schema: {e}")
-            return
+        def _load() -> tuple[Dict[str, Any], Dict[str, str], list[str]]:
+            # Table schema, then the last row's non-key values as defaults for the new row
+            resp = self.api.get("/table-schema", params={"oid": table_oid}, timeout=5)
+            resp.raise_for_status()
+            schema: Dict[str, Any] = resp.json()
+            columns_meta = schema.get("columns", {})
+            instances = schema.get("instances", [])
+            column_defaults: Dict[str, str] = {}
+            warnings: list[str] = []
+            for col_name, col_info in columns_meta.items():
+                # Skip index columns
+                if col_name in schema.get("index_columns", []):
+                    continue
+                column_defaults[col_name] = "unset"
+                # Augmented tables are refused, so their values are not needed
+                if not instances or schema.get("index_from"):
+                    continue
+                col_oid = ".".join(str(x) for x in col_info["oid"])
+                full_oid = f"{col_oid}.{instances[-1]}"
+                try:
+                    value_resp = self.api.get("/value", params={"oid": full_oid}, timeout=5)
+                    if value_resp.status_code == 200:
+                        column_defaults[col_name] = str(value_resp.json().get("value", "unset"))
+                except Exception as e:
+                    warnings.append(f"Could not fetch value for {col_name}: {e}")
+            return schema, column_defaults, warnings
+
+        def _load_failed(exc: Exception) -> None:
+            messagebox.showerror("Error", f"Failed to get schema: {exc}")
+
+        self.api.submit(
+            _load,
+            on_success=lambda loaded: self._show_add_instance_dialog(table_item, table_oid, *loaded),
+            on_error=_load_failed,
+        )
+
+    def _show_add_instance_dialog(
+        self,
+        table_item: str,
+        table_oid: str,
+        schema: Dict[str, Any],
+        column_defaults: Dict[str, str],
+        warnings: list[str],
+    ) -> None:
+        """Second half of _add_instance, once the table schema and last row are known."""
+        for warning in warnings:
+            self._log(warning, "WARNING")
 
         # Find index columns - use actual column names from schema
         index_columns = []
@@ -3931,43 +4161,6 @@ class SNMPControllerGUI:
             messagebox.showerror("Error", "Table has no index columns in schema")
             return
 
-        # Get non-key column values from the last row
-        instances = schema.get("instances", [])
-        columns_meta = schema.get("columns", {})
-        index_column_names = [name for name, _ in index_columns]
-        column_defaults = {}
-
-        if instances:
-            # Get the last instance
-            last_instance = instances[-1]
-
-            # Fetch values for all non-index columns from the last row
-            for col_name, col_info in columns_meta.items():
-                # Skip index columns
-                if col_name in index_column_names:
-                    continue
-                    
-                # This is a non-key column, get its value from the last row
-                col_oid = ".".join(str(x) for x in col_info["oid"])
-                full_oid = f"{col_oid}.{last_instance}"
-
-                try:
-                    resp = requests.get(f"{self.api_url}/value", params={"oid": full_oid}, timeout=5)
-                    if resp.status_code == 200:
-                        value_data = resp.json()
-                        column_defaults[col_name] = str(value_data.get("value", "unset"))
-                    else:
-                        column_defaults[col_name] = "unset"
-                except Exception as e:
-                    self._log(f"Could not fetch value for {col_name}: {e}", "WARNING")
-                    column_defaults[col_name] = "unset"
-        else:
-            # No existing instances, default all non-index columns to "unset"
-            for col_name, col_info in columns_meta.items():
-                # Skip index columns
-                if col_name not in index_column_names:
-                    column_defaults[col_name] = "unset"
-
         # Create dialog for index values
         dialog = ctk.CTkToplevel(self.root)
         dialog.title("Add Table Instance")
@@ -4096,26 +4289,31 @@ class SNMPControllerGUI:
                 index_parts_ordered.append(val)
 
             # Create the table row using the new endpoint
-            try:
-                payload = {
-                    "table_oid": table_oid,
-                    "index_values": index_values,
-                    "column_values": column_defaults  # Copy non-key values from last row
-                }
-                resp = requests.post(f"{self.api_url}/table-row", json=payload, timeout=5)
-                if resp.status_code == 200:
-                    result = resp.json()
-                    messagebox.showinfo("Success", f"Instance added successfully: {result.get('instance_oid')}")
-                    # Refresh table view
-                    self._populate_table_view(table_item)
-                    # Immediately add to OID tree
-                    instance_str = ".".join(index_parts_ordered)
-                    self._add_instance_to_oid_tree(table_item, instance_str)
+            payload = {
+                "table_oid": table_oid,
+                "index_values": index_values,
+                "column_values": column_defaults  # Copy non-key values from last row
+            }
+
+            def _added(result: Dict[str, Any]) -> None:
+                messagebox.showinfo("Success", f"Instance added successfully: {(result or {}).get('instance_oid')}")
+                # Refresh table view
+                self._populate_table_view(table_item)
+                # Immediately add to OID tree
+                instance_str = ".".join(index_parts_ordered)
+                self._add_instance_to_oid_tree(table_item, instance_str)
+                try:
                     dialog.destroy()
-                else:
-                    messagebox.showerror("Error", f"Failed to add instance: {resp.text}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to add instance: {e}")
+                except tk.TclError:
+                    pass
+
+            def _failed(exc: Exception) -> None:
+                add_btn.configure(state="normal")
+                detail = exc.response.text if isinstance(exc, requests.HTTPError) and exc.response is not None else exc
+                messagebox.showerror("Error", f"Failed to add instance: {detail}")
+
+            add_btn.configure(state="disabled")
+            self.api.fetch("POST", "/table-row", json=payload, on_success=_added, on_error=_failed)
 
         cancel_btn = ctk.CTkButton(button_frame, text="Cancel", command=on_cancel)
         cancel_btn.pack(side="right", padx=(10, 0))
@@ -4134,17 +4332,20 @@ class SNMPControllerGUI:
         if not table_oid:
             return
 
+        def _schema_failed(exc: Exception) -> None:
+            messagebox.showerror("Error", f"Failed to get schema: {exc}")
+
         # Get table schema
-        try:
-            resp = requests.get(f"{self.api_url}/table-schema", params={"oid": table_oid}, timeout=5)
-            if resp.status_code != 200:
-                messagebox.showerror("Error", "Failed to get table schema")
-                return
-            schema = resp.json()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to get schema: {e}")
-            return
+        self.api.fetch(
+            "GET",
+            "/table-schema",
+            params={"oid": table_oid},
+            on_success=lambda schema: self._show_add_index_column_dialog(table_item, table_oid, schema),
+            on_error=_schema_failed,
+        )
 
+    def _show_add_index_column_dialog(self, table_item: str, table_oid: str, schema: Dict[str, Any]) -> None:
+        """Second half of _add_index_column, once the table schema is known."""
         instances = schema.get("instances", [])
         if not instances:
             messagebox.showinfo("No Instances", "Table has no instances. Add instances first, then add more index columns.")
@@ -4187,78 +4388,91 @@ class SNMPControllerGUI:
                 return
             
             dialog.destroy()
-            
-            # Process each instance: delete and recreate with extra index part
-            success_count = 0
-            fail_count = 0
-            
-            for inst in instances:
-                try:
-                    # Parse current index parts
-                    current_index_parts = str(inst).split(".")
-                    
-                    # Build current index_values dict
-                    current_index_values = {}
-                    for i, part in enumerate(current_index_parts):
-                        col_name = "__index__" if i == 0 else f"__index_{i + 1}__"
-                        current_index_values[col_name] = part
-                    
-                    # Get current column values for this instance
-                    column_values = {}
-                    for col_name, col_info in columns_meta.items():
-                        if col_name.startswith("__index"):
+
+            def _recreate_all() -> tuple[int, int, list[tuple[str, str]]]:
+                # Process each instance: delete and recreate with extra index part
+                success_count = 0
+                fail_count = 0
+                messages: list[tuple[str, str]] = []
+
+                for inst in instances:
+                    try:
+                        # Parse current index parts
+                        current_index_parts = str(inst).split(".")
+
+                        # Build current index_values dict
+                        current_index_values = {}
+                        for i, part in enumerate(current_index_parts):
+                            col_name = "__index__" if i == 0 else f"__index_{i + 1}__"
+                            current_index_values[col_name] = part
+
+                        # Get current column values for this instance
+                        column_values = {}
+                        for col_name, col_info in columns_meta.items():
+                            if col_name.startswith("__index"):
+                                continue
+                            col_oid = ".".join(str(x) for x in col_info["oid"])
+                            full_oid = f"{col_oid}.{inst}"
+                            try:
+                                resp = self.api.get("/value", params={"oid": full_oid}, timeout=5)
+                                if resp.status_code == 200:
+                                    value_data = resp.json()
+                                    column_values[col_name] = str(value_data.get("value", ""))
+                            except Exception:
+                                pass
+
+                        # Delete old instance
+                        del_payload = {
+                            "table_oid": table_oid,
+                            "index_values": current_index_values
+                        }
+                        resp = self.api.delete("/table-row", json=del_payload, timeout=5)
+                        if resp.status_code != 200:
+                            messages.append((f"Failed to delete instance {inst}: {resp.text}", "WARNING"))
+                            fail_count += 1
                             continue
-                        col_oid = ".".join(str(x) for x in col_info["oid"])
-                        full_oid = f"{col_oid}.{inst}"
-                        try:
-                            resp = requests.get(f"{self.api_url}/value", params={"oid": full_oid}, timeout=5)
-                            if resp.status_code == 200:
-                                value_data = resp.json()
-                                column_values[col_name] = str(value_data.get("value", ""))
-                        except Exception:
-                            pass
-                    
-                    # Delete old instance
-                    del_payload = {
-                        "table_oid": table_oid,
-                        "index_values": current_index_values
-                    }
-                    resp = requests.delete(f"{self.api_url}/table-row", json=del_payload, timeout=5)
-                    if resp.status_code != 200:
-                        self._log(f"Failed to delete instance {inst}: {resp.text}", "WARNING")
-                        fail_count += 1
-                        continue
-                    
-                    # Create new instance with extra index part
-                    new_index_values = current_index_values.copy()
-                    new_col_name = f"__index_{current_parts + 1}__" if current_parts > 0 else "__index_2__"
-                    new_index_values[new_col_name] = default_val
-                    
-                    create_payload = {
-                        "table_oid": table_oid,
-                        "index_values": new_index_values,
-                        "column_values": column_values
-                    }
-                    resp = requests.post(f"{self.api_url}/table-row", json=create_payload, timeout=5)
-                    if resp.status_code == 200:
-                        success_count += 1
-                    else:
-                        self._log(f"Failed to recreate instance {inst}: {resp.text}", "WARNING")
+
+                        # Create new instance with extra index part
+                        new_index_values = current_index_values.copy()
+                        new_col_name = f"__index_{current_parts + 1}__" if current_parts > 0 else "__index_2__"
+                        new_index_values[new_col_name] = default_val
+
+                        create_payload = {
+                            "table_oid": table_oid,
+                            "index_values": new_index_values,
+                            "column_values": column_values
+                        }
+                        resp = self.api.post("/table-row", json=create_payload, timeout=5)
+                        if resp.status_code == 200:
+                            success_count += 1
+                        else:
+                            messages.append((f"Failed to recreate instance {inst}: {resp.text}", "WARNING"))
+                            fail_count += 1
+
+                    except Exception as e:
+                        messages.append((f"Error processing instance {inst}: {e}", "ERROR"))
                         fail_count += 1
-                        
-                except Exception as e:
-                    self._log(f"Error processing instance {inst}: {e}", "ERROR")
-                    fail_count += 1
-            
-            # Show result
-            if fail_count == 0:
-                messagebox.showinfo("Success", f"Added index column to {success_count} instances")
-            else:
-                messagebox.showwarning("Partial Success", f"Updated {success_count} instances, {fail_count} failed")
-            
-            # Refresh both views
-            self._populate_table_view(table_item)
-            self._populate_oid_tree()
+                return success_count, fail_count, messages
+
+            def _recreated(outcome: tuple[int, int, list[tuple[str, str]]]) -> None:
+                success_count, fail_count, messages = outcome
+                for message, level in messages:
+                    self._log(message, level)
+
+                # Show result
+                if fail_count == 0:
+                    messagebox.showinfo("Success", f"Added index column to {success_count} instances")
+                else:
+                    messagebox.showwarning("Partial Success", f"Updated {success_count} instances, {fail_count} failed")
+
+                # Refresh both views
+                self._populate_table_view(table_item)
+                self._populate_oid_tree()
+
+            def _recreate_failed(exc: Exception) -> None:
+                messagebox.showerror("Error", f"Failed to add index column: {exc}")
+
+            self.api.submit(_recreate_all, on_success=_recreated, on_error=_recreate_failed)
 
         cancel_btn = ctk.CTkButton(button_frame, text="Cancel", command=on_cancel)
         cancel_btn.pack(side="right", padx=(10, 0))
@@ -4289,77 +4503,103 @@ class SNMPControllerGUI:
                 messagebox.showerror("Error", "Table OID not found")
                 return
             
-            # Check if this is an augmented table
+            # Check if this is an augmented table, then confirm and delete
+            self.api.fetch(
+                "GET",
+                "/table-schema",
+                params={"oid": table_oid},
+                on_success=lambda schema: self._confirm_remove_instances(table_oid, selected_rows, schema),
+                on_error=lambda exc: self._confirm_remove_instances(table_oid, selected_rows, None, exc),
+            )
+        
+        except Exception as e:
+            messagebox.showerror("Error", f"Error removing instance: {e}")
+            self._log(f"Error in _remove_instance: {e}", "ERROR")
+
+    def _confirm_remove_instances(
+        self,
+        table_oid: str,
+        selected_rows: Tuple[str, ...],
+        schema: Dict[str, Any] | None,
+        schema_error: Exception | None = None,
+    ) -> None:
+        """Second half of _remove_instance, once the table schema is known."""
+        if schema_error is not None:
+            self._log(f"Error checking if table is augmented: {schema_error}", "WARNING")
+            # Continue anyway - if we can't verify, let the user try
+        index_from = (schema or {}).get("index_from", [])
+        if index_from:
+            # This is an augmented table - cannot remove instances directly
+            parent_info = index_from[0] if index_from else {}
+            parent_mib = parent_info.get("mib", "Unknown MIB")
+            parent_col = parent_info.get("column", "Unknown")
+            messagebox.showerror(
+                "Cannot Remove from Augmented Table",
+                f"This table (indexed by {parent_col}) is an augmented table that inherits instances from {parent_mib}.\n\n"
+                f"You cannot remove instances from this table. Instead, remove instances from the parent table in {parent_mib}, "
+                f"and the instances will automatically be removed from here."
+            )
+            return
+        
+        # Confirm deletion
+        if len(selected_rows) == 1:
+            msg = "Are you sure you want to delete this instance?"
+        else:
+            msg = f"Are you sure you want to delete {len(selected_rows)} instances?"
+        
+        if not messagebox.askyesno("Confirm Deletion", msg):
+            return
+        
+        # Collect the rows to delete while the table still shows them
+        index_columns = getattr(self, "_current_index_columns", [])
+        columns_meta = getattr(self, "_current_columns_meta", {})
+        targets: list[tuple[str, Dict[str, str]]] = []
+        failed_count = 0
+        for selected_item in selected_rows:
             try:
-                resp = requests.get(f"{self.api_url}/table-schema", params={"oid": table_oid}, timeout=5)
-                if resp.status_code == 200:
-                    schema = resp.json()
-                    index_from = schema.get("index_from", [])
-                    if index_from:
-                        # This is an augmented table - cannot remove instances directly
-                        parent_info = index_from[0] if index_from else {}
-                        parent_mib = parent_info.get("mib", "Unknown MIB")
-                        parent_col = parent_info.get("column", "Unknown")
-                        messagebox.showerror(
-                            "Cannot Remove from Augmented Table",
-                            f"This table (indexed by {parent_col}) is an augmented table that inherits instances from {parent_mib}.\n\n"
-                            f"You cannot remove instances from this table. Instead, remove instances from the parent table in {parent_mib}, "
-                            f"and the instances will automatically be removed from here."
-                        )
-                        return
-            except Exception as e:
-                self._log(f"Error checking if table is augmented: {e}", "WARNING")
-                # Continue anyway - if we can't verify, let the user try
-            
-            # Confirm deletion
-            if len(selected_rows) == 1:
-                msg = "Are you sure you want to delete this instance?"
-            else:
-                msg = f"Are you sure you want to delete {len(selected_rows)} instances?"
-            
-            if not messagebox.askyesno("Confirm Deletion", msg):
-                return
+                # Get the row values
+                values = self.table_tree.item(selected_item, "values")
+            except tk.TclError:
+                values = None
+            if not values:
+                failed_count += 1
+                continue
             
-            # Delete each selected instance
-            deleted_count = 0
-            failed_count = 0
+            # First value is the instance string
+            instance_str = str(values[0])
             
-            for selected_item in selected_rows:
+            # Extract index values from the instance string
+            index_values = self._extract_index_values(instance_str, index_columns, columns_meta)
+            targets.append((instance_str, index_values))
+
+        def _delete_all() -> list[tuple[str, str | None]]:
+            # Call DELETE /table-row endpoint for each row; None means success
+            outcomes: list[tuple[str, str | None]] = []
+            for instance_str, index_values in targets:
+                payload = {
+                    "table_oid": table_oid,
+                    "index_values": index_values
+                }
                 try:
-                    # Get the row values
-                    values = self.table_tree.item(selected_item, "values")
-                    if not values:
-                        failed_count += 1
-                        continue
-                    
-                    # First value is the instance string
-                    instance_str = values[0]
-                    
-                    # Extract index values from the instance string
-                    index_columns = getattr(self, "_current_index_columns", [])
-                    columns_meta = getattr(self, "_current_columns_meta", {})
-                    
-                    index_values = self._extract_index_values(instance_str, index_columns, columns_meta)
-                    
-                    # Call DELETE /table-row endpoint
-                    payload = {
-                        "table_oid": table_oid,
-                        "index_values": index_values
-                    }
-                    resp = requests.delete(f"{self.api_url}/table-row", json=payload, timeout=5)
-                    
-                    if resp.status_code == 200:
-                        deleted_count += 1
-                        self._log(f"Deleted instance: {instance_str}", "INFO")
-                        # Immediately remove from OID tree
-                        if self._current_table_item:
-                            self._remove_instance_from_oid_tree(self._current_table_item, instance_str)
-                    else:
-                        failed_count += 1
-                        self._log(f"Failed to delete instance {instance_str}: {resp.text}", "ERROR")
+                    resp = self.api.delete("/table-row", json=payload, timeout=5)
+                    outcomes.append((instance_str, None if resp.status_code == 200 else resp.text))
                 except Exception as e:
-                    failed_count += 1
-                    self._log(f"Error deleting instance: {e}", "ERROR")
+                    outcomes.append((instance_str, str(e)))
+            return outcomes
+
+        def _deleted(outcomes: list[tuple[str, str | None]]) -> None:
+            deleted_count = 0
+            failed = failed_count
+            for instance_str, error in outcomes:
+                if error is None:
+                    deleted_count += 1
+                    self._log(f"Deleted instance: {instance_str}", "INFO")
+                    # Immediately remove from OID tree
+                    if self._current_table_item:
+                        self._remove_instance_from_oid_tree(self._current_table_item, instance_str)
+                else:
+                    failed += 1
+                    self._log(f"Failed to delete instance {instance_str}: {error}", "ERROR")
             
             # Show result and refresh
             if deleted_count > 0:
@@ -4368,12 +4608,14 @@ class SNMPControllerGUI:
                 if self._current_table_item is not None:
                     self._populate_table_view(self._current_table_item)
             
-            if failed_count > 0:
-                messagebox.showwarning("Partial Failure", f"Failed to delete {failed_count} instance(s)")
-        
-        except Exception as e:
-            messagebox.showerror("Error", f"Error removing instance: {e}")
-            self._log(f"Error in _remove_instance: {e}", "ERROR")
+            if failed > 0:
+                messagebox.showwarning("Partial Failure", f"Failed to delete {failed} instance(s)")
+
+        self.api.submit(
+            _delete_all,
+            on_success=_deleted,
+            on_error=lambda exc: messagebox.showerror("Error", f"Error removing instance: {exc}"),
+        )
 
     def _show_edit_dialog(self, oid: str, current_value: str, item: str, is_writable: bool) -> None:
         """Show a dialog to edit the value of an OID."""
@@ -4603,49 +4845,48 @@ class SNMPControllerGUI:
         
         Handles both scalar OIDs and table column OIDs by routing to appropriate endpoint.
         """
-        try:
-            self._log(f"Setting value for OID {oid} to: {new_value}")
-            
+        self._log(f"Setting value for OID {oid} to: {new_value}")
+
+        # Table column OIDs fall back to the table-row endpoint
+        table_row_payload: Dict[str, Any] | None = None
+        decomposed = self._decompose_table_oid(oid)
+        if decomposed:
+            table_oid, column_name, instance = decomposed
+            # Convert instance string to index dict
+            # For simple single-index tables, instance is just the index value
+            # For multi-index tables, instance is dot-separated values
+            index_cols = []
+            for schema_name, schema_data in self.table_schemas.items():
+                if schema_data.get("oid") and '.'.join(str(x) for x in schema_data["oid"]) == table_oid:
+                    index_cols = schema_data.get("index_columns", [])
+                    break
+
+            # Build index_values dict
+            index_values = {}
+            instance_parts = instance.split('.')
+            for i, col_name in enumerate(index_cols):
+                if i < len(instance_parts):
+                    index_values[col_name] = instance_parts[i]
+            table_row_payload = {
+                "table_oid": table_oid,
+                "index_values": index_values,
+                "column_values": {column_name: new_value}
+            }
+
+        def _set() -> Any:
             # First try as a scalar OID
-            resp = requests.post(f"{self.api_url}/value",
+            resp = self.api.post("/value",
                                json={"oid": oid, "value": new_value},
                                timeout=5)
-            
+
             # If 404, try as a table column OID
-            if resp.status_code == 404:
-                decomposed = self._decompose_table_oid(oid)
-                if decomposed:
-                    table_oid, column_name, instance = decomposed
-                    # Convert instance string to index dict
-                    # For simple single-index tables, instance is just the index value
-                    # For multi-index tables, instance is dot-separated values
-                    schema = self.table_schemas.get(None)  # Find matching schema
-                    index_cols = []
-                    for schema_name, schema_data in self.table_schemas.items():
-                        if schema_data.get("oid") and '.'.join(str(x) for x in schema_data["oid"]) == table_oid:
-                            index_cols = schema_data.get("index_columns", [])
-                            break
-                    
-                    # Build index_values dict
-                    index_values = {}
-                    instance_parts = instance.split('.')
-                    for i, col_name in enumerate(index_cols):
-                        if i < len(instance_parts):
-                            index_values[col_name] = instance_parts[i]
-                    
-                    # Call table-row endpoint
-                    self._log(f"Trying table-row endpoint: table_oid={table_oid}, index_values={index_values}, column={column_name}")
-                    resp = requests.post(f"{self.api_url}/table-row",
-                                       json={
-                                           "table_oid": table_oid,
-                                           "index_values": index_values,
-                                           "column_values": {column_name: new_value}
-                                       },
-                                       timeout=5)
-            
+            if resp.status_code == 404 and table_row_payload is not None:
+                resp = self.api.post("/table-row", json=table_row_payload, timeout=5)
+
             resp.raise_for_status()
-            result = resp.json()
+            return resp.json()
 
+        def _applied(result: Any) -> None:
             # Log the API response for debugging
             self._log(f"API response: {result}")
 
@@ -4667,20 +4908,24 @@ class SNMPControllerGUI:
                             break
                 except (ValueError, TypeError):
                     pass
-            
-            self.oid_tree.set(item, "value", display_value)
+
+            try:
+                self.oid_tree.set(item, "value", display_value)
+            except tk.TclError:
+                pass  # Tree redrawn while the request was in flight
 
             self._log(f"Successfully set value for OID {oid}")
 
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Failed to set value for OID {oid}: {e}"
-            self._log(error_msg, "ERROR")
-            messagebox.showerror("Set Error", error_msg)
-        except Exception as e:
-            error_msg = f"Unexpected error setting value for OID {oid}: {e}"
+        def _failed(exc: Exception) -> None:
+            if isinstance(exc, requests.exceptions.RequestException):
+                error_msg = f"Failed to set value for OID {oid}: {exc}"
+            else:
+                error_msg = f"Unexpected error setting value for OID {oid}: {exc}"
             self._log(error_msg, "ERROR")
             messagebox.showerror("Set Error", error_msg)
 
+        self.api.submit(_set, on_success=_applied, on_error=_failed)
+
     def _is_oid_writable(self, oid: str) -> bool:
         """Check if an OID is writable based on metadata."""
         # Strip instance suffix (e.g., .0) for metadata lookup
@@ -4707,73 +4952,31 @@ class SNMPControllerGUI:
             self._search_current_index = (self._search_current_index + 1) % len(self._search_matches)
             self._show_search_match(self._search_current_index)
             return
-        
-        # Depth-first traversal of tree structure, including metadata for unloaded nodes
-        matches: list[tuple[str, str]] = []
-        seen_oids: set[str] = set()
-        
-        def dfs_search(item: str) -> None:
-            """Recursively search tree in depth-first order, including metadata."""
-            # Get OID from values column
-            item_values = self.oid_tree.item(item, "values")
-            base_oid = item_values[0] if item_values else ""
-            
-            # For entry nodes, construct full OID from table + instance
-            # Entry nodes store (table_oid, instance, ...) in values
-            item_tags = self.oid_tree.item(item, "tags")
-            is_entry = "table-entry" in item_tags
-            oid = base_oid
-            if is_entry and len(item_values) >= 2:
-                table_oid = item_values[0]
-                instance = item_values[1]
-                if table_oid and instance:
-                    oid = f"{table_oid}.{instance}"
-            
-            # Get display name
-            item_text = self.oid_tree.item(item, "text")
-            
-            # Check if this node matches
-            if oid and oid not in seen_oids:
-                if (search_term.lower() in item_text.lower() or
-                    search_term in oid or
-                    search_term.lower() in oid.lower()):
-                    matches.append((oid, item_text))
-                    seen_oids.add(oid)
-            
-            # Recursively search visible children in tree FIRST (before metadata)
-            # This ensures proper depth-first order
-            for child_item in self.oid_tree.get_children(item):
-                dfs_search(child_item)
-            
-            # Then check metadata for unloaded children (only for non-entry nodes)
-            # Entry nodes shouldn't search metadata because their children are loaded
-            if oid and not is_entry:
-                for oid_str, metadata in self.oid_metadata.items():
-                    if oid_str not in seen_oids and oid_str.startswith(oid + "."):
-                        # This is a potential child
-                        name = metadata.get("name", "")
-                        mib = metadata.get("mib", "")
-                        obj_type = metadata.get("type", "")
-                        display_name = name if name else oid_str
-                        
-                        # Skip table entry definitions (e.g., table.1) from metadata
-                        # Entry instances (e.g., table.192.168.1.1.1) are tree nodes, but
-                        # the entry definition OID itself is metadata-only
-                        if "SEQUENCE" in obj_type and "Entry" in name:
-                            continue
-                        
-                        if (search_term.lower() in name.lower() or
-                            search_term.lower() in mib.lower() or
-                            search_term in oid_str or
-                            search_term.lower() in oid_str.lower()):
-                            matches.append((oid_str, display_name))
-                            seen_oids.add(oid_str)
-        
-        # Start search from root
-        root_items = self.oid_tree.get_children("")
-        for root_item in root_items:
-            dfs_search(root_item)
-        
+
+        # Ranked hits from the agent's search index; the tree only expands to them
+        def on_success(data: Any) -> None:
+            if search_term != self.search_var.get().strip():
+                return  # Superseded by a newer search
+            matches = [(str(hit["oid"]), str(hit.get("name") or hit["oid"])) for hit in (data or {}).get("results", [])]
+            seen = {oid for oid, _ in matches}
+            matches.extend(m for m in self._search_table_entries(search_term) if m[0] not in seen)
+            self._apply_search_matches(search_term, matches)
+
+        def on_error(exc: Exception) -> None:
+            self._log(f"Search API unavailable ({exc}), searching the local tree", "DEBUG")
+            self._apply_search_matches(search_term, self._search_locally(search_term))
+
+        self.api.cancel_group("search")
+        self.api.fetch(
+            "GET",
+            "/search",
+            params={"q": search_term, "limit": 500},
+            on_success=on_success,
+            on_error=on_error,
+            group="search",
+        )
+
+    def _apply_search_matches(self, search_term: str, matches: list[tuple[str, str]]) -> None:
         if not matches:
             messagebox.showinfo("Search", f"No matches found for '{search_term}'")
             self._search_matches.clear()
@@ -4789,6 +4992,72 @@ class SNMPControllerGUI:
         self._show_search_match(0)
         
         self._log(f"Found {len(matches)} match(es) for '{search_term}'")
+
+    def _search_table_entries(self, search_term: str) -> list[tuple[str, str]]:
+        """Match table entries and columns already loaded under table nodes."""
+        term = search_term.lower()
+        matches: list[tuple[str, str]] = []
+
+        def search_items(item: str) -> None:
+            item_values = self.oid_tree.item(item, "values")
+            oid = item_values[0] if item_values else ""
+            # Entry nodes store (table_oid, instance, ...) in values
+            if "table-entry" in self.oid_tree.item(item, "tags") and len(item_values) >= 2:
+                if item_values[0] and item_values[1]:
+                    oid = f"{item_values[0]}.{item_values[1]}"
+            text = self.oid_tree.item(item, "text")
+            if oid and (term in text.lower() or term in oid.lower()):
+                matches.append((oid, text))
+            for child in self.oid_tree.get_children(item):
+                search_items(child)
+
+        for oid_str, table_item in list(self.oid_to_item.items()):
+            if table_item in self._unmaterialised or oid_str != self.oid_tree.set(table_item, "oid"):
+                continue
+            if 'table' in self.oid_tree.item(table_item, "tags"):
+                for entry_item in self.oid_tree.get_children(table_item):
+                    search_items(entry_item)
+        return matches
+
+    def _search_locally(self, search_term: str) -> list[tuple[str, str]]:
+        """Depth-first walk of the OID trie and metadata (fallback when /search is unavailable)."""
+        term = search_term.lower()
+        matches: list[tuple[str, str]] = []
+        seen_oids: set[str] = set()
+
+        def add_match(oid: str, name: str, mib: str = "") -> None:
+            if oid and oid not in seen_oids and (term in name.lower() or term in mib.lower() or term in oid.lower()):
+                matches.append((oid, name if name else oid))
+                seen_oids.add(oid)
+
+        trie_oids: set[str] = set()
+
+        def search_trie(node: Dict[Any, Any], prefix: Tuple[int, ...]) -> None:
+            for key, child in self._trie_children(node):
+                oid_tuple = prefix + (key,)
+                oid = ".".join(str(x) for x in oid_tuple)
+                trie_oids.add(oid)
+                metadata = self.oid_metadata.get(oid, {})
+                name = child.get('__name__') or metadata.get("name") or str(key)
+                # Skip table entry definitions (e.g., table.1); entry instances are tree nodes
+                if not ("SEQUENCE" in str(metadata.get("type", "")) and "Entry" in name):
+                    add_match(oid, name, str(metadata.get("mib", "")))
+                search_trie(child, oid_tuple)
+
+        search_trie(self._oid_trie, ())
+        for oid, name in self._search_table_entries(search_term):
+            add_match(oid, name)
+
+        def _oid_sort_key(oid: str) -> Tuple[int, ...]:
+            return tuple(int(x) for x in oid.split(".") if x.isdigit())
+
+        for oid_str in sorted((o for o in self.oid_metadata if o not in trie_oids), key=_oid_sort_key):
+            metadata = self.oid_metadata[oid_str]
+            name = metadata.get("name", "")
+            if "SEQUENCE" in str(metadata.get("type", "")) and "Entry" in name:
+                continue
+            add_match(oid_str, name, str(metadata.get("mib", "")))
+        return matches
     
     def _on_search_next(self) -> None:
         """Show the next search match."""
@@ -4808,9 +5077,10 @@ class SNMPControllerGUI:
         match_num = index + 1
         total_matches = len(self._search_matches)
         
-        # If already in tree, just select it (works for any node: OID, table, entry, or column)
-        if oid_str in self.oid_to_item:
-            item_id = self.oid_to_item[oid_str]
+        # If already in tree (or its ancestors can be materialised from the trie),
+        # just select it (works for any node: OID, table, entry, or column)
+        item_id = self._materialise_path(oid_str)
+        if item_id is not None:
             self._expand_path_to_item(item_id)
             self.oid_tree.see(item_id)
             self._search_setting_selection = True  # Mark that we're setting selection from search
@@ -4895,6 +5165,7 @@ class SNMPControllerGUI:
         """Expand the tree path to make the given OID visible."""
         if not self.oids_data:
             return
+        self._materialise_path(".".join(str(x) for x in target_oid))
 
         # Build the full path by checking each prefix of the target OID
         path_oids = []
@@ -4923,6 +5194,7 @@ class SNMPControllerGUI:
             current = self.oid_tree.parent(current)
         path.reverse()
         for node in path:
+            self._materialise_children(node)
             self.oid_tree.item(node, open=True)
             # If this is a table node with placeholder, trigger table discovery
             if 'table' in self.oid_tree.item(node, 'tags'):
@@ -5050,7 +5322,7 @@ class SNMPControllerGUI:
             
             self._log(f"Pre-populated {len(instances)} instances for table {table_oid}", "DEBUG")
             # Ensure tree column is wide enough for new items
-            self._ensure_tree_column_width()
+            self._ensure_tree_column_width(self.oid_tree.get_children(table_item))
             
         except Exception as e:
             self._log(f"Error pre-populating table {table_oid}: {e}", "WARNING")
@@ -5083,51 +5355,26 @@ class SNMPControllerGUI:
             self._log(f"No columns found for table {entry_oid}", "WARNING")
             return
 
-        instances: list[str] = []
+        # Every row, already materialised, in one request (no per-instance probing)
+        rows: list[Dict[str, Any]] = []
         index_columns: list[str] = []
         try:
-            resp = requests.get(f"{self.api_url}/table-schema", params={"oid": entry_oid}, timeout=5)
+            resp = self.api.get("/table-rows", params={"oid": entry_oid, "limit": 0}, timeout=5)
             if resp.status_code == 200:
-                schema = resp.json()
-                instances = [str(inst) for inst in schema.get("instances", [])]
-                index_columns = list(schema.get("index_columns", []))
+                page = resp.json()
+                rows = list(page.get("rows", []))
+                index_columns = list(page.get("index_columns", []))
                 self._log(
-                    f"Table schema loaded for {entry_oid}: found {len(instances)} instances: {instances}, index_columns={index_columns}",
+                    f"Table rows loaded for {entry_oid}: found {len(rows)} instances, index_columns={index_columns}",
                     "INFO",
                 )
             else:
                 self._log(
-                    f"Table schema request failed for {entry_oid}: {resp.status_code} {resp.text}",
+                    f"Table rows request failed for {entry_oid}: {resp.status_code} {resp.text}",
                     "WARNING",
                 )
         except Exception as e:
-            self._log(f"Error loading table schema for {entry_oid}: {e}", "WARNING")
-
-        if not instances:
-            index = 1
-            max_attempts = 20  # Limit the number of attempts to prevent infinite loading
-            while len(instances) < max_attempts:
-                try:
-                    resp = requests.get(
-                        f"{self.api_url}/value",
-                        params={"oid": first_col_oid + "." + str(index)},
-                        timeout=1,
-                    )
-                    if resp.status_code == 200:
-                        instances.append(str(index))
-                        index += 1
-                    else:
-                        break
-                except Exception:
-                    break
-
-            if len(instances) == max_attempts:
-                messagebox.showwarning("Warning", "Reached maximum attempts while loading instances.")
-
-            self._log(
-                f"Fallback instance discovery used for {entry_oid}: instances={instances}",
-                "DEBUG",
-            )
+            self._log(f"Error loading table rows for {entry_oid}: {e}", "WARNING")
 
         # Get columns
         columns = []
@@ -5138,72 +5385,29 @@ class SNMPControllerGUI:
                 columns.append((name, col_oid, col_num))
         columns.sort(key=lambda x: x[2])
 
-        # Sort instances using same logic as table view
-        def _instance_sort_key(inst: Any) -> list[tuple[int, Any]]:
-            parts = str(inst).split(".")
-            key: list[tuple[int, Any]] = []
-            for part in parts:
-                if part.isdigit():
-                    key.append((0, int(part)))
-                else:
-                    key.append((1, part))
-            return key
-        
-        instances = sorted(instances, key=_instance_sort_key)
-
-        # Build columns metadata dict for index value extraction
-        columns_meta: Dict[str, Any] = {}
-        for name, col_oid, col_num in columns:
-            if name in index_columns:
-                col_metadata = self.oid_metadata.get(col_oid, {})
-                columns_meta[name] = col_metadata
-        
+        # Rows arrive in instance order
+        index_column_set = {idx.lower() for idx in index_columns}
         grouped: Dict[str, List[Tuple[str, str, str, str, bool]]] = {}
-        # Extract index values once per instance for efficiency
-        instances_index_values: Dict[str, Dict[str, str]] = {}
-        for inst in instances:
-            instances_index_values[inst] = self._extract_index_values(inst, index_columns, columns_meta)
-        
-        for inst in instances:
+        for row in rows:
+            inst = str(row.get("instance", ""))
+            index_values = row.get("index", {})
+            cell_values = row.get("values", {})
             grouped[inst] = []
             for name, col_oid, col_num in columns:
                 full_col_oid = f"{col_oid}.{inst}"
-                is_index = name.lower() in {idx.lower() for idx in index_columns}
-
-                # Check if value is already loaded (from bulk or previous fetch)
-                if full_col_oid in self.oid_values:
-                    value_here = self.oid_values[full_col_oid]
-                    if is_index:
-                        # Get the actual index value for display
-                        value_here = instances_index_values[inst].get(name, "N/A")
+                is_index = name.lower() in index_column_set
+                if is_index:
+                    value_here = str(index_values.get(name, "N/A"))
                 else:
-                    # Not loaded yet - try to fetch it once
-                    if is_index:
-                        # Get the actual index value for display
-                        value_here = instances_index_values[inst].get(name, "N/A")
-                        self.oid_values[full_col_oid] = value_here
-                    else:
-                        try:
-                            resp = requests.get(
-                                f"{self.api_url}/value",
-                                params={"oid": full_col_oid},
-                                timeout=2,
-                            )
-                            if resp.status_code == 200:
-                                value_here = str(resp.json().get("value", "unset"))
-                                self.oid_values[full_col_oid] = value_here
-                            else:
-                                # Mark as attempted to avoid repeated failures
-                                value_here = "unset"
-                                self.oid_values[full_col_oid] = value_here
-                        except Exception:
-                            # Mark as attempted to avoid repeated failures
-                            value_here = "unset"
-                            self.oid_values[full_col_oid] = value_here
+                    value = cell_values.get(name)
+                    value_here = "unset" if value is None else str(value)
+                self.oid_values[full_col_oid] = value_here
                 grouped[inst].append((name, col_oid, full_col_oid, value_here, is_index))
 
         # Update UI
         def update_ui() -> None:
+            # Discovered instances replace the lazy placeholder
+            self._unmaterialised.pop(item, None)
             # Remove existing children
             existing_children = self.oid_tree.get_children(item)
             self._log(f"Removing {len(existing_children)} existing children from table", "DEBUG")
@@ -5285,7 +5489,7 @@ class SNMPControllerGUI:
             # Expand the table node to show the new instances
             self.oid_tree.item(item, open=True)
             # Ensure tree column is wide enough for new items
-            self._ensure_tree_column_width()
+            self._ensure_tree_column_width(self.oid_tree.get_children(item))
 
         self.root.after(0, update_ui)
     
@@ -5330,7 +5534,7 @@ class SNMPControllerGUI:
                 # Only fetch if not already loaded (for backwards compatibility with lazy loading)
                 try:
                     self._log(f"Fetching value for OID {fetch_oid} (instance={instance_str})")
-                    resp = requests.get(f"{self.api_url}/value", params={"oid": fetch_oid}, timeout=3)
+                    resp = self.api.get("/value", params={"oid": fetch_oid}, timeout=3)
                     resp.raise_for_status()
                     val = resp.json().get("value", "unset")
                     val_str = "unset" if val is None else str(val)
@@ -5373,50 +5577,23 @@ class SNMPControllerGUI:
             full_oid: The full OID including instance (e.g., "1.3.6.1.2.1.2.2.1.8.1")
             display_value: The formatted display value to show
         """
-        # Parse the OID to find the tree item
-        # For table columns, the OID format is: col_oid.instance
-        # We need to find the tree item that matches this
-
-        # Try to find the item in the OID tree
         # The tree stores base OID (without instance) in the "oid" column
-        # and instance in the "instance" column
-
-        parts = full_oid.rsplit(".", 1)
-        if len(parts) == 2:
-            base_oid, instance = parts
-        else:
-            # Scalar OID
-            base_oid = full_oid
-            instance = ""
-
-        # Search through the tree for matching items
-        def find_and_update(item: str) -> bool:
-            """Recursively search for the matching tree item."""
+        # and instance in the "instance" column. Table columns are indexed in
+        # oid_to_item by full OID, scalars by base OID; nodes not materialised
+        # yet pick the value up from oid_values when they are inserted.
+        for candidate in (full_oid, full_oid.rsplit(".", 1)[0]):
+            item = self.oid_to_item.get(candidate)
+            if item is None:
+                continue
             try:
                 item_oid = self.oid_tree.set(item, "oid")
                 item_instance = self.oid_tree.set(item, "instance")
-
-                # Check if this item matches
-                if item_oid == base_oid and item_instance == instance:
-                    # Found it! Update the value
+                if (f"{item_oid}.{item_instance}" if item_instance else item_oid) == full_oid:
                     self.oid_tree.set(item, "value", display_value)
                     self._log(f"Refreshed OID tree value for {full_oid}: {display_value}", "DEBUG")
-                    return True
-
-                # Search children
-                for child in self.oid_tree.get_children(item):
-                    if find_and_update(child):
-                        return True
-
-            except Exception as e:
-                self._log(f"Error searching tree item: {e}", "DEBUG")
-
-            return False
-
-        # Start search from root
-        for root_item in self.oid_tree.get_children():
-            if find_and_update(root_item):
-                break
+                    return
+            except tk.TclError as e:
+                self._log(f"Error updating tree item: {e}", "DEBUG")
 
     def _add_instance_to_oid_tree(self, table_item: str, instance: str) -> None:
         """Add a single new instance to the OID tree immediately.
@@ -5533,8 +5710,8 @@ class SNMPControllerGUI:
                     if "table" in item_tags and item_oid and item_oid != parent_table_oid:
                         # This is a table - check if it's augmented from the parent
                         try:
-                            resp = requests.get(
-                                f"{self.api_url}/table-schema",
+                            resp = self.api.get(
+                                "/table-schema",
                                 params={"oid": item_oid},
                                 timeout=5
                             )
@@ -5605,7 +5782,7 @@ class SNMPControllerGUI:
         if not table_oid:
             return
 
-        table_item = self.oid_to_item.get(table_oid)
+        table_item = self._materialise_path(table_oid)
         if not table_item:
             return
 
@@ -5662,30 +5839,91 @@ class SNMPControllerGUI:
             self._connect()
     
     def _connect(self) -> None:
-        """Connect to the REST API."""
+        """Connect to the REST API (model data is loaded off the Tk thread)."""
         host = self.host_var.get().strip()
         port = self.port_var.get().strip()
         self.api_url = f"http://{host}:{port}"
-        
+        self.api.base_url = self.api_url
+
+        self.status_var.set("Connecting...")
+        self._log(f"Connecting to {self.api_url}")
+        self.api.submit(
+            self._fetch_connect_data,
+            on_success=self._apply_connect_data,
+            on_error=self._on_connect_error,
+            key=("connect", self.api_url),
+        )
+
+    def _fetch_connect_data(self) -> Dict[str, Any]:
+        """Fetch MIBs, OIDs, metadata, values and table instances (worker thread).
+
+        Log lines are collected and replayed on the Tk thread.
+        """
+        messages: list[tuple[str, str]] = []
+        data: Dict[str, Any] = {"messages": messages}
+
+        # Test connection by fetching MIBs with dependencies
         try:
-            self.status_var.set("Connecting...")
-            self._log(f"Connecting to {self.api_url}")
-            
-            # Test connection by fetching MIBs with dependencies
-            try:
-                response = requests.get(f"{self.api_url}/mibs-with-dependencies", timeout=5)
-                response.raise_for_status()
-                mibs_dep_data = response.json()
-            except Exception:
-                # Fallback to simple /mibs endpoint if the new endpoint is not available
-                response = requests.get(f"{self.api_url}/mibs", timeout=5)
-                response.raise_for_status()
-                mibs_data = response.json()
-                configured_mibs = mibs_data.get("mibs", [])
-                mibs_dep_data = {
-                    "configured_mibs": configured_mibs,
-                    "tree": {mib: {"direct_deps": [], "transitive_deps": [], "is_configured": True} for mib in configured_mibs},
-                }
+            response = self.api.get("/mibs-with-dependencies", timeout=5)
+            response.raise_for_status()
+            data["mibs_dep_data"] = response.json()
+        except Exception:
+            # Fallback to simple /mibs endpoint if the new endpoint is not available
+            response = self.api.get("/mibs", timeout=5)
+            response.raise_for_status()
+            mibs_data = response.json()
+            configured_mibs = mibs_data.get("mibs", [])
+            data["mibs_dep_data"] = {
+                "configured_mibs": configured_mibs,
+                "tree": {mib: {"direct_deps": [], "transitive_deps": [], "is_configured": True} for mib in configured_mibs},
+            }
+
+        # Fetch OIDs
+        response = self.api.get("/oids", timeout=5)
+        response.raise_for_status()
+        data["oids"] = response.json().get("oids", {})
+
+        # Fetch OID metadata
+        try:
+            response = self.api.get("/oid-metadata", timeout=5)
+            response.raise_for_status()
+            data["oid_metadata"] = response.json().get("metadata", {})
+        except Exception as e:
+            messages.append((f"Failed to fetch OID metadata: {e}", "WARNING"))
+            data["oid_metadata"] = {}
+
+        # Fetch all OID values in bulk for efficient loading
+        try:
+            response = self.api.get("/values/bulk", timeout=30)
+            response.raise_for_status()
+            data["oid_values"] = response.json().get("values", {})
+            messages.append((f"Loaded {len(data['oid_values'])} OID values", "INFO"))
+        except Exception as e:
+            messages.append((f"Failed to fetch bulk values: {e}", "WARNING"))
+            data["oid_values"] = {}
+
+        # Fetch all table instances in bulk
+        try:
+            response = self.api.get("/tree/bulk", timeout=30)
+            response.raise_for_status()
+            tables = response.json().get("tables", {})
+            data["table_instances_data"] = tables
+            total_instances = sum(len(t.get("instances", [])) for t in tables.values())
+            messages.append((f"Loaded {len(tables)} tables with {total_instances} total instances", "INFO"))
+            if tables:
+                messages.append((f"Table OIDs loaded: {list(tables.keys())[:5]}...", "DEBUG"))
+        except Exception as e:
+            messages.append((f"Failed to fetch tree bulk data: {e}", "WARNING"))
+            data["table_instances_data"] = {}
+
+        return data
+
+    def _apply_connect_data(self, data: Dict[str, Any]) -> None:
+        """Build the UI from data fetched by _fetch_connect_data."""
+        try:
+            mibs_dep_data = data["mibs_dep_data"]
+            for message, level in data.get("messages", []):
+                self._log(message, level)
 
             # Populate MIB tree with dependencies
             self._populate_mibs_tree(mibs_dep_data)
@@ -5693,57 +5931,16 @@ class SNMPControllerGUI:
             # Get MIBs count for logging
             configured_mibs_list = mibs_dep_data.get("configured_mibs", [])
             
-            # Fetch OIDs
-            response = requests.get(f"{self.api_url}/oids", timeout=5)
-            response.raise_for_status()
-            
-            oids_data = response.json()
-            oids = oids_data.get("oids", {})
+            oids = data.get("oids", {})
             # Convert OID lists (from JSON) to tuples to match the annotated type
             try:
                 converted = {str(k): tuple(v) for k, v in oids.items()}
             except Exception:
                 converted = {}
             self.oids_data = converted
-
-            # Fetch OID metadata
-            try:
-                response = requests.get(f"{self.api_url}/oid-metadata", timeout=5)
-                response.raise_for_status()
-                metadata_data = response.json()
-                self.oid_metadata = metadata_data.get("metadata", {})
-            except Exception as e:
-                self._log(f"Failed to fetch OID metadata: {e}", "WARNING")
-                self.oid_metadata = {}
-
-            # Fetch all OID values in bulk for efficient loading
-            self._log("Loading all OID values in bulk...")
-            try:
-                response = requests.get(f"{self.api_url}/values/bulk", timeout=30)
-                response.raise_for_status()
-                values_data = response.json()
-                self.oid_values = values_data.get("values", {})
-                self._log(f"Loaded {len(self.oid_values)} OID values")
-            except Exception as e:
-                self._log(f"Failed to fetch bulk values: {e}", "WARNING")
-                self.oid_values = {}
-            
-            # Fetch all table instances in bulk
-            self._log("Loading all table instances in bulk...")
-            try:
-                response = requests.get(f"{self.api_url}/tree/bulk", timeout=30)
-                response.raise_for_status()
-                tree_data = response.json()
-                self.table_instances_data = tree_data.get("tables", {})
-                total_instances = sum(len(t.get("instances", [])) for t in self.table_instances_data.values())
-                self._log(f"Loaded {len(self.table_instances_data)} tables with {total_instances} total instances")
-                if self.table_instances_data:
-                    self._log(f"Table OIDs loaded: {list(self.table_instances_data.keys())[:5]}...", "DEBUG")
-            except Exception as e:
-                self._log(f"Failed to fetch tree bulk data: {e}", "WARNING")
-                import traceback
-                traceback.print_exc()
-                self.table_instances_data = {}
+            self.oid_metadata = data.get("oid_metadata", {})
+            self.oid_values = data.get("oid_values", {})
+            self.table_instances_data = data.get("table_instances_data", {})
             
             # Enable OID Tree tab when connected
             self.enable_oid_tree_tab()
@@ -5769,19 +5966,20 @@ class SNMPControllerGUI:
             # Load available traps
             self._load_traps()
 
-        except requests.exceptions.ConnectionError:
-            error_msg = "Cannot connect to REST API. Is the agent running?"
-            self._log(error_msg, "ERROR")
-            self.status_var.set("Connection failed")
-            if not self.silent_errors:
-                messagebox.showerror("Connection Error", error_msg)
-
         except Exception as e:
-            error_msg = f"Error connecting: {str(e)}"
-            self._log(error_msg, "ERROR")
-            self.status_var.set("Connection failed")
-            if not self.silent_errors:
-                messagebox.showerror("Error", error_msg)
+            self._on_connect_error(e)
+
+    def _on_connect_error(self, error: Exception) -> None:
+        if isinstance(error, requests.exceptions.ConnectionError):
+            error_msg = "Cannot connect to REST API. Is the agent running?"
+            title = "Connection Error"
+        else:
+            error_msg = f"Error connecting: {str(error)}"
+            title = "Error"
+        self._log(error_msg, "ERROR")
+        self.status_var.set("Connection failed")
+        if not self.silent_errors:
+            messagebox.showerror(title, error_msg)
     
     def _disconnect(self) -> None:
         """Disconnect from the REST API."""
@@ -5882,7 +6080,7 @@ class SNMPControllerGUI:
                 "trap_overrides": self.current_trap_overrides
             }
             try:
-                resp = requests.post(f"{self.api_url}/config", json=cfg, timeout=5)
+                resp = self.api.post("/config", json=cfg, timeout=5)
                 resp.raise_for_status()
                 self._log("Configuration saved to server")
             except requests.exceptions.RequestException as e:
@@ -5892,6 +6090,10 @@ class SNMPControllerGUI:
         except Exception as e:
             self._log(f"Error during shutdown: {e}", "ERROR")
 
+        if self.mib_browser is not None:
+            self.mib_browser.close()
+        self.api.close()
+
         try:
             self.root.destroy()
         except Exception:
@@ -5948,30 +6150,49 @@ class SNMPControllerGUI:
         return None
 
 
-    def _apply_trap_overrides(self, trap_overrides: Dict[str, str]) -> int:
-        """Apply trap override values by POSTing to /value. Returns count of successful updates."""
-        applied = 0
-
+    def _apply_trap_overrides(self, trap_overrides: Dict[str, str], then: Callable[[int], None]) -> None:
+        """Apply trap override values by POSTing to /value, then call ``then`` with the count of successful updates."""
+        updates: list[tuple[str, str, str]] = []
         for oid_str, value in trap_overrides.items():
             try:
                 actual_oid = self._resolve_oid_str_to_actual_oid(oid_str)
-                if not actual_oid:
-                    self._log(f"Could not resolve OID: {oid_str}", "WARNING")
-                    continue
-
-                update_payload = {"oid": actual_oid, "value": value}
-                response = requests.post(f"{self.api_url}/value", json=update_payload, timeout=5)
+            except Exception as exc:
+                self._log(f"Error setting OID {oid_str}: {exc}", "WARNING")
+                continue
+            if not actual_oid:
+                self._log(f"Could not resolve OID: {oid_str}", "WARNING")
+                continue
+            updates.append((oid_str, actual_oid, value))
 
-                if response.status_code == 200:
+        def _post_all() -> list[tuple[str, str, str | None]]:
+            # None means the value was set
+            outcomes: list[tuple[str, str, str | None]] = []
+            for oid_str, actual_oid, value in updates:
+                try:
+                    update_payload = {"oid": actual_oid, "value": value}
+                    response = self.api.post("/value", json=update_payload, timeout=5)
+                    if response.status_code == 200:
+                        outcomes.append((oid_str, value, None))
+                    else:
+                        outcomes.append((oid_str, value, f"Failed to set OID {oid_str}: {response.text}"))
+                except Exception as exc:
+                    outcomes.append((oid_str, value, f"Error setting OID {oid_str}: {exc}"))
+            return outcomes
+
+        def _applied(outcomes: list[tuple[str, str, str | None]]) -> None:
+            applied = 0
+            for oid_str, value, error in outcomes:
+                if error is None:
                     applied += 1
                     self._log(f"Set OID {oid_str} = {value}")
                 else:
-                    self._log(f"Failed to set OID {oid_str}: {response.text}", "WARNING")
-
-            except Exception as exc:
-                self._log(f"Error setting OID {oid_str}: {exc}", "WARNING")
+                    self._log(error, "WARNING")
+            then(applied)
 
-        return applied
+        if not updates:
+            then(0)
+            return
+        self.api.submit(_post_all, on_success=_applied, on_error=lambda exc: _applied([]))
 
 
     def _build_send_trap_payload(
@@ -5992,7 +6213,7 @@ class SNMPControllerGUI:
 
 
     def _post_send_trap(self, payload: SendTrapPayload) -> Dict[str, Any]:
-        response = requests.post(f"{self.api_url}/send-trap", json=payload, timeout=5)
+        response = self.api.post("/send-trap", json=payload, timeout=5)
         response.raise_for_status()
         return cast(Dict[str, Any], response.json())
 
@@ -6034,10 +6255,16 @@ class SNMPControllerGUI:
 
         try:
             port = int(self.receiver_port_var.get())
+        except ValueError:
+            messagebox.showerror("Error", "Invalid port number")
+            return
 
-            trap_overrides = self._collect_trap_overrides()
-            self._apply_trap_overrides(trap_overrides)
+        trap_overrides = self._collect_trap_overrides()
+        self._apply_trap_overrides(trap_overrides, lambda _applied: self._send_test_trap_to(trap_name, port))
 
+    def _send_test_trap_to(self, trap_name: str, port: int) -> None:
+        """Second half of _send_test_trap, once the trap overrides are applied."""
+        try:
             payload = self._build_send_trap_payload(
                 trap_name=trap_name,
                 dest_host="localhost",
@@ -6064,7 +6291,7 @@ class SNMPControllerGUI:
 
             # Check if trap was received
             try:
-                check_response = requests.get(f"{self.api_url}/trap-receiver/traps?limit=1", timeout=2)
+                check_response = self.api.get("/trap-receiver/traps?limit=1", timeout=2)
                 if check_response.status_code == 200:
                     check_result = check_response.json()
                     traps = check_result.get("traps", [])
@@ -6093,8 +6320,6 @@ class SNMPControllerGUI:
             except Exception:
                 messagebox.showinfo("Trap Sent", f"Test trap '{trap_name}' sent to localhost:{port}")
 
-        except ValueError:
-            messagebox.showerror("Error", "Invalid port number")
         except Exception as exc:
             error_msg = f"Failed to send test trap: {exc}"
             self._log(error_msg, "ERROR")
@@ -6112,10 +6337,12 @@ class SNMPControllerGUI:
             messagebox.showerror("No Destinations", "Please add at least one trap destination.")
             return
 
-        try:
-            trap_overrides = self._collect_trap_overrides()
-            applied = self._apply_trap_overrides(trap_overrides)
+        trap_overrides = self._collect_trap_overrides()
+        self._apply_trap_overrides(trap_overrides, lambda applied: self._send_trap_to_destinations(trap_name, applied))
 
+    def _send_trap_to_destinations(self, trap_name: str, applied: int) -> None:
+        """Second half of _send_trap, once the trap overrides are applied."""
+        try:
             if applied:
                 self._log(f"Applied {applied} trap-specific OID override(s)")
 
@@ -6173,7 +6400,7 @@ class SNMPControllerGUI:
             self._log("Baking state into schemas...")
 
             # Call API endpoint
-            resp = requests.post(f"{self.api_url}/bake-state", timeout=30)
+            resp = self.api.post("/bake-state", timeout=30)
             resp.raise_for_status()
             result = resp.json()
 
@@ -6213,7 +6440,7 @@ class SNMPControllerGUI:
                 return
 
             self._log("Regenerating schemas and clearing state...")
-            resp = requests.post(f"{self.api_url}/state/fresh", timeout=60)
+            resp = self.api.post("/state/fresh", timeout=60)
             resp.raise_for_status()
             result = resp.json()
 
@@ -6249,7 +6476,7 @@ class SNMPControllerGUI:
                 return
 
             self._log("Resetting state...")
-            resp = requests.post(f"{self.api_url}/state/reset", timeout=20)
+            resp = self.api.post("/state/reset", timeout=20)
             resp.raise_for_status()
 
             self._log("✓ State reset")
@@ -6280,12 +6507,12 @@ class SNMPControllerGUI:
             self._log(f"Saving preset '{preset_name}'...")
 
             # Bake state before saving preset
-            bake_resp = requests.post(f"{self.api_url}/bake-state", timeout=30)
+            bake_resp = self.api.post("/bake-state", timeout=30)
             bake_resp.raise_for_status()
 
             # Call API endpoint
-            resp = requests.post(
-                f"{self.api_url}/presets/save",
+            resp = self.api.post(
+                "/presets/save",
                 json={"preset_name": preset_name},
                 timeout=30
             )
@@ -6311,7 +6538,7 @@ class SNMPControllerGUI:
         """Show dialog to load a preset."""
         try:
             # Get list of presets
-            resp = requests.get(f"{self.api_url}/presets", timeout=5)
+            resp = self.api.get("/presets", timeout=5)
             resp.raise_for_status()
             result = resp.json()
 
@@ -6380,7 +6607,7 @@ class SNMPControllerGUI:
                 "Load Preset",
                 f"This will replace the current agent-model with preset '{preset_name}'.\n\n"
                 f"A backup will be created automatically.\n\n"
-                f"You will need to restart the agent for changes to take effect.\n\n"
+                f"The running agent switches to the preset immediately.\n\n"
                 f"Continue?"
             )
 
@@ -6390,8 +6617,8 @@ class SNMPControllerGUI:
             self._log(f"Loading preset '{preset_name}'...")
 
             # Call API endpoint
-            resp = requests.post(
-                f"{self.api_url}/presets/load",
+            resp = self.api.post(
+                "/presets/load",
                 json={"preset_name": preset_name},
                 timeout=30
             )
@@ -6400,10 +6627,13 @@ class SNMPControllerGUI:
 
             self._log(f"✓ Preset '{preset_name}' loaded successfully")
 
+            if result.get("applied"):
+                detail = "The running agent is now serving it."
+            else:
+                detail = "Please restart the agent for changes to take effect."
             messagebox.showinfo(
                 "Success",
-                f"Preset '{preset_name}' loaded successfully!\n\n"
-                f"Please restart the agent for changes to take effect."
+                f"Preset '{preset_name}' loaded successfully!\n\n{detail}"
             )
 
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,203 @@
+"""Long-lived SNMP manager session for the GUI.
+
+Owns one ``SnmpEngine`` running on a background asyncio loop so GUI commands
+do not pay engine start-up (and ``asyncio.run``) per request, and the Tk
+thread never blocks on the network. Walks use GETBULK with adaptive
+max-repetitions and hand results back in batches as they arrive.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, Optional, Sequence
+
+from pysnmp.hlapi.v3arch.asyncio import (
+    CommunityData,
+    ContextData,
+    ObjectType,
+    SnmpEngine,
+    UdpTransportTarget,
+    bulk_cmd,
+    get_cmd,
+    next_cmd,
+    set_cmd,
+)
+from pysnmp.hlapi.v3arch.asyncio.cmdgen import VB_PROCESSOR
+from pysnmp.proto import errind
+from pysnmp.proto.rfc1902 import Null
+from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchInstance, NoSuchObject
+
+# Adaptive GETBULK window
+MIN_REPETITIONS = 5
+MAX_REPETITIONS = 200
+# Grow the window while responses come back faster than this (seconds)
+FAST_RESPONSE = 0.25
+
+_TOO_BIG = 1
+
+
+def next_max_repetitions(current: int, returned: int, elapsed: float, too_big: bool = False) -> int:
+    """Pick the max-repetitions for the next GETBULK request.
+
+    Halve after a tooBig response, double while full responses come back
+    quickly, otherwise keep the current window.
+    """
+    if too_big:
+        return max(1, current // 2)
+    if returned >= current and elapsed < FAST_RESPONSE:
+        return min(MAX_REPETITIONS, current * 2)
+    return current
+
+
+def _oid_tuple(name: Any) -> tuple[int, ...]:
+    if hasattr(name, "get_oid"):
+        name = name.get_oid()
+    return tuple(int(x) for x in name)
+
+
+class WalkCancelled(Exception):
+    """Raised from a walk future when it was cancelled by the caller."""
+
+
+class SnmpSession:
+    """One SNMP engine on a background event loop, shared by all GUI operations."""
+
+    def __init__(self, timeout: float = 2.0, retries: int = 1) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="snmp-session", daemon=True)
+        self._engine: Optional[SnmpEngine] = None
+        self._targets: dict[tuple[str, int], UdpTransportTarget] = {}
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> "Future[Any]":
+        """Schedule a coroutine on the session loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def close(self) -> None:
+        """Stop the loop and release the engine's transports."""
+        if not self._loop.is_running():
+            return
+
+        async def _shutdown() -> None:
+            if self._engine is not None:
+                self._engine.close_dispatcher()
+                self._engine = None
+            self._targets.clear()
+
+        try:
+            self.submit(_shutdown()).result(timeout=2)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2)
+
+    # Helpers below run on the session loop
+
+    @property
+    def engine(self) -> SnmpEngine:
+        if self._engine is None:
+            self._engine = SnmpEngine()
+        return self._engine
+
+    async def _target(self, host: str, port: int) -> UdpTransportTarget:
+        target = self._targets.get((host, port))
+        if target is None:
+            target = await UdpTransportTarget.create((host, port), timeout=self.timeout, retries=self.retries)
+            self._targets[(host, port)] = target
+        return target
+
+    async def get(self, host: str, port: int, community: str, *var_binds: ObjectType) -> tuple[Any, ...]:
+        return await get_cmd(  # type: ignore[no-any-return]
+            self.engine, CommunityData(community, mpModel=1), await self._target(host, port), ContextData(), *var_binds
+        )
+
+    async def next(self, host: str, port: int, community: str, *var_binds: ObjectType) -> tuple[Any, ...]:
+        return await next_cmd(  # type: ignore[no-any-return]
+            self.engine, CommunityData(community, mpModel=1), await self._target(host, port), ContextData(), *var_binds
+        )
+
+    async def set(self, host: str, port: int, community: str, *var_binds: ObjectType) -> tuple[Any, ...]:
+        return await set_cmd(  # type: ignore[no-any-return]
+            self.engine, CommunityData(community, mpModel=1), await self._target(host, port), ContextData(), *var_binds
+        )
+
+    async def walk(
+        self,
+        host: str,
+        port: int,
+        community: str,
+        var_bind: ObjectType,
+        on_batch: Callable[[Sequence[ObjectType]], None],
+        cancel: Optional[threading.Event] = None,
+        max_repetitions: int = MIN_REPETITIONS * 2,
+    ) -> int:
+        """Walk the subtree under ``var_bind`` with GETBULK.
+
+        ``on_batch`` is called (on the session loop) with each response's
+        in-subtree var-binds. Returns the number of var-binds delivered.
+
+        Raises:
+            WalkCancelled: If ``cancel`` was set before the walk finished
+            RuntimeError: On an SNMP engine or PDU error
+        """
+        engine = self.engine
+        auth = CommunityData(community, mpModel=1)
+        target = await self._target(host, port)
+        root = VB_PROCESSOR.make_varbinds(engine.cache, (var_bind,))[0][0]
+        root_oid = _oid_tuple(root)
+        last: Any = root
+        last_oid = root_oid
+        repetitions = max(1, max_repetitions)
+        delivered = 0
+
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise WalkCancelled()
+            started = time.monotonic()
+            error_indication, error_status, _error_index, var_binds = await bulk_cmd(
+                engine, auth, target, ContextData(), 0, repetitions, (last, Null(""))
+            )
+            elapsed = time.monotonic() - started
+
+            if error_indication:
+                if isinstance(error_indication, errind.RequestTimedOut) and repetitions > MIN_REPETITIONS:
+                    # A large response may have been dropped on the way; retry
+                    # once at the minimum window, then give up
+                    repetitions = MIN_REPETITIONS
+                    continue
+                raise RuntimeError(str(error_indication))
+            if error_status:
+                if int(error_status) == _TOO_BIG and repetitions > 1:
+                    repetitions = next_max_repetitions(repetitions, 0, elapsed, too_big=True)
+                    continue
+                raise RuntimeError(error_status.prettyPrint())
+
+            batch = []
+            finished = not var_binds
+            for var_bind_out in var_binds:
+                name, value = var_bind_out[0], var_bind_out[1]
+                oid = _oid_tuple(name)
+                if (
+                    isinstance(value, (EndOfMibView, NoSuchObject, NoSuchInstance))
+                    or oid[: len(root_oid)] != root_oid
+                    or oid <= last_oid
+                ):
+                    finished = True
+                    break
+                batch.append(var_bind_out)
+                last, last_oid = name, oid
+
+            if batch:
+                delivered += len(batch)
+                on_batch(batch)
+            if finished:
+                return delivered
+            repetitions = next_max_repetitions(repetitions, len(var_binds), elapsed)